@@ -1,6 +1,7 @@
 import os
 import cv2
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional, List, Tuple
 from dataset_forge.utils.input_utils import get_folder_path
 from dataset_forge.utils.printing import (
@@ -14,6 +15,47 @@ from dataset_forge.utils.memory_utils import clear_memory, memory_context
 from dataset_forge.utils.file_utils import is_image_file
 from dataset_forge.utils.history_log import log_operation
 
+ALIGN_METHODS = ("auto", "homography", "ecc", "translation")
+# Longest side of the pyramid level used for the coarse estimate
+PYRAMID_MAX_SIDE = 1024
+# ECC iterations at the coarse level and for full-resolution refinement
+ECC_COARSE_ITERATIONS = 100
+ECC_REFINE_ITERATIONS = 5
+ECC_EPSILON = 1e-5
+LOWE_RATIO = 0.75
+# Strongest SIFT keypoints kept per image; bounds matching cost
+MAX_FEATURES = 2000
+MIN_MATCHES = 4
+FALLBACK_MATCHES = 20
+
+_keypoint_cache = None
+
+
+def _init_align_worker() -> None:
+    # One OpenCV thread per worker process; the pool provides the parallelism
+    cv2.setNumThreads(1)
+
+
+def _align_pair_job(job) -> Tuple[str, Optional[str]]:
+    """Align one pair from disk; returns (rel_path, error message or None)."""
+    rel_path, src1, src2, out_path, method, max_side = job
+    try:
+        img1 = cv2.imread(src1, cv2.IMREAD_UNCHANGED)
+        img2 = cv2.imread(src2, cv2.IMREAD_UNCHANGED)
+        if img1 is None or img2 is None:
+            return rel_path, "Could not read one or both images"
+        aligned = align_image(
+            img1, img2, method=method, max_side=max_side, reference_path=src2
+        )
+        if aligned is None:
+            return rel_path, "Alignment failed"
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        if not cv2.imwrite(out_path, aligned):
+            return rel_path, "Could not write output"
+        return rel_path, None
+    except Exception as e:
+        return rel_path, f"Error: {e}"
+
 
 def align_images_workflow(
     folder1: Optional[str] = None,
@@ -21,17 +63,25 @@ def align_images_workflow(
     output_folder: Optional[str] = None,
     recursive: bool = True,
     dry_run: bool = False,
+    method: str = "auto",
+    max_workers: Optional[int] = None,
+    max_side: int = PYRAMID_MAX_SIDE,
 ) -> None:
     """
     Align images from two folders (matching by filename) using SIFT+FLANN projective transformation.
     Supports both flat and recursive (subfolder) batch processing.
 
+    Pairs are aligned on a process pool; see align_image for the methods.
+
     Args:
         folder1: Path to the first folder (source images to align)
         folder2: Path to the second folder (reference images)
         output_folder: Path to save aligned images
         recursive: Whether to process subfolders recursively
         dry_run: If True, only print what would be done
+        method: "auto", "homography", "ecc" or "translation"
+        max_workers: Worker processes (default: CPU count; 1 runs inline)
+        max_side: Longest side of the coarse pyramid level
 
     Returns:
         None
@@ -85,36 +135,52 @@ def align_images_workflow(
             print_warning("No matching image filenames found in both folders.")
             return
         print_info(f"Found {len(common)} matching image(s) to align.")
+        if dry_run:
+            for rel_path in common:
+                print_info(f"[DRY RUN] Would align: {rel_path}")
+            return
+        jobs = [
+            (
+                rel_path,
+                os.path.join(folder1, rel_path),
+                os.path.join(folder2, rel_path),
+                os.path.join(output_folder, rel_path),
+                method,
+                max_side,
+            )
+            for rel_path in common
+        ]
         processed, failed = 0, 0
-        with memory_context("Align Images"), tqdm(
-            common, desc="Aligning", unit="img"
-        ) as bar:
-            for rel_path in bar:
-                src1 = os.path.join(folder1, rel_path)
-                src2 = os.path.join(folder2, rel_path)
-                out_path = os.path.join(output_folder, rel_path)
-                os.makedirs(os.path.dirname(out_path), exist_ok=True)
-                if dry_run:
-                    print_info(f"[DRY RUN] Would align: {rel_path}")
-                    continue
-                try:
-                    img1 = cv2.imread(src1, cv2.IMREAD_UNCHANGED)
-                    img2 = cv2.imread(src2, cv2.IMREAD_UNCHANGED)
-                    if img1 is None or img2 is None:
-                        print_warning(f"Could not read one or both images: {rel_path}")
-                        failed += 1
-                        continue
-                    aligned = align_image(img1, img2)
-                    if aligned is None:
-                        print_warning(f"Alignment failed: {rel_path}")
-                        failed += 1
+        max_workers = max_workers or os.cpu_count() or 1
+        with memory_context("Align Images"):
+            if max_workers <= 1 or len(jobs) == 1:
+                results = map(_align_pair_job, jobs)
+                executor = None
+            else:
+                executor = ProcessPoolExecutor(
+                    max_workers=min(max_workers, len(jobs)),
+                    initializer=_init_align_worker,
+                )
+                results = executor.map(
+                    _align_pair_job,
+                    jobs,
+                    chunksize=max(1, min(32, len(jobs) // (max_workers * 4))),
+                )
+            try:
+                for rel_path, error in tqdm(
+                    results, total=len(jobs), desc="Aligning", unit="img"
+                ):
+                    if error is None:
+                        processed += 1
                         continue
-                    cv2.imwrite(out_path, aligned)
-                    processed += 1
-                except Exception as e:
-                    print_error(f"Error processing {rel_path}: {e}")
-                    log_operation("align_images", f"Failed: {rel_path}: {e}")
                     failed += 1
+                    print_warning(f"{error}: {rel_path}")
+                    log_operation(
+                        "align_images", f"Failed: {rel_path}: {error}", outcome="error"
+                    )
+            finally:
+                if executor is not None:
+                    executor.shutdown()
         print_success(
             f"\nAlignment complete. {processed} images aligned, {failed} failed."
         )
@@ -129,48 +195,264 @@ def align_images_workflow(
         clear_memory()
 
 
-def align_image(image1: np.ndarray, image2: np.ndarray) -> Optional[np.ndarray]:
+def _get_keypoint_cache():
+    """Lazily create the on-disk cache for reference-image SIFT features."""
+    global _keypoint_cache
+    if _keypoint_cache is None:
+        from dataset_forge.utils.result_cache import FileResultCache
+
+        _keypoint_cache = FileResultCache("align_keypoints")
+    return _keypoint_cache
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 2:
+        gray = image
+    elif image.shape[2] == 4:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+    else:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    if gray.dtype != np.uint8:
+        gray = cv2.normalize(gray, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+    return gray
+
+
+def _pyramid_scale(shape: Tuple[int, ...], max_side: int) -> float:
+    return min(1.0, max_side / float(max(shape[:2])))
+
+
+def _downscale(gray: np.ndarray, scale: float) -> np.ndarray:
+    if scale >= 1.0:
+        return gray
+    h, w = gray.shape[:2]
+    size = (max(1, round(w * scale)), max(1, round(h * scale)))
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+
+def _sift_features(gray: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    keypoints, descriptors = cv2.SIFT_create(nfeatures=MAX_FEATURES).detectAndCompute(
+        gray, None
+    )
+    points = np.float32([kp.pt for kp in keypoints]).reshape(-1, 2)
+    return points, descriptors
+
+
+def _reference_features(
+    gray: np.ndarray, scale: float, reference_path: Optional[str], max_side: int
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    SIFT features of the coarse reference level, cached on disk by file content.
+
+    References reused across runs (or shared by several sources) are only
+    detected once.
     """
-    Align image1 to image2 using SIFT keypoints and FLANN-based matching.
+    if reference_path is None:
+        return _sift_features(_downscale(gray, scale))
+    cache = _get_keypoint_cache()
+    key = cache.make_key(
+        reference_path,
+        {"detector": "sift", "max_side": max_side, "nfeatures": MAX_FEATURES},
+    )
+    entry = cache.entry_path(key, ".npz")
+    if os.path.exists(entry):
+        try:
+            with np.load(entry) as data:
+                descriptors = data["descriptors"]
+                return data["points"], descriptors if descriptors.size else None
+        except (OSError, ValueError, KeyError):
+            pass
+    points, descriptors = _sift_features(_downscale(gray, scale))
+    os.makedirs(os.path.dirname(entry), exist_ok=True)
+    tmp = f"{entry}.{os.getpid()}.tmp.npz"
+    np.savez(
+        tmp,
+        points=points,
+        descriptors=(
+            descriptors if descriptors is not None else np.zeros((0, 128), np.float32)
+        ),
+    )
+    os.replace(tmp, entry)
+    return points, descriptors
+
+
+def _scale_matrix(sx: float, sy: float) -> np.ndarray:
+    return np.array([[sx, 0, 0], [0, sy, 0], [0, 0, 1]], dtype=np.float64)
+
+
+def _ecc(
+    template: np.ndarray,
+    moving: np.ndarray,
+    warp: np.ndarray,
+    motion: int,
+    iterations: int,
+) -> Optional[np.ndarray]:
+    """Run ECC; returns the refined warp (template -> moving coords) or None."""
+    criteria = (
+        cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT,
+        iterations,
+        ECC_EPSILON,
+    )
+    try:
+        _, warp = cv2.findTransformECC(
+            template.astype(np.float32),
+            moving.astype(np.float32),
+            warp.astype(np.float32),
+            motion,
+            criteria,
+            None,
+            5,
+        )
+        return warp
+    except cv2.error:
+        return None
+
+
+def _to_3x3(warp: np.ndarray) -> np.ndarray:
+    if warp.shape == (3, 3):
+        return warp.astype(np.float64)
+    return np.vstack([warp, [0, 0, 1]]).astype(np.float64)
+
+
+def _refine_ecc(
+    gray1: np.ndarray, ref_gray: np.ndarray, M: np.ndarray, iterations: int
+) -> np.ndarray:
+    """Refine a source->reference homography with a short full-resolution ECC run."""
+    if iterations <= 0:
+        return M
+    refined = _ecc(ref_gray, gray1, np.linalg.inv(M), cv2.MOTION_HOMOGRAPHY, iterations)
+    if refined is None:
+        return M
+    return np.linalg.inv(_to_3x3(refined))
+
+
+def estimate_homography(
+    gray1: np.ndarray,
+    gray2: np.ndarray,
+    max_side: int = PYRAMID_MAX_SIDE,
+    reference_path: Optional[str] = None,
+) -> Optional[np.ndarray]:
+    """
+    Estimate the homography mapping gray1 onto gray2 (resized to gray1's size).
+
+    SIFT + FLANN matching runs on a pyramid level whose longest side is
+    max_side; the resulting points are mapped back to full resolution before
+    RANSAC.
+    """
+    h1, w1 = gray1.shape[:2]
+    h2, w2 = gray2.shape[:2]
+    s1 = _pyramid_scale(gray1.shape, max_side)
+    s2 = _pyramid_scale(gray2.shape, max_side)
+    points1, descriptors1 = _sift_features(_downscale(gray1, s1))
+    points2, descriptors2 = _reference_features(gray2, s2, reference_path, max_side)
+    if descriptors1 is None or descriptors2 is None:
+        return None
+    if len(descriptors1) < 2 or len(descriptors2) < 2:
+        return None
+    flann = cv2.FlannBasedMatcher(dict(algorithm=1, trees=5), dict(checks=50))
+    knn = flann.knnMatch(descriptors1, descriptors2, k=2)
+    matches = [
+        m[0] for m in knn if len(m) == 2 and m[0].distance < LOWE_RATIO * m[1].distance
+    ]
+    if len(matches) < MIN_MATCHES:
+        # Too few distinctive matches: fall back to the best raw matches
+        matches = sorted((m[0] for m in knn if m), key=lambda m: m.distance)
+        matches = matches[:FALLBACK_MATCHES]
+    if len(matches) < MIN_MATCHES:
+        return None
+    src = points1[[m.queryIdx for m in matches]] / s1
+    # Reference coordinates in the frame of the reference resized to image1
+    dst = points2[[m.trainIdx for m in matches]] / s2 * (w1 / w2, h1 / h2)
+    M, _ = cv2.findHomography(
+        src.reshape(-1, 1, 2), dst.reshape(-1, 1, 2), cv2.RANSAC, 3.0 / s1
+    )
+    return M
+
+
+def estimate_ecc(
+    gray1: np.ndarray, ref_gray: np.ndarray, max_side: int = PYRAMID_MAX_SIDE
+) -> Optional[np.ndarray]:
+    """
+    Affine ECC for small misalignments: coarse estimate, full-resolution refinement.
+
+    ref_gray must already have gray1's size. Returns a 3x3 source->reference matrix.
+    """
+    s = _pyramid_scale(gray1.shape, max_side)
+    coarse1, coarse_ref = _downscale(gray1, s), _downscale(ref_gray, s)
+    # Seed with the phase-correlation shift to widen ECC's convergence basin
+    init = np.linalg.inv(estimate_translation(coarse1, coarse_ref))[:2]
+    warp = _ecc(coarse_ref, coarse1, init, cv2.MOTION_AFFINE, ECC_COARSE_ITERATIONS)
+    if warp is None:
+        return None
+    warp = warp.astype(np.float64)
+    warp[:, 2] /= s
+    if s < 1.0:
+        refined = _ecc(ref_gray, gray1, warp, cv2.MOTION_AFFINE, ECC_REFINE_ITERATIONS)
+        if refined is not None:
+            warp = refined
+    return np.linalg.inv(_to_3x3(warp))
+
+
+def estimate_translation(gray1: np.ndarray, ref_gray: np.ndarray) -> np.ndarray:
+    """Translation-only source->reference matrix via FFT phase correlation."""
+    a = gray1.astype(np.float32)
+    b = ref_gray.astype(np.float32)
+    window = cv2.createHanningWindow(a.shape[::-1], cv2.CV_32F)
+    (dx, dy), _ = cv2.phaseCorrelate(b, a, window)
+    return np.array([[1, 0, -dx], [0, 1, -dy], [0, 0, 1]], dtype=np.float64)
+
+
+def align_image(
+    image1: np.ndarray,
+    image2: np.ndarray,
+    method: str = "auto",
+    max_side: int = PYRAMID_MAX_SIDE,
+    refine_iterations: int = ECC_REFINE_ITERATIONS,
+    reference_path: Optional[str] = None,
+) -> Optional[np.ndarray]:
+    """
+    Align image1 to image2 (resized to image1's size).
     Returns the aligned image or None if alignment fails.
 
+    Methods:
+        - "homography": SIFT + FLANN on a downscaled pyramid level, then a
+          short full-resolution ECC refinement
+        - "ecc": affine ECC, for small misalignments
+        - "translation": phase correlation only (fastest)
+        - "auto": homography, falling back to ECC and then translation
+
     Args:
         image1: Source image to align
         image2: Reference image
+        method: One of ALIGN_METHODS
+        max_side: Longest side of the coarse pyramid level
+        refine_iterations: Full-resolution ECC iterations (0 disables refinement)
+        reference_path: Path of image2, enables the on-disk keypoint cache
 
     Returns:
         Aligned image as np.ndarray, or None if failed
     """
+    if method not in ALIGN_METHODS:
+        raise ValueError(f"Unknown alignment method: {method}")
     try:
-        size = (image1.shape[1], image1.shape[0])
-        image2 = cv2.resize(image2, size)
-        image1_gray = cv2.cvtColor(image1, cv2.COLOR_BGR2GRAY)
-        image2_gray = cv2.cvtColor(image2, cv2.COLOR_BGR2GRAY)
-        sift = cv2.SIFT_create()
-        keypoints1, descriptors1 = sift.detectAndCompute(image1_gray, None)
-        keypoints2, descriptors2 = sift.detectAndCompute(image2_gray, None)
-        if descriptors1 is None or descriptors2 is None:
-            return None
-        FLANN_INDEX_KDTREE = 1
-        index_params = dict(algorithm=FLANN_INDEX_KDTREE, trees=5)
-        search_params = dict(checks=50)
-        flann = cv2.FlannBasedMatcher(index_params, search_params)
-        matches = [m[0] for m in flann.knnMatch(descriptors1, descriptors2, k=2)]
-        if len(matches) < 4:
-            return None
-        matches = sorted(matches, key=lambda x: x.distance)
-        n = min(20, len(matches))  # TODO: Expose as advanced option
-        src_points = np.float32(
-            [keypoints1[m.queryIdx].pt for m in matches[:n]]
-        ).reshape(-1, 1, 2)
-        dst_points = np.float32(
-            [keypoints2[m.trainIdx].pt for m in matches[:n]]
-        ).reshape(-1, 1, 2)
-        M, mask = cv2.findHomography(src_points, dst_points, cv2.RANSAC, 5.0)
+        h, w = image1.shape[:2]
+        gray1 = _to_gray(image1)
+        gray2 = _to_gray(image2)
+        ref_gray = (
+            gray2
+            if gray2.shape[:2] == (h, w)
+            else cv2.resize(gray2, (w, h), interpolation=cv2.INTER_AREA)
+        )
+        M = None
+        if method in ("auto", "homography"):
+            M = estimate_homography(gray1, gray2, max_side, reference_path)
+            if M is not None:
+                M = _refine_ecc(gray1, ref_gray, M, refine_iterations)
+        if M is None and method in ("auto", "ecc"):
+            M = estimate_ecc(gray1, ref_gray, max_side)
+        if M is None and method in ("auto", "translation"):
+            M = estimate_translation(gray1, ref_gray)
         if M is None:
             return None
-        h, w = image1.shape[:2]
-        aligned_image = cv2.warpPerspective(image1, M, (w, h))
-        return aligned_image
+        return cv2.warpPerspective(image1, M, (w, h))
     except Exception:
         return None
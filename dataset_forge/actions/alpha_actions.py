@@ -1,4 +1,6 @@
 import os
+import struct
+from typing import Dict, List, Optional, Tuple
 from dataset_forge.utils.io_utils import is_image_file
 from PIL import Image
 import shutil
@@ -21,56 +23,192 @@ from dataset_forge.utils.printing import (
 )
 from dataset_forge.utils.color import Mocha
 from dataset_forge.utils.audio_utils import play_done_sound
+from dataset_forge.utils.lazy_imports import numpy_as_np as np
+from dataset_forge.utils.parallel_utils import prefetch_map
+from dataset_forge.utils.input_utils import ask_yes_no
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# PNG color types 4 (grey + alpha) and 6 (RGBA) always carry an alpha channel
+PNG_ALPHA_COLOR_TYPES = (4, 6)
+WEBP_VP8X_ALPHA_FLAG = 0x10
+ALPHA_CLASSES = ("opaque", "binary", "true")
+
+
+def _scan_image_files(folder: str) -> List[Tuple[str, str]]:
+    """Single os.scandir walk returning sorted (relative path, full path) image pairs."""
+    found = []
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(folder, rel_dir)) as it:
+                for entry in it:
+                    rel = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(rel)
+                    elif is_image_file(entry.name) and entry.is_file():
+                        found.append((rel, entry.path))
+        except OSError:
+            continue
+    found.sort()
+    return found
+
+
+def _png_has_alpha(f) -> Optional[bool]:
+    header = f.read(33)
+    if len(header) < 33 or header[:8] != PNG_SIGNATURE or header[12:16] != b"IHDR":
+        return None
+    if header[25] in PNG_ALPHA_COLOR_TYPES:
+        return True
+    # Palette/grey/RGB images have alpha only through a tRNS chunk, which must
+    # come before the first IDAT; skip chunk bodies without reading them
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            return False
+        length, ctype = struct.unpack(">I4s", chunk)
+        if ctype == b"tRNS":
+            return True
+        if ctype in (b"IDAT", b"IEND"):
+            return False
+        f.seek(length + 4, os.SEEK_CUR)
+
+
+def _webp_has_alpha(f) -> Optional[bool]:
+    header = f.read(30)
+    if len(header) < 21 or header[:4] != b"RIFF" or header[8:12] != b"WEBP":
+        return None
+    chunk = header[12:16]
+    if chunk == b"VP8X":
+        return bool(header[20] & WEBP_VP8X_ALPHA_FLAG)
+    if chunk == b"VP8L" and len(header) >= 25:
+        # 0x2f signature, then 14-bit width-1, 14-bit height-1, 1-bit alpha_is_used
+        return bool((struct.unpack("<I", header[21:25])[0] >> 28) & 1)
+    if chunk == b"VP8 ":
+        return False
+    return None
+
+
+def alpha_from_header(path: str) -> Optional[bool]:
+    """
+    Tell whether an image has an alpha channel from its file header alone.
+
+    PNG: IHDR color type or a tRNS chunk before the image data. WebP: the VP8X
+    alpha flag or the VP8L alpha bit. JPEG never has alpha.
+
+    Returns:
+        True/False, or None when the header is not conclusive (other formats,
+        malformed files).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jpg", ".jpeg"):
+        return False
+    with open(path, "rb") as f:
+        if ext == ".png":
+            return _png_has_alpha(f)
+        if ext == ".webp":
+            return _webp_has_alpha(f)
+    return None
+
+
+def _mode_has_alpha(img) -> bool:
+    return img.mode in ("RGBA", "LA", "PA") or (
+        img.mode == "P" and "transparency" in img.info
+    )
+
+
+def classify_alpha(path: str) -> str:
+    """
+    Classify an image's alpha channel from its alpha plane.
+
+    Returns:
+        "opaque" (alpha is 255 everywhere, so removing it is lossless),
+        "binary" (only fully transparent or fully opaque pixels) or
+        "true" (partial transparency).
+    """
+    with Image.open(path) as img:
+        if img.mode not in ("RGBA", "LA"):
+            img = img.convert("RGBA")
+        alpha = np.asarray(img.getchannel("A"))
+    if alpha.min() == 255:
+        return "opaque"
+    if np.count_nonzero((alpha != 0) & (alpha != 255)) == 0:
+        return "binary"
+    return "true"
+
+
+def _inspect_alpha(path: str, classify: bool) -> Tuple[bool, Optional[str]]:
+    """(has alpha, class or None) for one file."""
+    has_alpha = alpha_from_header(path)
+    if has_alpha is None:
+        with Image.open(path) as img:
+            has_alpha = _mode_has_alpha(img)
+    if not has_alpha or not classify:
+        return has_alpha, None
+    return True, classify_alpha(path)
+
+
+def audit_alpha(
+    folder: str, classify: bool = False, max_workers: Optional[int] = None, desc: str = ""
+) -> Dict[str, object]:
+    """
+    Find images with alpha in a folder tree, optionally classifying the alpha.
+
+    The tree is walked once with os.scandir; files are then checked on a thread
+    pool from their headers (only formats without a conclusive header are
+    opened with PIL), and with classify=True only images that have alpha are
+    decoded to inspect the alpha plane.
+
+    Returns:
+        Dict with "alpha" (relative paths with alpha), "errors" ([(path, error)])
+        and, when classify, "classes" (relative path -> opaque/binary/true).
+    """
+    files = _scan_image_files(folder)
+
+    def inspect(item):
+        try:
+            return _inspect_alpha(item[1], classify), None
+        except Exception as e:
+            return (False, None), str(e)
+
+    alpha, errors, classes = [], [], {}
+    for (rel_path, _), ((has_alpha, alpha_class), error) in tqdm(
+        prefetch_map(inspect, files, max_workers=max_workers),
+        total=len(files),
+        desc=desc or f"Checking {os.path.basename(folder)} for alpha channels",
+    ):
+        if error:
+            errors.append((rel_path, error))
+        elif has_alpha:
+            alpha.append(rel_path)
+            if alpha_class:
+                classes[rel_path] = alpha_class
+    result: Dict[str, object] = {"alpha": alpha, "errors": errors}
+    if classify:
+        result["classes"] = classes
+    return result
 
 
 class AlphaAnalyzer:
     @staticmethod
-    def find_alpha_channels(hq_folder=None, lq_folder=None, single_folder=None):
-        """Find images with alpha channels in folders. Supports both single folder and HQ/LQ pair workflows."""
+    def find_alpha_channels(
+        hq_folder=None, lq_folder=None, single_folder=None, classify=False
+    ):
+        """Find images with alpha channels in folders. Supports both single folder and HQ/LQ pair workflows.
+
+        With classify=True, images with alpha are also sorted into opaque
+        (removable without loss), binary and true alpha
+        (``<folder>_alpha_classes`` in the result).
+        """
         print_header("Finding Images with Alpha Channels")
 
         def check_alpha_in_folder(folder_path, folder_name):
-            images_with_alpha = []
-            errors = []
-
-            # Collect all image files recursively with progress bar
-            image_files = []
-            total_files = 0
-
-            # First, count total files for progress bar
-            for root, dirs, files in os.walk(folder_path):
-                total_files += len(files)
-
-            # Now collect image files with progress bar
-            with tqdm(
-                total=total_files,
-                desc=f"Discovering images in {folder_name}",
-                unit="files",
-            ) as pbar:
-                for root, dirs, files in os.walk(folder_path):
-                    for filename in files:
-                        pbar.update(1)
-                        if is_image_file(filename):
-                            # Get relative path from the root folder
-                            rel_path = os.path.relpath(
-                                os.path.join(root, filename), folder_path
-                            )
-                            image_files.append((rel_path, os.path.join(root, filename)))
-
-            # Check alpha channels with progress bar
-            for rel_path, full_path in tqdm(
-                image_files, desc=f"Checking {folder_name} for alpha channels"
-            ):
-                try:
-                    with Image.open(full_path) as img:
-                        if img.mode in ("RGBA", "LA") or (
-                            img.mode == "P" and "transparency" in img.info
-                        ):
-                            images_with_alpha.append(rel_path)
-                except Exception as e:
-                    errors.append((rel_path, str(e)))
-
-            return images_with_alpha, errors
+            audit = audit_alpha(
+                folder_path,
+                classify=classify,
+                desc=f"Checking {folder_name} for alpha channels",
+            )
+            return audit["alpha"], audit["errors"], audit.get("classes")
 
         # Determine workflow type
         if single_folder:
@@ -87,9 +225,13 @@ class AlphaAnalyzer:
 
         results = {}
         for folder_path, folder_name in folders_to_check:
-            alpha_images, errors = check_alpha_in_folder(folder_path, folder_name)
+            alpha_images, errors, classes = check_alpha_in_folder(
+                folder_path, folder_name
+            )
             results[f"{folder_name.lower()}_alpha"] = alpha_images
             results[f"{folder_name.lower()}_errors"] = errors
+            if classes is not None:
+                results[f"{folder_name.lower()}_alpha_classes"] = classes
 
         print_section("Alpha Channel Analysis Summary")
         print_info(f"Workflow: {workflow_type.upper()}")
@@ -146,6 +288,17 @@ class AlphaAnalyzer:
                 if len(single_errors) > 5:
                     print_error(f"  ... and {len(single_errors) - 5} more errors")
 
+        for folder_path, folder_name in folders_to_check:
+            classes = results.get(f"{folder_name.lower()}_alpha_classes")
+            if classes:
+                counts = {c: 0 for c in ALPHA_CLASSES}
+                for alpha_class in classes.values():
+                    counts[alpha_class] += 1
+                print_info(
+                    f"\n{folder_name} alpha: {counts['opaque']} fully opaque (alpha removable without loss), "
+                    f"{counts['binary']} binary, {counts['true']} true alpha"
+                )
+
         print_section("Analysis Complete")
 
         # Play completion sound
@@ -154,9 +307,14 @@ class AlphaAnalyzer:
         return results
 
 
-def find_alpha_channels(hq_folder=None, lq_folder=None, single_folder=None):
+def find_alpha_channels(
+    hq_folder=None, lq_folder=None, single_folder=None, classify=False
+):
     return AlphaAnalyzer.find_alpha_channels(
-        hq_folder=hq_folder, lq_folder=lq_folder, single_folder=single_folder
+        hq_folder=hq_folder,
+        lq_folder=lq_folder,
+        single_folder=single_folder,
+        classify=classify,
     )
 
 
@@ -187,7 +345,10 @@ def find_alpha_channels_menu():
             print_error("Both HQ and LQ paths must be valid directories.")
             return
 
-        find_alpha_channels(hq_folder=hq_folder, lq_folder=lq_folder)
+        classify = ask_yes_no(
+            "Classify alpha (fully opaque / binary / true alpha)?", default=False
+        )
+        find_alpha_channels(hq_folder=hq_folder, lq_folder=lq_folder, classify=classify)
 
     elif choice == "2":
         # Single folder workflow
@@ -203,7 +364,10 @@ def find_alpha_channels_menu():
             print_error("Folder path must be a valid directory.")
             return
 
-        find_alpha_channels(single_folder=single_folder)
+        classify = ask_yes_no(
+            "Classify alpha (fully opaque / binary / true alpha)?", default=False
+        )
+        find_alpha_channels(single_folder=single_folder, classify=classify)
 
     elif choice == "0":
         print_info("Operation cancelled.")
@@ -213,12 +377,35 @@ def find_alpha_channels_menu():
         print_error("Invalid choice. Operation cancelled.")
 
 
-def remove_alpha_channels(hq_folder, lq_folder):
-    """Remove alpha channels from images in HQ/LQ folders using AlphaRemover class."""
+def _select_for_removal(results, key, only_opaque):
+    """Alpha images of one folder, restricted to fully opaque ones if requested."""
+    images = results.get(f"{key}_alpha", [])
+    if not only_opaque:
+        return images
+    classes = results.get(f"{key}_alpha_classes", {})
+    return [rel for rel in images if classes.get(rel) == "opaque"]
+
+
+def remove_alpha_channels(hq_folder, lq_folder, only_opaque=None):
+    """Remove alpha channels from images in HQ/LQ folders using AlphaRemover class.
+
+    Only files the alpha audit reports as having alpha are rewritten; with
+    only_opaque, only those whose alpha is 255 everywhere (lossless removal).
+    """
     print_header("Removing Alpha Channels")
 
-    alpha_results = AlphaAnalyzer.find_alpha_channels(hq_folder, lq_folder)
-    if not (alpha_results["hq_alpha"] or alpha_results["lq_alpha"]):
+    if only_opaque is None:
+        only_opaque = ask_yes_no(
+            "Only remove alpha where it is fully opaque (lossless)?", default=False
+        )
+    alpha_results = AlphaAnalyzer.find_alpha_channels(
+        hq_folder, lq_folder, classify=only_opaque
+    )
+    selected = {
+        "hq": _select_for_removal(alpha_results, "hq", only_opaque),
+        "lq": _select_for_removal(alpha_results, "lq", only_opaque),
+    }
+    if not (selected["hq"] or selected["lq"]):
         print_info("\nNo images with alpha channels found to process.")
         return
 
@@ -234,61 +421,33 @@ def remove_alpha_channels(hq_folder, lq_folder):
         os.makedirs(os.path.join(destination, "hq"), exist_ok=True)
         os.makedirs(os.path.join(destination, "lq"), exist_ok=True)
 
-    remover = AlphaRemover()
-    processed_count = 0
-    errors = []
-
-    for rel_path in tqdm(alpha_results["hq_alpha"], desc="Processing HQ Images"):
-        src_path = os.path.join(hq_folder, rel_path)
-
-        # For copy/move operations, preserve directory structure
-        if operation == "inplace":
-            dest_path = src_path
-        else:
-            if os.path.dirname(rel_path):
-                # Create subdirectories in destination
-                subdir = os.path.join(destination, "hq", os.path.dirname(rel_path))
-                os.makedirs(subdir, exist_ok=True)
-                dest_path = os.path.join(subdir, os.path.basename(rel_path))
+    jobs = []
+    for key, folder in (("hq", hq_folder), ("lq", lq_folder)):
+        for rel_path in selected[key]:
+            src_path = os.path.join(folder, rel_path)
+            # For copy/move operations, preserve directory structure
+            if operation == "inplace":
+                dest_path = src_path
             else:
-                dest_path = os.path.join(destination, "hq", rel_path)
+                dest_path = os.path.join(destination, key, rel_path)
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            jobs.append((key.upper(), rel_path, src_path, dest_path))
 
-        try:
-            success, msg = remover.process(
-                src_path, output_path=dest_path, operation=operation
-            )
-            if success:
-                processed_count += 1
-            else:
-                errors.append(f"Failed to process HQ: {rel_path} ({msg})")
-        except Exception as e:
-            errors.append(f"Error processing HQ {rel_path}: {e}")
+    remover = AlphaRemover()
 
-    for rel_path in tqdm(alpha_results["lq_alpha"], desc="Processing LQ Images"):
-        src_path = os.path.join(lq_folder, rel_path)
+    def process(job):
+        _, _, src_path, dest_path = job
+        return remover.process(src_path, output_path=dest_path, operation=operation)
 
-        # For copy/move operations, preserve directory structure
-        if operation == "inplace":
-            dest_path = src_path
+    processed_count = 0
+    errors = []
+    for (label, rel_path, _, _), (success, msg) in tqdm(
+        prefetch_map(process, jobs), total=len(jobs), desc="Removing alpha channels"
+    ):
+        if success:
+            processed_count += 1
         else:
-            if os.path.dirname(rel_path):
-                # Create subdirectories in destination
-                subdir = os.path.join(destination, "lq", os.path.dirname(rel_path))
-                os.makedirs(subdir, exist_ok=True)
-                dest_path = os.path.join(subdir, os.path.basename(rel_path))
-            else:
-                dest_path = os.path.join(destination, "lq", rel_path)
-
-        try:
-            success, msg = remover.process(
-                src_path, output_path=dest_path, operation=operation
-            )
-            if success:
-                processed_count += 1
-            else:
-                errors.append(f"Failed to process LQ: {rel_path} ({msg})")
-        except Exception as e:
-            errors.append(f"Error processing LQ {rel_path}: {e}")
+            errors.append(f"Failed to process {label}: {rel_path} ({msg})")
 
     print_section("Remove Alpha Channels Summary")
     print_success(f"Successfully processed: {processed_count} images")
@@ -349,10 +508,16 @@ def remove_alpha_channels_menu():
             return
         os.makedirs(dest_dir, exist_ok=True)
 
+    only_opaque = ask_yes_no(
+        "Only remove alpha where it is fully opaque (lossless)?", default=False
+    )
+
     # Find all images with alpha channels recursively
     print_info("Scanning for images with alpha channels (recursively)...")
-    alpha_results = AlphaAnalyzer.find_alpha_channels(single_folder=input_folder)
-    image_files_with_alpha = alpha_results.get("single_alpha", [])
+    alpha_results = AlphaAnalyzer.find_alpha_channels(
+        single_folder=input_folder, classify=only_opaque
+    )
+    image_files_with_alpha = _select_for_removal(alpha_results, "single", only_opaque)
 
     if not image_files_with_alpha:
         print_info("No images with alpha channels found in the input folder.")
@@ -391,6 +556,8 @@ def remove_alpha_channels_menu():
                     output_path = os.path.join(dest_dir, image_file)
 
             with Image.open(input_path) as img:
+                if img.mode == "P" and "transparency" in img.info:
+                    img = img.convert("RGBA")
                 # Check if image has alpha channel
                 if img.mode in ("RGBA", "LA", "PA"):
                     # Convert to RGB or L (grayscale)
@@ -11,6 +11,7 @@ from dataset_forge.utils.parallel_utils import (
 )
 from dataset_forge.menus.session_state import parallel_config, user_preferences
 from dataset_forge.utils.io_utils import is_image_file
+from dataset_forge.utils.pair_utils import resolve_pairs
 from collections import Counter
 import cv2
 import shutil
@@ -81,41 +82,23 @@ def generate_hq_lq_dataset_report(hq_folder, lq_folder):
     print_header("HQ/LQ DATASET REPORT", char="=", color=Mocha.sapphire)
     print_section("Overall Dataset Information", char="-", color=Mocha.lavender)
 
-    try:
-        hq_files_list = sorted(
-            [
-                f
-                for f in os.listdir(hq_folder)
-                if os.path.isfile(os.path.join(hq_folder, f)) and is_image_file(f)
-            ]
-        )
-        lq_files_list = sorted(
-            [
-                f
-                for f in os.listdir(lq_folder)
-                if os.path.isfile(os.path.join(lq_folder, f)) and is_image_file(f)
-            ]
-        )
-    except FileNotFoundError as fnf_e:
-        print_error(f"Error: One of the dataset folders not found: {fnf_e}")
+    missing = [f for f in (hq_folder, lq_folder) if not os.path.isdir(f)]
+    if missing:
+        print_error(f"Error: One of the dataset folders not found: {missing[0]}")
         print_warning("Please ensure HQ and LQ folders are correctly set.")
         print_header("", char="=", color=Mocha.sapphire)
         return
 
-    matching_pairs_list = [
-        f for f in hq_files_list if f in lq_files_list
-    ]  # Ensure it's a list for len
+    pair_table = resolve_pairs(hq_folder, lq_folder)
+    hq_unique_files = pair_table.hq_only.tolist()
+    lq_unique_files = pair_table.lq_only.tolist()
 
     print_info(f"HQ Folder: {hq_folder}")
     print_info(f"LQ Folder: {lq_folder}")
-    print_info(f"Total HQ Images (root): {len(hq_files_list)}")
-    print_info(f"Total LQ Images (root): {len(lq_files_list)}")
-    print_info(
-        f"Matching HQ/LQ Pairs (based on root filenames): {len(matching_pairs_list)}"
-    )
+    print_info(f"Total HQ Images (root): {len(pair_table) + len(hq_unique_files)}")
+    print_info(f"Total LQ Images (root): {len(pair_table) + len(lq_unique_files)}")
+    print_info(f"Matching HQ/LQ Pairs (based on root filenames): {len(pair_table)}")
 
-    hq_unique_files = [f for f in hq_files_list if f not in lq_files_list]
-    lq_unique_files = [f for f in lq_files_list if f not in hq_files_list]
     print_info(f"Images unique to HQ folder (root): {len(hq_unique_files)}")
     if hq_unique_files and len(hq_unique_files) <= 5:
         print_info(f"  ({', '.join(hq_unique_files)})")
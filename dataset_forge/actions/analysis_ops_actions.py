@@ -32,12 +32,13 @@ class ScaleAnalyzer(DatasetAnalyzer):
                 if os.path.isfile(os.path.join(lq_folder, f)) and is_image_file(f)
             ]
         )
+        hq_set, lq_set = set(hq_files), set(lq_files)
         scales = []
         inconsistent_scales = []
         missing_lq = []
         missing_hq = []
         for hq_file in tqdm(hq_files, desc="Finding Scale", disable=not verbose):
-            if hq_file in lq_files:
+            if hq_file in lq_set:
                 hq_path = os.path.join(hq_folder, hq_file)
                 lq_path = os.path.join(lq_folder, hq_file)
                 try:
@@ -63,7 +64,7 @@ class ScaleAnalyzer(DatasetAnalyzer):
             else:
                 missing_lq.append(hq_file)
         for lq_file in lq_files:
-            if lq_file not in hq_files:
+            if lq_file not in hq_set:
                 missing_hq.append(lq_file)
         return {
             "total_hq_files": len(hq_files),
@@ -137,7 +137,8 @@ def batch_rename_hq_lq_folders(hq_path, lq_path, prefix="", padding=5, dry_run=T
     lq_files = sorted(
         [f for f in os.listdir(lq_path) if os.path.isfile(os.path.join(lq_path, f))]
     )
-    matching_files = [f for f in hq_files if f in lq_files]
+    lq_set = set(lq_files)
+    matching_files = [f for f in hq_files if f in lq_set]
     print_info(f"Found {len(matching_files)} matching HQ/LQ pairs.")
 
     if dry_run:
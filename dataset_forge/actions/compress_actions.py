@@ -15,6 +15,11 @@ from dataset_forge.utils.file_utils import (
     perform_file_operation,
     run_oxipng,
 )
+from dataset_forge.utils.png_optimizer import (
+    OxipngOptions,
+    format_optimization_report,
+    optimize_pngs,
+)
 from dataset_forge.utils.monitoring import monitor_all, task_registry
 from dataset_forge.utils.memory_utils import clear_memory, clear_cuda_cache
 from dataset_forge.utils.printing import (
@@ -29,6 +34,27 @@ from dataset_forge.utils.color import Mocha
 from dataset_forge.utils.audio_utils import play_done_sound
 
 
+def _compressed_output_path(image_path, output_format, action, dest_dir):
+    """Where compress_single_image writes image_path."""
+    if action == "inplace":
+        return image_path
+    if not dest_dir:
+        raise ValueError("Destination directory required for copy/move operations")
+    name, _ = os.path.splitext(os.path.basename(image_path))
+    return os.path.join(dest_dir, f"{name}.{output_format}")
+
+
+def _optimize_outputs(output_paths, oxipng_level, oxipng_strip, oxipng_alpha):
+    """Run the oxipng scheduler once over all PNG outputs of a batch."""
+    pngs = [p for p in output_paths if p.lower().endswith(".png") and os.path.exists(p)]
+    if not pngs:
+        return
+    report = optimize_pngs(
+        pngs, OxipngOptions(level=oxipng_level, strip=oxipng_strip, alpha=oxipng_alpha)
+    )
+    print_info(f"[Oxipng] {format_optimization_report(report)}")
+
+
 def compress_single_image(
     image_path: str,
     output_format: str = "png",
@@ -58,19 +84,10 @@ def compress_single_image(
         bool: True if successful, False otherwise
     """
     try:
-        # Determine output path
-        if action == "inplace":
-            output_path = image_path
-        else:
-            if not dest_dir:
-                raise ValueError(
-                    "Destination directory required for copy/move operations"
-                )
-
-            filename = os.path.basename(image_path)
-            name, _ = os.path.splitext(filename)
-            output_path = os.path.join(dest_dir, f"{name}.{output_format}")
-
+        output_path = _compressed_output_path(
+            image_path, output_format, action, dest_dir
+        )
+        if output_path != image_path:
             # Create destination directory if needed
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
@@ -184,7 +201,7 @@ def compress_images(
                 oxipng_level,
                 action,
                 dest_dir,
-                use_oxipng,
+                False,
                 oxipng_strip,
                 oxipng_alpha,
             )
@@ -195,7 +212,7 @@ def compress_images(
                 oxipng_level,
                 action,
                 dest_dir,
-                use_oxipng,
+                False,
                 oxipng_strip,
                 oxipng_alpha,
             )
@@ -218,7 +235,7 @@ def compress_images(
                 oxipng_level,
                 action,
                 dest_dir,
-                use_oxipng,
+                False,
                 oxipng_strip,
                 oxipng_alpha,
             ),
@@ -226,6 +243,20 @@ def compress_images(
             desc="Compressing images",
             max_workers=config.max_workers,
         )
+    if use_oxipng and output_format.lower() == "png":
+        # Optimized in one scheduled pass rather than one oxipng per pool thread
+        sources = (
+            [p for pair in image_paths for p in pair] if paired_mode else image_paths
+        )
+        _optimize_outputs(
+            [
+                _compressed_output_path(p, output_format, action, dest_dir)
+                for p in sources
+            ],
+            oxipng_level,
+            oxipng_strip,
+            oxipng_alpha,
+        )
     clear_memory()
     clear_cuda_cache()
     print_success("Compression complete.")
@@ -315,7 +346,7 @@ def compress_directory(
             oxipng_level,
             "copy",
             os.path.dirname(output_path),
-            use_oxipng,
+            False,
             oxipng_strip,
             oxipng_alpha,
         )
@@ -327,6 +358,13 @@ def compress_directory(
         max_workers=config.max_workers,
         processing_type=ProcessingType.THREAD,
     )
+    if use_oxipng and output_format.lower() == "png":
+        _optimize_outputs(
+            [output_path for _, output_path in image_paths],
+            oxipng_level,
+            oxipng_strip,
+            oxipng_alpha,
+        )
     clear_memory()
     clear_cuda_cache()
     print_success("Directory compression complete.")
@@ -1,59 +1,353 @@
 import os
+from itertools import combinations
+from math import comb
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
 from dataset_forge.utils.progress_utils import tqdm
 from PIL import Image
 import imagehash
 from dataset_forge.utils.monitoring import monitor_all, task_registry
 from dataset_forge.utils.memory_utils import clear_memory, clear_cuda_cache
-from dataset_forge.utils.printing import print_success
+from dataset_forge.utils.parallel_utils import prefetch_map
+from dataset_forge.utils.printing import print_success, print_info
 from dataset_forge.utils.audio_utils import play_done_sound
 
+# Connected components up to this many nodes per side are solved optimally
+MAX_EXACT_COMPONENT = 256
+QUERY_BLOCK_SIZE = 8192
+
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _hash_one(path, hash_func):
+    try:
+        with Image.open(path) as img:
+            return np.asarray(hash_func(img).hash, dtype=bool).ravel()
+    except Exception:
+        return None
+
+
+def compute_hash_bits(
+    folder: str,
+    files: Sequence[str],
+    hash_func=imagehash.phash,
+    max_workers: Optional[int] = None,
+    desc: str = "Hashing images",
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Hash images on a thread pool.
+
+    Returns:
+        (names, bits): names of the files that could be hashed, in input order,
+        and a (N, B) boolean matrix of their hash bits.
+    """
+    names, rows = [], []
+    paths = [os.path.join(folder, f) for f in files]
+    results = prefetch_map(
+        lambda p: _hash_one(p, hash_func), paths, max_workers=max_workers
+    )
+    for fname, (_, bits) in tqdm(zip(files, results), total=len(files), desc=desc):
+        if bits is not None:
+            names.append(fname)
+            rows.append(bits)
+    if not rows:
+        return names, np.zeros((0, 0), dtype=bool)
+    return names, np.stack(rows)
+
+
+def hamming_distances(packed_a: np.ndarray, packed_b: np.ndarray) -> np.ndarray:
+    """Row-wise Hamming distance between two equally shaped packed uint8 arrays."""
+    return _POPCOUNT_TABLE[np.bitwise_xor(packed_a, packed_b)].sum(
+        axis=1, dtype=np.int32
+    )
+
+
+def _chunk_values(bits: np.ndarray, num_chunks: int) -> np.ndarray:
+    """Split (N, B) bit rows into num_chunks integer chunk values (N, num_chunks)."""
+    out = np.zeros((bits.shape[0], num_chunks), dtype=np.int64)
+    for c, part in enumerate(np.array_split(bits, num_chunks, axis=1)):
+        weights = 1 << np.arange(part.shape[1] - 1, -1, -1, dtype=np.int64)
+        out[:, c] = part.astype(np.int64) @ weights
+    return out
+
+
+def _flip_masks(width: int, radius: int) -> np.ndarray:
+    """All width-bit masks with at most `radius` bits set."""
+    masks = [0]
+    for r in range(1, min(radius, width) + 1):
+        for positions in combinations(range(width), r):
+            masks.append(sum(1 << p for p in positions))
+    return np.array(masks, dtype=np.int64)
+
+
+def _plan_chunks(num_bits: int, threshold: int, db_size: int) -> int:
+    """
+    Pick the multi-index chunk count with the lowest estimated query cost.
+
+    More chunks mean fewer flip probes per chunk but fuller buckets; the cost
+    model is chunks * probes * (1 + expected bucket size).
+    """
+    best, best_cost = None, None
+    for num_chunks in range(1, min(threshold + 1, num_bits) + 1):
+        width = -(-num_bits // num_chunks)
+        if width > 62:  # chunk values must fit in int64
+            continue
+        radius = threshold // num_chunks
+        probes = sum(comb(width, r) for r in range(radius + 1))
+        cost = num_chunks * probes * (1.0 + db_size / 2.0**width)
+        if best_cost is None or cost < best_cost:
+            best, best_cost = num_chunks, cost
+    return best or -(-num_bits // 62)
+
+
+def hamming_candidates(
+    query_bits: np.ndarray,
+    db_bits: np.ndarray,
+    threshold: int,
+    top_k: int = 5,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find, for every query, its top-k database rows within a Hamming threshold.
+
+    Uses multi-index hashing: the bits are split into m chunks and, by the
+    pigeonhole principle, any row within `threshold` matches the query within
+    ``threshold // m`` bits on at least one chunk. Those chunk neighbourhoods
+    are probed with vectorized searchsorted lookups, so no query is compared
+    against the whole database.
+
+    Returns:
+        (query_idx, db_idx, dist) arrays sorted by (query, dist, db index).
+    """
+    empty = (np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0, np.int32))
+    if len(query_bits) == 0 or len(db_bits) == 0:
+        return empty
+    num_bits = db_bits.shape[1]
+    num_chunks = _plan_chunks(num_bits, threshold, len(db_bits))
+    radius = threshold // num_chunks
+    widths = [len(a) for a in np.array_split(np.arange(num_bits), num_chunks)]
+
+    q_chunks = _chunk_values(query_bits, num_chunks)
+    d_chunks = _chunk_values(db_bits, num_chunks)
+    q_packed = np.packbits(query_bits, axis=1)
+    d_packed = np.packbits(db_bits, axis=1)
+
+    tables = []
+    for c in range(num_chunks):
+        order = np.argsort(d_chunks[:, c], kind="stable")
+        tables.append((d_chunks[order, c], order, _flip_masks(widths[c], radius)))
+
+    out_q, out_d, out_dist = [], [], []
+    for start in range(0, len(query_bits), QUERY_BLOCK_SIZE):
+        block = np.arange(start, min(start + QUERY_BLOCK_SIZE, len(query_bits)))
+        cand_q, cand_d = [], []
+        for c, (sorted_vals, order, masks) in enumerate(tables):
+            for mask in masks:
+                probe = q_chunks[block, c] ^ mask
+                lo = np.searchsorted(sorted_vals, probe, side="left")
+                hi = np.searchsorted(sorted_vals, probe, side="right")
+                counts = hi - lo
+                hit = counts > 0
+                if not hit.any():
+                    continue
+                counts = counts[hit]
+                offsets = np.repeat(lo[hit] - np.cumsum(counts) + counts, counts)
+                cand_q.append(np.repeat(block[hit], counts))
+                cand_d.append(order[offsets + np.arange(counts.sum())])
+        if not cand_q:
+            continue
+        pair_keys = np.unique(
+            np.concatenate(cand_q) * len(db_bits) + np.concatenate(cand_d)
+        )
+        qi, di = np.divmod(pair_keys, len(db_bits))
+        dist = hamming_distances(q_packed[qi], d_packed[di])
+        keep = dist <= threshold
+        qi, di, dist = qi[keep], di[keep], dist[keep]
+        order = np.lexsort((di, dist, qi))
+        qi, di, dist = qi[order], di[order], dist[order]
+        # Rank within each query group, keep the best k
+        first = np.r_[0, np.flatnonzero(np.diff(qi)) + 1]
+        ranks = np.arange(len(qi)) - np.repeat(first, np.diff(np.r_[first, len(qi)]))
+        keep = ranks < top_k
+        out_q.append(qi[keep])
+        out_d.append(di[keep])
+        out_dist.append(dist[keep])
+    if not out_q:
+        return empty
+    return np.concatenate(out_q), np.concatenate(out_d), np.concatenate(out_dist)
+
+
+def assign_pairs(
+    hq_idx: np.ndarray, lq_idx: np.ndarray, cost: np.ndarray
+) -> List[Tuple[int, int]]:
+    """
+    Resolve candidate edges into a one-to-one HQ/LQ assignment.
+
+    Each connected component of the sparse candidate graph is solved with the
+    Hungarian algorithm (maximum matches, then minimum total cost) when it is
+    small enough; larger components use a global greedy pass over edges sorted
+    by (cost, hq, lq). Both are deterministic and independent of file order.
+    """
+    if len(hq_idx) == 0:
+        return []
+    # Canonical edge order; duplicate edges keep their lowest cost
+    order = np.lexsort((cost, lq_idx, hq_idx))
+    hq_idx, lq_idx, cost = hq_idx[order], lq_idx[order], cost[order]
+    first = np.r_[True, (np.diff(hq_idx) != 0) | (np.diff(lq_idx) != 0)]
+    hq_idx, lq_idx, cost = hq_idx[first], lq_idx[first], cost[first]
+
+    hq_ids, hq_local = np.unique(hq_idx, return_inverse=True)
+    lq_ids, lq_local = np.unique(lq_idx, return_inverse=True)
+    n_hq = len(hq_ids)
+
+    try:
+        from scipy.optimize import linear_sum_assignment
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components
+    except ImportError:
+        linear_sum_assignment = connected_components = None
+
+    # Connected components of the bipartite graph (LQ nodes offset by n_hq)
+    n_nodes = n_hq + len(lq_ids)
+    if connected_components is not None:
+        graph = coo_matrix(
+            (np.ones(len(hq_local)), (hq_local, lq_local + n_hq)),
+            shape=(n_nodes, n_nodes),
+        )
+        roots = connected_components(graph, directed=False)[1][hq_local]
+    else:
+        parent = list(range(n_nodes))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for h, l in zip(hq_local.tolist(), (lq_local + n_hq).tolist()):
+            rh, rl = find(h), find(l)
+            if rh != rl:
+                parent[max(rh, rl)] = min(rh, rl)
+        roots = np.array([find(h) for h in hq_local.tolist()])
+
+    pairs = []
+    order = np.argsort(roots, kind="stable")
+    bounds = np.flatnonzero(np.diff(roots[order])) + 1
+    for edges in np.split(order, bounds):
+        comp_h = np.unique(hq_local[edges])
+        comp_l = np.unique(lq_local[edges])
+        if len(edges) == 1:
+            pairs.append((int(hq_ids[hq_local[edges[0]]]), int(lq_ids[lq_local[edges[0]]])))
+            continue
+        if (
+            linear_sum_assignment is not None
+            and max(len(comp_h), len(comp_l)) <= MAX_EXACT_COMPONENT
+        ):
+            rows = np.searchsorted(comp_h, hq_local[edges])
+            cols = np.searchsorted(comp_l, lq_local[edges])
+            # Missing edges cost more than any full set of real edges
+            big = float(cost[edges].sum()) + 1.0
+            matrix = np.full((len(comp_h), len(comp_l)), big)
+            matrix[rows, cols] = cost[edges]
+            for r, c in zip(*linear_sum_assignment(matrix)):
+                if matrix[r, c] < big:
+                    pairs.append((int(hq_ids[comp_h[r]]), int(lq_ids[comp_l[c]])))
+            continue
+        used_h, used_l = set(), set()
+        for e in edges[np.lexsort((lq_idx[edges], hq_idx[edges], cost[edges]))]:
+            h, l = int(hq_idx[e]), int(lq_idx[e])
+            if h not in used_h and l not in used_l:
+                used_h.add(h)
+                used_l.add(l)
+                pairs.append((h, l))
+    return sorted(pairs)
+
+
+def _rerank_costs(
+    hq_paths, lq_paths, qi, di, dist, embedder, ambiguity_margin, embedding_weight
+):
+    """Add an embedding cosine-distance term to the edges of ambiguous HQ images."""
+    cost = dist.astype(np.float64)
+    best = np.full(qi.max() + 1, np.iinfo(np.int32).max)
+    np.minimum.at(best, qi, dist)
+    near_best = dist <= best[qi] + ambiguity_margin
+    counts = np.bincount(qi[near_best], minlength=len(best))
+    ambiguous = counts[qi] > 1
+    if not ambiguous.any():
+        return cost
+    amb_q = np.unique(qi[ambiguous])
+    amb_d = np.unique(di[ambiguous])
+    print_info(f"Re-ranking {len(amb_q)} ambiguous HQ images with embeddings...")
+
+    def normalized(paths):
+        emb = np.asarray(embedder(paths), dtype=np.float64).reshape(len(paths), -1)
+        return emb / np.maximum(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12)
+
+    hq_emb = normalized([hq_paths[i] for i in amb_q])
+    lq_emb = normalized([lq_paths[i] for i in amb_d])
+    rows = np.searchsorted(amb_q, qi[ambiguous])
+    cols = np.searchsorted(amb_d, di[ambiguous])
+    cosine_dist = 1.0 - np.einsum("ij,ij->i", hq_emb[rows], lq_emb[cols])
+    cost[ambiguous] += embedding_weight * cosine_dist
+    return cost
+
 
 def fuzzy_hq_lq_pairing_logic(
-    hq_folder, lq_folder, hash_func=imagehash.phash, threshold=8
+    hq_folder,
+    lq_folder,
+    hash_func=imagehash.phash,
+    threshold=8,
+    top_k=5,
+    max_workers=None,
+    embedder: Optional[Callable[[List[str]], np.ndarray]] = None,
+    ambiguity_margin=1,
+    embedding_weight=2.0,
 ):
     """
     Pair HQ and LQ images using perceptual hashes (fuzzy matching).
     Returns a list of (hq_path, lq_path) pairs.
-    TODO: Add support for deep embeddings for even more robust matching.
+
+    Both folders are hashed in parallel. A multi-index Hamming search finds the
+    top-k LQ candidates within `threshold` bits of each HQ hash, and a global
+    assignment (see `assign_pairs`) resolves conflicts, so the result is
+    deterministic and close to optimal instead of first-come-first-served.
+
+    Args:
+        hq_folder: Folder of HQ images
+        lq_folder: Folder of LQ images
+        hash_func: imagehash function (e.g. imagehash.phash)
+        threshold: Maximum Hamming distance for a pair
+        top_k: Candidates kept per HQ image
+        max_workers: Hashing threads (defaults to the I/O worker count)
+        embedder: Optional callable mapping a list of image paths to an (N, D)
+            embedding array; used to re-rank HQ images whose best candidates are
+            within `ambiguity_margin` bits of each other
+        ambiguity_margin: Hamming gap below which candidates count as ambiguous
+        embedding_weight: Weight of the cosine distance added when re-ranking
     """
-    hq_files = [
+    hq_files = sorted(
         f for f in os.listdir(hq_folder) if os.path.isfile(os.path.join(hq_folder, f))
-    ]
-    lq_files = [
+    )
+    lq_files = sorted(
         f for f in os.listdir(lq_folder) if os.path.isfile(os.path.join(lq_folder, f))
-    ]
-    hq_hashes = {}
-    lq_hashes = {}
-    # Compute hashes for HQ images
-    for fname in tqdm(hq_files, desc="Hashing HQ images"):
-        try:
-            with Image.open(os.path.join(hq_folder, fname)) as img:
-                hq_hashes[fname] = hash_func(img)
-        except Exception:
-            continue
-    # Compute hashes for LQ images
-    for fname in tqdm(lq_files, desc="Hashing LQ images"):
-        try:
-            with Image.open(os.path.join(lq_folder, fname)) as img:
-                lq_hashes[fname] = hash_func(img)
-        except Exception:
-            continue
-    # Fuzzy match: for each HQ, find closest LQ within threshold
-    pairs = []
-    used_lq = set()
-    for hq_fname, hq_hash in tqdm(hq_hashes.items(), desc="Pairing images"):
-        best_lq = None
-        best_dist = None
-        for lq_fname, lq_hash in lq_hashes.items():
-            if lq_fname in used_lq:
-                continue
-            dist = hq_hash - lq_hash
-            if best_dist is None or dist < best_dist:
-                best_dist = dist
-                best_lq = lq_fname
-        if best_lq is not None and best_dist is not None and best_dist <= threshold:
-            pairs.append(
-                (os.path.join(hq_folder, hq_fname), os.path.join(lq_folder, best_lq))
-            )
-            used_lq.add(best_lq)
-    return pairs
+    )
+    hq_names, hq_bits = compute_hash_bits(
+        hq_folder, hq_files, hash_func, max_workers, desc="Hashing HQ images"
+    )
+    lq_names, lq_bits = compute_hash_bits(
+        lq_folder, lq_files, hash_func, max_workers, desc="Hashing LQ images"
+    )
+    if not hq_names or not lq_names:
+        return []
+
+    qi, di, dist = hamming_candidates(hq_bits, lq_bits, threshold, top_k=top_k)
+    if len(qi) == 0:
+        return []
+    hq_paths = [os.path.join(hq_folder, f) for f in hq_names]
+    lq_paths = [os.path.join(lq_folder, f) for f in lq_names]
+    cost = dist.astype(np.float64)
+    if embedder is not None:
+        cost = _rerank_costs(
+            hq_paths, lq_paths, qi, di, dist, embedder, ambiguity_margin, embedding_weight
+        )
+    return [(hq_paths[h], lq_paths[l]) for h, l in assign_pairs(qi, di, cost)]
@@ -15,6 +15,7 @@ from dataset_forge.actions.orientation_organizer_actions import (
 )
 from dataset_forge.actions.operations_actions import (
     extract_random_pairs as _extract_random_pairs,
+    recover_interrupted_file_operations as _recover_interrupted_file_operations,
     shuffle_image_pairs as _shuffle_image_pairs,
     split_adjust_dataset as _split_adjust_dataset,
     remove_small_image_pairs as _remove_small_image_pairs,
@@ -1171,6 +1172,11 @@ def shuffle_image_pairs(hq_folder, lq_folder):
     return _shuffle_image_pairs(hq_folder, lq_folder)
 
 
+def recover_interrupted_file_operations():
+    """Resume or roll back an interrupted shuffle/split/remove-pairs operation."""
+    return _recover_interrupted_file_operations()
+
+
 def split_single_folder_in_sets(folder):
     """Split a single folder of images into N sets with progress bar and operation choice."""
     return _split_single_folder_in_sets(folder)
@@ -1271,15 +1277,17 @@ def images_orientation_organization(*args, **kwargs):
             kwargs["lq_folder"],
             kwargs["output_hq_folder"],
             kwargs["output_lq_folder"],
-            kwargs["orientations"],
+            kwargs.get("orientations"),
             kwargs.get("operation", "copy"),
+            buckets=kwargs.get("buckets"),
         )
     else:
         return organize_images_by_orientation(
             kwargs["input_folder"],
             kwargs["output_folder"],
-            kwargs["orientations"],
+            kwargs.get("orientations"),
             kwargs.get("operation", "copy"),
+            buckets=kwargs.get("buckets"),
         )
 
 
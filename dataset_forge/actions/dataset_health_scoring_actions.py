@@ -1,97 +1,272 @@
 """
 Business logic for Dataset Health Scoring workflow.
+
+Scoring runs as a single parallel pass: ``scan_dataset`` lists every folder
+once (name, extension and size of each image) and opens each image once to
+record whether it is readable and its resolution. All checks are then
+computed from that table instead of re-listing and re-opening the dataset.
+
+For a fast preview of very large datasets, ``sample_fraction`` opens only a
+stratified random sample (strata are folder x file extension, each sampled
+proportionally with a minimum per stratum). Listing-based checks (image
+count, formats, file sizes) stay exact; image-based checks are estimated
+with 95% confidence intervals, and the health score is reported as a range
+covering every check whose outcome the sample cannot settle.
 """
 
-from typing import Dict, Any, Optional, Tuple, List
+import math
 import os
+import random
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 from dataset_forge.utils.file_utils import is_image_file
-from dataset_forge.utils.printing import print_info, print_warning, print_error
-from dataset_forge.utils.progress_utils import tqdm
 from dataset_forge.utils.memory_utils import clear_memory
+from dataset_forge.utils.parallel_utils import prefetch_map
+from dataset_forge.utils.printing import print_error, print_info, print_warning
+from dataset_forge.utils.progress_utils import tqdm
 
-# --- Step Functions ---
+MIN_IMAGES = 10
+MIN_AVG_RESOLUTION = 256
+MAX_FORMATS = 2
+MAX_ASPECT_RATIOS = 3
+# Minimum images opened per stratum in sampling mode
+MIN_PER_STRATUM = 30
+CONFIDENCE_Z = 1.96  # 95% confidence
 
+# --- Scan ---
 
-def basic_validation(
-    dataset_path: str, lq_path: Optional[str] = None
-) -> Dict[str, Any]:
+
+@dataclass
+class Stratum:
+    """Images sharing a folder and extension, and what was learned by opening them."""
+
+    folder: str
+    ext: str
+    paths: List[str] = field(default_factory=list)
+    # path -> (readable, width, height) for the images that were opened
+    inspected: Dict[str, Tuple[bool, int, int]] = field(default_factory=dict)
+
+    @property
+    def population(self) -> int:
+        return len(self.paths)
+
+    @property
+    def sampling_fraction(self) -> float:
+        return len(self.inspected) / len(self.paths) if self.paths else 1.0
+
+
+@dataclass
+class ScanTable:
+    """Everything the health checks need, collected in one pass."""
+
+    folders: List[str]
+    folder_issues: List[str] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)
+    sizes: List[int] = field(default_factory=list)
+    strata: Dict[Tuple[str, str], Stratum] = field(default_factory=dict)
+    sample_fraction: Optional[float] = None
+
+    @property
+    def sampled(self) -> bool:
+        return any(s.sampling_fraction < 1.0 for s in self.strata.values())
+
+    @property
+    def inspected_count(self) -> int:
+        return sum(len(s.inspected) for s in self.strata.values())
+
+
+def _inspect_image(path: str) -> Tuple[bool, int, int]:
+    """Open an image once: (readable, width, height)."""
+    from PIL import Image
+
+    try:
+        with Image.open(path) as img:
+            width, height = img.size
+            img.verify()
+        return True, width, height
+    except Exception:
+        return False, 0, 0
+
+
+def _sample_paths(
+    strata: Dict[Tuple[str, str], Stratum], fraction: float, seed: int
+) -> List[str]:
+    """Proportional stratified sample with at least MIN_PER_STRATUM per stratum."""
+    rng = random.Random(seed)
+    selected = []
+    for key in sorted(strata):
+        paths = strata[key].paths
+        n = min(len(paths), max(MIN_PER_STRATUM, math.ceil(fraction * len(paths))))
+        selected.extend(rng.sample(paths, n))
+    return selected
+
+
+def scan_dataset(
+    dataset_path: str,
+    lq_path: Optional[str] = None,
+    inspect: bool = True,
+    sample_fraction: Optional[float] = None,
+    seed: int = 0,
+    max_workers: Optional[int] = None,
+) -> ScanTable:
     """
-    Perform basic validation on the dataset (file existence, supported formats, min count).
+    List the dataset once and open its images (or a stratified sample) in parallel.
+
     Args:
         dataset_path: Path to the dataset folder (HQ or single folder)
         lq_path: Optional LQ folder for HQ/LQ mode
+        inspect: Open images (needed for readability and resolution checks)
+        sample_fraction: Fraction of images to open (e.g. 0.02), or None for all
+        seed: Random seed for the sample
+        max_workers: Parallel workers for opening images
+
     Returns:
-        Dictionary with validation results and issues found.
+        ScanTable for the check functions.
     """
-    issues = []
-    passed = True
-    min_images = 10
+    if sample_fraction is not None and not 0 < sample_fraction <= 1:
+        raise ValueError("sample_fraction must be in (0, 1]")
     folders = [dataset_path] if lq_path is None else [dataset_path, lq_path]
+    table = ScanTable(folders=folders, sample_fraction=sample_fraction)
     for folder in folders:
         if not os.path.exists(folder):
-            issues.append(f"Folder does not exist: {folder}")
-            passed = False
-        elif not os.path.isdir(folder):
-            issues.append(f"Not a directory: {folder}")
-            passed = False
-        else:
-            files = [f for f in os.listdir(folder) if is_image_file(f)]
-            if len(files) < min_images:
-                issues.append(
-                    f"Too few images in {folder} (found {len(files)}, need {min_images})"
-                )
-                passed = False
-    return {
-        "passed": passed,
-        "issues": issues,
-        "suggestion": "Add more images or check folder paths." if not passed else "",
-    }
+            table.folder_issues.append(f"Folder does not exist: {folder}")
+            continue
+        if not os.path.isdir(folder):
+            table.folder_issues.append(f"Not a directory: {folder}")
+            continue
+        count = 0
+        with os.scandir(folder) as it:
+            for entry in it:
+                if not is_image_file(entry.name):
+                    continue
+                count += 1
+                ext = os.path.splitext(entry.name)[1].lower()
+                stratum = table.strata.get((folder, ext))
+                if stratum is None:
+                    stratum = table.strata[(folder, ext)] = Stratum(folder, ext)
+                stratum.paths.append(entry.path)
+                try:
+                    table.sizes.append(entry.stat().st_size)
+                except OSError:
+                    pass
+        table.counts[folder] = count
 
+    if not inspect:
+        return table
+    if sample_fraction is None or sample_fraction >= 1:
+        paths = [p for key in sorted(table.strata) for p in table.strata[key].paths]
+    else:
+        paths = _sample_paths(table.strata, sample_fraction, seed)
+    owner = {p: stratum for stratum in table.strata.values() for p in stratum.paths} if paths else {}
+    for path, info in tqdm(
+        prefetch_map(_inspect_image, paths, max_workers=max_workers),
+        total=len(paths),
+        desc="Scanning images",
+    ):
+        owner[path].inspected[path] = info
+    return table
 
-def unreadable_files_check(
-    dataset_path: str, lq_path: Optional[str] = None
-) -> Dict[str, Any]:
+
+# --- Estimation ---
+
+
+def _stratified_mean(
+    table: ScanTable, value: Callable[[Tuple[bool, int, int]], Optional[float]]
+) -> Tuple[Optional[float], float, int]:
     """
-    Check for unreadable/corrupt image files.
+    Stratified estimate of the mean of value() over all images.
+
+    value() returns None for images outside the domain (e.g. unreadable images
+    for resolution). Returns (mean or None, variance of the mean, n used).
     """
-    from PIL import Image
+    strata = []
+    for stratum in table.strata.values():
+        values = [v for v in map(value, stratum.inspected.values()) if v is not None]
+        if values:
+            strata.append((stratum, values))
+    total = sum(s.population for s, _ in strata)
+    if not total:
+        return None, 0.0, 0
+    mean = variance = 0.0
+    n_used = 0
+    for stratum, values in strata:
+        weight = stratum.population / total
+        n = len(values)
+        n_used += n
+        stratum_mean = sum(values) / n
+        mean += weight * stratum_mean
+        if n > 1:
+            s2 = sum((v - stratum_mean) ** 2 for v in values) / (n - 1)
+            # Finite population correction: a fully opened stratum has no sampling error
+            variance += weight**2 * (1 - stratum.sampling_fraction) * s2 / n
+    return mean, variance, n_used
 
-    folders = [dataset_path] if lq_path is None else [dataset_path, lq_path]
-    unreadable = []
-    for folder in folders:
-        for fname in os.listdir(folder):
-            fpath = os.path.join(folder, fname)
-            if is_image_file(fname):
-                try:
-                    with Image.open(fpath) as img:
-                        img.verify()
-                except Exception:
-                    unreadable.append(fpath)
-    passed = len(unreadable) == 0
+
+def _wilson_interval(p: float, n: float, z: float = CONFIDENCE_Z) -> Tuple[float, float]:
+    """Wilson score interval for a proportion p observed over n samples."""
+    if n <= 0:
+        return 0.0, 1.0
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+# --- Checks computed from the scan table ---
+
+
+def check_basic_validation(table: ScanTable) -> Dict[str, Any]:
+    """File existence, supported formats and a minimum image count (exact)."""
+    issues = list(table.folder_issues)
+    for folder, count in table.counts.items():
+        if count < MIN_IMAGES:
+            issues.append(f"Too few images in {folder} (found {count}, need {MIN_IMAGES})")
+    passed = not issues
     return {
         "passed": passed,
-        "unreadable": unreadable,
-        "suggestion": "Remove or replace corrupt files." if not passed else "",
+        "issues": issues,
+        "suggestion": "Add more images or check folder paths." if not passed else "",
     }
 
 
-def image_format_consistency(
-    dataset_path: str, lq_path: Optional[str] = None
-) -> Dict[str, Any]:
-    """
-    Check for image format consistency.
-    """
-    folders = [dataset_path] if lq_path is None else [dataset_path, lq_path]
-    formats = set()
-    for folder in folders:
-        for fname in os.listdir(folder):
-            if is_image_file(fname):
-                ext = os.path.splitext(fname)[1].lower()
-                formats.add(ext)
-    passed = len(formats) <= 2  # Allow up to 2 formats
+def check_unreadable_files(table: ScanTable) -> Dict[str, Any]:
+    """Unreadable/corrupt images; estimated with a Wilson interval when sampled."""
+    unreadable = sorted(
+        path
+        for stratum in table.strata.values()
+        for path, (readable, _, _) in stratum.inspected.items()
+        if not readable
+    )
+    result: Dict[str, Any] = {"passed": not unreadable, "unreadable": unreadable}
+    if table.sampled:
+        rate, variance, n = _stratified_mean(table, lambda info: 0.0 if info[0] else 1.0)
+        rate = rate or 0.0
+        population = sum(s.population for s in table.strata.values())
+        if 0 < rate < 1 and variance > 0:
+            # Effective sample size of the stratified estimate (includes the FPC)
+            n_eff = rate * (1 - rate) / variance
+        else:
+            n_eff = n / (1 - table.inspected_count / population)
+        low, high = _wilson_interval(rate, n_eff)
+        result.update(
+            unreadable_rate=rate,
+            unreadable_rate_ci=(low, high),
+            estimated_unreadable=(int(low * population), math.ceil(high * population)),
+            # No sample can prove a large dataset has no corrupt files
+            certain=low > 0,
+        )
+    result["suggestion"] = "Remove or replace corrupt files." if not result["passed"] else ""
+    return result
+
+
+def check_format_consistency(table: ScanTable) -> Dict[str, Any]:
+    """At most MAX_FORMATS file extensions (exact)."""
+    formats = sorted({ext for _, ext in table.strata})
+    passed = len(formats) <= MAX_FORMATS
     return {
         "passed": passed,
-        "formats": list(formats),
+        "formats": formats,
         "suggestion": (
             "Consider converting images to a consistent format (e.g., all .png or .jpg)."
             if not passed
@@ -100,74 +275,130 @@ def image_format_consistency(
     }
 
 
-def quality_metrics(dataset_path: str, lq_path: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Compute quality metrics (resolution, blur, color stats, etc.).
-    """
-    from PIL import Image
-
-    folders = [dataset_path] if lq_path is None else [dataset_path, lq_path]
-    resolutions = []
-    for folder in folders:
-        for fname in os.listdir(folder):
-            fpath = os.path.join(folder, fname)
-            if is_image_file(fname):
-                try:
-                    with Image.open(fpath) as img:
-                        resolutions.append(img.size)
-                except Exception:
-                    continue
-    if not resolutions:
+def check_quality_metrics(table: ScanTable) -> Dict[str, Any]:
+    """Average resolution of the readable images, with confidence intervals when sampled."""
+    mean_w, var_w, n = _stratified_mean(table, lambda info: info[1] if info[0] else None)
+    mean_h, var_h, _ = _stratified_mean(table, lambda info: info[2] if info[0] else None)
+    if mean_w is None:
         return {
             "passed": False,
             "avg_resolution": (0, 0),
             "suggestion": "No readable images found.",
         }
-    avg_w = sum(w for w, h in resolutions) // len(resolutions)
-    avg_h = sum(h for w, h in resolutions) // len(resolutions)
-    passed = avg_w >= 256 and avg_h >= 256
+    passed = mean_w >= MIN_AVG_RESOLUTION and mean_h >= MIN_AVG_RESOLUTION
+    result: Dict[str, Any] = {
+        "passed": passed,
+        "avg_resolution": (int(mean_w), int(mean_h)),
+    }
+    if table.sampled:
+        ci_w = (mean_w - CONFIDENCE_Z * math.sqrt(var_w), mean_w + CONFIDENCE_Z * math.sqrt(var_w))
+        ci_h = (mean_h - CONFIDENCE_Z * math.sqrt(var_h), mean_h + CONFIDENCE_Z * math.sqrt(var_h))
+        low_passes = min(ci_w[0], ci_h[0]) >= MIN_AVG_RESOLUTION
+        high_passes = ci_w[1] >= MIN_AVG_RESOLUTION and ci_h[1] >= MIN_AVG_RESOLUTION
+        result.update(
+            avg_resolution_ci=(
+                (int(ci_w[0]), int(ci_h[0])),
+                (math.ceil(ci_w[1]), math.ceil(ci_h[1])),
+            ),
+            certain=low_passes == high_passes,
+        )
+    result["suggestion"] = (
+        "Average resolution is low. Consider upscaling or filtering low-res images."
+        if not passed
+        else ""
+    )
+    return result
+
+
+def check_aspect_ratio_consistency(table: ScanTable) -> Dict[str, Any]:
+    """At most MAX_ASPECT_RATIOS distinct aspect ratios among readable images."""
+    ratio_counts: Dict[float, int] = {}
+    for stratum in table.strata.values():
+        for readable, w, h in stratum.inspected.values():
+            if readable:
+                ratio = round(w / h, 2) if h else 0
+                ratio_counts[ratio] = ratio_counts.get(ratio, 0) + 1
+    passed = len(ratio_counts) <= MAX_ASPECT_RATIOS
+    result: Dict[str, Any] = {"passed": passed, "ratios": sorted(ratio_counts)}
+    if table.sampled:
+        # Ratios seen only once hint at rare ratios the sample missed (Good-Turing)
+        singletons = sum(1 for c in ratio_counts.values() if c == 1)
+        result["certain"] = not passed or singletons == 0
+    result["suggestion"] = (
+        "Consider standardizing aspect ratios for model training." if not passed else ""
+    )
+    return result
+
+
+def check_file_size_outliers(table: ScanTable) -> Dict[str, Any]:
+    """File sizes outside 1.5 IQR (exact, sizes come from the listing)."""
+    from dataset_forge.utils.lazy_imports import numpy_as_np as np
+
+    sizes = table.sizes
+    if not sizes:
+        return {"passed": True, "outliers": [], "suggestion": ""}
+    arr = np.asarray(sizes)
+    q1, q3 = np.percentile(arr, [25, 75])
+    iqr = q3 - q1
+    lower, upper = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    outliers = arr[(arr < lower) | (arr > upper)].tolist()
+    passed = len(outliers) < max(3, len(sizes) // 20)
     return {
         "passed": passed,
-        "avg_resolution": (avg_w, avg_h),
-        "suggestion": (
-            "Average resolution is low. Consider upscaling or filtering low-res images."
-            if not passed
-            else ""
-        ),
+        "outliers": outliers,
+        "suggestion": "Remove or investigate file size outliers." if not passed else "",
     }
 
 
+# --- Step Functions (each scans on its own; score_dataset shares one scan) ---
+
+
+def basic_validation(
+    dataset_path: str, lq_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Perform basic validation on the dataset (file existence, supported formats, min count).
+    Args:
+        dataset_path: Path to the dataset folder (HQ or single folder)
+        lq_path: Optional LQ folder for HQ/LQ mode
+    Returns:
+        Dictionary with validation results and issues found.
+    """
+    return check_basic_validation(scan_dataset(dataset_path, lq_path, inspect=False))
+
+
+def unreadable_files_check(
+    dataset_path: str, lq_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Check for unreadable/corrupt image files.
+    """
+    return check_unreadable_files(scan_dataset(dataset_path, lq_path))
+
+
+def image_format_consistency(
+    dataset_path: str, lq_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Check for image format consistency.
+    """
+    return check_format_consistency(scan_dataset(dataset_path, lq_path, inspect=False))
+
+
+def quality_metrics(dataset_path: str, lq_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Compute quality metrics (resolution, blur, color stats, etc.).
+    """
+    return check_quality_metrics(scan_dataset(dataset_path, lq_path))
+
+
 def aspect_ratio_consistency(
     dataset_path: str, lq_path: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Check for aspect ratio consistency.
     """
-    from PIL import Image
-
-    folders = [dataset_path] if lq_path is None else [dataset_path, lq_path]
-    ratios = set()
-    for folder in folders:
-        for fname in os.listdir(folder):
-            fpath = os.path.join(folder, fname)
-            if is_image_file(fname):
-                try:
-                    with Image.open(fpath) as img:
-                        w, h = img.size
-                        ratio = round(w / h, 2) if h else 0
-                        ratios.add(ratio)
-                except Exception:
-                    continue
-    passed = len(ratios) <= 3  # Allow up to 3 aspect ratios
-    return {
-        "passed": passed,
-        "ratios": list(ratios),
-        "suggestion": (
-            "Consider standardizing aspect ratios for model training."
-            if not passed
-            else ""
-        ),
-    }
+    return check_aspect_ratio_consistency(scan_dataset(dataset_path, lq_path))
 
 
 def file_size_outliers(
@@ -176,31 +407,7 @@ def file_size_outliers(
     """
     Check for file size outliers.
     """
-    import numpy as np
-
-    folders = [dataset_path] if lq_path is None else [dataset_path, lq_path]
-    sizes = []
-    for folder in folders:
-        for fname in os.listdir(folder):
-            fpath = os.path.join(folder, fname)
-            if is_image_file(fname):
-                try:
-                    sizes.append(os.path.getsize(fpath))
-                except Exception:
-                    continue
-    if not sizes:
-        return {"passed": True, "outliers": [], "suggestion": ""}
-    arr = np.array(sizes)
-    q1, q3 = np.percentile(arr, 25), np.percentile(arr, 75)
-    iqr = q3 - q1
-    lower, upper = q1 - 1.5 * iqr, q3 + 1.5 * iqr
-    outliers = [s for s in sizes if s < lower or s > upper]
-    passed = len(outliers) < max(3, len(sizes) // 20)
-    return {
-        "passed": passed,
-        "outliers": outliers,
-        "suggestion": "Remove or investigate file size outliers." if not passed else "",
-    }
+    return check_file_size_outliers(scan_dataset(dataset_path, lq_path, inspect=False))
 
 
 def consistency_checks(
@@ -258,26 +465,49 @@ ALL_STEPS = [
     ("compliance_scan", compliance_scan),
 ]
 
+# Checks computed from one shared ScanTable (used by score_dataset)
+TABLE_CHECKS = [
+    ("basic_validation", check_basic_validation),
+    ("unreadable_files_check", check_unreadable_files),
+    ("image_format_consistency", check_format_consistency),
+    ("quality_metrics", check_quality_metrics),
+    ("aspect_ratio_consistency", check_aspect_ratio_consistency),
+    ("file_size_outliers", check_file_size_outliers),
+    ("consistency_checks", lambda table: consistency_checks(*table.folders)),
+    ("compliance_scan", lambda table: compliance_scan(*table.folders)),
+]
+
 
 def compute_health_score(results: Dict[str, Any]) -> Dict[str, Any]:
     """
     Compute the overall health score from all step results.
+
+    Steps marked ``certain: False`` (sampled checks whose outcome the sample
+    cannot settle) widen ``score_range``; with a full scan it equals the score.
+
     Args:
         results: Dictionary with all step results.
     Returns:
-        Dictionary with score (0-100), status string, and suggestions.
+        Dictionary with score (0-100), score_range, status string, and suggestions.
     """
     score = 0.0
+    low = high = 0.0
     suggestions = []
     breakdown = {}
     for step, weight in STEP_WEIGHTS:
         step_result = results.get(step, {})
         passed = step_result.get("passed", False)
+        certain = step_result.get("certain", True)
         if passed:
             score += 100 * weight
-            breakdown[step] = ("✅", int(100 * weight))
+            high += 100 * weight
+            if certain:
+                low += 100 * weight
+            breakdown[step] = ("✅" if certain else "❔", int(100 * weight))
         else:
-            breakdown[step] = ("❌", 0)
+            if not certain:
+                high += 100 * weight
+            breakdown[step] = ("❌" if certain else "❔", 0)
             if step_result.get("suggestion"):
                 suggestions.append(
                     f"{step.replace('_', ' ').title()}: {step_result['suggestion']}"
@@ -291,30 +521,56 @@ def compute_health_score(results: Dict[str, Any]) -> Dict[str, Any]:
         status = "❌ Unusable"
     return {
         "score": score,
+        "score_range": (int(round(low)), int(round(high))),
         "status": status,
         "breakdown": breakdown,
         "suggestions": suggestions,
     }
 
 
-def score_dataset(dataset_path: str, lq_path: Optional[str] = None) -> Dict[str, Any]:
+def score_dataset(
+    dataset_path: str,
+    lq_path: Optional[str] = None,
+    sample_fraction: Optional[float] = None,
+    seed: int = 0,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
     """
     Run the full Dataset Health Scoring workflow.
     Args:
         dataset_path: Path to the dataset folder (HQ or single folder)
         lq_path: Optional LQ folder for HQ/LQ mode
+        sample_fraction: Open only a stratified sample of this fraction of the
+            images (e.g. 0.02) for a fast preview; None scans everything
+        seed: Random seed for the sample
+        max_workers: Parallel workers for opening images
     Returns:
         Dictionary with all step results, final score/status, and suggestions.
+        ``scan`` describes what was opened (images, inspected, sampled).
     """
-    results = {}
-    for step_name, step_func in ALL_STEPS:
+    table = scan_dataset(
+        dataset_path,
+        lq_path,
+        sample_fraction=sample_fraction,
+        seed=seed,
+        max_workers=max_workers,
+    )
+    results: Dict[str, Any] = {}
+    for step_name, step_func in TABLE_CHECKS:
         try:
-            results[step_name] = step_func(dataset_path, lq_path)
+            results[step_name] = step_func(table)
         except Exception as e:
             results[step_name] = {
                 "passed": False,
                 "error": str(e),
                 "suggestion": f"Error in {step_name}: {e}",
             }
+    results["scan"] = {
+        "images": sum(table.counts.values()),
+        "inspected": table.inspected_count,
+        "sampled": table.sampled,
+        "sample_fraction": sample_fraction,
+        "strata": len(table.strata),
+    }
     results["health_score"] = compute_health_score(results)
     return results
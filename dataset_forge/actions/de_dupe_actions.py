@@ -10,10 +10,11 @@ from dataset_forge.utils.printing import print_success, print_error, print_info
 from dataset_forge.utils.audio_utils import play_done_sound
 
 
-def compute_hashes(folder, hash_func="phash"):
+def compute_hashes(folder, hash_func="phash", use_store=True):
     """
     Compute perceptual hashes for all images in a folder.
     hash_func: 'phash', 'dhash', 'ahash', or 'whash'.
+    use_store: Reuse/persist hashes in the feature store (keyed by content)
     Returns a dict: {filename: hash}
     """
     hash_funcs = {
@@ -22,7 +23,9 @@ def compute_hashes(folder, hash_func="phash"):
         "ahash": imagehash.average_hash,
         "whash": imagehash.whash,
     }
-    func = hash_funcs.get(hash_func, imagehash.phash)
+    if hash_func not in hash_funcs:
+        hash_func = "phash"
+    func = hash_funcs[hash_func]
     hashes = {}
     files = [
         fname
@@ -30,6 +33,18 @@ def compute_hashes(folder, hash_func="phash"):
         if os.path.isfile(os.path.join(folder, fname))
         and fname.lower().endswith((".png", ".jpg", ".jpeg", ".bmp", ".webp"))
     ]
+    if use_store:
+        try:
+            from dataset_forge.actions.feature_extractors import hash_from_int
+            from dataset_forge.utils.feature_store import get_or_compute
+
+            table = get_or_compute([os.path.join(folder, f) for f in files], hash_func)
+            return {
+                os.path.basename(path): hash_from_int(value)
+                for path, value in zip(table.paths, table.column("hash"))
+            }
+        except Exception as e:
+            print_error(f"Feature store unavailable, hashing directly: {e}")
     for fname in tqdm(files, desc="Hashing images"):
         fpath = os.path.join(folder, fname)
         try:
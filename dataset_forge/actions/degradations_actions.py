@@ -83,7 +83,9 @@ def apply_blur_degradation(
                     processed += 1
             except Exception as e:
                 print_error(f"Failed to process {img_name}: {e}")
-                log_operation("blur_degradation", f"Failed: {img_name}: {e}")
+                log_operation(
+                    "blur_degradation", f"Failed: {img_name}: {e}", outcome="error"
+                )
     print_success(f"Blur degradation applied to {processed} images.")
     log_operation("blur_degradation", f"Processed {processed} images in {input_folder}")
     clear_memory()
@@ -173,7 +175,9 @@ def apply_noise_degradation(
                     processed += 1
             except Exception as e:
                 print_error(f"Failed to process {img_name}: {e}")
-                log_operation("noise_degradation", f"Failed: {img_name}: {e}")
+                log_operation(
+                    "noise_degradation", f"Failed: {img_name}: {e}", outcome="error"
+                )
     print_success(f"Noise degradation applied to {processed} images.")
     log_operation(
         "noise_degradation", f"Processed {processed} images in {input_folder}"
@@ -239,7 +243,9 @@ def apply_compress_degradation(
                     processed += 1
             except Exception as e:
                 print_error(f"Failed to process {img_name}: {e}")
-                log_operation("compress_degradation", f"Failed: {img_name}: {e}")
+                log_operation(
+                    "compress_degradation", f"Failed: {img_name}: {e}", outcome="error"
+                )
     print_success(f"Compression degradation applied to {processed} images.")
     log_operation(
         "compress_degradation", f"Processed {processed} images in {input_folder}"
@@ -299,7 +305,9 @@ def apply_pixelate_degradation(
                     processed += 1
             except Exception as e:
                 print_error(f"Failed to process {img_name}: {e}")
-                log_operation("pixelate_degradation", f"Failed: {img_name}: {e}")
+                log_operation(
+                    "pixelate_degradation", f"Failed: {img_name}: {e}", outcome="error"
+                )
     print_success(f"Pixelate degradation applied to {processed} images.")
     log_operation(
         "pixelate_degradation", f"Processed {processed} images in {input_folder}"
@@ -369,7 +377,9 @@ def apply_color_degradation(
                     processed += 1
             except Exception as e:
                 print_error(f"Failed to process {img_name}: {e}")
-                log_operation("color_degradation", f"Failed: {img_name}: {e}")
+                log_operation(
+                    "color_degradation", f"Failed: {img_name}: {e}", outcome="error"
+                )
     print_success(f"Color degradation applied to {processed} images.")
     log_operation(
         "color_degradation", f"Processed {processed} images in {input_folder}"
@@ -429,7 +439,9 @@ def apply_saturation_degradation(
                     processed += 1
             except Exception as e:
                 print_error(f"Failed to process {img_name}: {e}")
-                log_operation("saturation_degradation", f"Failed: {img_name}: {e}")
+                log_operation(
+                    "saturation_degradation", f"Failed: {img_name}: {e}", outcome="error"
+                )
     print_success(f"Saturation degradation applied to {processed} images.")
     log_operation(
         "saturation_degradation", f"Processed {processed} images in {input_folder}"
@@ -516,7 +528,9 @@ def apply_dithering_degradation(
                     processed += 1
             except Exception as e:
                 print_error(f"Failed to process {img_name}: {e}")
-                log_operation("dithering_degradation", f"Failed: {img_name}: {e}")
+                log_operation(
+                    "dithering_degradation", f"Failed: {img_name}: {e}", outcome="error"
+                )
     print_success(f"Dithering degradation applied to {processed} images.")
     log_operation(
         "dithering_degradation", f"Processed {processed} images in {input_folder}"
@@ -614,7 +628,9 @@ def apply_subsampling_degradation(
                 processed += 1
             except Exception as e:
                 print_error(f"Failed to process {img_name}: {e}")
-                log_operation("subsampling_degradation", f"Failed: {img_name}: {e}")
+                log_operation(
+                    "subsampling_degradation", f"Failed: {img_name}: {e}", outcome="error"
+                )
     print_success(f"Subsampling degradation applied to {processed} images.")
     log_operation(
         "subsampling_degradation", f"Processed {processed} images in {input_folder}"
@@ -702,7 +718,9 @@ def apply_screentone_degradation(
                     processed += 1
             except Exception as e:
                 print_error(f"Failed to process {img_name}: {e}")
-                log_operation("screentone_degradation", f"Failed: {img_name}: {e}")
+                log_operation(
+                    "screentone_degradation", f"Failed: {img_name}: {e}", outcome="error"
+                )
     print_success(f"Screentone degradation applied to {processed} images.")
     log_operation(
         "screentone_degradation", f"Processed {processed} images in {input_folder}"
@@ -787,7 +805,9 @@ def apply_halo_degradation(
                     processed += 1
             except Exception as e:
                 print_error(f"Failed to process {img_name}: {e}")
-                log_operation("halo_degradation", f"Failed: {img_name}: {e}")
+                log_operation(
+                    "halo_degradation", f"Failed: {img_name}: {e}", outcome="error"
+                )
     print_success(f"Halo degradation applied to {processed} images.")
     log_operation("halo_degradation", f"Processed {processed} images in {input_folder}")
     clear_memory()
@@ -853,7 +873,9 @@ def apply_sin_degradation(
                     processed += 1
             except Exception as e:
                 print_error(f"Failed to process {img_name}: {e}")
-                log_operation("sin_degradation", f"Failed: {img_name}: {e}")
+                log_operation(
+                    "sin_degradation", f"Failed: {img_name}: {e}", outcome="error"
+                )
     print_success(f"Sin degradation applied to {processed} images.")
     log_operation("sin_degradation", f"Processed {processed} images in {input_folder}")
     clear_memory()
@@ -910,7 +932,9 @@ def apply_shift_degradation(
                     processed += 1
             except Exception as e:
                 print_error(f"Failed to process {img_name}: {e}")
-                log_operation("shift_degradation", f"Failed: {img_name}: {e}")
+                log_operation(
+                    "shift_degradation", f"Failed: {img_name}: {e}", outcome="error"
+                )
     print_success(f"Shift degradation applied to {processed} images.")
     log_operation(
         "shift_degradation", f"Processed {processed} images in {input_folder}"
@@ -976,7 +1000,9 @@ def apply_canny_degradation(
                 processed += 1
             except Exception as e:
                 print_error(f"Failed to process {img_name}: {e}")
-                log_operation("canny_degradation", f"Failed: {img_name}: {e}")
+                log_operation(
+                    "canny_degradation", f"Failed: {img_name}: {e}", outcome="error"
+                )
     print_success(f"Canny degradation applied to {processed} images.")
     log_operation(
         "canny_degradation", f"Processed {processed} images in {input_folder}"
@@ -1052,7 +1078,9 @@ def apply_resize_degradation(
                     processed += 1
             except Exception as e:
                 print_error(f"Failed to process {img_name}: {e}")
-                log_operation("resize_degradation", f"Failed: {img_name}: {e}")
+                log_operation(
+                    "resize_degradation", f"Failed: {img_name}: {e}", outcome="error"
+                )
     print_success(f"Resize degradation applied to {processed} images.")
     log_operation(
         "resize_degradation", f"Processed {processed} images in {input_folder}"
@@ -10,14 +10,20 @@ file type detection, and comprehensive statistics. It includes features like:
 - Comprehensive statistics and reporting
 - Multiple output formats (console, markdown, JSON)
 - Configurable depth and ignore patterns
-- Memory-efficient processing for large directories
+- os.scandir-based walking on a bounded thread pool with streamed output,
+  heap-based top-N tracking and sampled MIME detection for multi-million file trees
 """
 
+import fnmatch
+import heapq
+import io
 import os
 import re
 import json
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+import stat
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Pattern, TextIO, Tuple
 from datetime import datetime
 
 # Import emoji utilities for better emoji handling
@@ -29,7 +35,13 @@ from ..utils.emoji_utils import (
     categorize_emoji,
 )
 from ..utils.memory_utils import auto_cleanup, memory_context
-from ..utils.printing import print_info, print_success, print_warning, print_error
+from ..utils.printing import (
+    print_error,
+    print_header,
+    print_info,
+    print_success,
+    print_warning,
+)
 from ..utils.color import Mocha
 
 # Try to import magic for better file type detection
@@ -45,9 +57,8 @@ except ImportError:
     )
 
 
-def is_image_file(filename: str) -> bool:
-    """Check if a file is an image based on its extension."""
-    image_extensions = {
+IMAGE_EXTENSIONS = frozenset(
+    {
         ".jpg",
         ".jpeg",
         ".png",
@@ -63,7 +74,227 @@ def is_image_file(filename: str) -> bool:
         ".nef",
         ".arw",
     }
-    return Path(filename).suffix.lower() in image_extensions
+)
+
+# Extension -> category, checked before the image/other fallbacks
+_EXTENSION_CATEGORIES = {
+    **dict.fromkeys((".py", ".pyc", ".pyo"), "code_python"),
+    **dict.fromkeys((".js", ".jsx"), "code_js"),
+    **dict.fromkeys((".html", ".htm"), "code_html"),
+    ".json": "data_json",
+    ".csv": "data_csv",
+    **dict.fromkeys((".pth", ".safetensors", ".onnx", ".pb"), "model"),
+    **dict.fromkeys((".yml", ".yaml", ".ini", ".cfg", ".conf"), "config"),
+    ".log": "log",
+    **dict.fromkeys((".bak", ".backup"), "backup"),
+    **dict.fromkeys((".tmp", ".temp"), "temp"),
+    ".pdf": "document_pdf",
+    **dict.fromkeys((".zip", ".rar", ".tar", ".gz", ".7z"), "archive"),
+    **dict.fromkeys((".mp3", ".wav", ".flac", ".ogg", ".aac"), "audio"),
+    **dict.fromkeys((".mp4", ".avi", ".mov", ".wmv", ".flv", ".webm"), "video"),
+    **dict.fromkeys((".ttf", ".otf", ".woff", ".woff2"), "font"),
+}
+# Images larger than this get the HQ emoji
+HQ_IMAGE_BYTES = 1024 * 1024
+
+
+def _file_ext(filename: str) -> str:
+    """Lower-case last suffix including the dot ("" if none)."""
+    _, dot, ext = filename.rpartition(".")
+    return "." + ext.lower() if dot else ""
+
+
+def is_image_file(filename: str) -> bool:
+    """Check if a file is an image based on its extension."""
+    return _file_ext(os.path.basename(filename)) in IMAGE_EXTENSIONS
+
+
+DEFAULT_IGNORE_PATTERNS = (
+    ".git",
+    "__pycache__",
+    "node_modules",
+    ".idea",
+    ".vscode",
+    ".DS_Store",
+    "Thumbs.db",
+    "*.tmp",
+    "*.temp",
+)
+# Directory scans are I/O bound; same default as ThreadPoolExecutor
+DEFAULT_TREE_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+# Directories with more files than this are stat'ed in parallel chunks
+STAT_CHUNK_SIZE = 4096
+# Largest / most recent files kept for the statistics report
+TOP_N_FILES = 10
+# magic.from_file calls per extension; other files reuse the majority result
+MIME_SAMPLES_PER_EXT = 3
+
+
+def _compile_ignore_patterns(patterns: List[str]) -> Optional[Pattern]:
+    """One regex for all ignore patterns: globs match the whole name, others any substring."""
+    parts = []
+    for pattern in patterns:
+        if any(ch in pattern for ch in "*?["):
+            parts.append("^" + fnmatch.translate(pattern))
+        elif pattern:
+            parts.append(re.escape(pattern))
+    return re.compile("|".join(parts)) if parts else None
+
+
+class _DirListing(NamedTuple):
+    dirs: List[Tuple[str, str, bool]]  # (name, path, is_symlink), sorted
+    files: List[Tuple[str, str, Optional[int], Optional[float]]]  # name, path, size, mtime
+    unstatted: List[os.DirEntry]  # files of huge directories, stat'ed by the caller
+    error: Optional[str]
+
+
+def _stat_entries(
+    entries: List[os.DirEntry],
+) -> List[Tuple[str, str, Optional[int], Optional[float]]]:
+    result = []
+    for entry in entries:
+        try:
+            st = entry.stat()
+            result.append((entry.name, entry.path, st.st_size, st.st_mtime))
+        except OSError:
+            result.append((entry.name, entry.path, 0, None))
+    return result
+
+
+def _scan_directory(
+    path: str, ignore_re: Optional[Pattern], need_stat: bool
+) -> _DirListing:
+    """List one directory with os.scandir; file types come from the listing itself."""
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError as e:
+        return _DirListing([], [], [], str(e))
+    dirs, files, pending = [], [], []
+    for entry in entries:
+        if ignore_re is not None and ignore_re.search(entry.name):
+            continue
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            dirs.append((entry.name, entry.path, entry.is_symlink()))
+        elif need_stat:
+            pending.append(entry)
+        else:
+            files.append((entry.name, entry.path, None, None))
+    dirs.sort(key=lambda d: d[0].lower())
+    if len(pending) <= STAT_CHUNK_SIZE:
+        files.extend(_stat_entries(pending))
+        pending = []
+    return _DirListing(dirs, files, pending, None)
+
+
+def _fallback_file_type(filename: str) -> str:
+    filename = filename.lower()
+    if filename.endswith(".py"):
+        return "text/x-python"
+    if filename.endswith(".json"):
+        return "application/json"
+    if filename.endswith(".txt"):
+        return "text/plain"
+    if is_image_file(filename):
+        return "image"
+    return "unknown"
+
+
+class _MimeSampler:
+    """
+    Sampled MIME detection: magic runs on the first few files of each
+    extension and the rest of that extension reuse the most common answer.
+    """
+
+    def __init__(self, samples_per_ext: int = MIME_SAMPLES_PER_EXT):
+        self.samples_per_ext = samples_per_ext
+        self._samples: Dict[str, Counter] = {}
+        self._resolved: Dict[str, str] = {}
+
+    def detect(self, path: str) -> str:
+        name = os.path.basename(path)
+        ext = _file_ext(name)
+        mime = self._resolved.get(ext)
+        if mime is not None:
+            return mime
+        if not (MAGIC_AVAILABLE and magic):
+            # Extension-based types depend on the extension only
+            mime = self._resolved[ext] = _fallback_file_type(name)
+            return mime
+        try:
+            mime = magic.from_file(path, mime=True)
+        except Exception:
+            mime = _fallback_file_type(name)
+        seen = self._samples.setdefault(ext, Counter())
+        seen[mime] += 1
+        if sum(seen.values()) >= self.samples_per_ext:
+            self._resolved[ext] = seen.most_common(1)[0][0]
+        return mime
+
+
+class TreeStats:
+    """Running directory statistics; top files are kept in bounded heaps."""
+
+    def __init__(self, top_n: int = TOP_N_FILES):
+        self.top_n = top_n
+        self.total_files = 0
+        self.total_dirs = 0
+        self.total_size = 0
+        self.empty_directories = 0
+        self.hidden_files = 0
+        self.file_types: Counter = Counter()
+        self.extensions: Counter = Counter()
+        self._largest: List[Tuple[int, str]] = []
+        self._recent: List[Tuple[float, str]] = []
+
+    def _push(self, heap: List, item: Tuple) -> None:
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def add_file(
+        self,
+        path: str,
+        name: str,
+        size: int,
+        mtime: Optional[float],
+        file_type: Optional[str],
+    ) -> None:
+        self.total_files += 1
+        self.total_size += size
+        if name.startswith("."):
+            self.hidden_files += 1
+        if file_type:
+            self.file_types[file_type] += 1
+        ext = _file_ext(name)
+        if ext and ext != name:
+            self.extensions[ext] += 1
+        self._push(self._largest, (size, path))
+        if mtime is not None:
+            self._push(self._recent, (mtime, path))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_files": self.total_files,
+            "total_dirs": self.total_dirs,
+            "total_size": self.total_size,
+            "file_types": dict(self.file_types),
+            "extensions": dict(self.extensions),
+            "largest_files": [
+                (path, size) for size, path in sorted(self._largest, reverse=True)
+            ],
+            "recent_files": [
+                (path, datetime.fromtimestamp(mtime))
+                for mtime, path in sorted(self._recent, reverse=True)
+            ],
+            "empty_directories": self.empty_directories,
+            "hidden_files": self.hidden_files,
+        }
 
 
 class EnhancedDirectoryTreeGenerator:
@@ -71,6 +302,8 @@ class EnhancedDirectoryTreeGenerator:
 
     def __init__(self):
         """Initialize the directory tree generator with emoji-safe categories."""
+        self.stats: Dict[str, Any] = {}
+        self._emoji_cache: Dict[Tuple, str] = {}
         # Enhanced categories with more specific emojis
         self.categories = {
             "directory": "📁",
@@ -141,6 +374,48 @@ class EnhancedDirectoryTreeGenerator:
             "font/woff2": "font",
         }
 
+    def _emoji_for(
+        self, name: str, size: Optional[int] = None, mime: Optional[str] = None
+    ) -> str:
+        """Emoji from a file name plus already-known size/MIME type (no syscalls)."""
+        ext = _file_ext(name)
+        key = (ext, None if size is None else size > HQ_IMAGE_BYTES, mime)
+        emoji = self._emoji_cache.get(key)
+        if emoji is None:
+            emoji = self._emoji_cache[key] = self._resolve_emoji(*key)
+        return emoji
+
+    def _resolve_emoji(
+        self, ext: str, is_large: Optional[bool], mime: Optional[str]
+    ) -> str:
+        if ext in _EXTENSION_CATEGORIES:
+            emoji = self.categories[_EXTENSION_CATEGORIES[ext]]
+        elif ext in IMAGE_EXTENSIONS:
+            if is_large is None:
+                emoji = self.categories["image"]
+            elif is_large:
+                emoji = self.categories["image_hq"]
+            else:
+                emoji = self.categories["image_lq"]
+        else:
+            emoji = self.categories["other"]
+
+        if mime:
+            if mime in self.file_type_mappings:
+                category = self.file_type_mappings[mime]
+                emoji = self.categories.get(category, self.categories["other"])
+            elif mime.startswith("image"):
+                emoji = self.categories["image"]
+            elif mime.startswith("audio"):
+                emoji = self.categories["audio"]
+            elif mime.startswith("video"):
+                emoji = self.categories["video"]
+            elif mime.startswith("text"):
+                emoji = self.categories["document"]
+            elif mime.startswith("application"):
+                emoji = self.categories["other"]
+        return emoji if is_valid_emoji(emoji) else "📄"
+
     def get_file_emoji(self, file_path: str) -> str:
         """
         Get the appropriate emoji for a file based on its type with emoji validation.
@@ -154,94 +429,20 @@ class EnhancedDirectoryTreeGenerator:
         try:
             if os.path.isdir(file_path):
                 return self.categories["directory"]
-
-            # Enhanced detection for specific file types (works without magic)
-            filename = os.path.basename(file_path).lower()
-
-            # Check for specific file extensions first
-            if filename.endswith((".py", ".pyc", ".pyo")):
-                emoji = self.categories["code_python"]
-            elif filename.endswith((".js", ".jsx")):
-                emoji = self.categories["code_js"]
-            elif filename.endswith((".html", ".htm")):
-                emoji = self.categories["code_html"]
-            elif filename.endswith((".json")):
-                emoji = self.categories["data_json"]
-            elif filename.endswith((".csv")):
-                emoji = self.categories["data_csv"]
-            elif filename.endswith((".pth", ".safetensors", ".onnx", ".pb")):
-                emoji = self.categories["model"]
-            elif filename.endswith((".yml", ".yaml", ".ini", ".cfg", ".conf")):
-                emoji = self.categories["config"]
-            elif filename.endswith((".log")):
-                emoji = self.categories["log"]
-            elif filename.endswith((".bak", ".backup")):
-                emoji = self.categories["backup"]
-            elif filename.endswith((".tmp", ".temp")):
-                emoji = self.categories["temp"]
-            elif filename.endswith((".pdf")):
-                emoji = self.categories["document_pdf"]
-            elif filename.endswith((".zip", ".rar", ".tar", ".gz", ".7z")):
-                emoji = self.categories["archive"]
-            elif filename.endswith((".mp3", ".wav", ".flac", ".ogg", ".aac")):
-                emoji = self.categories["audio"]
-            elif filename.endswith((".mp4", ".avi", ".mov", ".wmv", ".flv", ".webm")):
-                emoji = self.categories["video"]
-            elif filename.endswith((".ttf", ".otf", ".woff", ".woff2")):
-                emoji = self.categories["font"]
-            elif is_image_file(filename):
-                # Check if it's HQ or LQ based on size or naming convention
+            size = None
+            mime = None
+            if is_image_file(file_path) or (MAGIC_AVAILABLE and magic):
                 try:
-                    # Use a safer approach to get file size
-                    if os.path.exists(file_path) and os.access(file_path, os.R_OK):
-                        file_size = os.path.getsize(file_path)
-                        if file_size > 1024 * 1024:  # > 1MB
-                            emoji = self.categories["image_hq"]
-                        else:
-                            emoji = self.categories["image_lq"]
-                    else:
-                        emoji = self.categories["image"]
-                except (OSError, PermissionError, FileNotFoundError):
-                    emoji = self.categories["image"]
-            else:
-                emoji = self.categories["other"]
-
-            # Use magic if available for more accurate detection
+                    size = os.path.getsize(file_path)
+                except OSError:
+                    pass
             if MAGIC_AVAILABLE and magic:
                 try:
-                    if os.path.exists(file_path) and os.access(file_path, os.R_OK):
-                        mime_type = magic.from_file(file_path, mime=True)
-
-                        # Check if it's a known type
-                        if mime_type in self.file_type_mappings:
-                            category = self.file_type_mappings[mime_type]
-                            emoji = self.categories.get(
-                                category, self.categories["other"]
-                            )
-
-                        # Fallback to MIME type detection
-                        elif mime_type.startswith("image"):
-                            emoji = self.categories["image"]
-                        elif mime_type.startswith("audio"):
-                            emoji = self.categories["audio"]
-                        elif mime_type.startswith("video"):
-                            emoji = self.categories["video"]
-                        elif mime_type.startswith("text"):
-                            emoji = self.categories["document"]
-                        elif mime_type.startswith("application"):
-                            emoji = self.categories["other"]
+                    mime = magic.from_file(file_path, mime=True)
                 except Exception:
                     pass  # Silently fall back to extension-based detection
-
-            # Validate and sanitize the emoji
-            if is_valid_emoji(emoji):
-                return emoji
-            else:
-                # Fallback to a safe emoji
-                return "📄"
-
+            return self._emoji_for(os.path.basename(file_path), size, mime)
         except Exception:
-            # Final fallback
             return self.categories["other"]
 
     def get_file_info(self, file_path: str) -> Dict[str, Any]:
@@ -263,55 +464,19 @@ class EnhancedDirectoryTreeGenerator:
             "modified": None,
             "type": "unknown",
         }
-
         try:
-            # Check if file exists and is accessible
-            if not os.path.exists(file_path):
-                return info
-
-            info["is_dir"] = os.path.isdir(file_path)
-            info["emoji"] = self.get_file_emoji(file_path)
-
-            if not info["is_dir"]:
-                # Only try to get file info if it's a file and accessible
-                if os.access(file_path, os.R_OK):
-                    try:
-                        info["size"] = os.path.getsize(file_path)
-                    except (OSError, PermissionError):
-                        info["size"] = 0
-
-                    try:
-                        info["modified"] = datetime.fromtimestamp(
-                            os.path.getmtime(file_path)
-                        )
-                    except (OSError, PermissionError):
-                        info["modified"] = None
-
-                    # Get file type
-                    if MAGIC_AVAILABLE and magic:
-                        try:
-                            mime_type = magic.from_file(file_path, mime=True)
-                            info["type"] = mime_type
-                        except Exception:
-                            info["type"] = "unknown"
-                    else:
-                        # Fallback based on extension
-                        filename = os.path.basename(file_path).lower()
-                        if filename.endswith(".py"):
-                            info["type"] = "text/x-python"
-                        elif filename.endswith(".json"):
-                            info["type"] = "application/json"
-                        elif filename.endswith(".txt"):
-                            info["type"] = "text/plain"
-                        elif is_image_file(filename):
-                            info["type"] = "image"
-                        else:
-                            info["type"] = "unknown"
-
-        except Exception:
-            # Return safe defaults if anything goes wrong
-            pass
-
+            st = os.stat(file_path)
+        except OSError:
+            return info
+        info["is_dir"] = stat.S_ISDIR(st.st_mode)
+        if info["is_dir"]:
+            info["emoji"] = self.categories["directory"]
+            return info
+        info["size"] = st.st_size
+        info["modified"] = datetime.fromtimestamp(st.st_mtime)
+        info["type"] = _MimeSampler(samples_per_ext=1).detect(file_path)
+        mime = info["type"] if "/" in info["type"] else None
+        info["emoji"] = self._emoji_for(info["name"], st.st_size, mime)
         return info
 
     @auto_cleanup
@@ -324,6 +489,7 @@ class EnhancedDirectoryTreeGenerator:
         current_depth: int = 0,
         include_stats: bool = True,
         include_file_info: bool = False,
+        max_workers: Optional[int] = None,
     ) -> Tuple[str, Dict[str, Any]]:
         """
         Generate a tree structure starting from the root path.
@@ -336,172 +502,183 @@ class EnhancedDirectoryTreeGenerator:
             current_depth: Current depth level
             include_stats: Whether to include statistics
             include_file_info: Whether to include detailed file information
+            max_workers: Threads scanning directories concurrently
 
         Returns:
             Tuple of (tree_string, statistics_dict)
         """
-        print_info(
-            f"DEBUG: generate_tree called for {root_path} at depth {current_depth}"
-        )
+        buffer = io.StringIO()
         with memory_context("Directory Tree Generation"):
-            if ignore_patterns is None:
-                ignore_patterns = [
-                    ".git",
-                    "__pycache__",
-                    "node_modules",
-                    ".idea",
-                    ".vscode",
-                    ".DS_Store",
-                    "Thumbs.db",
-                    "*.tmp",
-                    "*.temp",
-                ]
-
-            # Reset statistics
-            if include_stats:
-                self.stats = {
-                    "total_files": 0,
-                    "total_dirs": 0,
-                    "total_size": 0,
-                    "file_types": {},
-                    "largest_files": [],
-                    "recent_files": [],
-                }
-
-            output = []
-            root_path = os.path.abspath(root_path)
-            print_info(f"DEBUG: About to list directory {root_path}")
+            stats = self.write_tree(
+                root_path,
+                buffer,
+                prefix=prefix,
+                ignore_patterns=ignore_patterns,
+                max_depth=max_depth,
+                current_depth=current_depth,
+                include_stats=include_stats,
+                include_file_info=include_file_info,
+                max_workers=max_workers,
+            )
+        return buffer.getvalue(), stats
 
-            try:
-                items = os.listdir(root_path)
-                print_info(f"DEBUG: Found {len(items)} items in {root_path}")
-            except PermissionError:
-                print_info(f"DEBUG: Permission denied for {root_path}")
-                return f"{prefix}└── ⛔ Permission Denied\n", self.stats
+    def collect_statistics(
+        self,
+        root_path: str,
+        ignore_patterns: Optional[List[str]] = None,
+        max_depth: int = -1,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Walk a tree for statistics only, without rendering any lines."""
+        return self.write_tree(
+            root_path,
+            None,
+            ignore_patterns=ignore_patterns,
+            max_depth=max_depth,
+            include_stats=True,
+            max_workers=max_workers,
+        )
 
-            # Sort items (directories first, then alphabetically)
-            try:
-                items.sort(
-                    key=lambda x: (
-                        not os.path.isdir(os.path.join(root_path, x)),
-                        x.lower(),
-                    )
-                )
-                print_info(f"DEBUG: Sorted {len(items)} items")
-            except Exception:
-                # If sorting fails, just use alphabetical order
-                items.sort(key=lambda x: x.lower())
-                print_info(f"DEBUG: Used fallback sorting for {len(items)} items")
-
-            # Filter ignored items
-            items = [
-                item
-                for item in items
-                if not any(pattern in item for pattern in ignore_patterns)
-            ]
-            print_info(f"DEBUG: After filtering, {len(items)} items remain")
+    def write_tree(
+        self,
+        root_path: str,
+        out: Optional[TextIO],
+        prefix: str = "",
+        ignore_patterns: Optional[List[str]] = None,
+        max_depth: int = -1,
+        current_depth: int = 0,
+        include_stats: bool = True,
+        include_file_info: bool = False,
+        max_workers: Optional[int] = None,
+        line_filter: Optional[Callable[[str], str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Stream tree lines to `out` (None for statistics only) and return stats.
 
-            # Process items without complex progress tracking
-            for index, item in enumerate(items):
-                try:
-                    print_info(f"DEBUG: Processing item {index+1}/{len(items)}: {item}")
-                    item_path = os.path.join(root_path, item)
-                    is_last_item = index == len(items) - 1
-
-                    current_prefix = "└── " if is_last_item else "├── "
-                    next_prefix = "    " if is_last_item else "│   "
-
-                    # Check if item still exists (it might have been deleted)
-                    if not os.path.exists(item_path):
-                        print_info(f"DEBUG: Item no longer exists: {item_path}")
-                        continue
-
-                    if os.path.isdir(item_path):
-                        # Directory
-                        print_info(f"DEBUG: Processing directory: {item}")
-                        emoji = self.get_file_emoji(item_path)
-                        output.append(f"{prefix}{current_prefix}{emoji} {item}\n")
-
-                        if include_stats:
-                            self.stats["total_dirs"] += 1
-
-                        # Recursively process subdirectories
-                        if max_depth == -1 or current_depth < max_depth:
-                            try:
-                                print_info(f"DEBUG: Recursing into {item_path}")
-                                sub_tree, _ = self.generate_tree(
-                                    item_path,
-                                    prefix + next_prefix,
-                                    ignore_patterns,
-                                    max_depth,
-                                    current_depth + 1,
-                                    include_stats=False,  # Don't double-count
-                                    include_file_info=include_file_info,
-                                )
-                                output.append(sub_tree)
-                                print_info(
-                                    f"DEBUG: Completed recursion for {item_path}"
-                                )
-                            except Exception as e:
-                                # If subdirectory processing fails, add error indicator
-                                print_info(
-                                    f"DEBUG: Error in subdirectory {item_path}: {e}"
-                                )
-                                output.append(
-                                    f"{prefix}{next_prefix}└── ⚠️ Error processing subdirectory\n"
-                                )
-                    else:
-                        # File
-                        print_info(f"DEBUG: Processing file: {item}")
-                        try:
-                            file_info = self.get_file_info(item_path)
-                            emoji = file_info["emoji"]
-
-                            if include_file_info:
-                                size_str = self.format_file_size(file_info["size"])
-                                output.append(
-                                    f"{prefix}{current_prefix}{emoji} {item} ({size_str})\n"
-                                )
-                            else:
-                                output.append(
-                                    f"{prefix}{current_prefix}{emoji} {item}\n"
-                                )
-
-                            # Update statistics
-                            if include_stats:
-                                self.stats["total_files"] += 1
-                                self.stats["total_size"] += file_info["size"]
-
-                                # Track file types
-                                file_type = file_info["type"]
-                                if file_type not in self.stats["file_types"]:
-                                    self.stats["file_types"][file_type] = 0
-                                self.stats["file_types"][file_type] += 1
-
-                                # Track largest files
-                                self.stats["largest_files"].append(
-                                    (item_path, file_info["size"])
-                                )
-
-                                # Track recent files
-                                if file_info["modified"]:
-                                    self.stats["recent_files"].append(
-                                        (item_path, file_info["modified"])
-                                    )
-                        except Exception as e:
-                            # If file processing fails, add error indicator
-                            print_info(f"DEBUG: Error processing file {item_path}: {e}")
-                            output.append(
-                                f"{prefix}{current_prefix}⚠️ {item} (Error processing)\n"
-                            )
-
-                except Exception as e:
-                    # Skip this item if there's any error
-                    print_info(f"DEBUG: Skipping item {item} due to error: {e}")
-                    continue
-
-            print_info(f"DEBUG: Completed processing {root_path}")
-            return "".join(output), self.stats
+        Directories are listed with os.scandir on a bounded thread pool: when a
+        directory is rendered, all of its subdirectories are queued for
+        scanning, so siblings are read while the first subtree is written.
+        Sizes and mtimes come from one stat per file, done in parallel chunks
+        for very large directories and skipped entirely when neither stats nor
+        file info are requested.
+
+        Args:
+            line_filter: Optional transform applied to each line before writing
+                (e.g. JSON string escaping)
+        """
+        if ignore_patterns is None:
+            ignore_patterns = list(DEFAULT_IGNORE_PATTERNS)
+        ignore_re = _compile_ignore_patterns(ignore_patterns)
+        need_stat = include_stats or include_file_info
+        stats = TreeStats()
+        mime = _MimeSampler()
+        write = None
+        if out is not None:
+            write = out.write if line_filter is None else (
+                lambda line: out.write(line_filter(line))
+            )
+        workers = max_workers or DEFAULT_TREE_WORKERS
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            root = pool.submit(
+                _scan_directory, os.path.abspath(root_path), ignore_re, need_stat
+            )
+            self._render_directory(
+                pool,
+                root,
+                prefix,
+                current_depth,
+                max_depth,
+                ignore_re,
+                need_stat,
+                include_stats,
+                include_file_info,
+                write,
+                stats,
+                mime,
+            )
+        self.stats = stats.to_dict() if include_stats else {}
+        return self.stats
+
+    def _render_directory(
+        self,
+        pool: ThreadPoolExecutor,
+        listing_future: Future,
+        prefix: str,
+        depth: int,
+        max_depth: int,
+        ignore_re: Optional[Pattern],
+        need_stat: bool,
+        include_stats: bool,
+        include_file_info: bool,
+        write: Optional[Callable[[str], Any]],
+        stats: "TreeStats",
+        mime: "_MimeSampler",
+    ) -> None:
+        listing = listing_future.result()
+        if listing.error is not None:
+            if write:
+                write(f"{prefix}└── ⛔ Permission Denied\n")
+            return
+        files = listing.files
+        if listing.unstatted:
+            chunks = [
+                listing.unstatted[i : i + STAT_CHUNK_SIZE]
+                for i in range(0, len(listing.unstatted), STAT_CHUNK_SIZE)
+            ]
+            for chunk in pool.map(_stat_entries, chunks):
+                files.extend(chunk)
+        files.sort(key=lambda f: f[0].lower())
+        if not listing.dirs and not files:
+            stats.empty_directories += 1
+
+        recurse = max_depth == -1 or depth < max_depth
+        children = [
+            (
+                name,
+                pool.submit(_scan_directory, path, ignore_re, need_stat)
+                if recurse and not is_link
+                else None,
+            )
+            for name, path, is_link in listing.dirs
+        ]
+        total = len(children) + len(files)
+        dir_emoji = self.categories["directory"]
+        for index, (name, child) in enumerate(children):
+            last = index == total - 1
+            if write:
+                write(f"{prefix}{'└── ' if last else '├── '}{dir_emoji} {name}\n")
+            stats.total_dirs += 1
+            if child is not None:
+                self._render_directory(
+                    pool,
+                    child,
+                    prefix + ("    " if last else "│   "),
+                    depth + 1,
+                    max_depth,
+                    ignore_re,
+                    need_stat,
+                    include_stats,
+                    include_file_info,
+                    write,
+                    stats,
+                    mime,
+                )
+        offset = len(children)
+        for index, (name, path, size, mtime) in enumerate(files, offset):
+            file_type = mime.detect(path) if (include_stats or MAGIC_AVAILABLE) else None
+            if include_stats:
+                stats.add_file(path, name, size or 0, mtime, file_type)
+            if write:
+                emoji = self._emoji_for(
+                    name, size, file_type if file_type and "/" in file_type else None
+                )
+                branch = "└── " if index == total - 1 else "├── "
+                if include_file_info:
+                    write(
+                        f"{prefix}{branch}{emoji} {name} ({self.format_file_size(size or 0)})\n"
+                    )
+                else:
+                    write(f"{prefix}{branch}{emoji} {name}\n")
 
     def format_file_size(self, size_bytes: int) -> str:
         """Format file size in human-readable format."""
@@ -603,6 +780,59 @@ class EnhancedDirectoryTreeGenerator:
             print_error(f"❌ Error saving JSON file: {e}")
             return ""
 
+    def _stream_to_file(self, root_path, output_path, writer, tree_kwargs) -> str:
+        # Written under a temporary name (hidden from the scan) and renamed when complete
+        part_path = output_path + ".part"
+        ignore = tree_kwargs.get("ignore_patterns")
+        ignore = list(DEFAULT_IGNORE_PATTERNS if ignore is None else ignore)
+        tree_kwargs = dict(
+            tree_kwargs, ignore_patterns=ignore + [os.path.basename(part_path)]
+        )
+        try:
+            with open(part_path, "w", encoding="utf-8") as f:
+                writer(f, tree_kwargs)
+            os.replace(part_path, output_path)
+            return output_path
+        except Exception as e:
+            print_error(f"❌ Error writing {output_path}: {e}")
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            return ""
+
+    def stream_tree_to_markdown(
+        self, root_path: str, output_path: str, **tree_kwargs
+    ) -> str:
+        """Walk root_path and stream the tree and statistics straight into a markdown file."""
+
+        def writer(f, kwargs):
+            f.write(f"# Directory Tree for: {os.path.abspath(root_path)}\n\n")
+            f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            f.write("## Tree Structure\n\n```\n")
+            stats = self.write_tree(root_path, f, **kwargs)
+            f.write("```\n\n")
+            if stats:
+                f.write("## Statistics\n\n")
+                f.write(self.generate_statistics_report(stats))
+                f.write("\n")
+
+        return self._stream_to_file(root_path, output_path, writer, tree_kwargs)
+
+    def stream_tree_to_json(self, root_path: str, output_path: str, **tree_kwargs) -> str:
+        """Walk root_path and stream a JSON document with the same keys as save_tree_to_json."""
+
+        def writer(f, kwargs):
+            f.write("{\n")
+            f.write(f'  "generated_at": {json.dumps(datetime.now().isoformat())},\n')
+            f.write('  "tree_output": "')
+            stats = self.write_tree(
+                root_path, f, line_filter=lambda line: json.dumps(line)[1:-1], **kwargs
+            )
+            f.write('",\n  "statistics": ')
+            f.write(json.dumps(stats, default=str))
+            f.write("\n}\n")
+
+        return self._stream_to_file(root_path, output_path, writer, tree_kwargs)
+
 
 def generate_directory_tree(
     root_path: str,
@@ -642,58 +872,53 @@ def generate_directory_tree(
     print_header("🌳 Enhanced Directory Tree Generator", color=Mocha.lavender)
 
     generator = EnhancedDirectoryTreeGenerator()
-
-    # Generate tree
-    tree_output, stats = generator.generate_tree(
-        root_path=root_path,
+    tree_kwargs = dict(
         ignore_patterns=ignore_patterns,
         max_depth=max_depth,
         include_stats=include_stats,
         include_file_info=include_file_info,
     )
 
-    # Format output
     if output_format == "console":
+        tree_output, stats = generator.generate_tree(root_path=root_path, **tree_kwargs)
         output = f"Directory Tree for: {os.path.abspath(root_path)}\n\n"
         output += tree_output
 
         if include_stats and stats:
             output += "\n" + generator.generate_statistics_report(stats)
 
-    elif output_format == "markdown":
-        output_path = os.path.join(root_path, "directory_tree.md")
-        saved_path = generator.save_tree_to_markdown(tree_output, stats, output_path)
-        if saved_path:
-            output = f"✅ Directory tree saved to: {saved_path}"
-            print_success(output)
+    elif output_format in ("markdown", "json"):
+        # File outputs are streamed while walking instead of built as one string
+        if output_format == "markdown":
+            output_path = os.path.join(root_path, "directory_tree.md")
+            saved_path = generator.stream_tree_to_markdown(
+                root_path, output_path, **tree_kwargs
+            )
         else:
-            output = "❌ Failed to save markdown file"
-
-    elif output_format == "json":
-        output_path = os.path.join(root_path, "directory_tree.json")
-        saved_path = generator.save_tree_to_json(tree_output, stats, output_path)
+            output_path = os.path.join(root_path, "directory_tree.json")
+            saved_path = generator.stream_tree_to_json(
+                root_path, output_path, **tree_kwargs
+            )
+        stats = generator.stats
         if saved_path:
             output = f"✅ Directory tree saved to: {saved_path}"
             print_success(output)
         else:
-            output = "❌ Failed to save JSON file"
+            output = f"❌ Failed to save {output_format} file"
 
     else:
         output = "❌ Invalid output format"
+        stats = {}
 
     return output, stats
 
 
 def quick_tree_generation():
     """Quick directory tree generation with default settings."""
-    print_info("DEBUG: About to call print_header")
     print_header("🌳 Quick Directory Tree Generation", color=Mocha.sapphire)
-    print_info("DEBUG: After print_header")
 
     # Simple input without complex utilities
-    print_info("DEBUG: About to call input")
     root_path = input("📁 Enter directory path: ").strip()
-    print_info("DEBUG: After input")
     if not root_path:
         print_warning("❌ No path specified. Operation cancelled.")
         return
@@ -895,9 +1120,7 @@ def tree_statistics_analysis():
         print_info("🔄 Analyzing directory statistics...")
 
         generator = EnhancedDirectoryTreeGenerator()
-        tree_output, stats = generator.generate_tree(
-            root_path=root_path, include_stats=True, include_file_info=True
-        )
+        stats = generator.collect_statistics(root_path)
 
         # Display statistics
         print_info("\n" + generator.generate_statistics_report(stats))
@@ -942,9 +1165,7 @@ def compare_directories():
 
         for path in paths:
             try:
-                tree_output, stats = generator.generate_tree(
-                    root_path=path, include_stats=True, include_file_info=False
-                )
+                stats = generator.collect_statistics(path)
                 results.append((path, stats))
                 print_success(f"✅ Analyzed: {path}")
             except Exception as e:
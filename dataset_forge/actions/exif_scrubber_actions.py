@@ -38,9 +38,10 @@ def scrub_exif_single_folder(
                     stderr=subprocess.PIPE,
                 )
             count += 1
-            log_operation("exif_scrub", f"Scrubbed EXIF from {fpath}")
+            log_operation("exif_scrub", f"Scrubbed EXIF from {fpath}", path=fpath)
         except Exception as e:
             failed.append(fname)
+            log_operation("exif_scrub", f"Failed: {e}", path=fpath, outcome="error")
     
     print_success(f"EXIF scrubbing complete! Processed {count} images.")
     play_done_sound()
@@ -0,0 +1,216 @@
+"""
+Built-in batch extractors for the Dataset Forge feature store.
+
+Each extractor receives a batch of image paths and returns one row per path
+(or None where the image could not be analyzed, so failures are never stored).
+See ``dataset_forge.utils.feature_store`` for the store and ``register_feature``.
+Model-backed features load their model once per process, on first use.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from dataset_forge.utils.feature_store import register_feature
+from dataset_forge.utils.lazy_imports import numpy_as_np as np
+from dataset_forge.utils.parallel_utils import prefetch_map
+
+QUALITY_COLUMNS = ("sharpness", "contrast", "brightness", "noise", "artifacts")
+COMPLEXITY_COLUMNS = (
+    "edge_density",
+    "texture_complexity",
+    "color_variety",
+    "structural_complexity",
+)
+PYIQA_METRICS = ("niqe", "brisque", "musiq", "hyperiqa", "topiq_nr")
+CLIP_MODEL = ("ViT-B-32", "laion2b_s34b_b79k")
+
+_models: Dict[str, Any] = {}
+_models_lock = threading.Lock()
+
+
+def _device() -> str:
+    from dataset_forge.utils.lazy_imports import torch
+
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def _cached_model(key: str, factory):
+    with _models_lock:
+        if key not in _models:
+            _models[key] = factory()
+        return _models[key]
+
+
+def _decode_rgb(path: str) -> Optional["np.ndarray"]:
+    from PIL import Image
+
+    try:
+        with Image.open(path) as img:
+            return np.asarray(img.convert("RGB"))
+    except Exception:
+        return None
+
+
+def _map_arrays(func, paths: List[str]) -> List[Optional[Sequence[Any]]]:
+    """Decode each path and apply func on a thread pool (None for unreadable images)."""
+
+    def work(path):
+        array = _decode_rgb(path)
+        return None if array is None else func(array)
+
+    return [row for _, row in prefetch_map(work, paths)]
+
+
+@register_feature("quality", version="1", columns=QUALITY_COLUMNS)
+def quality_features(paths: List[str]) -> List[Optional[Sequence[float]]]:
+    """Sharpness, contrast, brightness, noise and artifacts (sample_prioritization.QualityAnalyzer)."""
+    from dataset_forge.utils.sample_prioritization import QualityAnalyzer
+
+    analyzer = _cached_model("quality", QualityAnalyzer)
+    return _map_arrays(
+        lambda a: [analyzer.analyze_quality_array(a)[c] for c in QUALITY_COLUMNS], paths
+    )
+
+
+@register_feature("complexity", version="1", columns=COMPLEXITY_COLUMNS)
+def complexity_features(paths: List[str]) -> List[Optional[Sequence[float]]]:
+    """Edge density, texture, color variety and structure (ComplexityAnalyzer)."""
+    from dataset_forge.utils.sample_prioritization import ComplexityAnalyzer
+
+    analyzer = _cached_model("complexity", ComplexityAnalyzer)
+    return _map_arrays(
+        lambda a: [analyzer.analyze_complexity_array(a)[c] for c in COMPLEXITY_COLUMNS],
+        paths,
+    )
+
+
+def _register_hash(name: str, func_name: str) -> None:
+    @register_feature(name, version="1", columns=("hash",), dtype="uint64", batch_size=256)
+    def hash_feature(paths: List[str]) -> List[Optional[Sequence[int]]]:
+        import imagehash
+        from PIL import Image
+
+        func = getattr(imagehash, func_name)
+
+        def work(path):
+            try:
+                with Image.open(path) as img:
+                    return [int(str(func(img)), 16)]
+            except Exception:
+                return None
+
+        return [row for _, row in prefetch_map(work, paths)]
+
+    hash_feature.__doc__ = f"64-bit perceptual hash (imagehash.{func_name})."
+
+
+for _name, _func_name in (
+    ("phash", "phash"),
+    ("dhash", "dhash"),
+    ("ahash", "average_hash"),
+    ("whash", "whash"),
+):
+    _register_hash(_name, _func_name)
+
+
+def hash_from_int(value: int):
+    """Turn a stored 64-bit hash back into an imagehash.ImageHash."""
+    import imagehash
+
+    return imagehash.hex_to_hash(f"{int(value):016x}")
+
+
+def _register_pyiqa(metric: str) -> None:
+    @register_feature(f"pyiqa_{metric}", version="1", columns=("score",), batch_size=32)
+    def pyiqa_feature(paths: List[str]) -> List[Optional[Sequence[float]]]:
+        from dataset_forge.actions.quality_scoring_actions import score_paths_with_pyiqa
+
+        scores = score_paths_with_pyiqa(
+            paths, model_name=metric, device=_device(), use_cache=False
+        )
+        return [[scores[p]] if p in scores else None for p in paths]
+
+    pyiqa_feature.__doc__ = f"pyiqa '{metric}' score."
+
+
+for _metric in PYIQA_METRICS:
+    _register_pyiqa(_metric)
+
+
+@register_feature("bhi", version="1", columns=("blockiness", "hyperiqa", "ic9600"), batch_size=16)
+def bhi_features(paths: List[str]) -> List[Optional[Sequence[float]]]:
+    """Blockiness, HyperIQA and IC9600 complexity, as used by BHI filtering."""
+    from dataset_forge.actions.bhi_filtering_actions import calculate_image_blockiness, ic9600
+    from dataset_forge.utils.lazy_imports import torch
+
+    device = _device()
+    hyper = _cached_model(
+        "hyperiqa", lambda: __import__("pyiqa").create_metric("hyperiqa", device=device)
+    )
+    ic_model = _cached_model("ic9600", lambda: ic9600(device=device))
+    if ic_model is None:
+        raise RuntimeError("IC9600 model could not be loaded")
+
+    rows: List[Optional[Sequence[float]]] = []
+    with torch.no_grad():
+        for path, array in prefetch_map(_decode_rgb, paths):
+            if array is None:
+                rows.append(None)
+                continue
+            try:
+                tensor = (
+                    torch.from_numpy(np.ascontiguousarray(array))
+                    .permute(2, 0, 1)
+                    .unsqueeze(0)
+                    .float()
+                    .div(255.0)
+                    .to(device)
+                )
+                rows.append(
+                    [
+                        float(calculate_image_blockiness(tensor).flatten()[0]),
+                        float(torch.as_tensor(hyper(tensor)).flatten()[0]),
+                        float(ic_model.get_onlu_score(tensor).flatten()[0]),
+                    ]
+                )
+            except Exception:
+                rows.append(None)
+    return rows
+
+
+@register_feature("clip", version="-".join(CLIP_MODEL), columns=512, batch_size=64)
+def clip_features(paths: List[str]) -> List[Optional[Sequence[float]]]:
+    """CLIP image embeddings (the ViT-B-32 model used by visual de-duplication)."""
+    from PIL import Image
+
+    from dataset_forge.utils.lazy_imports import torch
+
+    device = _device()
+
+    def load():
+        import open_clip
+
+        model, _, preprocess = open_clip.create_model_and_transforms(
+            CLIP_MODEL[0], pretrained=CLIP_MODEL[1]
+        )
+        return model.to(device).eval(), preprocess
+
+    model, preprocess = _cached_model(f"clip_{device}", load)
+
+    def prepare(path):
+        try:
+            with Image.open(path) as img:
+                return preprocess(img.convert("RGB"))
+        except Exception:
+            return None
+
+    prepared = [tensor for _, tensor in prefetch_map(prepare, paths)]
+    valid = [i for i, t in enumerate(prepared) if t is not None]
+    rows: List[Optional[Sequence[float]]] = [None] * len(paths)
+    if valid:
+        with torch.no_grad():
+            batch = torch.stack([prepared[i] for i in valid]).to(device)
+            embeddings = model.encode_image(batch).float().cpu().numpy()
+        for i, embedding in zip(valid, embeddings):
+            rows[i] = embedding
+    return rows
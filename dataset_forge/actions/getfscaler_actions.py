@@ -22,6 +22,7 @@ from dataset_forge.utils.printing import (
 from dataset_forge.utils.audio_utils import play_done_sound, play_error_sound
 from dataset_forge.utils.memory_utils import clear_memory, clear_cuda_cache
 from dataset_forge.utils.color import Mocha
+from dataset_forge.utils.result_cache import FileResultCache, run_cached_batch
 
 
 @dataclass
@@ -280,22 +281,33 @@ class GetfScalerIntegration:
 class BatchGetfScaler:
     """Batch processing capabilities for getfscaler."""
 
-    def __init__(self, exe_path: str = "getfscaler.exe", max_workers: int = 4):
+    def __init__(self, exe_path: str = "getfscaler.exe", max_workers: int = 4,
+                 use_cache: bool = True):
         self.scaler = GetfScalerIntegration(exe_path)
         self.max_workers = max_workers
+        self.cache = FileResultCache("getfscaler") if use_cache else None
 
     def analyze_directory(self,
                          directory: str,
                          file_patterns: List[str] = ["*.png", "*.jpg", "*.jpeg", "*.mp4", "*.mkv"],
                          native_height: float = 720.0,
+                         results_file: Optional[str] = None,
+                         resume: bool = True,
                          **kwargs) -> Dict[str, Dict]:
         """
         Analyze all matching files in a directory.
 
+        Up to ``max_workers`` getfscaler processes run concurrently. Results are
+        cached by file content hash + analysis parameters, and streamed to
+        ``results_file`` (JSONL) as they complete so an interrupted scan can be
+        resumed.
+
         Args:
             directory: Directory to scan
             file_patterns: List of file patterns to match
             native_height: Target native height
+            results_file: Optional JSONL file to stream results to
+            resume: Skip files already present in results_file
             **kwargs: Additional arguments for analyze_image
 
         Returns:
@@ -305,30 +317,32 @@ class BatchGetfScaler:
         if not directory_path.exists():
             raise FileNotFoundError(f"Directory not found: {directory}")
 
-        # Find all matching files
+        # Find all matching files (patterns may overlap)
         files = []
         for pattern in file_patterns:
             files.extend(directory_path.glob(pattern))
+        files = sorted(set(files))
 
         if not files:
             print_warning(f"No files found matching patterns: {file_patterns}")
             return {}
 
-        print_info(f"Found {len(files)} files to analyze...")
-
-        # Process files sequentially (getfscaler is CPU intensive)
-        results = {}
-        for i, file in enumerate(files, 1):
-            try:
-                print_info(f"Analyzing {i}/{len(files)}: {file.name}")
-                result = self.scaler.analyze_image(str(file), native_height=native_height, **kwargs)
-                results[str(file)] = result
-                print_success(f"✓ Analyzed: {file.name}")
-            except Exception as e:
-                print_error(f"✗ Failed to analyze {file.name}: {e}")
-                results[str(file)] = {'error': str(e), 'success': False}
-
-        return results
+        print_info(f"Found {len(files)} files to analyze with {self.max_workers} workers...")
+
+        def analyze(path: str) -> Dict:
+            return self.scaler.analyze_image(path, native_height=native_height, **kwargs)
+
+        cache_args = {'tool': 'getfscaler', 'native_height': native_height, **kwargs}
+        return run_cached_batch(
+            files,
+            analyze,
+            cache=self.cache,
+            cache_args=cache_args,
+            results_file=results_file,
+            resume=resume,
+            max_workers=self.max_workers,
+            desc="getfscaler",
+        )
 
     def save_batch_results(self, results: Dict[str, Dict], output_file: str):
         """Save batch analysis results to JSON file."""
@@ -513,20 +527,31 @@ def find_native_resolution_getfscaler(image_path, lq_path=None, extra_args=None)
     print_info("🔧 getfscaler workflow finished.")
 
 
-def batch_analyze_getfscaler(directory_path, output_file=None, **kwargs):
+def batch_analyze_getfscaler(directory_path, output_file=None, results_file=None,
+                             max_workers=None, resume=True, **kwargs):
     """
     Batch analyze multiple files using getfscaler.
     
     Args:
         directory_path: Directory containing files to analyze
         output_file: Optional output file for results
+        results_file: Optional JSONL file streamed during the scan (defaults to
+            output_file with a .jsonl extension when output_file is given)
+        max_workers: Concurrent getfscaler processes (defaults to config max_workers)
+        resume: Resume an interrupted scan from results_file
         **kwargs: Additional arguments for getfscaler
     """
     print_header("🔧 Batch getfscaler Analysis", color=Mocha.yellow)
     
     try:
-        batch_scaler = BatchGetfScaler("getfscaler.exe")
-        results = batch_scaler.analyze_directory(directory_path, **kwargs)
+        if max_workers is None:
+            max_workers = ConfigManager.load_config().max_workers
+        if results_file is None and output_file:
+            results_file = str(Path(output_file).with_suffix('.jsonl'))
+        batch_scaler = BatchGetfScaler("getfscaler.exe", max_workers=max_workers)
+        results = batch_scaler.analyze_directory(
+            directory_path, results_file=results_file, resume=resume, **kwargs
+        )
         
         if output_file:
             batch_scaler.save_batch_results(results, output_file)
@@ -9,101 +9,229 @@ from dataset_forge.utils.memory_utils import clear_memory, clear_cuda_cache
 from dataset_forge.utils.printing import print_success
 from dataset_forge.utils.audio_utils import play_done_sound
 from dataset_forge.utils.color import Mocha
+from dataset_forge.utils.result_cache import (
+    FileResultCache,
+    file_sha256,
+    run_cached_batch,
+)
 
 
-def find_native_resolution(image_path, lq_path=None, extra_args=None):
-    """
-    Runs getnative on the given image (and optionally LQ image) and prints the output or error.
+_NATIVE_CACHES = {}
+
+
+def _native_cache(tool):
+    """Return the shared on-disk result cache for a native-resolution tool."""
+    if tool not in _NATIVE_CACHES:
+        _NATIVE_CACHES[tool] = FileResultCache(tool)
+    return _NATIVE_CACHES[tool]
+
+
+def _run_tool(cmd, timeout):
+    """Run an external analysis tool and return a JSON-serializable result dict."""
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except Exception as e:
+        return {"success": False, "stdout": "", "stderr": str(e)}
+    return {
+        "success": result.returncode == 0 and bool(result.stdout.strip()),
+        "stdout": result.stdout.strip(),
+        "stderr": result.stderr.strip(),
+    }
+
+
+def _cached_run(tool, image_path, cache_args, runner, use_cache):
+    """Look up a tool result by file hash + args, running the tool on a miss."""
+    if not use_cache:
+        return runner()
+    cache = _native_cache(tool)
+    try:
+        key = cache.make_key(image_path, cache_args)
+    except OSError:
+        return runner()
+    cached = cache.get(key)
+    if cached is not None:
+        return dict(cached, cached=True)
+    result = runner()
+    if result.get("success"):
+        cache.set(key, result)
+    return result
+
+
+def run_getnative(image_path, lq_path=None, extra_args=None, use_cache=True):
     """
-    from dataset_forge.utils.printing import print_info, print_error
-    from dataset_forge.utils.audio_utils import play_error_sound
-    import sys
+    Run getnative non-interactively, reusing cached results for unchanged files.
 
-    print_info("[DEBUG] Running getnative (VapourSynth) native resolution detection...")
+    Returns:
+        dict: {"success", "stdout", "stderr"} (plus "cached" on a cache hit)
+    """
     cmd = [sys.executable, "-m", "getnative"]
     if extra_args:
         cmd.extend(extra_args)
     cmd.append(image_path)
     if lq_path:
         cmd.append(lq_path)
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-        if result.returncode == 0 and result.stdout.strip():
-            print_info(f"getnative output:\n{result.stdout.strip()}")
-        elif result.stderr.strip():
-            print_error(f"getnative error: {result.stderr.strip()}")
-            play_error_sound()
-        else:
-            print_error("getnative returned no output and no error message.")
-            play_error_sound()
-    except Exception as e:
-        print_error(f"[getnative] Exception: {e}")
-        play_error_sound()
-    print_info("[DEBUG] getnative workflow finished.")
-    play_done_sound()
+        # The LQ file takes part in the key, so a changed LQ invalidates the entry
+        use_cache = use_cache and os.path.exists(lq_path)
+    cache_args = {
+        "tool": "getnative",
+        "extra_args": list(extra_args or []),
+        "lq": file_sha256(lq_path) if lq_path and use_cache else None,
+    }
+    return _cached_run(
+        "getnative", image_path, cache_args, lambda: _run_tool(cmd, 60), use_cache
+    )
 
 
-def find_native_resolution_resdet(image_path, extra_args=None):
-    """
-    Runs resdet on the given image and prints the output or error.
-    Uses WSL if on Windows, otherwise runs natively.
-    """
+def _resdet_command(image_path, extra_args=None):
+    """Build the resdet command line, going through WSL on Windows."""
     import shutil
-    import subprocess
-    from dataset_forge.utils.printing import print_info, print_error
-    from dataset_forge.utils.audio_utils import play_error_sound
-
-    print_info(f"[DEBUG] Running resdet on: {image_path}")
-    is_windows = platform.system().lower() == "windows"
 
-    def to_wsl_path(win_path):
-        # Convert C:/Users/... to /mnt/c/Users/...
-        if win_path[1:3] == ":/" or win_path[1:3] == ":\\":
-            drive = win_path[0].lower()
-            rest = win_path[2:].replace("\\", "/")
-            return f"/mnt/{drive}{rest}"
-        return win_path
-
-    if is_windows:
-        wsl_exe = shutil.which("wsl")
-        if not wsl_exe:
-            print_error(
+    if platform.system().lower() == "windows":
+        if not shutil.which("wsl"):
+            raise FileNotFoundError(
                 "WSL is not installed or not in PATH. Please install WSL and resdet in your WSL environment."
             )
-            play_error_sound()
-            return
-        wsl_image_path = to_wsl_path(image_path)
+        # Convert C:/Users/... to /mnt/c/Users/...
+        if image_path[1:3] == ":/" or image_path[1:3] == ":\\":
+            drive = image_path[0].lower()
+            rest = image_path[2:].replace("\\", "/")
+            image_path = f"/mnt/{drive}{rest}"
         cmd = ["wsl", "resdet"]
-        if extra_args:
-            cmd.extend(extra_args)
-        cmd.append(wsl_image_path)
     else:
         resdet_path = shutil.which("resdet")
         if not resdet_path:
-            print_error("resdet not found in PATH.")
-            play_error_sound()
-            return
+            raise FileNotFoundError("resdet not found in PATH.")
         cmd = [resdet_path]
-        if extra_args:
-            cmd.extend(extra_args)
-        cmd.append(image_path)
+    if extra_args:
+        cmd.extend(extra_args)
+    cmd.append(image_path)
+    return cmd
+
+
+def run_resdet(image_path, extra_args=None, use_cache=True):
+    """
+    Run resdet non-interactively, reusing cached results for unchanged files.
+
+    Returns:
+        dict: {"success", "stdout", "stderr"} (plus "cached" on a cache hit)
+    """
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        if result.returncode == 0 and result.stdout.strip():
-            print_info(f"resdet output:\n{result.stdout.strip()}")
-        elif result.stderr.strip():
-            print_error(f"resdet error: {result.stderr.strip()}")
-            play_error_sound()
-        else:
-            print_error("resdet returned no output and no error message.")
-            play_error_sound()
-    except Exception as e:
-        print_error(f"[resdet] Exception: {e}")
+        cmd = _resdet_command(image_path, extra_args)
+    except FileNotFoundError as e:
+        return {"success": False, "stdout": "", "stderr": str(e)}
+    cache_args = {"tool": "resdet", "extra_args": list(extra_args or [])}
+    return _cached_run(
+        "resdet", image_path, cache_args, lambda: _run_tool(cmd, 30), use_cache
+    )
+
+
+def _report_tool_result(tool, result):
+    """Print a tool result the way the interactive workflows always have."""
+    from dataset_forge.utils.printing import print_info, print_error
+    from dataset_forge.utils.audio_utils import play_error_sound
+
+    if result["success"]:
+        suffix = " (cached)" if result.get("cached") else ""
+        print_info(f"{tool} output{suffix}:\n{result['stdout']}")
+    elif result["stderr"]:
+        print_error(f"{tool} error: {result['stderr']}")
         play_error_sound()
+    else:
+        print_error(f"{tool} returned no output and no error message.")
+        play_error_sound()
+
+
+def find_native_resolution(image_path, lq_path=None, extra_args=None):
+    """
+    Runs getnative on the given image (and optionally LQ image) and prints the output or error.
+    """
+    from dataset_forge.utils.printing import print_info
+
+    print_info("[DEBUG] Running getnative (VapourSynth) native resolution detection...")
+    _report_tool_result("getnative", run_getnative(image_path, lq_path, extra_args))
+    print_info("[DEBUG] getnative workflow finished.")
+    play_done_sound()
+
+
+def find_native_resolution_resdet(image_path, extra_args=None):
+    """
+    Runs resdet on the given image and prints the output or error.
+    Uses WSL if on Windows, otherwise runs natively.
+    """
+    from dataset_forge.utils.printing import print_info
+
+    print_info(f"[DEBUG] Running resdet on: {image_path}")
+    _report_tool_result("resdet", run_resdet(image_path, extra_args))
     print_info("[DEBUG] resdet workflow finished.")
     play_done_sound()
 
 
+@monitor_all("batch_find_native_resolution", critical_on_error=False)
+def batch_find_native_resolution(
+    directory,
+    tool="getnative",
+    extra_args=None,
+    results_file=None,
+    resume=True,
+    max_workers=4,
+    retry_failed=True,
+):
+    """
+    Run getnative or resdet over every image in a directory.
+
+    Up to ``max_workers`` tool processes run at once. Results are cached by file
+    hash + tool args and streamed to ``results_file`` (JSONL) as they complete,
+    so an interrupted scan resumes where it stopped.
+
+    Args:
+        directory: Folder of images to analyze
+        tool: "getnative" or "resdet"
+        extra_args: Extra command-line arguments for the tool
+        results_file: Optional JSONL output file
+        resume: Skip files already recorded in results_file
+        max_workers: Maximum concurrent tool processes
+        retry_failed: On resume, re-run files whose recorded run failed
+
+    Returns:
+        dict: Mapping of image path to tool result
+    """
+    from dataset_forge.utils.printing import print_info, print_warning
+    from dataset_forge.utils.file_utils import is_image_file
+
+    runners = {
+        "getnative": lambda path: run_getnative(path, extra_args=extra_args, use_cache=False),
+        "resdet": lambda path: run_resdet(path, extra_args=extra_args, use_cache=False),
+    }
+    if tool not in runners:
+        raise ValueError(f"Unknown native resolution tool: {tool}")
+
+    files = sorted(
+        os.path.join(directory, f) for f in os.listdir(directory) if is_image_file(f)
+    )
+    if not files:
+        print_warning(f"No images found in {directory}")
+        return {}
+
+    print_info(f"Analyzing {len(files)} images with {tool} ({max_workers} workers)...")
+    results = run_cached_batch(
+        files,
+        runners[tool],
+        cache=_native_cache(tool),
+        cache_args={"tool": tool, "extra_args": list(extra_args or [])},
+        results_file=results_file,
+        resume=resume,
+        max_workers=max_workers,
+        desc=tool,
+        retry_failed=retry_failed,
+    )
+    succeeded = sum(1 for r in results.values() if r.get("success"))
+    print_success(f"{tool}: {succeeded}/{len(results)} images analyzed successfully")
+    if results_file:
+        print_info(f"Results streamed to: {results_file}")
+    play_done_sound()
+    return results
+
+
 def find_native_resolution_getfnative(image_path, lq_path=None, extra_args=None):
     """
     Runs GetFnative on the given image (and optionally LQ image) and prints the output or error.
@@ -232,6 +360,14 @@ clip = core.imwri.Read(r"{abs_image_path}", float_output=True)
 clip.set_output(0)
 """
 
+        # Reuse an identical script from a previous run instead of rewriting it
+        if abs_vpy_path.exists():
+            try:
+                if abs_vpy_path.read_text(encoding="utf-8") == vpy_content:
+                    return str(abs_vpy_path)
+            except OSError:
+                pass
+
         # Write VPY script
         with open(abs_vpy_path, "w", encoding="utf-8") as f:
             f.write(vpy_content)
@@ -0,0 +1,251 @@
+"""
+Headless step adapters for the Dataset Forge job runner.
+
+Each adapter wraps an existing non-interactive action so it can be chained
+from a job file (see ``dataset_forge.utils.job_runner``). Adapters read
+``input_dir``, write into ``output_dir`` and never prompt. Filtering steps
+(dedup, BHI) hardlink the images they keep instead of copying them, and the
+heavy modules (torch, DPID backends) are only imported when their step runs.
+"""
+
+import os
+from typing import Dict, List, Optional
+
+from dataset_forge.utils.file_utils import is_image_file, transfer_files
+from dataset_forge.utils.job_runner import register_step
+from dataset_forge.utils.printing import print_info, print_warning
+
+DPID_METHODS = ("umzi", "phhofm", "basicsr", "openmmlab")
+
+
+def _list_images(folder: str) -> List[str]:
+    with os.scandir(folder) as it:
+        return sorted(e.name for e in it if e.is_file() and is_image_file(e.name))
+
+
+def _transfer_images(
+    input_dir: str, output_dir: str, names: List[str], operation: str = "link"
+) -> None:
+    """Hardlink (or copy) the named images from input_dir into output_dir."""
+    results = transfer_files(
+        [(os.path.join(input_dir, n), os.path.join(output_dir, n)) for n in names],
+        operation=operation,
+        desc=f"{operation.title()}ing {len(names)} images",
+    )
+    failed = {dest: r["error"] for dest, r in results.items() if r["error"]}
+    if failed:
+        dest, error = next(iter(failed.items()))
+        raise RuntimeError(f"{len(failed)} file(s) could not be written, e.g. {dest}: {error}")
+
+
+def _warn_errors(action: str, errors) -> None:
+    if not errors:
+        return
+    print_warning(f"{action}: {len(errors)} image(s) failed")
+    for path, error in errors[:5]:
+        print_warning(f"  {path}: {error}")
+
+
+@register_step("sanitize")
+def sanitize_step(
+    input_dir: str,
+    output_dir: str,
+    fix_corruption: bool = False,
+    icc_to_srgb: bool = False,
+    remove_alpha: bool = False,
+    strip_metadata: bool = False,
+    to_png: bool = False,
+    oxipng: bool = False,
+    batch_rename: bool = False,
+    max_workers: Optional[int] = None,
+) -> None:
+    """Streaming sanitize pipeline (see sanitize_images_actions.SanitizeSteps)."""
+    from dataset_forge.actions.sanitize_images_actions import (
+        SanitizeSteps,
+        plan_sanitize_outputs,
+        run_sanitize_pipeline,
+    )
+
+    steps = SanitizeSteps(
+        fix_corruption=fix_corruption,
+        icc_to_srgb=icc_to_srgb,
+        remove_alpha=remove_alpha,
+        strip_metadata=strip_metadata,
+        to_png=to_png,
+        oxipng=oxipng,
+    )
+    jobs = plan_sanitize_outputs([(input_dir, output_dir)], batch_rename, to_png)
+    _, errors = run_sanitize_pipeline(jobs, steps, max_workers=max_workers)
+    _warn_errors("sanitize", errors)
+
+
+@register_step("resave")
+def resave_step(
+    input_dir: str,
+    output_dir: str,
+    output_format: str = "png",
+    grayscale: bool = False,
+    quality: int = 95,
+    lossless: bool = True,
+) -> None:
+    """Re-encode every image to output_format."""
+    from dataset_forge.actions.resave_images_actions import resave_images
+
+    _, _, failed = resave_images(
+        input_dir,
+        output_dir,
+        output_format=output_format,
+        grayscale=grayscale,
+        quality=quality,
+        lossless=lossless,
+    )
+    if failed:
+        print_warning(f"resave: {failed} image(s) failed")
+
+
+@register_step("dedup")
+def dedup_step(
+    input_dir: str, output_dir: str, hash_func: str = "phash", max_distance: int = 0
+) -> None:
+    """
+    Keep one image per (near-)duplicate group.
+
+    Args:
+        hash_func: phash, dhash, ahash or whash
+        max_distance: 0 for identical hashes, otherwise the Hamming distance
+            within which images count as near-duplicates
+    """
+    from dataset_forge.actions.de_dupe_actions import (
+        compute_hashes,
+        find_duplicates,
+        find_near_duplicates,
+    )
+
+    hashes = compute_hashes(input_dir, hash_func)
+    if max_distance > 0:
+        groups = find_near_duplicates(hashes, max_distance)
+    else:
+        groups = find_duplicates(hashes)
+    dropped = set()
+    for group in groups:
+        dropped.update(sorted(group)[1:])
+    keep = [n for n in _list_images(input_dir) if n not in dropped]
+    print_info(f"dedup: {len(groups)} duplicate group(s), dropping {len(dropped)} image(s)")
+    _transfer_images(input_dir, output_dir, keep)
+
+
+@register_step("dpid")
+def dpid_step(
+    input_dir: str, output_dir: str, method: str = "basicsr", scale: float = 0.5, **params
+) -> str:
+    """
+    DPID downscale by one scale factor.
+
+    Extra params are passed to the method's ``run_<method>_dpid_single_folder``
+    (e.g. lambd, kernel_size, sigma).
+
+    Returns:
+        The ``<pct>pct`` subfolder the method writes to.
+    """
+    if method not in DPID_METHODS:
+        raise ValueError(f"Unknown DPID method '{method}'. Use one of {DPID_METHODS}")
+    import dataset_forge.dpid as dpid
+
+    run = getattr(dpid, f"run_{method}_dpid_single_folder")
+    run(input_dir, output_dir, [float(scale)], overwrite=True, **params)
+    return os.path.join(output_dir, f"{int(float(scale) * 100)}pct")
+
+
+@register_step("tile")
+def tile_step(
+    input_dir: str,
+    output_dir: str,
+    tile_size: int = 512,
+    func_type: str = "laplacian",
+    process_type: str = "thread",
+    **params,
+) -> None:
+    """Best-tile extraction (laplacian or ic9600 complexity)."""
+    from dataset_forge.actions.tiling_actions import tile_single_folder
+
+    tile_single_folder(
+        input_dir,
+        output_dir,
+        tile_size=tile_size,
+        process_type=process_type,
+        func_type=func_type,
+        **params,
+    )
+
+
+@register_step("bhi_filter")
+def bhi_filter_step(
+    input_dir: str,
+    output_dir: str,
+    preset: str = "moderate",
+    thresholds: Optional[Dict[str, float]] = None,
+    batch_size: int = 8,
+    rejected_folder: Optional[str] = None,
+) -> None:
+    """
+    Keep the images that pass BHI filtering (blockiness, HyperIQA, IC9600).
+
+    Images are hardlinked into output_dir and the rejected ones are removed
+    from there (or moved to rejected_folder), so input_dir is left untouched.
+    """
+    from dataset_forge.actions.bhi_filtering_actions import (
+        get_bhi_preset_thresholds,
+        run_bhi_filtering,
+    )
+
+    _transfer_images(input_dir, output_dir, _list_images(input_dir))
+    run_bhi_filtering(
+        input_path=output_dir,
+        thresholds=thresholds or get_bhi_preset_thresholds(preset),
+        action="move" if rejected_folder else "delete",
+        batch_size=batch_size,
+        move_folder=rejected_folder,
+    )
+
+
+@register_step("degrade")
+def degrade_step(input_dir: str, output_dir: str, degradation: str = "blur", **params) -> None:
+    """
+    Apply one degradation from degradations_actions (blur, noise, compress...).
+
+    Extra params are passed to ``apply_<degradation>_degradation``.
+    """
+    from dataset_forge.actions import degradations_actions
+
+    apply = getattr(degradations_actions, f"apply_{degradation}_degradation", None)
+    if apply is None:
+        raise ValueError(f"Unknown degradation '{degradation}'")
+    apply(input_dir, output_dir, in_place=False, **params)
+
+
+@register_step("optimize_png")
+def optimize_png_step(
+    input_dir: str,
+    output_dir: str,
+    level: int = 4,
+    strip: Optional[str] = "safe",
+    alpha: bool = True,
+    timeout: Optional[float] = None,
+) -> None:
+    """Copy the images (reflinked where supported) and oxipng the PNGs."""
+    from dataset_forge.utils.png_optimizer import (
+        OxipngOptions,
+        format_optimization_report,
+        optimize_pngs,
+    )
+
+    names = _list_images(input_dir)
+    _transfer_images(input_dir, output_dir, names, operation="copy")
+    pngs = [os.path.join(output_dir, n) for n in names if n.lower().endswith(".png")]
+    report = optimize_pngs(
+        pngs,
+        OxipngOptions(level=level, strip=strip, alpha=alpha, timeout=timeout),
+        use_index=False,
+    )
+    print_info(f"[oxipng] {format_optimization_report(report)}")
+    _warn_errors("optimize_png", report["failed"])
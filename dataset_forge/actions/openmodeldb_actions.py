@@ -5,10 +5,8 @@ Handles API integration, caching, filtering, download, and verification for Open
 
 import os
 import json
-import hashlib
 import requests
 import re
-from tqdm import tqdm
 from dataset_forge.utils.printing import (
     print_info,
     print_success,
@@ -21,6 +19,7 @@ import webbrowser
 from dataset_forge.utils.monitoring import monitor_all, task_registry
 from dataset_forge.utils.memory_utils import clear_memory, clear_cuda_cache
 from dataset_forge.utils.printing import print_success
+from dataset_forge.utils.download_utils import compute_file_sha256, download_files
 
 OPENMODELDB_API_URL = "https://openmodeldb.info/api/v1/models.json"
 
@@ -139,16 +138,24 @@ def get_resource_filename(resource, model_details):
 
 @monitor_all("Download Model", critical_on_error=True)
 def download_model(
-    model_details: dict, models_dir: str, verify_sha256: bool = False
+    model_details: dict,
+    models_dir: str,
+    verify_sha256: bool = False,
+    max_workers: int = 4,
 ) -> None:
     """
     Downloads the model file(s) to the models directory, with progress bar and optional SHA256 verification.
     Always prompts for confirmation before downloading. If file exists but SHA256 fails, prompts to overwrite.
     Handles Google Drive, OneDrive, and direct links.
+
+    Direct links are hashed while streaming, resume interrupted ``.part`` files
+    and, for multi-resource models, download concurrently (up to ``max_workers``).
+    With ``verify_sha256`` a checksum mismatch discards the download.
     """
     import os
 
     os.makedirs(models_dir, exist_ok=True)
+    direct_jobs = []
     for resource in model_details.get("resources", []):
         url = resource["urls"][0]
         filename = get_resource_filename(resource, model_details)
@@ -194,6 +201,13 @@ def download_model(
                     continue
                 print_info(f"Downloading from Google Drive: {filename}")
                 gdown.download(id=gdrive_id, output=dest_path, quiet=False)
+                play_done_sound()
+                print_success(f"Downloaded: {filename}")
+                if verify_sha256 and sha256:
+                    if verify_file_sha256(dest_path, sha256):
+                        print_success("SHA256 verified.")
+                    else:
+                        print_error("SHA256 verification failed!")
             elif is_onedrive_url(url):
                 print_warning("Automatic OneDrive downloads are not supported.")
                 print_warning(
@@ -202,43 +216,50 @@ def download_model(
                 webbrowser.open(url)
                 continue
             else:
-                print_info(f"Downloading: {filename}")
-                with requests.get(url, stream=True, timeout=30) as r:
-                    r.raise_for_status()
-                    total = int(r.headers.get("content-length", 0))
-                    with open(dest_path, "wb") as f, tqdm(
-                        total=total, unit="B", unit_scale=True, desc=filename
-                    ) as pbar:
-                        for chunk in r.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                pbar.update(len(chunk))
-            play_done_sound()
-            print_success(f"Downloaded: {filename}")
-            # Optionally verify SHA256
-            if verify_sha256 and sha256:
-                if verify_file_sha256(dest_path, sha256):
-                    print_success("SHA256 verified.")
-                else:
-                    print_error("SHA256 verification failed!")
+                # Direct links are collected and downloaded together below
+                direct_jobs.append(
+                    {
+                        "url": url,
+                        "dest_path": dest_path,
+                        "sha256": sha256 if verify_sha256 else None,
+                        "expected": sha256,
+                    }
+                )
         except Exception as e:
             print_error(f"Download failed: {e}")
 
+    if not direct_jobs:
+        return
+    print_info(f"Downloading {len(direct_jobs)} file(s)...")
+    results = download_files(direct_jobs, max_workers=max_workers)
+    for job in direct_jobs:
+        filename = os.path.basename(job["dest_path"])
+        outcome = results[job["dest_path"]]
+        if outcome["error"]:
+            print_error(f"Download failed: {filename}: {outcome['error']}")
+            continue
+        print_success(f"Downloaded: {filename}")
+        if job["expected"]:
+            if outcome["sha256"] == job["expected"].lower():
+                print_success(f"SHA256 verified: {filename}")
+            else:
+                print_warning(f"SHA256 does not match the published hash: {filename}")
+    play_done_sound()
+
 
 def verify_file_sha256(filepath: str, expected_hash: str) -> bool:
     """
     Verifies the SHA256 hash of a file.
+
+    The digest is cached in a ``.sha256.json`` sidecar keyed by file size and
+    mtime, so repeat checks of an unchanged checkpoint do not re-read it.
     Args:
         filepath: Path to file
         expected_hash: Expected SHA256 hash
     Returns:
         True if matches, False otherwise
     """
-    h = hashlib.sha256()
-    with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest().lower() == expected_hash.lower()
+    return compute_file_sha256(filepath) == expected_hash.lower()
 
 
 @monitor_all("Test Model", critical_on_error=True)
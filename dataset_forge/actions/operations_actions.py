@@ -1,7 +1,7 @@
 import os
 import shutil
 import random
-from subprocess import CalledProcessError
+import time
 from dataset_forge.utils.progress_utils import tqdm
 from dataset_forge.utils.file_utils import (
     is_image_file,
@@ -9,10 +9,22 @@ from dataset_forge.utils.file_utils import (
     IMAGE_TYPES,
 )
 from dataset_forge.utils.input_utils import (
+    ask_float,
     get_pairs_to_process,
     get_file_operation_choice,
     get_destination_path,
 )
+from dataset_forge.utils.pair_utils import matching_pair_names
+from dataset_forge.utils.png_optimizer import (
+    OxipngOptions,
+    format_optimization_report,
+    optimize_pngs,
+)
+from dataset_forge.utils.file_journal import (
+    FileOp,
+    list_incomplete_journals,
+    run_file_operations,
+)
 import logging
 from collections import Counter, defaultdict
 import concurrent.futures
@@ -58,26 +70,92 @@ from dataset_forge.utils.lazy_imports import (
 )
 
 
+def _reserve_unique_path(dest_dir, filename, reserved):
+    """get_unique_filename that also avoids names already planned in this batch."""
+    base, ext = os.path.splitext(filename)
+    candidate = filename
+    counter = 1
+    while (dest_dir, candidate) in reserved or os.path.exists(
+        os.path.join(dest_dir, candidate)
+    ):
+        candidate = f"{base}_{counter}{ext}"
+        counter += 1
+    reserved.add((dest_dir, candidate))
+    return os.path.join(dest_dir, candidate)
+
+
+def plan_pair_operations(
+    filenames, hq_folder, lq_folder, operation, dest_hq_folder=None, dest_lq_folder=None
+):
+    """
+    Plan journaled file operations for HQ/LQ pairs.
+
+    Args:
+        operation: "copy" or "move" into the destination folders; anything else
+            ("remove", "inplace") deletes the pair.
+    Returns:
+        List of (filename, [hq FileOp, lq FileOp]).
+    """
+    reserved = set()
+    planned = []
+    for filename in filenames:
+        hq_path = os.path.join(hq_folder, filename)
+        lq_path = os.path.join(lq_folder, filename)
+        if operation in ("copy", "move"):
+            ops = [
+                FileOp(
+                    operation,
+                    hq_path,
+                    _reserve_unique_path(dest_hq_folder, filename, reserved),
+                ),
+                FileOp(
+                    operation,
+                    lq_path,
+                    _reserve_unique_path(dest_lq_folder, filename, reserved),
+                ),
+            ]
+        else:
+            ops = [FileOp("delete", hq_path), FileOp("delete", lq_path)]
+        planned.append((filename, ops))
+    return planned
+
+
+def run_pair_operations(planned, label):
+    """
+    Execute planned pair operations through the file journal.
+
+    Returns:
+        (filenames of fully processed pairs, list of error messages)
+    """
+    ops = [op for _, pair_ops in planned for op in pair_ops]
+    if not ops:
+        return [], []
+    try:
+        summary = run_file_operations(ops, label=label)
+    except (ValueError, OSError) as e:
+        return [], [f"Could not plan {label}: {e}"]
+    failed = {id(op): message for op, message in summary["failed_ops"]}
+    errors = []
+    processed = []
+    for filename, pair_ops in planned:
+        messages = [failed[id(op)] for op in pair_ops if id(op) in failed]
+        if messages:
+            errors.append(f"Error processing {filename}: {messages[0]}")
+        else:
+            processed.append(filename)
+    if summary["state"] != "completed":
+        print_warning(
+            f"{label} did not finish; its journal was kept at {summary['journal']}. "
+            "Use 'Resume/Roll Back Interrupted Operation' to finish or undo it."
+        )
+    return processed, errors
+
+
+
 def split_dataset_in_half(hq_folder, lq_folder):
     print_header("Splitting Dataset in Half", "=", Mocha.lavender)
 
-    hq_files = sorted(
-        [
-            f
-            for f in os.listdir(hq_folder)
-            if os.path.isfile(os.path.join(hq_folder, f)) and is_image_file(f)
-        ]
-    )
-    lq_files = sorted(
-        [
-            f
-            for f in os.listdir(lq_folder)
-            if os.path.isfile(os.path.join(lq_folder, f)) and is_image_file(f)
-        ]
-    )
-
-    # Find matching pairs
-    matching_files = [f for f in hq_files if f in lq_files]
+    matching_files = matching_pair_names(hq_folder, lq_folder)
 
     if not matching_files:
         print_warning("No matching HQ/LQ pairs found.")
@@ -122,84 +200,36 @@ def split_dataset_in_half(hq_folder, lq_folder):
         )
         print_warning("If you intended to move files, please choose 'copy' or 'move'.")
 
-    # Process first half
-    print_info(
-        f"\nProcessing first half ({len(first_half_files)} pairs) using {operation}..."
-    )
-    processed_first_half = 0
-    errors_first_half = []
-    if operation != "inplace":
-        for filename in tqdm(
-            first_half_files, desc=f"{operation.capitalize()}ing First Half"
-        ):
-            hq_src = os.path.join(hq_folder, filename)
-            lq_src = os.path.join(lq_folder, filename)
-
-            try:
-                hq_dest = os.path.join(
-                    output_dir_1_hq, get_unique_filename(output_dir_1_hq, filename)
-                )
-                lq_dest = os.path.join(
-                    output_dir_1_lq, get_unique_filename(output_dir_1_lq, filename)
-                )
-                if operation == "copy":
-                    shutil.copy2(hq_src, hq_dest)
-                    shutil.copy2(lq_src, lq_dest)
-                elif operation == "move":
-                    shutil.move(hq_src, hq_dest)
-                    shutil.move(lq_src, lq_dest)
-                processed_first_half += 1
-            except Exception as e:
-                errors_first_half.append(
-                    f"Error {operation}ing pair {filename} to split_1: {e}"
-                )
-    else:  # Inplace, just count
-        processed_first_half = len(first_half_files)
-
-    # Process second half
-    print_info(
-        f"\nProcessing second half ({len(second_half_files)} pairs) using {operation}..."
-    )
-    processed_second_half = 0
-    errors_second_half = []
+    processed_first_half = len(first_half_files)
+    processed_second_half = len(second_half_files)
+    errors = []
     if operation != "inplace":
-        for filename in tqdm(
-            second_half_files, desc=f"{operation.capitalize()}ing Second Half"
-        ):
-            hq_src = os.path.join(hq_folder, filename)
-            lq_src = os.path.join(lq_folder, filename)
-
-            try:
-                hq_dest = os.path.join(
-                    output_dir_2_hq, get_unique_filename(output_dir_2_hq, filename)
-                )
-                lq_dest = os.path.join(
-                    output_dir_2_lq, get_unique_filename(output_dir_2_lq, filename)
-                )
-                if operation == "copy":
-                    shutil.copy2(hq_src, hq_dest)
-                    shutil.copy2(lq_src, lq_dest)
-                elif operation == "move":
-                    # Important: If moving, source files for second half might have been moved
-                    # if they were also part of the first_half_files source during the 'move' operation.
-                    # This logic assumes source folders (hq_folder, lq_folder) are not modified by the first half's 'move'.
-                    # If 'move' is from original, ensure files are still there.
-                    # However, typical use of 'move' here is to move *from* original *to* new split folders.
-                    if os.path.exists(hq_src) and os.path.exists(lq_src):
-                        shutil.move(hq_src, hq_dest)
-                        shutil.move(lq_src, lq_dest)
-                    else:
-                        errors_second_half.append(
-                            f"Source file {filename} already moved or missing for second half."
-                        )
-                        continue  # Skip if source is gone
-                processed_second_half += 1
-            except Exception as e:
-                errors_second_half.append(
-                    f"Error {operation}ing pair {filename} to split_2: {e}"
-                )
-    else:  # Inplace, just count
-        processed_second_half = len(second_half_files)
+        print_info(
+            f"\n{operation.capitalize()}ing {len(first_half_files)} + {len(second_half_files)} pairs into split_1/split_2..."
+        )
+        # Both halves go into one journal so an interruption can be resumed or rolled back as a whole
+        first_planned = plan_pair_operations(
+            first_half_files,
+            hq_folder,
+            lq_folder,
+            operation,
+            output_dir_1_hq,
+            output_dir_1_lq,
+        )
+        second_planned = plan_pair_operations(
+            second_half_files,
+            hq_folder,
+            lq_folder,
+            operation,
+            output_dir_2_hq,
+            output_dir_2_lq,
+        )
+        processed, errors = run_pair_operations(
+            first_planned + second_planned, f"Split dataset ({operation})"
+        )
+        processed = set(processed)
+        processed_first_half = len(processed.intersection(first_half_files))
+        processed_second_half = len(processed.intersection(second_half_files))
 
     print_success("\nSplit in half operation complete.")
     if operation == "inplace":
@@ -210,34 +240,16 @@ def split_dataset_in_half(hq_folder, lq_folder):
         print_info(
             f"Total processed into first half: {processed_first_half}, into second half: {processed_second_half}"
         )
-        if errors_first_half or errors_second_half:
+        if errors:
             print_error("Errors encountered during split:")
-            for e in errors_first_half:
-                print_error(f"  - {e}")
-            for e in errors_second_half:
+            for e in errors:
                 print_error(f"  - {e}")
 
 
 def remove_pairs_by_count_percentage(hq_folder, lq_folder):
     print_header("Remove Pairs by Count/Percentage", "=", Mocha.lavender)
 
-    hq_files = sorted(
-        [
-            f
-            for f in os.listdir(hq_folder)
-            if os.path.isfile(os.path.join(hq_folder, f)) and is_image_file(f)
-        ]
-    )
-    lq_files = sorted(
-        [
-            f
-            for f in os.listdir(lq_folder)
-            if os.path.isfile(os.path.join(lq_folder, f)) and is_image_file(f)
-        ]
-    )
-
-    # Find matching pairs
-    matching_files = [f for f in hq_files if f in lq_files]
+    matching_files = matching_pair_names(hq_folder, lq_folder)
 
     if not matching_files:
         print_warning("No matching HQ/LQ pairs found.")
@@ -326,43 +338,11 @@ def remove_pairs_by_count_percentage(hq_folder, lq_folder):
         f"\nPerforming '{action_verb}' operation on {len(pairs_to_remove_names)} pairs..."
     )
 
-    processed_count = 0
-    errors = []
-
-    for filename in tqdm(
-        pairs_to_remove_names, desc=f"{action_verb.capitalize()}ing Pairs"
-    ):
-        hq_path = os.path.join(hq_folder, filename)
-        lq_path = os.path.join(lq_folder, filename)
-
-        try:
-            if operation == "move":
-                hq_dest = os.path.join(
-                    dest_hq_folder, get_unique_filename(dest_hq_folder, filename)
-                )
-                lq_dest = os.path.join(
-                    dest_lq_folder, get_unique_filename(dest_lq_folder, filename)
-                )
-                shutil.move(hq_path, hq_dest)
-                shutil.move(lq_path, lq_dest)
-            elif operation == "copy":
-                hq_dest = os.path.join(
-                    dest_hq_folder, get_unique_filename(dest_hq_folder, filename)
-                )
-                lq_dest = os.path.join(
-                    dest_lq_folder, get_unique_filename(dest_lq_folder, filename)
-                )
-                shutil.copy2(hq_path, hq_dest)
-                shutil.copy2(lq_path, lq_dest)
-            else:  # remove
-                os.remove(hq_path)
-                os.remove(lq_path)
-
-            processed_count += 1
-
-        except Exception as e:
-            error_msg = f"Error processing {filename}: {e}"
-            errors.append(error_msg)
+    planned = plan_pair_operations(
+        pairs_to_remove_names, hq_folder, lq_folder, operation, dest_hq_folder, dest_lq_folder
+    )
+    processed, errors = run_pair_operations(planned, "Remove pairs by count")
+    processed_count = len(processed)
 
     # Summary
     print_info("\n" + "-" * 30)
@@ -391,21 +371,7 @@ def remove_pairs_by_count_percentage(hq_folder, lq_folder):
 def remove_pairs_by_size(hq_folder, lq_folder):
     print_header("Remove Pairs by File Size", "=", Mocha.lavender)
 
-    hq_files = sorted(
-        [
-            f
-            for f in os.listdir(hq_folder)
-            if os.path.isfile(os.path.join(hq_folder, f)) and is_image_file(f)
-        ]
-    )
-    lq_files = sorted(
-        [
-            f
-            for f in os.listdir(lq_folder)
-            if os.path.isfile(os.path.join(lq_folder, f)) and is_image_file(f)
-        ]
-    )
-    matching_files = [f for f in hq_files if f in lq_files]
+    matching_files = matching_pair_names(hq_folder, lq_folder)
 
     if not matching_files:
         print_warning("No matching HQ/LQ pairs found.")
@@ -518,41 +484,11 @@ def remove_pairs_by_size(hq_folder, lq_folder):
     print_info(f"Found {len(pairs_to_remove)} pairs meeting size criteria.")
 
     # Process the pairs
-    processed_count = 0
-    errors = []
-
-    for filename in tqdm(pairs_to_remove, desc=f"{action_verb.capitalize()}ing Pairs"):
-        hq_path = os.path.join(hq_folder, filename)
-        lq_path = os.path.join(lq_folder, filename)
-
-        try:
-            if operation == "move":
-                hq_dest = os.path.join(
-                    dest_hq_folder, get_unique_filename(dest_hq_folder, filename)
-                )
-                lq_dest = os.path.join(
-                    dest_lq_folder, get_unique_filename(dest_lq_folder, filename)
-                )
-                shutil.move(hq_path, hq_dest)
-                shutil.move(lq_path, lq_dest)
-            elif operation == "copy":
-                hq_dest = os.path.join(
-                    dest_hq_folder, get_unique_filename(dest_hq_folder, filename)
-                )
-                lq_dest = os.path.join(
-                    dest_lq_folder, get_unique_filename(dest_lq_folder, filename)
-                )
-                shutil.copy2(hq_path, hq_dest)
-                shutil.copy2(lq_path, lq_dest)
-            else:  # remove
-                os.remove(hq_path)
-                os.remove(lq_path)
-
-            processed_count += 1
-
-        except Exception as e:
-            error_msg = f"Error processing {filename}: {e}"
-            errors.append(error_msg)
+    planned = plan_pair_operations(
+        pairs_to_remove, hq_folder, lq_folder, operation, dest_hq_folder, dest_lq_folder
+    )
+    processed, errors = run_pair_operations(planned, "Remove pairs by size")
+    processed_count = len(processed)
 
     # Summary
     print_info("\n" + "-" * 30)
@@ -586,21 +522,7 @@ def remove_pairs_by_dimensions(hq_folder, lq_folder):
     print_info("  Remove Pairs by Dimensions")
     print_info("=" * 30)
 
-    hq_files_list = sorted(
-        [
-            f
-            for f in os.listdir(hq_folder)
-            if os.path.isfile(os.path.join(hq_folder, f)) and is_image_file(f)
-        ]
-    )
-    lq_files_list = sorted(
-        [
-            f
-            for f in os.listdir(lq_folder)
-            if os.path.isfile(os.path.join(lq_folder, f)) and is_image_file(f)
-        ]
-    )
-    matching_files = [f for f in hq_files_list if f in lq_files_list]
+    matching_files = matching_pair_names(hq_folder, lq_folder)
 
     if not matching_files:
         print_warning("No matching HQ/LQ pairs found.")
@@ -797,40 +719,11 @@ def remove_pairs_by_dimensions(hq_folder, lq_folder):
             f"Note: Skipped {len(skipped_due_error)} pairs due to errors reading image dimensions."
         )
 
-    processed_count = 0
-    errors = []
-
-    for filename in tqdm(
-        pairs_to_process_names, desc=f"{action_verb.capitalize()}ing Pairs by Dimension"
-    ):
-        hq_path = os.path.join(hq_folder, filename)
-        lq_path = os.path.join(lq_folder, filename)
-
-        try:
-            if operation == "move":
-                hq_dest = os.path.join(
-                    dest_hq_folder, get_unique_filename(dest_hq_folder, filename)
-                )
-                lq_dest = os.path.join(
-                    dest_lq_folder, get_unique_filename(dest_lq_folder, filename)
-                )
-                shutil.move(hq_path, hq_dest)
-                shutil.move(lq_path, lq_dest)
-            elif operation == "copy":
-                hq_dest = os.path.join(
-                    dest_hq_folder, get_unique_filename(dest_hq_folder, filename)
-                )
-                lq_dest = os.path.join(
-                    dest_lq_folder, get_unique_filename(dest_lq_folder, filename)
-                )
-                shutil.copy2(hq_path, hq_dest)
-                shutil.copy2(lq_path, lq_dest)
-            elif operation == "inplace":  # Actual deletion
-                os.remove(hq_path)
-                os.remove(lq_path)
-            processed_count += 1
-        except Exception as e:
-            errors.append(f"Error {action_verb}ing pair {filename}: {e}")
+    planned = plan_pair_operations(
+        pairs_to_process_names, hq_folder, lq_folder, operation, dest_hq_folder, dest_lq_folder
+    )
+    processed, errors = run_pair_operations(planned, "Remove pairs by dimensions")
+    processed_count = len(processed)
 
     print_info("\n" + "-" * 30)
     print_info("  Remove by Dimensions Summary")
@@ -861,21 +754,7 @@ def remove_pairs_by_dimensions(hq_folder, lq_folder):
 def remove_pairs_by_file_type(hq_folder, lq_folder):
     print_header("Remove Pairs by File Type", "=", Mocha.lavender)
 
-    hq_files_list = sorted(
-        [
-            f
-            for f in os.listdir(hq_folder)
-            if os.path.isfile(os.path.join(hq_folder, f)) and is_image_file(f)
-        ]
-    )
-    lq_files_list = sorted(
-        [
-            f
-            for f in os.listdir(lq_folder)
-            if os.path.isfile(os.path.join(lq_folder, f)) and is_image_file(f)
-        ]
-    )
-    matching_files = [f for f in hq_files_list if f in lq_files_list]
+    matching_files = matching_pair_names(hq_folder, lq_folder)
 
     if not matching_files:
         print_warning("No matching HQ/LQ pairs found.")
@@ -985,40 +864,11 @@ def remove_pairs_by_file_type(hq_folder, lq_folder):
         f"\nWill {action_verb} {len(pairs_to_process_names)} pairs where {target_choice} is of type '{file_type_to_remove_normalized}'."
     )
 
-    processed_count = 0
-    errors = []
-
-    for filename in tqdm(
-        pairs_to_process_names, desc=f"{action_verb.capitalize()}ing Pairs by File Type"
-    ):
-        hq_path = os.path.join(hq_folder, filename)
-        lq_path = os.path.join(lq_folder, filename)
-
-        try:
-            if operation == "move":
-                hq_dest = os.path.join(
-                    dest_hq_folder, get_unique_filename(dest_hq_folder, filename)
-                )
-                lq_dest = os.path.join(
-                    dest_lq_folder, get_unique_filename(dest_lq_folder, filename)
-                )
-                shutil.move(hq_path, hq_dest)
-                shutil.move(lq_path, lq_dest)
-            elif operation == "copy":
-                hq_dest = os.path.join(
-                    dest_hq_folder, get_unique_filename(dest_hq_folder, filename)
-                )
-                lq_dest = os.path.join(
-                    dest_lq_folder, get_unique_filename(dest_lq_folder, filename)
-                )
-                shutil.copy2(hq_path, hq_dest)
-                shutil.copy2(lq_path, lq_dest)
-            elif operation == "inplace":  # Actual deletion
-                os.remove(hq_path)
-                os.remove(lq_path)
-            processed_count += 1
-        except Exception as e:
-            errors.append(f"Error {action_verb}ing pair {filename}: {e}")
+    planned = plan_pair_operations(
+        pairs_to_process_names, hq_folder, lq_folder, operation, dest_hq_folder, dest_lq_folder
+    )
+    processed, errors = run_pair_operations(planned, "Remove pairs by file type")
+    processed_count = len(processed)
 
     print_info("\n" + "-" * 30)
     print_info(" Remove by File Type Summary")
@@ -1334,16 +1184,7 @@ def remove_small_image_pairs(hq_folder, lq_folder):
     checked_count = 0
     errors = []
 
-    lq_files = sorted(
-        [
-            f
-            for f in os.listdir(lq_folder)
-            if os.path.isfile(os.path.join(lq_folder, f)) and is_image_file(f)
-        ]
-    )
-    # Filter to only include pairs that exist in both folders
-    hq_files_set = set(os.listdir(hq_folder))
-    matching_files = [f for f in lq_files if f in hq_files_set and is_image_file(f)]
+    matching_files = matching_pair_names(hq_folder, lq_folder)
 
     print_info(f"Checking {len(matching_files)} HQ/LQ pairs...")
 
@@ -1440,18 +1281,7 @@ def extract_random_pairs(input_hq_folder, input_lq_folder):
         except ValueError:
             print_warning("Invalid input. Please enter an integer.")
 
-    hq_files = [
-        f
-        for f in os.listdir(input_hq_folder)
-        if os.path.isfile(os.path.join(input_hq_folder, f)) and is_image_file(f)
-    ]
-    lq_files = [
-        f
-        for f in os.listdir(input_lq_folder)
-        if os.path.isfile(os.path.join(input_lq_folder, f)) and is_image_file(f)
-    ]
-
-    available_pairs = [f for f in hq_files if f in lq_files]
+    available_pairs = matching_pair_names(input_hq_folder, input_lq_folder)
 
     if len(available_pairs) < num_pairs:
         print_warning(
@@ -1545,22 +1375,7 @@ def shuffle_image_pairs(hq_folder, lq_folder):
     print_info("  Shuffling Image Pairs (with Renaming)")
     print_info("=" * 30)
 
-    hq_files_list = sorted(
-        [
-            f
-            for f in os.listdir(hq_folder)
-            if os.path.isfile(os.path.join(hq_folder, f)) and is_image_file(f)
-        ]
-    )
-    lq_files_list = sorted(
-        [
-            f
-            for f in os.listdir(lq_folder)
-            if os.path.isfile(os.path.join(lq_folder, f)) and is_image_file(f)
-        ]
-    )
-
-    matching_files = [f for f in hq_files_list if f in lq_files_list]
+    matching_files = matching_pair_names(hq_folder, lq_folder)
 
     if not matching_files:
         print_warning("No matching HQ/LQ pairs found to shuffle.")
@@ -1616,203 +1431,36 @@ def shuffle_image_pairs(hq_folder, lq_folder):
 
     random.shuffle(original_pairs_info)  # Shuffle the list of dicts
 
-    # Generate new sequential names (e.g., 00001.ext, 00002.ext)
-    # The new name will use the original extension of the file it's being assigned to after shuffle.
-
-    processed_count = 0
-    errors = []
-
-    # Temporary renaming for inplace shuffle to avoid collisions
-    # (e.g. a.jpg -> 00001.jpg, b.jpg -> a.jpg - this would fail without temp)
-    temp_suffix = "_shuffletemp_" + str(
-        random.randint(10000, 99999)
-    )  # Unique temp suffix
-
-    # --- Stage 1: Copy or Move to destination (if not inplace), or rename to temp (if inplace) ---
-    # This list will hold info about files in their (potentially new) locations before final renaming.
-    files_in_final_location_for_renaming = []
-
-    print_info(f"\nStage 1: Preparing files for shuffling ({operation})...")
-    if operation == "inplace":
-        # Rename to temporary names in source folders
-        for idx, pair_info in enumerate(
-            tqdm(original_pairs_info, desc="Renaming to Temp (Inplace)")
-        ):
-            orig_name = pair_info["original_name"]
-            ext = pair_info["ext"]
-
-            hq_src_path = os.path.join(hq_folder, orig_name)
-            lq_src_path = os.path.join(lq_folder, orig_name)
-
-            # Create a unique temporary name that's unlikely to already exist or be a target name
-            temp_name_base = f"{idx:05d}{temp_suffix}"
-            hq_temp_path = os.path.join(hq_folder, temp_name_base + ext)
-            lq_temp_path = os.path.join(lq_folder, temp_name_base + ext)
-
-            try:
-                if os.path.exists(hq_src_path):
-                    os.rename(hq_src_path, hq_temp_path)
-                else:
-                    errors.append(f"Inplace-Temp: HQ Source {hq_src_path} not found.")
-                    continue
-                if os.path.exists(lq_src_path):
-                    os.rename(lq_src_path, lq_temp_path)
-                else:  # Rollback HQ rename if LQ fails
-                    os.rename(hq_temp_path, hq_src_path)
-                    errors.append(
-                        f"Inplace-Temp: LQ Source {lq_src_path} not found. HQ rename for {orig_name} rolled back."
-                    )
-                    continue
-
-                files_in_final_location_for_renaming.append(
-                    {
-                        "current_hq_path": hq_temp_path,
-                        "current_lq_path": lq_temp_path,
-                        "original_ext": ext,  # This is the extension of the file that will eventually get this slot's new name.
-                        # No, this should be the extension of THIS file.
-                        # The `original_pairs_info` is shuffled.
-                        # The new name (00001, 00002) will take *this* file's extension.
-                    }
-                )
-            except Exception as e:
-                errors.append(f"Error renaming {orig_name} to temporary: {e}")
-    else:  # "copy" or "move"
-        for pair_info in tqdm(
-            original_pairs_info, desc=f"{operation.capitalize()}ing to Destination"
-        ):
-            orig_name = pair_info["original_name"]
-            ext = pair_info["ext"]
-
-            hq_src_path = os.path.join(hq_folder, orig_name)
-            lq_src_path = os.path.join(lq_folder, orig_name)
-
-            # Destination files will initially keep their original names in the new location
-            # get_unique_filename is important if multiple source datasets could have same names.
-            # Here, `orig_name` is already unique within its source, so unique check is for destination.
-
-            # For shuffle, the crucial part is that the *pairing* based on original names is maintained
-            # during copy/move, and *then* they are renamed according to the shuffle order.
-            # The `original_pairs_info` is ALREADY shuffled.
-            # So, `pair_info` is for the file that will end up at a certain position in the shuffle.
-
-            # Let's re-think. `original_pairs_info` is a shuffled list of what *was* in the source.
-            # We need to copy/move these files using their original names, then rename them
-            # based on their new position in the `original_pairs_info` list.
-
-            # No, the current `pair_info` from `original_pairs_info` (which is shuffled) IS the file
-            # that should receive the (idx+1)th name.
-
-            # If copying/moving, the file `orig_name` is processed. Its new name will be based on its
-            # position in the shuffled list `original_pairs_info`.
-
-            # Correct approach for copy/move:
-            # Iterate 0 to N-1 for new names. `original_pairs_info[i]` is the original file that gets new name `i`.
-            # This is what the original script was closer to for copy/move.
-
-            # Let's stick to: `original_pairs_info` is shuffled. Iterate through it.
-            # Each item `pair_info` represents an original file.
-            # This file will be given a new name corresponding to its current index in the shuffled list.
-
-            hq_dest_path_initial = os.path.join(
-                output_hq_dir, get_unique_filename(output_hq_dir, orig_name)
-            )
-            lq_dest_path_initial = os.path.join(
-                output_lq_dir, get_unique_filename(output_lq_dir, orig_name)
-            )
-
-            try:
-                if operation == "copy":
-                    if os.path.exists(hq_src_path):
-                        shutil.copy2(hq_src_path, hq_dest_path_initial)
-                    else:
-                        errors.append(f"Copy: HQ Source {hq_src_path} not found.")
-                        continue
-                    if os.path.exists(lq_src_path):
-                        shutil.copy2(lq_src_path, lq_dest_path_initial)
-                    else:
-                        errors.append(f"Copy: LQ Source {lq_src_path} not found.")
-                        os.remove(hq_dest_path_initial)
-                        continue  # Clean up copied HQ
-                elif operation == "move":
-                    if os.path.exists(hq_src_path):
-                        shutil.move(hq_src_path, hq_dest_path_initial)
-                    else:
-                        errors.append(f"Move: HQ Source {hq_src_path} not found.")
-                        continue
-                    if os.path.exists(lq_src_path):
-                        shutil.move(lq_src_path, lq_dest_path_initial)
-                    else:  # This case is tricky for move, as HQ is already gone. Log error.
-                        errors.append(
-                            f"Move: LQ Source {lq_src_path} not found after HQ was moved. HQ is at {hq_dest_path_initial}."
-                        )
-                        continue
-
-                files_in_final_location_for_renaming.append(
-                    {
-                        "current_hq_path": hq_dest_path_initial,  # Path in the *new* directory
-                        "current_lq_path": lq_dest_path_initial,  # Path in the *new* directory
-                        "original_ext": ext,  # The extension of this specific file.
-                    }
-                )
-            except Exception as e:
-                errors.append(
-                    f"Error {operation}ing file {orig_name} to destination: {e}"
-                )
-
-    # --- Stage 2: Rename files (which are now in their final folders) to new sequential shuffled names ---
-    print_info(f"\nStage 2: Renaming files to final shuffled order...")
-    # `files_in_final_location_for_renaming` now contains paths to files that are
-    # either temp-named (inplace) or copied/moved to destination with original-ish names.
-    # The order of this list corresponds to the shuffled order.
-
-    for idx, file_detail in enumerate(
-        tqdm(files_in_final_location_for_renaming, desc="Final Renaming")
-    ):
-        # The new name is based on the index 'idx' in the shuffled list.
-        # The extension comes from the file itself (which was stored in 'original_ext' or can be derived).
-        current_hq_path = file_detail["current_hq_path"]
-        current_lq_path = file_detail["current_lq_path"]
-        # Get extension from current path, as original_ext might be from a different context if logic was mixed.
-        # Safest is to get ext from current_hq_path (assuming hq/lq share it)
-        ext_for_new_name = os.path.splitext(current_hq_path)[1]
-
-        new_name_base = f"{idx+1:05d}"  # e.g., 00001, 00002
-        final_hq_name = new_name_base + ext_for_new_name
-        final_lq_name = new_name_base + ext_for_new_name
-
-        # The directory for renaming is the directory of the current_path
-        final_hq_path = os.path.join(os.path.dirname(current_hq_path), final_hq_name)
-        final_lq_path = os.path.join(os.path.dirname(current_lq_path), final_lq_name)
-
-        try:
-            # Avoid renaming to itself if names collide due to prior unique naming, though unlikely with sequential.
-            if current_hq_path != final_hq_path:
-                # Ensure final path doesn't exist if we are not careful with get_unique_filename logic before.
-                # However, for sequential renaming, this should be fine.
-                if os.path.exists(final_hq_path):
-                    errors.append(
-                        f"Final Renaming: Target HQ path {final_hq_path} unexpectedly exists before rename."
-                    )
-                    continue
-                os.rename(current_hq_path, final_hq_path)
-
-            if current_lq_path != final_lq_path:
-                if os.path.exists(final_lq_path):
-                    errors.append(
-                        f"Final Renaming: Target LQ path {final_lq_path} unexpectedly exists before rename."
-                    )
-                    os.rename(final_hq_path, current_hq_path)
-                    continue  # Rollback HQ
-                os.rename(current_lq_path, final_lq_path)
-
-            processed_count += 1
-        except Exception as e:
-            errors.append(
-                f"Error during final rename of '{os.path.basename(current_hq_path)}' to '{final_hq_name}': {e}"
+    # Each pair goes straight to its sequential name (00001.ext, ...) keeping its
+    # own extension. For in-place shuffles the journal routes names that are
+    # also another pair's source through temporary names, and an interrupted
+    # run can be resumed or rolled back from its journal.
+    file_op = "rename" if operation == "inplace" else operation
+    planned = []
+    for idx, pair_info in enumerate(original_pairs_info):
+        orig_name = pair_info["original_name"]
+        new_name = f"{idx+1:05d}{pair_info['ext']}"
+        planned.append(
+            (
+                orig_name,
+                [
+                    FileOp(
+                        file_op,
+                        os.path.join(hq_folder, orig_name),
+                        os.path.join(output_hq_dir, new_name),
+                    ),
+                    FileOp(
+                        file_op,
+                        os.path.join(lq_folder, orig_name),
+                        os.path.join(output_lq_dir, new_name),
+                    ),
+                ],
             )
+        )
 
-    # Cleanup: Remove original files if operation was 'move' and it was done in stages (not directly relevant here as move is to new name)
-    # The current logic for 'move' already puts it in the final place with a temp/original name.
+    print_info(f"\nShuffling and renaming {len(planned)} pairs ({operation})...")
+    processed, errors = run_pair_operations(planned, f"Shuffle pairs ({operation})")
+    processed_count = len(processed)
 
     print_info("\n" + "-" * 30)
     print_info("  Shuffle Image Pairs Summary")
@@ -1847,21 +1495,7 @@ def transform_dataset(hq_folder, lq_folder):
 
     BATCH_SIZE = 1000  # Process this many pairs at a time
 
-    hq_files_list = sorted(
-        [
-            f
-            for f in os.listdir(hq_folder)
-            if os.path.isfile(os.path.join(hq_folder, f)) and is_image_file(f)
-        ]
-    )
-    lq_files_list = sorted(
-        [
-            f
-            for f in os.listdir(lq_folder)
-            if os.path.isfile(os.path.join(lq_folder, f)) and is_image_file(f)
-        ]
-    )
-    matching_files = [f for f in hq_files_list if f in lq_files_list]
+    matching_files = matching_pair_names(hq_folder, lq_folder)
 
     if not matching_files:
         print_warning("No matching HQ/LQ pairs found for transformation.")
@@ -2187,16 +1821,7 @@ def remove_small_image_pairs(hq_folder, lq_folder):
     checked_count = 0
     errors = []
 
-    lq_files = sorted(
-        [
-            f
-            for f in os.listdir(lq_folder)
-            if os.path.isfile(os.path.join(lq_folder, f)) and is_image_file(f)
-        ]
-    )
-    # Filter to only include pairs that exist in both folders
-    hq_files_set = set(os.listdir(hq_folder))
-    matching_files = [f for f in lq_files if f in hq_files_set and is_image_file(f)]
+    matching_files = matching_pair_names(hq_folder, lq_folder)
 
     print_info(f"Checking {len(matching_files)} HQ/LQ pairs...")
 
@@ -2263,6 +1888,53 @@ def remove_small_image_pairs(hq_folder, lq_folder):
     print_info("=" * 30)
 
 
+def recover_interrupted_file_operations():
+    """Resume or roll back journaled bulk file operations that did not finish."""
+    print_header("Interrupted File Operations", "=", Mocha.lavender)
+    journals = list_incomplete_journals()
+    if not journals:
+        print_info("No interrupted shuffle/split/remove operations found.")
+        return
+    for idx, journal in enumerate(journals, 1):
+        created = time.strftime(
+            "%Y-%m-%d %H:%M:%S", time.localtime(journal.plan.get("created", 0))
+        )
+        print_info(
+            f"  {idx}. {journal.label} [{journal.state}] started {created}: "
+            f"{len(journal.completed_steps())}/{len(journal.steps)} steps done"
+        )
+    choice = input("Select operation number (blank to cancel): ").strip()
+    if not choice.isdigit() or not 1 <= int(choice) <= len(journals):
+        return
+    journal = journals[int(choice) - 1]
+    action = (
+        input("(r)esume, roll (b)ack, or (d)iscard journal? [r]: ").strip().lower()
+        or "r"
+    )
+    if action == "r":
+        summary = journal.execute(desc=f"Resuming {journal.label}")
+        if summary["state"] == "completed":
+            journal.commit()
+            print_success(f"{journal.label} completed.")
+        else:
+            print_error(
+                f"{len(summary['errors'])} steps still failing; the journal was kept."
+            )
+    elif action == "b":
+        summary = journal.rollback()
+        if summary["state"] == "rolled_back":
+            journal.discard()
+            print_success(f"{journal.label} rolled back.")
+        else:
+            print_error(
+                f"{len(summary['errors'])} steps could not be undone; the journal was kept."
+            )
+    elif action == "d":
+        journal.discard()
+        print_warning("Journal discarded; files were left as they are.")
+    play_done_sound()
+
+
 def split_adjust_dataset(hq_folder, lq_folder):
     print_info("\nSplit/Adjust Dataset Options:")
     print_info(
@@ -2286,8 +1958,17 @@ def split_adjust_dataset(hq_folder, lq_folder):
     )
     print_info("  8. Umzi's DPID Downscaler (pepedpid)")
     method = input("Enter method number (default 1): ").strip() or "1"
+    pair_methods = {
+        "1": split_dataset_in_half,
+        "2": remove_pairs_by_count_percentage,
+        "3": remove_pairs_by_size,
+        "4": remove_pairs_by_dimensions,
+        "5": remove_pairs_by_file_type,
+    }
+    if method in pair_methods:
+        pair_methods[method](hq_folder, lq_folder)
+        return
     if method != "7" and method != "8":
-        # ... existing code for other methods ...
         return
     if method == "7":
         from dataset_forge import dpid_phhofm
@@ -2399,7 +2080,6 @@ def optimize_png_menu(hq_folder, lq_folder):
     import glob
     import shutil
     from PIL import Image
-    import subprocess
     import sys
     import os
 
@@ -2428,6 +2108,14 @@ def optimize_png_menu(hq_folder, lq_folder):
         folders = [(lq_folder, "LQ")]
     else:
         folders = [(hq_folder, "HQ"), (lq_folder, "LQ")]
+    timeout = (
+        ask_float(
+            "Per-file oxipng time budget in seconds (0 = unlimited)",
+            default=0,
+            min_value=0,
+        )
+        or None
+    )
 
     for folder, label in folders:
         if not folder or not os.path.isdir(folder):
@@ -2435,7 +2123,9 @@ def optimize_png_menu(hq_folder, lq_folder):
             continue
         print_info(f"\nProcessing {label} folder: {folder}")
         image_files = [
-            f for f in os.listdir(folder) if os.path.isfile(os.path.join(folder, f))
+            f
+            for f in os.listdir(folder)
+            if is_image_file(f) and os.path.isfile(os.path.join(folder, f))
         ]
         png_files = []
         for fname in image_files:
@@ -2461,29 +2151,23 @@ def optimize_png_menu(hq_folder, lq_folder):
         print_info(
             f"Optimizing {len(png_files)} PNG files in {label} folder with oxipng..."
         )
-        try:
-            # Check if oxipng is installed
-            result = subprocess.run(["oxipng", "--version"], capture_output=True)
-            if result.returncode != 0:
-                print_warning(
-                    "oxipng is not installed or not found in PATH. Please install oxipng."
-                )
-                continue
-        except FileNotFoundError:
+        if not shutil.which("oxipng"):
             print_warning(
                 "oxipng is not installed or not found in PATH. Please install oxipng."
             )
             continue
-        # Run oxipng on all PNGs in the folder
-        try:
-            # Use -o 4 --strip safe --alpha
-            cmd = ["oxipng", "-o", "4", "--strip", "safe", "--alpha"] + png_files
-            subprocess.run(cmd, check=True)
-            print_success(f"oxipng optimization complete for {label} folder.")
-        except CalledProcessError as e:
-            print_error(f"oxipng failed: {e}")
-        except Exception as e:
-            print_error(f"Error running oxipng: {e}")
+        # -o 4 --strip safe --alpha; files already optimized this way are skipped
+        report = optimize_pngs(
+            png_files,
+            OxipngOptions(level=4, strip="safe", alpha=True, timeout=timeout),
+            desc=f"oxipng {label}",
+        )
+        for path, error in report["failed"][:10]:
+            print_error(f"oxipng failed for {path}: {error}")
+        print_success(
+            f"oxipng optimization complete for {label} folder: "
+            f"{format_optimization_report(report)}"
+        )
     print_info("\nPNG optimization finished.")
     print_info("=" * 30)
 
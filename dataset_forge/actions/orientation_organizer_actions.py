@@ -1,75 +1,208 @@
+import math
 import os
-import shutil
 from PIL import Image
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Union
 from dataset_forge.utils.progress_utils import tqdm
 from dataset_forge.utils.history_log import log_operation
+from dataset_forge.utils.file_utils import transfer_files
 from dataset_forge.utils.monitoring import monitor_all, task_registry
 from dataset_forge.utils.memory_utils import clear_memory, clear_cuda_cache
-from dataset_forge.utils.printing import print_success
+from dataset_forge.utils.parallel_utils import prefetch_map
+from dataset_forge.utils.printing import print_success, print_warning
 from dataset_forge.utils.audio_utils import play_done_sound
 
+ORIENTATIONS = ("landscape", "portrait", "square")
+DEFAULT_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".webp", ".tiff")
+DEFAULT_SCAN_WORKERS = 16
+DEFAULT_TRANSFER_WORKERS = 8
+# EXIF orientations 5-8 rotate the image by 90 degrees
+_EXIF_ORIENTATION_TAG = 0x0112
+_TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
 
-def get_image_orientation(image_path: str) -> Optional[str]:
-    """Return 'landscape', 'portrait', or 'square' for the given image, or None if not an image."""
+AspectBuckets = Dict[str, float]
+
+
+def read_image_size(
+    image_path: str, honour_exif: bool = True
+) -> Optional[Tuple[int, int]]:
+    """
+    Return the displayed (width, height) of an image from its header.
+
+    PIL only parses the header on open, so no pixel data is decoded. With
+    honour_exif, sizes of images whose EXIF orientation rotates them by 90
+    degrees are swapped.
+    """
     try:
         with Image.open(image_path) as img:
             w, h = img.size
-            if w > h:
-                return "landscape"
-            elif h > w:
-                return "portrait"
-            elif w == h:
-                return "square"
+            if honour_exif and img.format in ("JPEG", "TIFF", "WEBP", "PNG", "MPO"):
+                try:
+                    if img.getexif().get(_EXIF_ORIENTATION_TAG) in _TRANSPOSED_ORIENTATIONS:
+                        w, h = h, w
+                except Exception:
+                    pass
+            return w, h
     except Exception:
         return None
-    return None
+
+
+def orientation_from_size(w: int, h: int) -> str:
+    if w > h:
+        return "landscape"
+    if h > w:
+        return "portrait"
+    return "square"
+
+
+def get_image_orientation(image_path: str) -> Optional[str]:
+    """Return 'landscape', 'portrait', or 'square' for the given image, or None if not an image."""
+    size = read_image_size(image_path)
+    if size is None:
+        return None
+    return orientation_from_size(*size)
+
+
+def parse_aspect_buckets(spec: Union[str, List[str]]) -> AspectBuckets:
+    """
+    Parse aspect-ratio buckets such as "1:1, 4:3, 3:4, 16:9".
+
+    Returns:
+        Dict mapping a folder-safe bucket name ("16x9") to width/height ratio.
+    """
+    items = spec.split(",") if isinstance(spec, str) else spec
+    buckets: AspectBuckets = {}
+    for item in items:
+        item = item.strip().lower().replace("x", ":")
+        if not item:
+            continue
+        try:
+            w, h = (float(v) for v in item.split(":"))
+        except ValueError:
+            raise ValueError(f"Invalid aspect ratio: {item!r} (expected W:H)")
+        if w <= 0 or h <= 0:
+            raise ValueError(f"Invalid aspect ratio: {item!r}")
+        name = f"{w:g}x{h:g}"
+        buckets[name] = w / h
+    if not buckets:
+        raise ValueError("No aspect ratio buckets given.")
+    return buckets
+
+
+def assign_aspect_bucket(w: int, h: int, buckets: AspectBuckets) -> str:
+    """Return the bucket whose ratio is closest to w/h (compared in log space)."""
+    ratio = math.log(w / h)
+    return min(buckets, key=lambda name: abs(math.log(buckets[name]) - ratio))
+
+
+def classify_image(
+    image_path: str, buckets: Optional[AspectBuckets] = None
+) -> Optional[str]:
+    """Bucket name for an image: its orientation, or nearest aspect bucket if given."""
+    size = read_image_size(image_path)
+    if size is None or min(size) <= 0:
+        return None
+    if buckets:
+        return assign_aspect_bucket(*size, buckets)
+    return orientation_from_size(*size)
+
+
+def _classify_paths(
+    paths: List[str],
+    buckets: Optional[AspectBuckets],
+    max_workers: int,
+    desc: str,
+) -> Dict[str, Optional[str]]:
+    results = prefetch_map(
+        lambda p: classify_image(p, buckets), paths, max_workers=max_workers
+    )
+    return dict(tqdm(results, total=len(paths), desc=desc))
+
+
+def _list_files(folder: str, extensions: Tuple[str, ...]) -> List[str]:
+    return sorted(
+        fname for fname in os.listdir(folder) if fname.lower().endswith(extensions)
+    )
 
 
 def scan_folder_for_orientations(
     folder: str,
-    extensions: Tuple[str, ...] = (".png", ".jpg", ".jpeg", ".bmp", ".webp", ".tiff"),
+    extensions: Tuple[str, ...] = DEFAULT_EXTENSIONS,
+    buckets: Optional[AspectBuckets] = None,
+    max_workers: int = DEFAULT_SCAN_WORKERS,
 ) -> Dict[str, List[str]]:
-    """Scan a folder and return a dict with keys 'landscape', 'portrait', 'square' mapping to lists of file paths."""
-    result = {"landscape": [], "portrait": [], "square": []}
-    files = [
-        fname for fname in os.listdir(folder) if fname.lower().endswith(extensions)
-    ]
-    for fname in tqdm(files, desc="Checking image orientations"):
-        fpath = os.path.join(folder, fname)
-        orientation = get_image_orientation(fpath)
-        if orientation:
-            result[orientation].append(fpath)
+    """
+    Scan a folder and map each bucket to its file paths.
+
+    Without buckets the keys are 'landscape', 'portrait' and 'square'; with
+    aspect buckets (see parse_aspect_buckets) each image goes to the nearest
+    ratio. Image headers are read on a thread pool.
+    """
+    keys = list(buckets) if buckets else list(ORIENTATIONS)
+    result = {k: [] for k in keys}
+    paths = [os.path.join(folder, f) for f in _list_files(folder, extensions)]
+    classified = _classify_paths(paths, buckets, max_workers, "Checking image orientations")
+    for fpath in paths:
+        bucket = classified.get(fpath)
+        if bucket:
+            result[bucket].append(fpath)
     return result
 
 
+def _report_transfer_errors(results: Dict[str, Dict[str, Optional[str]]]) -> int:
+    errors = [(dest, r["error"]) for dest, r in results.items() if r["error"]]
+    for dest, error in errors[:10]:
+        print_warning(f"Failed to write {dest}: {error}")
+    if len(errors) > 10:
+        print_warning(f"... and {len(errors) - 10} more failures")
+    return len(errors)
+
+
 def organize_images_by_orientation(
     input_folder: str,
     output_folder: str,
-    orientations: List[str],
+    orientations: Optional[List[str]] = None,
     operation: str = "copy",
-    extensions: Tuple[str, ...] = (".png", ".jpg", ".jpeg", ".bmp", ".webp", ".tiff"),
+    extensions: Tuple[str, ...] = DEFAULT_EXTENSIONS,
+    buckets: Optional[AspectBuckets] = None,
+    max_workers: int = DEFAULT_TRANSFER_WORKERS,
 ) -> Dict[str, List[str]]:
-    """Copy or move images of specified orientations from input_folder to output_folder/orientation/. Returns dict of moved/copied files."""
+    """
+    Copy, move or hardlink images of the selected buckets into output_folder/<bucket>/.
+
+    Args:
+        orientations: Buckets to keep (default: all)
+        operation: "copy" (reflink when supported), "move" or "link" (hardlink)
+        buckets: Optional aspect-ratio buckets instead of landscape/portrait/square
+        max_workers: Parallel file operations
+    Returns:
+        Dict of bucket -> destination paths.
+    """
     os.makedirs(output_folder, exist_ok=True)
-    found = scan_folder_for_orientations(input_folder, extensions)
+    found = scan_folder_for_orientations(input_folder, extensions, buckets)
+    orientations = orientations or list(found)
+    jobs = []
     result = {o: [] for o in orientations}
     for orientation in orientations:
         out_dir = os.path.join(output_folder, orientation)
         os.makedirs(out_dir, exist_ok=True)
-        files = found.get(orientation, [])
-        for fpath in tqdm(files, desc=f"{operation.title()}ing {orientation} images"):
+        for fpath in found.get(orientation, []):
             dest = os.path.join(out_dir, os.path.basename(fpath))
-            if operation == "move":
-                shutil.move(fpath, dest)
-            else:
-                shutil.copy2(fpath, dest)
+            jobs.append((fpath, dest))
             result[orientation].append(dest)
+    transferred = transfer_files(
+        jobs, operation, max_workers, desc=f"{operation.title()}ing images"
+    )
+    if _report_transfer_errors(transferred):
+        result = {
+            o: [d for d in dests if not transferred[d]["error"]]
+            for o, dests in result.items()
+        }
     log_operation(
         "orientation_organize",
         f"Organized {input_folder} by orientation: {', '.join(orientations)}",
+        path=input_folder,
     )
-    
+
     total_processed = sum(len(files) for files in result.values())
     print_success(f"Orientation organization complete! Processed {total_processed} images.")
     play_done_sound()
@@ -81,44 +214,57 @@ def organize_hq_lq_by_orientation(
     lq_folder: str,
     output_hq_folder: str,
     output_lq_folder: str,
-    orientations: List[str],
+    orientations: Optional[List[str]] = None,
     operation: str = "copy",
-    extensions: Tuple[str, ...] = (".png", ".jpg", ".jpeg", ".bmp", ".webp", ".tiff"),
+    extensions: Tuple[str, ...] = DEFAULT_EXTENSIONS,
+    buckets: Optional[AspectBuckets] = None,
+    max_workers: int = DEFAULT_TRANSFER_WORKERS,
 ) -> Dict[str, List[Tuple[str, str]]]:
-    """Copy or move HQ/LQ image pairs of specified orientations, keeping alignment. Returns dict of (hq, lq) pairs."""
+    """
+    Copy, move or hardlink HQ/LQ image pairs by bucket, keeping alignment.
+
+    The bucket is decided by the HQ image, so both halves of a pair always land
+    in the same bucket even if the LQ has a slightly different aspect ratio.
+    Returns dict of bucket -> (hq, lq) destination pairs.
+    """
     os.makedirs(output_hq_folder, exist_ok=True)
     os.makedirs(output_lq_folder, exist_ok=True)
-    hq_files = {
-        os.path.splitext(f)[0]: f
-        for f in os.listdir(hq_folder)
-        if f.lower().endswith(extensions)
-    }
-    lq_files = {
-        os.path.splitext(f)[0]: f
-        for f in os.listdir(lq_folder)
-        if f.lower().endswith(extensions)
-    }
-    common_keys = set(hq_files.keys()) & set(lq_files.keys())
+    hq_files = {os.path.splitext(f)[0]: f for f in _list_files(hq_folder, extensions)}
+    lq_files = {os.path.splitext(f)[0]: f for f in _list_files(lq_folder, extensions)}
+    common_keys = sorted(set(hq_files.keys()) & set(lq_files.keys()))
+    hq_paths = [os.path.join(hq_folder, hq_files[k]) for k in common_keys]
+    classified = _classify_paths(
+        hq_paths, buckets, DEFAULT_SCAN_WORKERS, "Checking HQ orientations"
+    )
+    orientations = orientations or (list(buckets) if buckets else list(ORIENTATIONS))
     result = {o: [] for o in orientations}
-    for key in common_keys:
-        hq_path = os.path.join(hq_folder, hq_files[key])
-        lq_path = os.path.join(lq_folder, lq_files[key])
-        orientation = get_image_orientation(hq_path)
-        if orientation in orientations:
-            out_hq_dir = os.path.join(output_hq_folder, orientation)
-            out_lq_dir = os.path.join(output_lq_folder, orientation)
-            os.makedirs(out_hq_dir, exist_ok=True)
-            os.makedirs(out_lq_dir, exist_ok=True)
-            dest_hq = os.path.join(out_hq_dir, os.path.basename(hq_path))
-            dest_lq = os.path.join(out_lq_dir, os.path.basename(lq_path))
-            if operation == "move":
-                shutil.move(hq_path, dest_hq)
-                shutil.move(lq_path, dest_lq)
-            else:
-                shutil.copy2(hq_path, dest_hq)
-                shutil.copy2(lq_path, dest_lq)
+    jobs = []
+    for key, hq_path in zip(common_keys, hq_paths):
+        orientation = classified.get(hq_path)
+        if orientation in result:
+            lq_path = os.path.join(lq_folder, lq_files[key])
+            dest_hq = os.path.join(output_hq_folder, orientation, os.path.basename(hq_path))
+            dest_lq = os.path.join(output_lq_folder, orientation, os.path.basename(lq_path))
+            jobs.extend([(hq_path, dest_hq), (lq_path, dest_lq)])
             result[orientation].append((dest_hq, dest_lq))
-    
+    transferred = transfer_files(
+        jobs, operation, max_workers, desc=f"{operation.title()}ing pairs"
+    )
+    if _report_transfer_errors(transferred):
+        result = {
+            o: [
+                (h, l)
+                for h, l in pairs
+                if not transferred[h]["error"] and not transferred[l]["error"]
+            ]
+            for o, pairs in result.items()
+        }
+    log_operation(
+        "orientation_organize",
+        f"Organized {hq_folder} / {lq_folder} by orientation: {', '.join(orientations)}",
+        path=hq_folder,
+    )
+
     total_processed = sum(len(pairs) for pairs in result.values())
     print_success(f"HQ/LQ orientation organization complete! Processed {total_processed} pairs.")
     play_done_sound()
@@ -1,10 +1,17 @@
+import csv
 import os
+import shutil
+import tempfile
+from typing import List, Tuple
+
 from dataset_forge.utils.progress_utils import tqdm
 import numpy as np
 from dataset_forge.actions.frames_actions import ImgToEmbedding, EmbeddedModel
+from dataset_forge.utils.cache_utils import CACHE_BASE_DIR
 from dataset_forge.utils.file_utils import is_image_file
 from dataset_forge.utils.monitoring import monitor_all, task_registry
 from dataset_forge.utils.memory_utils import clear_memory, clear_cuda_cache
+from dataset_forge.utils.parallel_utils import prefetch_map
 from dataset_forge.utils.printing import (
     print_info,
     print_success,
@@ -16,6 +23,15 @@ from dataset_forge.utils.printing import (
 from dataset_forge.utils.color import Mocha
 from dataset_forge.utils.audio_utils import play_done_sound
 
+OUTLIER_METHODS = ("mahalanobis", "knn", "isolation_forest")
+OUTLIER_WORK_DIR = os.path.join(CACHE_BASE_DIR, "outliers")
+DEFAULT_EMBED_BATCH_SIZE = 32
+DEFAULT_DECODE_WORKERS = 4
+# Rows per chunk when streaming over the embedding matrix
+STATS_CHUNK_ROWS = 65536
+# Dimensions kept for kNN / isolation forest (projected with the running covariance)
+DEFAULT_PROJECTION_DIMS = 64
+
 
 def detect_outliers(
     hq_folder=None,
@@ -23,66 +39,363 @@ def detect_outliers(
     single_path=None,
     model_name="ConvNextS",
     device="cuda",
+    method="mahalanobis",
+    **kwargs,
 ):
     """
     Detect outlier images using embeddings and clustering or distance-based scoring.
     Supports HQ/LQ or single-folder workflows.
+
+    Args:
+        method: "mahalanobis", "knn" or "isolation_forest"
+        **kwargs: Passed to _detect_outliers_for_folder (batch_size, output_csv, ...)
     """
     if hq_folder and lq_folder:
         print_info(f"\n[Outlier Detection] HQ/LQ mode: {hq_folder} / {lq_folder}")
-        _detect_outliers_for_folder(hq_folder, model_name, device, label="HQ")
-        _detect_outliers_for_folder(lq_folder, model_name, device, label="LQ")
+        _detect_outliers_for_folder(
+            hq_folder, model_name, device, label="HQ", method=method, **kwargs
+        )
+        _detect_outliers_for_folder(
+            lq_folder, model_name, device, label="LQ", method=method, **kwargs
+        )
     elif single_path:
         print_info(f"\n[Outlier Detection] Single folder mode: {single_path}")
-        _detect_outliers_for_folder(single_path, model_name, device)
+        _detect_outliers_for_folder(single_path, model_name, device, method=method, **kwargs)
     else:
         print_error("[Outlier Detection] No valid path(s) provided.")
 
 
-def _detect_outliers_for_folder(folder, model_name, device, label=None):
-    image_files = [
+class RunningStats:
+    """
+    Incremental mean and covariance over batches (Chan et al. parallel update).
+
+    Only O(D^2) state is kept, so statistics over millions of embeddings never
+    need the full matrix in memory.
+    """
+
+    def __init__(self, dim: int):
+        self.n = 0
+        self.mean = np.zeros(dim, dtype=np.float64)
+        self.m2 = np.zeros((dim, dim), dtype=np.float64)
+
+    def update(self, batch: np.ndarray) -> None:
+        batch = np.asarray(batch, dtype=np.float64)
+        if batch.size == 0:
+            return
+        n_b = batch.shape[0]
+        mean_b = batch.mean(axis=0)
+        centered = batch - mean_b
+        m2_b = centered.T @ centered
+        delta = mean_b - self.mean
+        total = self.n + n_b
+        self.m2 += m2_b + np.outer(delta, delta) * (self.n * n_b / total)
+        self.mean += delta * (n_b / total)
+        self.n = total
+
+    def covariance(self, shrinkage: float = 1e-3) -> np.ndarray:
+        """Sample covariance with a small ridge for numerical stability."""
+        cov = self.m2 / max(self.n - 1, 1)
+        ridge = shrinkage * max(np.trace(cov) / cov.shape[0], 1e-12)
+        return cov + ridge * np.eye(cov.shape[0])
+
+
+def _iter_chunks(matrix: np.ndarray, rows: int = STATS_CHUNK_ROWS):
+    for start in range(0, matrix.shape[0], rows):
+        yield start, np.asarray(matrix[start : start + rows], dtype=np.float64)
+
+
+def _mahalanobis_scores(
+    matrix: np.ndarray, stats: RunningStats, shrinkage: float = 1e-3
+) -> np.ndarray:
+    precision = np.linalg.pinv(stats.covariance(shrinkage))
+    scores = np.empty(matrix.shape[0], dtype=np.float64)
+    for start, chunk in _iter_chunks(matrix):
+        centered = chunk - stats.mean
+        scores[start : start + len(chunk)] = np.sqrt(
+            np.maximum(np.einsum("ij,jk,ik->i", centered, precision, centered), 0)
+        )
+    return scores
+
+
+def robust_mahalanobis_scores(
+    matrix: np.ndarray,
+    trim_quantile: float = 0.975,
+    dims: int = DEFAULT_PROJECTION_DIMS,
+) -> np.ndarray:
+    """
+    Mahalanobis distance with a one-step reweighted (trimmed) estimate.
+
+    Embeddings are projected to `dims` principal components first so the
+    covariance is well conditioned. Pass 1 streams the matrix to get
+    mean/covariance; pass 2 recomputes them without the rows beyond
+    `trim_quantile`, so the outliers themselves do not inflate the covariance
+    they are measured against.
+    """
+    matrix = _project(matrix, dims)
+    stats = RunningStats(matrix.shape[1])
+    for _, chunk in _iter_chunks(matrix):
+        stats.update(chunk)
+    first = _mahalanobis_scores(matrix, stats)
+    cutoff = np.quantile(first, trim_quantile)
+
+    trimmed = RunningStats(matrix.shape[1])
+    for start, chunk in _iter_chunks(matrix):
+        trimmed.update(chunk[first[start : start + len(chunk)] <= cutoff])
+    if trimmed.n <= 1:
+        return first
+    return _mahalanobis_scores(matrix, trimmed)
+
+
+def _project(matrix: np.ndarray, dims: int) -> np.ndarray:
+    """Project onto the top principal components using streamed covariance."""
+    stats = RunningStats(matrix.shape[1])
+    for _, chunk in _iter_chunks(matrix):
+        stats.update(chunk)
+    # Keep enough samples per dimension for a stable covariance estimate
+    dims = max(1, min(dims, matrix.shape[1], matrix.shape[0] // 5))
+    eigvals, eigvecs = np.linalg.eigh(stats.covariance())
+    components = eigvecs[:, ::-1][:, :dims]
+    projected = np.empty((matrix.shape[0], dims), dtype=np.float32)
+    for start, chunk in _iter_chunks(matrix):
+        projected[start : start + len(chunk)] = (chunk - stats.mean) @ components
+    return projected
+
+
+def knn_scores(
+    matrix: np.ndarray, k: int = 10, dims: int = DEFAULT_PROJECTION_DIMS
+) -> np.ndarray:
+    """
+    Mean distance to the k nearest neighbours (excluding the point itself).
+
+    Vectors are first projected to `dims` principal components so the index
+    stays small. Uses a FAISS HNSW index when faiss is installed, otherwise
+    scikit-learn's NearestNeighbors.
+    """
+    data = _project(matrix, dims)
+    k = min(k, len(data) - 1)
+    if k < 1:
+        return np.zeros(len(data))
+    try:
+        import faiss
+
+        index = faiss.IndexHNSWFlat(data.shape[1], 32)
+        index.add(data)
+        search = lambda chunk: np.sqrt(np.maximum(index.search(chunk, k + 1)[0], 0))
+    except ImportError:
+        from sklearn.neighbors import NearestNeighbors
+
+        nn = NearestNeighbors(n_neighbors=k + 1).fit(data)
+        search = lambda chunk: nn.kneighbors(chunk)[0]
+
+    scores = np.empty(len(data), dtype=np.float64)
+    for start in range(0, len(data), STATS_CHUNK_ROWS):
+        chunk = data[start : start + STATS_CHUNK_ROWS]
+        # Column 0 is the query itself (distance 0)
+        scores[start : start + len(chunk)] = search(chunk)[:, 1:].mean(axis=1)
+    return scores
+
+
+def isolation_forest_scores(
+    matrix: np.ndarray,
+    max_fit_samples: int = 100_000,
+    random_state: int = 0,
+) -> np.ndarray:
+    """
+    Isolation-forest anomaly scores (higher = more anomalous).
+
+    The forest is fitted on a random subsample of rows and the full matrix is
+    scored in chunks, so only the subsample is ever held in memory.
+    """
+    from sklearn.ensemble import IsolationForest
+
+    rng = np.random.default_rng(random_state)
+    n = matrix.shape[0]
+    fit_idx = (
+        np.sort(rng.choice(n, max_fit_samples, replace=False))
+        if n > max_fit_samples
+        else np.arange(n)
+    )
+    forest = IsolationForest(random_state=random_state).fit(
+        np.asarray(matrix[fit_idx], dtype=np.float32)
+    )
+    scores = np.empty(n, dtype=np.float64)
+    for start, chunk in _iter_chunks(matrix):
+        scores[start : start + len(chunk)] = -forest.score_samples(chunk)
+    return scores
+
+
+def _decode_for_outliers(path, transform):
+    """Decode and transform one image in a worker thread; None if unusable."""
+    from PIL import Image
+
+    try:
+        with Image.open(path) as img:
+            img = img.convert("RGB")
+            if img.width < 10 or img.height < 10:
+                return None
+            return transform(img)
+    except Exception:
+        return None
+
+
+def stream_embeddings_to_memmap(
+    image_files: List[str],
+    embedder,
+    memmap_path: str,
+    batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+    num_workers: int = DEFAULT_DECODE_WORKERS,
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Embed images in batches, writing rows straight into a memory-mapped matrix.
+
+    Decoding and transforms run on a thread pool ahead of the model. Rows are
+    written in input order, skipping images that fail to decode.
+
+    Returns:
+        (files, matrix): the embedded files and a read-only (N, D) float32 memmap
+    """
+    import torch
+
+    transform = embedder.transform
+    device = embedder.device
+    matrix = None
+    files = []
+    batch_paths, batch_tensors = [], []
+
+    def flush():
+        nonlocal matrix
+        batch = torch.stack(batch_tensors).to(device)
+        with torch.no_grad(), torch.autocast(
+            device_type="cuda" if str(device).startswith("cuda") else "cpu",
+            enabled=bool(getattr(embedder, "amp", False)) and str(device).startswith("cuda"),
+        ):
+            emb = embedder.net(batch)
+        emb = emb.float().reshape(len(batch_tensors), -1).cpu().numpy()
+        if matrix is None:
+            matrix = np.lib.format.open_memmap(
+                memmap_path, mode="w+", dtype=np.float32,
+                shape=(len(image_files), emb.shape[1]),
+            )
+        matrix[len(files) : len(files) + len(emb)] = emb
+        files.extend(batch_paths)
+        batch_paths.clear()
+        batch_tensors.clear()
+
+    decoded = prefetch_map(
+        lambda p: _decode_for_outliers(p, transform),
+        image_files,
+        max_workers=num_workers,
+        prefetch=batch_size * 2,
+    )
+    for path, tensor in tqdm(decoded, total=len(image_files), desc="Embedding", unit="img"):
+        if tensor is None:
+            print_warning(f"Failed to embed {path}")
+            continue
+        batch_paths.append(path)
+        batch_tensors.append(tensor)
+        if len(batch_tensors) >= batch_size:
+            flush()
+    if batch_tensors:
+        flush()
+    if matrix is None:
+        return [], np.zeros((0, 0), dtype=np.float32)
+    matrix.flush()
+    del matrix
+    full = np.load(memmap_path, mmap_mode="r")
+    return files, full[: len(files)]
+
+
+def score_outliers(matrix: np.ndarray, method: str = "mahalanobis", **kwargs) -> np.ndarray:
+    """Score every row of an embedding matrix; higher means more anomalous."""
+    if method == "mahalanobis":
+        return robust_mahalanobis_scores(matrix, **kwargs)
+    if method == "knn":
+        return knn_scores(matrix, **kwargs)
+    if method == "isolation_forest":
+        return isolation_forest_scores(matrix, **kwargs)
+    raise ValueError(f"Unknown outlier method: {method}. Choose from {OUTLIER_METHODS}")
+
+
+def write_outlier_csv(
+    output_csv: str, files: List[str], scores: np.ndarray, threshold: float, method: str
+) -> None:
+    """Write all images ranked by outlier score (most anomalous first)."""
+    order = np.argsort(-scores, kind="stable")
+    os.makedirs(os.path.dirname(os.path.abspath(output_csv)), exist_ok=True)
+    with open(output_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["rank", "path", "score", "is_outlier", "method"])
+        for rank, i in enumerate(order, 1):
+            writer.writerow(
+                [rank, files[i], f"{scores[i]:.6f}", bool(scores[i] > threshold), method]
+            )
+
+
+@monitor_all("detect_outliers_for_folder")
+def _detect_outliers_for_folder(
+    folder,
+    model_name,
+    device,
+    label=None,
+    method="mahalanobis",
+    batch_size=DEFAULT_EMBED_BATCH_SIZE,
+    num_workers=DEFAULT_DECODE_WORKERS,
+    output_csv=None,
+    embedder=None,
+):
+    if method not in OUTLIER_METHODS:
+        print_error(f"Unknown outlier method: {method}")
+        return
+    image_files = sorted(
         os.path.join(folder, f) for f in os.listdir(folder) if is_image_file(f)
-    ]
+    )
     if not image_files:
         print_warning(f"No images found in {folder}.")
         return
     print_info(
         f"Extracting embeddings for {len(image_files)} images{' in ' + label if label else ''}..."
     )
-    model_enum = getattr(EmbeddedModel, model_name, EmbeddedModel.ConvNextS)
-    embedder = ImgToEmbedding(model=model_enum, device=device)
-    embeddings = []
-    for img_path in tqdm(image_files, desc="Embedding", unit="img"):
-        try:
-            import cv2
-
-            img = (
-                cv2.cvtColor(cv2.imread(img_path), cv2.COLOR_BGR2RGB).astype(np.float32)
-                / 255.0
-            )
-            emb = embedder(img)
-            if hasattr(emb, "detach"):
-                emb = emb.detach().cpu().numpy().flatten()
-            else:
-                emb = np.array(emb).flatten()
-            embeddings.append(emb)
-        except Exception as e:
-            print_warning(f"Failed to embed {img_path}: {e}")
-            embeddings.append(None)
-    # Remove failed embeddings
-    valid = [(f, e) for f, e in zip(image_files, embeddings) if e is not None]
-    if not valid:
-        print_error("No valid embeddings computed.")
-        return
-    files, emb_array = zip(*valid)
-    emb_array = np.stack(emb_array)
-    # Outlier scoring: use distance to mean (simple stub, replace with clustering if needed)
-    mean_emb = np.mean(emb_array, axis=0)
-    dists = np.linalg.norm(emb_array - mean_emb, axis=1)
-    threshold = np.mean(dists) + 2 * np.std(dists)
-    outliers = [f for f, d in zip(files, dists) if d > threshold]
+    if embedder is None:
+        model_enum = getattr(EmbeddedModel, model_name, EmbeddedModel.ConvNextS)
+        embedder = ImgToEmbedding(model=model_enum, device=device)
+
+    os.makedirs(OUTLIER_WORK_DIR, exist_ok=True)
+    work_dir = tempfile.mkdtemp(dir=OUTLIER_WORK_DIR)
+    try:
+        files, matrix = stream_embeddings_to_memmap(
+            image_files,
+            embedder,
+            os.path.join(work_dir, "embeddings.npy"),
+            batch_size=batch_size,
+            num_workers=num_workers,
+        )
+        if not files:
+            print_error("No valid embeddings computed.")
+            return
+        print_info(f"Scoring {len(files)} embeddings ({method})...")
+        scores = score_outliers(matrix, method)
+        del matrix
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        clear_cuda_cache()
+
+    threshold = float(np.mean(scores) + 2 * np.std(scores))
+    order = np.argsort(-scores, kind="stable")
+    outliers = [files[i] for i in order if scores[i] > threshold]
+
+    if output_csv is None:
+        base = os.path.basename(os.path.normpath(folder))
+        output_csv = os.path.join(
+            os.path.dirname(os.path.abspath(folder)), f"{base}_outliers_{method}.csv"
+        )
+    write_outlier_csv(output_csv, files, scores, threshold, method)
+
     print_info(f"\nPotential outliers ({len(outliers)}):")
-    for f in outliers:
+    for f in outliers[:50]:
         print_info(f"  {f}")
+    if len(outliers) > 50:
+        print_info(f"  ... and {len(outliers) - 50} more")
     if not outliers:
         print_info("No strong outliers detected.")
+    print_success(f"Ranked outlier list written to: {output_csv}")
+    return {"files": files, "scores": scores, "outliers": outliers, "csv": output_csv}
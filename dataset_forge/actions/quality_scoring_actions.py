@@ -1,5 +1,15 @@
+import hashlib
+import io
+import json
 import os
+import threading
+
+from PIL import Image
+
 from dataset_forge.utils.progress_utils import tqdm
+from dataset_forge.utils.cache_utils import CACHE_BASE_DIR
+from dataset_forge.utils.parallel_utils import ShapeBatcher, prefetch_map
+from dataset_forge.utils.result_cache import file_sha256
 from dataset_forge.utils.file_utils import is_image_file
 from dataset_forge.utils.monitoring import monitor_all, task_registry
 from dataset_forge.utils.memory_utils import clear_memory, clear_cuda_cache
@@ -22,28 +32,272 @@ from dataset_forge.utils.lazy_imports import (
 )
 
 
-def score_images_with_pyiqa(folder, model_name="niqe", device="cpu"):
+DEFAULT_SCORE_BATCH_SIZE = 8
+DEFAULT_DECODE_WORKERS = 4
+QUALITY_SCORE_DIR = os.path.join(CACHE_BASE_DIR, "quality_scores")
+
+_metric_cache = {}
+_metric_lock = threading.Lock()
+
+
+def get_metric(model_name="niqe", device="cpu"):
+    """
+    Return a cached pyiqa metric instance for (model_name, device).
+
+    Creating a metric loads its weights, so instances are reused across calls.
+    """
     if pyiqa is None:
         raise ImportError(
             "pyiqa is not installed. Please install it to use quality scoring."
         )
-    model = pyiqa.create_metric(model_name, device=device)
-    image_files = [
-        os.path.join(folder, f) for f in os.listdir(folder) if is_image_file(f)
-    ]
-    scores = []
-    for img_path in tqdm(image_files, desc=f"Scoring ({model_name})", unit="img"):
+    # Keyed by the pyiqa module too, so a replaced module never serves stale metrics
+    key = (id(pyiqa), model_name, str(device))
+    with _metric_lock:
+        if key not in _metric_cache:
+            _metric_cache[key] = pyiqa.create_metric(model_name, device=device)
+        return _metric_cache[key]
+
+
+def clear_metric_cache():
+    """Drop cached metric instances (frees model memory)."""
+    with _metric_lock:
+        _metric_cache.clear()
+    clear_memory()
+    clear_cuda_cache()
+
+
+class QualityScoreStore:
+    """
+    Persistent image quality scores keyed by file content hash.
+
+    One JSON file per metric, scoring resolution (``max_side``) and pyiqa
+    version under ``store/cache/quality_scores/``, so thresholds can be
+    changed and histograms re-plotted without rescoring, and scores of
+    downscaled previews never mix with full-resolution ones.
+    """
+
+    def __init__(self, model_name, score_dir=None, max_side=None):
+        version = getattr(pyiqa, "__version__", "unknown") if pyiqa else "unknown"
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in model_name)
+        if max_side:
+            safe_name += f"__max{int(max_side)}"
+        score_dir = score_dir or QUALITY_SCORE_DIR
+        os.makedirs(score_dir, exist_ok=True)
+        self.path = os.path.join(score_dir, f"{safe_name}__{version}.json")
+        self.scores = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.scores = json.load(f)
+            except (OSError, ValueError):
+                self.scores = {}
+
+    def get(self, digest):
+        return self.scores.get(digest)
+
+    def set(self, digest, score):
+        self.scores[digest] = score
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.scores, f)
+        os.replace(tmp_path, self.path)
+
+
+def _load_for_scoring(path, max_side=None):
+    """
+    Read an image once: hash its bytes and decode it to a CHW float array.
+
+    Returns (None, None) if the file cannot be read.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        print_warning(f"Failed to read {path}: {e}")
+        return None, None
+    digest = hashlib.sha256(data).hexdigest()
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img = img.convert("RGB")
+            if max_side and max(img.size) > max_side:
+                img.thumbnail((max_side, max_side), Image.BICUBIC)
+            array = np.asarray(img, dtype=np.float32).transpose(2, 0, 1) / 255.0
+    except Exception:
+        # Let the metric try its own loader on formats PIL cannot decode
+        array = None
+    return digest, array
+
+
+def _score_batch(metric, arrays, device):
+    """
+    Score a list of same-shaped CHW arrays in one forward pass.
+
+    Raises:
+        ValueError: If the metric does not return one score per image (e.g.
+            it reduces the batch to a single number)
+    """
+    import torch
+
+    batch = torch.from_numpy(np.stack(arrays)).to(device)
+    with torch.no_grad():
+        out = torch.as_tensor(metric(batch)).detach().flatten().float().cpu()
+    if out.numel() != len(arrays):
+        raise ValueError(
+            f"Metric returned {out.numel()} score(s) for a batch of {len(arrays)}"
+        )
+    return [float(v) for v in out]
+
+
+def score_paths_with_pyiqa(
+    paths,
+    model_name="niqe",
+    device="cpu",
+    batch_size=DEFAULT_SCORE_BATCH_SIZE,
+    num_workers=DEFAULT_DECODE_WORKERS,
+    max_side=None,
+    use_cache=True,
+    desc=None,
+    max_buffered=None,
+):
+    """
+    Score image paths with a pyiqa metric using a batched, pipelined engine.
+
+    Images are read, hashed and decoded on a background thread pool while the
+    metric runs. Decoded images are grouped into same-size buckets and scored
+    `batch_size` at a time; once `max_buffered` decoded images are waiting in
+    partial buckets, the largest bucket is scored early so memory stays
+    bounded on mixed-resolution data. Scores are persisted per content hash,
+    so already scored images (even renamed or copied ones) are never rescored.
+
+    Args:
+        paths: Image paths to score
+        model_name: pyiqa metric name
+        device: Torch device for the metric
+        batch_size: Images per forward pass
+        num_workers: Decode threads
+        max_side: Optional downscale of the longest side before scoring
+        use_cache: Read/write persisted scores
+        desc: Progress bar label
+        max_buffered: Cap on decoded images held across buckets
+            (defaults to 4 * batch_size)
+
+    Returns:
+        dict: Mapping of path to score for every image that could be scored
+    """
+    store = QualityScoreStore(model_name, max_side=max_side) if use_cache else None
+    results = {}
+    batcher = ShapeBatcher(batch_size, max_buffered)
+    metric = None
+
+    def flush(items):
+        nonlocal metric
+        if metric is None:
+            metric = get_metric(model_name, device)
         try:
-            score = float(model(img_path))
-            scores.append((img_path, score))
+            scores = _score_batch(metric, [a for _, _, a in items], device)
+        except Exception:
+            # Some metrics reject batches; fall back to one image at a time
+            scores = []
+            for _, _, array in items:
+                try:
+                    scores.append(_score_batch(metric, [array], device)[0])
+                except Exception:
+                    scores.append(None)
+        for (path, digest, _), score in zip(items, scores):
+            if score is None:
+                score_by_path(path, digest)
+            else:
+                record(path, digest, score)
+
+    def record(path, digest, score):
+        results[path] = score
+        if store is not None:
+            store.set(digest, score)
+
+    def score_by_path(path, digest):
+        nonlocal metric
+        if metric is None:
+            metric = get_metric(model_name, device)
+        try:
+            record(path, digest, float(metric(path)))
         except Exception as e:
-            print_warning(f"Failed to score {img_path}: {e}")
+            print_warning(f"Failed to score {path}: {e}")
+
+    loaded = prefetch_map(
+        lambda p: _load_for_scoring(p, max_side), paths, max_workers=num_workers
+    )
+    with tqdm(total=len(paths), desc=desc or f"Scoring ({model_name})", unit="img") as pbar:
+        for path, (digest, array) in loaded:
+            pbar.update(1)
+            if digest is None:
+                continue
+            cached = store.get(digest) if store is not None else None
+            if cached is not None:
+                results[path] = cached
+            elif array is None:
+                score_by_path(path, digest)
+            else:
+                ready = batcher.add(array.shape, (path, digest, array))
+                if ready:
+                    flush(ready)
+        for items in batcher.drain():
+            flush(items)
+
+    if store is not None and metric is not None:
+        store.save()
+    # Preserve input order
+    return {p: results[p] for p in paths if p in results}
+
+
+def _list_images(folder):
+    return sorted(os.path.join(folder, f) for f in os.listdir(folder) if is_image_file(f))
+
+
+@monitor_all("score_images_with_pyiqa")
+def score_images_with_pyiqa(folder, model_name="niqe", device="cpu", **kwargs):
+    """
+    Score every image in a folder with a pyiqa metric.
+
+    Args:
+        folder: Folder of images
+        model_name: pyiqa metric name
+        device: Torch device
+        **kwargs: Passed to score_paths_with_pyiqa (batch_size, num_workers, ...)
+
+    Returns:
+        list: (path, score) tuples
+    """
+    if pyiqa is None:
+        raise ImportError(
+            "pyiqa is not installed. Please install it to use quality scoring."
+        )
+    scores = list(
+        score_paths_with_pyiqa(_list_images(folder), model_name, device, **kwargs).items()
+    )
 
     print_success(f"Quality scoring complete! Scored {len(scores)} images.")
     play_done_sound()
     return scores
 
 
+def load_cached_scores(folder, model_name="niqe", max_side=None):
+    """
+    Return persisted (path, score) tuples for a folder without running a model.
+
+    Images that were never scored with this metric (at this max_side) are
+    omitted.
+    """
+    store = QualityScoreStore(model_name, max_side=max_side)
+    scores = []
+    for path in _list_images(folder):
+        score = store.get(file_sha256(path))
+        if score is not None:
+            scores.append((path, score))
+    return scores
+
+
 def plot_quality_histogram(scores, model_name="niqe", show=True, save_path=None):
     values = [s[1] for s in scores]
     plt.figure(figsize=(8, 4))
@@ -65,11 +319,18 @@ def filter_images_by_quality(scores, threshold, mode="above"):
         return [s for s in scores if s[1] <= threshold]
 
 
-def score_hq_lq_folders(hq_folder, lq_folder, model_name="niqe", device="cpu"):
+@monitor_all("score_hq_lq_folders")
+def score_hq_lq_folders(hq_folder, lq_folder, model_name="niqe", device="cpu", **kwargs):
+    """Score HQ and LQ folders in one pipelined run, sharing a single metric instance."""
     print_info(f"Scoring HQ folder: {hq_folder}")
-    hq_scores = score_images_with_pyiqa(hq_folder, model_name, device)
     print_info(f"Scoring LQ folder: {lq_folder}")
-    lq_scores = score_images_with_pyiqa(lq_folder, model_name, device)
+    hq_paths = _list_images(hq_folder)
+    lq_paths = _list_images(lq_folder)
+    scores = score_paths_with_pyiqa(
+        hq_paths + lq_paths, model_name, device, desc=f"Scoring HQ+LQ ({model_name})", **kwargs
+    )
+    hq_scores = [(p, scores[p]) for p in hq_paths if p in scores]
+    lq_scores = [(p, scores[p]) for p in lq_paths if p in scores]
 
     print_success(
         f"HQ/LQ quality scoring complete! Scored {len(hq_scores)} HQ and {len(lq_scores)} LQ images."
@@ -96,13 +357,63 @@ def score_image_with_pyiqa(
         ImportError: If pyiqa is not installed
         Exception: If scoring fails
     """
-    if pyiqa is None:
-        raise ImportError(
-            "pyiqa is not installed. Please install it to use quality scoring."
-        )
-    model = pyiqa.create_metric(model_name, device=device)
+    model = get_metric(model_name, device)
     try:
         score = float(model(image_path))
         return score
     except Exception as e:
         raise Exception(f"Failed to score {image_path}: {e}")
+
+
+def run_quality_scoring_workflow():
+    """
+    Interactive workflow: score a folder, then filter and plot on any threshold.
+
+    Scores are persisted, so trying other thresholds (or re-running the
+    workflow on the same folder) reuses them instead of rescoring.
+    """
+    from dataset_forge.utils.input_utils import (
+        get_path_with_history,
+        get_input,
+        ask_yes_no,
+    )
+
+    print_header("⭐ Automated Dataset Quality Scoring", color=Mocha.sapphire)
+    folder = get_path_with_history("📁 Enter folder path:", allow_single_folder=True)
+    if not folder or not os.path.isdir(folder):
+        print_error("Please provide a valid folder.")
+        return
+    model_name = get_input("pyiqa metric name", default="niqe").strip() or "niqe"
+    device = "cuda" if _cuda_available() else "cpu"
+
+    scores = score_images_with_pyiqa(folder, model_name, device)
+    if not scores:
+        print_warning("No images were scored.")
+        return
+    values = [s[1] for s in scores]
+    print_info(
+        f"Scores: min {min(values):.4f}, max {max(values):.4f}, mean {sum(values) / len(values):.4f}"
+    )
+    while True:
+        resp = input("Threshold to filter on (blank to finish): ").strip()
+        if not resp:
+            break
+        try:
+            threshold = float(resp)
+        except ValueError:
+            print_error("Please enter a valid number.")
+            continue
+        mode = "above" if ask_yes_no("Keep images above the threshold?", default=True) else "below"
+        kept = filter_images_by_quality(scores, threshold, mode)
+        print_info(f"{len(kept)}/{len(scores)} images are {mode} {threshold}.")
+    if ask_yes_no("Show score histogram?", default=False):
+        plot_quality_histogram(scores, model_name)
+
+
+def _cuda_available():
+    try:
+        import torch
+
+        return torch.cuda.is_available()
+    except ImportError:
+        return False
@@ -9,6 +9,8 @@ Sanitize Images Actions
 
 import os
 import shutil
+import struct
+from dataclasses import dataclass
 from typing import Optional, Tuple, List
 from dataset_forge.actions import exif_scrubber_actions
 from dataset_forge.utils.image_ops import AlphaRemover
@@ -25,12 +27,18 @@ from dataset_forge.utils.history_log import log_operation
 import tempfile
 import shutil
 import subprocess
-from PIL import Image
-import cv2
+from PIL import Image, ImageFile
 from dataset_forge.utils.image_ops import ICCToSRGBConverter
-import concurrent.futures
+from dataset_forge.utils.pair_utils import match_pairs
+from dataset_forge.utils.parallel_utils import prefetch_map
+from dataset_forge.utils.png_optimizer import (
+    OxipngOptions,
+    format_optimization_report,
+    optimize_pngs,
+)
+from dataset_forge.utils.steg_scan import scan_images
 import uuid
-from dataset_forge.utils.monitoring import monitor_all, task_registry
+from dataset_forge.utils.monitoring import monitor_all
 from dataset_forge.utils.memory_utils import clear_memory, clear_cuda_cache
 from dataset_forge.utils.audio_utils import play_done_sound
 from dataset_forge.utils.input_utils import ask_yes_no
@@ -143,142 +151,361 @@ def run_zsteg_check(input_path: str) -> dict:
 SUPPORTED_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".tif", ".tiff", ".bmp")
 
 
-def run_oxipng_on_file(src, dst, dry_run=False):
-    cmd = ["oxipng", "--opt", "3", "--strip", "all", "--out", dst, src]
-    if dry_run:
-        print_info(f"[Dry run] Would run: {' '.join(cmd)}")
-        return
-    try:
-        subprocess.run(cmd, check=True)
-    except Exception as e:
-        print_warning(f"oxipng failed for {src}: {e}")
-
-
-def parallel_oxipng(tempB_folder, out_folder, dry_run=False, max_workers=None):
-    files = [f for f in os.listdir(tempB_folder) if f.lower().endswith(".png")]
-    args = []
-    for fname in files:
-        src = os.path.join(tempB_folder, fname)
-        dst = os.path.join(out_folder, fname)
-        args.append((src, dst, dry_run))
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        list(
-            tqdm(
-                executor.map(lambda x: run_oxipng_on_file(*x), args),
-                total=len(args),
-                desc="oxipng",
-            )
-        )
+SANITIZE_OXIPNG = OxipngOptions(level=3, strip="all")
 
 
-def _parse_zsteg_output(stdout: str, stderr: str) -> Tuple[str, str]:
+@dataclass(frozen=True)
+class SanitizeSteps:
     """
-    Parse zsteg output and return (summary, full_output).
-    Summary is a human-friendly one-line result for CLI.
-    Full_output is the raw output for the temp file.
+    Steps applied to every image by the streaming sanitize pipeline.
+
+    All enabled decode steps run on a single decode in one worker, in this
+    order: fix corruption -> ICC to sRGB -> remove alpha -> strip metadata ->
+    encode (PNG when to_png). oxipng then runs over the written PNGs through
+    the png_optimizer scheduler.
+
+    JPEG and WebP outputs are only re-encoded when a step changes pixels
+    (fix corruption, an ICC profile to convert, an alpha channel to drop), and
+    then keep the source JPEG quantization or WebP lossless flag. Metadata is
+    otherwise stripped from the encoded bytes without decoding.
     """
-    import re
-
-    # Detect stack overflow or Ruby errors
-    if (
-        "stack level too deep" in stdout
-        or "SystemStackError" in stdout
-        or "stack level too deep" in stderr
-        or "SystemStackError" in stderr
-    ):
+
+    fix_corruption: bool = False
+    icc_to_srgb: bool = False
+    remove_alpha: bool = False
+    strip_metadata: bool = False
+    to_png: bool = False
+    oxipng: bool = False
+
+    @property
+    def needs_decode(self) -> bool:
         return (
-            "Stack overflow (zsteg Ruby bug, see details in results file)",
-            stdout + "\n" + stderr,
+            self.fix_corruption
+            or self.icc_to_srgb
+            or self.remove_alpha
+            or self.strip_metadata
+            or self.to_png
         )
-    if "zsteg not found" in stderr.lower():
-        return ("[zsteg] Not found in PATH.", stdout + "\n" + stderr)
-    # Summarize findings
-    text_lines = []
-    file_lines = []
-    file_types = set()
-    for line in stdout.splitlines():
-        if "text:" in line:
-            text_lines.append(line.strip())
-        elif "file:" in line:
-            file_lines.append(line.strip())
-            # Try to extract file type after 'file:'
-            m = re.search(r"file: (.+)$", line)
-            if m:
-                file_types.add(m.group(1).strip())
-    summary_parts = []
-    if text_lines:
-        n = len(text_lines)
-        shown = text_lines[:2]
-        summary = f"Hidden text found in {n} channel{'s' if n > 1 else ''}"
-        if n > 2:
-            summary += f" (e.g. {', '.join(shown)[:60]}... +{n-2} more)"
-        else:
-            summary += f" (e.g. {', '.join(shown)[:60]})"
-        summary_parts.append(summary)
-    if file_types:
-        types_list = list(file_types)
-        shown_types = types_list[:2]
-        summary = f"Embedded file signature detected ({', '.join(shown_types)[:60]}"
-        if len(types_list) > 2:
-            summary += f", +{len(types_list)-2} more)"
-        else:
-            summary += ")"
-        summary_parts.append(summary)
-    if not summary_parts:
-        if stdout.strip():
-            return ("No suspicious hidden data detected.", stdout + "\n" + stderr)
-        else:
-            return ("No suspicious hidden data detected.", stdout + "\n" + stderr)
-    return ("; ".join(summary_parts), stdout + "\n" + stderr)
-
-
-def _run_zsteg_check(image_path: str, zsteg_results_file=None):
-    import subprocess
-    import re
-    import shutil
-
-    zsteg_path = shutil.which("zsteg")
-    if not zsteg_path:
-        msg = "zsteg not found in PATH."
-        print_error(msg)
-        if zsteg_results_file:
-            with open(zsteg_results_file, "a", encoding="utf-8") as f:
-                f.write(f"{image_path}: {msg}\n\n")
-        return
+
+
+_SAVE_FORMATS = {
+    ".jpg": "JPEG",
+    ".jpeg": "JPEG",
+    ".png": "PNG",
+    ".webp": "WEBP",
+    ".tif": "TIFF",
+    ".tiff": "TIFF",
+    ".bmp": "BMP",
+}
+
+
+# JPEG markers kept by the lossless metadata strip: APP0 (JFIF) and APP14
+# (Adobe colour transform, needed to decode CMYK/YCCK correctly)
+_JPEG_KEEP_APP_MARKERS = (0xE0, 0xEE)
+_JPEG_COMMENT_MARKER = 0xFE
+_JPEG_SOS_MARKER = 0xDA
+_WEBP_METADATA_CHUNKS = (b"EXIF", b"XMP ", b"ICCP")
+# VP8X feature flags for the ICC, EXIF and XMP chunks
+_WEBP_METADATA_FLAGS = 0x20 | 0x08 | 0x04
+
+
+def _strip_jpeg_metadata(data: bytes) -> Optional[bytes]:
+    if data[:2] != b"\xff\xd8":
+        return None
+    out = [data[:2]]
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # Fill byte before the marker
+            pos += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            out.append(data[pos : pos + 2])
+            pos += 2
+            continue
+        if marker == _JPEG_SOS_MARKER:
+            out.append(data[pos:])
+            return b"".join(out)
+        (length,) = struct.unpack(">H", data[pos + 2 : pos + 4])
+        end = pos + 2 + length
+        if length < 2 or end > len(data):
+            return None
+        is_metadata = (
+            0xE1 <= marker <= 0xEF and marker not in _JPEG_KEEP_APP_MARKERS
+        ) or marker == _JPEG_COMMENT_MARKER
+        if not is_metadata:
+            out.append(data[pos:end])
+        pos = end
+    return None
+
+
+def _strip_webp_metadata(data: bytes) -> Optional[bytes]:
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WEBP":
+        return None
+    chunks = []
+    pos = 12
+    while pos + 8 <= len(data):
+        fourcc = data[pos : pos + 4]
+        (size,) = struct.unpack("<I", data[pos + 4 : pos + 8])
+        end = pos + 8 + size + (size & 1)
+        if pos + 8 + size > len(data):
+            return None
+        chunk = data[pos:end]
+        if fourcc == b"VP8X" and size >= 1:
+            flags = chunk[8] & ~_WEBP_METADATA_FLAGS
+            chunk = chunk[:8] + bytes([flags]) + chunk[9:]
+        if fourcc not in _WEBP_METADATA_CHUNKS:
+            chunks.append(chunk)
+        pos = end
+    body = b"WEBP" + b"".join(chunks)
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+_METADATA_STRIPPERS = {"JPEG": _strip_jpeg_metadata, "WEBP": _strip_webp_metadata}
+
+
+def strip_metadata_lossless(input_path: str, output_path: str) -> bool:
+    """
+    Remove EXIF, XMP, ICC and comment data from a JPEG or WebP without decoding it.
+
+    The compressed image data is copied byte for byte, so unlike a re-encode
+    this never costs quality.
+
+    Args:
+        input_path: Path to the input JPEG or WebP file
+        output_path: Path to write the stripped file to
+
+    Returns:
+        True if the file was stripped, False if it is not a JPEG/WebP this
+        parser understands (the caller should fall back to re-encoding)
+    """
+    with open(input_path, "rb") as f:
+        data = f.read()
+    for strip in _METADATA_STRIPPERS.values():
+        stripped = strip(data)
+        if stripped is not None:
+            with open(output_path, "wb") as f:
+                f.write(stripped)
+            return True
+    return False
+
+
+def _webp_is_lossless(path: str) -> bool:
+    """True when the first image chunk of a WebP file is VP8L (lossless)."""
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if header[:4] != b"RIFF" or header[8:12] != b"WEBP":
+            return False
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return False
+            fourcc, size = struct.unpack("<4sI", chunk)
+            if fourcc in (b"VP8 ", b"VP8L"):
+                return fourcc == b"VP8L"
+            if fourcc == b"ANMF":
+                # Animation frame: its image chunk follows a 16-byte frame header
+                f.seek(16, os.SEEK_CUR)
+                continue
+            f.seek(size + (size & 1), os.SEEK_CUR)
+
+
+def _changes_pixels(img, steps: SanitizeSteps) -> bool:
+    return (
+        steps.fix_corruption
+        or (steps.icc_to_srgb and "icc_profile" in img.info)
+        or (steps.remove_alpha and AlphaRemover.has_alpha(img))
+    )
+
+
+def _lossy_save_params(source, src_path: str, fmt: str) -> dict:
+    """Encoder settings that keep a JPEG/WebP at the quality it was stored with."""
+    if fmt == "JPEG" and source.format == "JPEG":
+        from PIL import JpegImagePlugin
+
+        return {
+            "qtables": source.quantization,
+            "subsampling": JpegImagePlugin.get_sampling(source),
+        }
+    if fmt == "WEBP" and source.format == "WEBP" and _webp_is_lossless(src_path):
+        return {"lossless": True}
+    return {"quality": 95}
+
+
+def _list_sanitize_inputs(folder: str) -> List[str]:
+    return sorted(
+        f for f in os.listdir(folder) if f.lower().endswith(SUPPORTED_IMAGE_EXTENSIONS)
+    )
+
+
+def _output_name(filename: str, index: Optional[int], padding: int, to_png: bool):
+    stem, ext = os.path.splitext(filename)
+    ext = ".png" if to_png else ext.lower()
+    if index is not None:
+        stem = str(index).zfill(padding)
+    return stem + ext
+
+
+def plan_sanitize_outputs(
+    folders: List[Tuple[str, str]],
+    batch_rename: bool = False,
+    to_png: bool = False,
+) -> List[Tuple[str, str]]:
+    """
+    Map every input image to its final output path.
+
+    Args:
+        folders: (input folder, output folder) tuples; two entries are treated
+            as an HQ/LQ pair and renamed in lockstep
+        batch_rename: Give outputs sequential zero-padded names
+        to_png: Outputs get a ``.png`` extension
+
+    Returns:
+        (source path, destination path) jobs. When pairs are renamed, images
+        without a partner (matched by stem) are left out.
+    """
+    listings = [_list_sanitize_inputs(in_folder) for in_folder, _ in folders]
+    if batch_rename and len(folders) == 2:
+        pairs, hq_only, lq_only = match_pairs(listings[0], listings[1], by_stem=True)
+        if hq_only or lq_only:
+            print_warning(
+                f"Skipping {len(hq_only) + len(lq_only)} image(s) without an HQ/LQ partner."
+            )
+        listings = [[hq for hq, _ in pairs], [lq for _, lq in pairs]]
+
+    jobs = []
+    for (in_folder, out_folder), files in zip(folders, listings):
+        padding = len(str(len(files)))
+        taken = set()
+        for idx, fname in enumerate(files, 1):
+            name = _output_name(fname, idx if batch_rename else None, padding, to_png)
+            base, ext = os.path.splitext(name)
+            counter = 1
+            while name in taken:
+                name = f"{base}_{counter}{ext}"
+                counter += 1
+            taken.add(name)
+            jobs.append((os.path.join(in_folder, fname), os.path.join(out_folder, name)))
+    return jobs
+
+
+def sanitize_image_file(job) -> Tuple[str, Optional[str]]:
+    """
+    Process-pool worker: decode src once, apply every enabled step and write dst.
+
+    JPEG/WebP files that no step needs to re-encode are copied, with their
+    metadata stripped from the encoded bytes when strip_metadata is set.
+
+    Args:
+        job: (src, dst, SanitizeSteps)
+
+    Returns:
+        (src, error message or None)
+    """
+    src, dst, steps = job
+    part = dst + ".part"
+    fmt = _SAVE_FORMATS[os.path.splitext(dst)[1].lower()]
     try:
-        result = subprocess.run(
-            [zsteg_path, image_path],
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            timeout=30,
-        )
-        # Remove ANSI color codes if present
-        stdout = re.sub(r"\x1b\[[0-9;]*m", "", result.stdout)
-        stderr = re.sub(r"\x1b\[[0-9;]*m", "", result.stderr)
-        summary, full_output = _parse_zsteg_output(stdout, stderr)
-        print_info(f"[zsteg] {os.path.basename(image_path)}: {summary}")
-        if zsteg_results_file:
-            with open(zsteg_results_file, "a", encoding="utf-8") as f:
-                f.write(f"===== {image_path} =====\n{full_output}\n\n")
-    except FileNotFoundError:
-        msg = "zsteg not found in PATH."
-        print_error(msg)
-        if zsteg_results_file:
-            with open(zsteg_results_file, "a", encoding="utf-8") as f:
-                f.write(f"{image_path}: {msg}\n\n")
-    except subprocess.CalledProcessError as e:
-        msg = f"[zsteg] CalledProcessError for {image_path}: {e}"
-        print_error(msg)
-        if zsteg_results_file:
-            with open(zsteg_results_file, "a", encoding="utf-8") as f:
-                f.write(f"{image_path}: {msg}\n\n")
+        if not steps.needs_decode:
+            shutil.copy2(src, dst)
+            return src, None
+        if fmt in _METADATA_STRIPPERS:
+            with Image.open(src) as img:
+                reencode = _changes_pixels(img, steps)
+            if not reencode:
+                if not steps.strip_metadata:
+                    shutil.copy2(src, dst)
+                    return src, None
+                if strip_metadata_lossless(src, part):
+                    os.replace(part, dst)
+                    return src, None
+        previous = ImageFile.LOAD_TRUNCATED_IMAGES
+        ImageFile.LOAD_TRUNCATED_IMAGES = steps.fix_corruption
+        try:
+            with Image.open(src) as img:
+                img.load()
+                source = img
+                info = dict(img.info)
+                if steps.icc_to_srgb and "icc_profile" in info:
+                    img = ICCToSRGBConverter.convert_image(img)
+                    info.pop("icc_profile")
+                if steps.remove_alpha:
+                    img = AlphaRemover.strip_alpha(img)
+                if steps.strip_metadata:
+                    info = {}
+                params = {}
+                for key in ("icc_profile", "exif", "dpi"):
+                    if info.get(key):
+                        params[key] = info[key]
+                if fmt in _METADATA_STRIPPERS:
+                    params.update(_lossy_save_params(source, src, fmt))
+                    if img.mode not in ("RGB", "L", "CMYK", "RGBA"):
+                        img = img.convert("RGB")
+                img.save(part, format=fmt, **params)
+        finally:
+            ImageFile.LOAD_TRUNCATED_IMAGES = previous
+        os.replace(part, dst)
+        return src, None
     except Exception as e:
-        msg = f"[zsteg] Exception for {image_path}: {e}"
-        print_error(msg)
-        if zsteg_results_file:
-            with open(zsteg_results_file, "a", encoding="utf-8") as f:
-                f.write(f"{image_path}: {msg}\n\n")
+        if os.path.exists(part):
+            os.remove(part)
+        return src, str(e)
+
+
+def run_sanitize_pipeline(
+    jobs: List[Tuple[str, str]],
+    steps: SanitizeSteps,
+    max_workers: Optional[int] = None,
+    desc: str = "Sanitizing",
+) -> Tuple[int, List[Tuple[str, str]]]:
+    """
+    Stream (src, dst) jobs through sanitize_image_file on a process pool.
+
+    Each image is read from the input and written straight to its final
+    output path, so no intermediate copies of the dataset are created.
+
+    Returns:
+        (number of images written, [(src, error), ...])
+    """
+    for out_dir in {os.path.dirname(dst) for _, dst in jobs}:
+        os.makedirs(out_dir, exist_ok=True)
+    work = [(src, dst, steps) for src, dst in jobs]
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers <= 1 or len(work) <= 1:
+        results = map(sanitize_image_file, work)
+    else:
+        results = (
+            result
+            for _, result in prefetch_map(
+                sanitize_image_file, work, max_workers=max_workers, use_processes=True
+            )
+        )
+    errors = []
+    for src, error in tqdm(results, total=len(work), desc=desc):
+        if error:
+            errors.append((src, error))
+    done = len(work) - len(errors)
+    if steps.oxipng:
+        # One scheduled pass sized against oxipng's own threads, instead of an
+        # oxipng per pool worker
+        failed = {src for src, _ in errors}
+        pngs = [
+            dst for src, dst in jobs if src not in failed and dst.lower().endswith(".png")
+        ]
+        report = optimize_pngs(
+            pngs, SANITIZE_OXIPNG, cpu_count=max_workers, use_index=False
+        )
+        print_info(f"[oxipng] {format_optimization_report(report)}")
+        for path, error in report["failed"][:10]:
+            print_warning(f"oxipng failed for {path}: {error}")
+    log_operation(
+        "sanitize_images",
+        f"{done}/{len(work)} images written ({steps})",
+    )
+    return done, errors
 
 
 @monitor_all("sanitize_images", critical_on_error=True)
@@ -289,30 +516,12 @@ def sanitize_images(
 ):
     """
     Interactive sanitize workflow: prompts for each step, tracks run/skipped, returns summary dict.
-    """
-    from dataset_forge.utils.printing import (
-        print_section,
-        print_info,
-        print_success,
-        print_warning,
-        print_error,
-    )
-    from dataset_forge.utils.input_utils import ask_yes_no
-    import tempfile, os, shutil, concurrent.futures, uuid
-    from PIL import Image
-    from dataset_forge.utils.image_ops import ICCToSRGBConverter, AlphaRemover
-    from dataset_forge.utils.progress_utils import tqdm
-    from dataset_forge.utils.memory_utils import clear_memory, clear_cuda_cache
-    from dataset_forge.utils.audio_utils import play_done_sound
-    from dataset_forge.actions import exif_scrubber_actions
-    from dataset_forge.utils.history_log import log_operation
-    from dataset_forge.actions.sanitize_images_actions import (
-        run_oxipng_on_file,
-        parallel_oxipng,
-        _run_steghide_check,
-        _run_zsteg_check,
-    )
 
+    The selected steps are applied in a single streaming pass (see
+    run_sanitize_pipeline): every image is decoded once and written directly
+    to the output folder under its final name, so the input is never modified
+    and no temporary copies of the dataset are made.
+    """
     summary = {}
     max_workers = os.cpu_count() or 4
     hq_path = os.path.join(input_path, "hq")
@@ -328,573 +537,156 @@ def sanitize_images(
         print_info(f"Detected single folder: {input_path}")
         folders = [(input_path, output_folder)]
 
-    # 1. Fix Image Corruption
-    print_section("🩹 Fix Image Corruption", char="-", color=Mocha.yellow)
-    fix_corruption = ask_yes_no(
-        "Fix image corruption in-place in input folder(s)?", default=False
+    def ask_step(key, title, color, question):
+        print_section(title, char="-", color=color)
+        enabled = ask_yes_no(question, default=False)
+        summary[key] = "Run" if enabled else "Skipped"
+        return enabled
+
+    fix_corruption = ask_step(
+        "🩹 Fix Corruption",
+        "🩹 Fix Image Corruption",
+        Mocha.yellow,
+        "Fix image corruption (decode truncated images and re-encode)?",
+    )
+    batch_rename = ask_step(
+        "🔢 Batch Rename",
+        "🔢 Batch Rename Images",
+        Mocha.sapphire,
+        "Batch rename images to sequential zero-padded names?",
+    )
+    icc_to_srgb = ask_step(
+        "🎨 ICC to sRGB",
+        "🎨 ICC to sRGB Conversion",
+        Mocha.green,
+        "Run ICC to sRGB conversion?",
+    )
+    to_png = ask_step(
+        "🖼️  Convert to PNG",
+        "🖼️  Convert to PNG",
+        Mocha.blue,
+        "Convert images to PNG format?",
+    )
+    remove_alpha = ask_step(
+        "🧊 Remove Alpha",
+        "🧊 Remove Transparency (Alpha)",
+        Mocha.teal,
+        "Remove transparency (alpha channel)?",
+    )
+    remove_metadata = ask_step(
+        "🗑️  Remove Metadata",
+        "🗑️  Remove Metadata (oxipng)",
+        Mocha.peach,
+        "Remove metadata (oxipng)?",
+    )
+    use_oxipng = remove_metadata and to_png and shutil.which("oxipng") is not None
+    if remove_metadata and to_png and not use_oxipng:
+        print_warning("oxipng not found in PATH; metadata will be stripped on re-encode only.")
+    steps = SanitizeSteps(
+        fix_corruption=fix_corruption,
+        icc_to_srgb=icc_to_srgb,
+        remove_alpha=remove_alpha,
+        strip_metadata=remove_metadata,
+        to_png=to_png,
+        oxipng=use_oxipng,
     )
-    summary["🩹 Fix Corruption"] = "Run" if fix_corruption else "Skipped"
-    if fix_corruption:
-
-        def fix_corruption_inplace(folder):
-            files = [
-                f
-                for f in os.listdir(folder)
-                if f.lower().endswith(SUPPORTED_IMAGE_EXTENSIONS)
-            ]
-            print_info(f"Fixing image corruption in-place in {folder} (parallel)...")
-            import threading
-
-            thread = threading.Thread(target=lambda: None)
-            task_registry.register_thread(thread)
-
-            def fix_one(fpath):
-                try:
-                    img = cv2.imread(fpath)
-                    if img is not None:
-                        cv2.imwrite(fpath, img)
-                    else:
-                        print_warning(f"Could not read {fpath} with OpenCV.")
-                except Exception as e:
-                    print_warning(f"Error fixing {fpath}: {e}")
-
-            with concurrent.futures.ThreadPoolExecutor(
-                max_workers=max_workers
-            ) as executor:
-                list(
-                    tqdm(
-                        executor.map(fix_one, [os.path.join(folder, f) for f in files]),
-                        total=len(files),
-                        desc=f"Fix corruption {os.path.basename(folder)}",
-                    )
-                )
-            clear_memory()
-            clear_cuda_cache()
 
-        for in_folder, _ in folders:
-            if not dry_run:
-                fix_corruption_inplace(in_folder)
-            else:
-                print_info(f"[Dry run] Would fix corruption in {in_folder}")
-    else:
-        print_info("Skipping image corruption fix.")
-
-    # 2. Copy to Temp
-    print_section("📂 Copy Images to Temp Folder", char="-", color=Mocha.lavender)
-    copy_to_temp = ask_yes_no("Copy all image files to temp folder?", default=False)
-    summary["📂 Copy to Temp"] = "Run" if copy_to_temp else "Skipped"
-    if not copy_to_temp:
-        print_info("Skipping copy to temp folder and all subsequent steps.")
+    print_section("🚿 Sanitize Images", char="-", color=Mocha.lavender)
+    jobs = plan_sanitize_outputs(folders, batch_rename=batch_rename, to_png=to_png)
+    if not jobs:
+        print_warning("No supported images found.")
         return summary
-    with tempfile.TemporaryDirectory() as temp_root:
-        tempA_folders = []
-        for in_folder, _ in folders:
-            tempA = os.path.join(temp_root, os.path.basename(in_folder) + "_A")
-            tempA_folders.append(tempA)
-            if not dry_run:
-                os.makedirs(tempA, exist_ok=True)
-            files = [
-                f
-                for f in os.listdir(in_folder)
-                if f.lower().endswith(SUPPORTED_IMAGE_EXTENSIONS)
-            ]
-            for fname in tqdm(files, desc=f"Copy to tempA {os.path.basename(tempA)}"):
-                src = os.path.join(in_folder, fname)
-                dst = os.path.join(tempA, fname)
-                if not dry_run:
-                    shutil.copy2(src, dst)
-                else:
-                    print_info(f"[Dry run] Would copy {src} -> {dst}")
-        # 3. Batch rename in tempA (strictly sequential, zero-padded, HQ/LQ aligned)
-        print_section("🔢 Batch Rename Images", char="-", color=Mocha.sapphire)
-        batch_rename = ask_yes_no("Batch rename images in tempA?", default=False)
-        summary["🔢 Batch Rename"] = "Run" if batch_rename else "Skipped"
-        if batch_rename:
-
-            def batch_rename_sequential(folder):
-                if not os.path.exists(folder):
-                    print_warning(f"Folder does not exist: {folder}")
-                    return
-                files = sorted(
-                    [
-                        f
-                        for f in os.listdir(folder)
-                        if f.lower().endswith(SUPPORTED_IMAGE_EXTENSIONS)
-                    ]
-                )
-                n = len(files)
-                padding = len(str(n))
-
-                # Two-phase approach: first rename all to temporary names, then to final names
-                temp_renames = []
-                final_renames = []
-
-                # Phase 1: Create temporary names and plan final names
-                for idx, filename in enumerate(files, 1):
-                    ext = os.path.splitext(filename)[1].lower()
-                    final_name = f"{str(idx).zfill(padding)}{ext}"
-                    temp_name = f"temp_{uuid.uuid4().hex[:12]}{ext}"
-
-                    src = os.path.join(folder, filename)
-                    temp_path = os.path.join(folder, temp_name)
-                    final_path = os.path.join(folder, final_name)
-
-                    temp_renames.append((src, temp_path))
-                    final_renames.append((temp_path, final_path))
-
-                print_info(f"Batch renaming in {folder}...")
-
-                # Phase 2: Execute temporary renames
-                for src, temp_path in tqdm(
-                    temp_renames, desc=f"Rename to temp {os.path.basename(folder)}"
-                ):
-                    if not dry_run:
-                        try:
-                            os.rename(src, temp_path)
-                        except FileExistsError:
-                            # If temp file exists, use a unique name
-                            base, ext = os.path.splitext(temp_path)
-                            counter = 1
-                            while os.path.exists(temp_path):
-                                temp_path = os.path.join(
-                                    folder, f"{base}_{counter}{ext}"
-                                )
-                                counter += 1
-                            os.rename(src, temp_path)
-                    else:
-                        print_info(f"[Dry run] Would rename {src} -> {temp_path}")
-
-                # Phase 3: Execute final renames
-                for temp_path, final_path in tqdm(
-                    final_renames, desc=f"Rename to final {os.path.basename(folder)}"
-                ):
-                    if not dry_run:
-                        try:
-                            os.rename(temp_path, final_path)
-                        except FileExistsError:
-                            # If final name exists, use a unique name
-                            base, ext = os.path.splitext(final_path)
-                            counter = 1
-                            while os.path.exists(final_path):
-                                final_path = os.path.join(
-                                    folder, f"{base}_{counter}{ext}"
-                                )
-                                counter += 1
-                            os.rename(temp_path, final_path)
-                    else:
-                        print_info(
-                            f"[Dry run] Would rename {temp_path} -> {final_path}"
-                        )
-
-            if is_pair:
-                hq_files = sorted(
-                    [
-                        f
-                        for f in os.listdir(tempA_folders[0])
-                        if f.lower().endswith(SUPPORTED_IMAGE_EXTENSIONS)
-                    ]
-                )
-                lq_files = sorted(
-                    [
-                        f
-                        for f in os.listdir(tempA_folders[1])
-                        if f.lower().endswith(SUPPORTED_IMAGE_EXTENSIONS)
-                    ]
+    if dry_run:
+        for src, dst in jobs[:10]:
+            print_info(f"[Dry run] Would write {src} -> {dst}")
+        if len(jobs) > 10:
+            print_info(f"[Dry run] ... and {len(jobs) - 10} more")
+    else:
+        print_info(
+            f"Sanitizing {len(jobs)} images in one pass with {max_workers} workers..."
+        )
+        done, errors = run_sanitize_pipeline(jobs, steps, max_workers=max_workers)
+        for src, error in errors[:10]:
+            print_warning(f"Failed to sanitize {src}: {error}")
+        if len(errors) > 10:
+            print_warning(f"... and {len(errors) - 10} more failures")
+        summary["🚿 Images Written"] = f"{done}/{len(jobs)}"
+        clear_memory()
+        clear_cuda_cache()
+    # Steganography checks (batched, prefiltered and cached; see utils.steg_scan)
+    print_section("🕵️  Steganography Checks", char="-", color=Mocha.mauve)
+    run_steg = ask_yes_no(
+        "Run steganography checks (steghide/zsteg)?", default=False
+    )
+    steg_report = None
+    if run_steg:
+        steghide_choice = ask_yes_no(
+            "Use steghide for steganography checks?", default=False
+        )
+        zsteg_choice = ask_yes_no(
+            "Use zsteg for steganography checks?", default=True
+        )
+        summary["🕵️  Steganography"] = (
+            f"steghide: {'Run' if steghide_choice else 'Skipped'}, zsteg: {'Run' if zsteg_choice else 'Skipped'}"
+        )
+        for tool, chosen in (("steghide", steghide_choice), ("zsteg", zsteg_choice)):
+            if chosen and not shutil.which(tool):
+                print_warning(
+                    f"{tool} not found in PATH; images it would scan are only prefiltered."
                 )
-                n = min(len(hq_files), len(lq_files))
-                padding = len(str(n))
-
-                # Two-phase approach for HQ/LQ folders
-                hq_temp_renames = []
-                lq_temp_renames = []
-                hq_final_renames = []
-                lq_final_renames = []
-
-                # Phase 1: Create temporary names and plan final names
-                for idx, filename in enumerate(hq_files[:n], 1):
-                    ext = os.path.splitext(filename)[1].lower()
-                    final_name = f"{str(idx).zfill(padding)}{ext}"
-                    temp_name = f"temp_{uuid.uuid4().hex[:12]}{ext}"
-
-                    hq_src = os.path.join(tempA_folders[0], filename)
-                    lq_src = os.path.join(tempA_folders[1], filename)
-                    hq_temp_path = os.path.join(tempA_folders[0], temp_name)
-                    lq_temp_path = os.path.join(tempA_folders[1], temp_name)
-                    hq_final_path = os.path.join(tempA_folders[0], final_name)
-                    lq_final_path = os.path.join(tempA_folders[1], final_name)
-
-                    hq_temp_renames.append((hq_src, hq_temp_path))
-                    lq_temp_renames.append((lq_src, lq_temp_path))
-                    hq_final_renames.append((hq_temp_path, hq_final_path))
-                    lq_final_renames.append((lq_temp_path, lq_final_path))
-
-                # Phase 2: Execute temporary renames
-                print_info("Phase 1: Renaming to temporary names...")
-                for hq_src, hq_temp_path in hq_temp_renames:
-                    if not dry_run:
-                        try:
-                            os.rename(hq_src, hq_temp_path)
-                        except FileExistsError:
-                            # If temp file exists, use a unique name
-                            base, ext = os.path.splitext(hq_temp_path)
-                            counter = 1
-                            while os.path.exists(hq_temp_path):
-                                hq_temp_path = os.path.join(
-                                    tempA_folders[0], f"{base}_{counter}{ext}"
-                                )
-                                counter += 1
-                            os.rename(hq_src, hq_temp_path)
-                    else:
-                        print_info(f"[Dry run] Would rename {hq_src} -> {hq_temp_path}")
-
-                for lq_src, lq_temp_path in lq_temp_renames:
-                    if not dry_run:
-                        try:
-                            os.rename(lq_src, lq_temp_path)
-                        except FileExistsError:
-                            # If temp file exists, use a unique name
-                            base, ext = os.path.splitext(lq_temp_path)
-                            counter = 1
-                            while os.path.exists(lq_temp_path):
-                                lq_temp_path = os.path.join(
-                                    tempA_folders[1], f"{base}_{counter}{ext}"
-                                )
-                                counter += 1
-                            os.rename(lq_src, lq_temp_path)
-                    else:
-                        print_info(f"[Dry run] Would rename {lq_src} -> {lq_temp_path}")
-
-                # Phase 3: Execute final renames
-                print_info("Phase 2: Renaming to final names...")
-                for hq_temp_path, hq_final_path in hq_final_renames:
-                    if not dry_run:
-                        try:
-                            os.rename(hq_temp_path, hq_final_path)
-                        except FileExistsError:
-                            # If final name exists, use a unique name
-                            base, ext = os.path.splitext(hq_final_path)
-                            counter = 1
-                            while os.path.exists(hq_final_path):
-                                hq_final_path = os.path.join(
-                                    tempA_folders[0], f"{base}_{counter}{ext}"
-                                )
-                                counter += 1
-                            os.rename(hq_temp_path, hq_final_path)
-                    else:
-                        print_info(
-                            f"[Dry run] Would rename {hq_temp_path} -> {hq_final_path}"
-                        )
-
-                for lq_temp_path, lq_final_path in lq_final_renames:
-                    if not dry_run:
-                        try:
-                            os.rename(lq_temp_path, lq_final_path)
-                        except FileExistsError:
-                            # If final name exists, use a unique name
-                            base, ext = os.path.splitext(lq_final_path)
-                            counter = 1
-                            while os.path.exists(lq_final_path):
-                                lq_final_path = os.path.join(
-                                    tempA_folders[1], f"{base}_{counter}{ext}"
-                                )
-                                counter += 1
-                            os.rename(lq_temp_path, lq_final_path)
-                    else:
-                        print_info(
-                            f"[Dry run] Would rename {lq_temp_path} -> {lq_final_path}"
-                        )
-            else:
-                batch_rename_sequential(tempA_folders[0])
-        else:
-            print_info("Skipping batch rename.")
-        # 4. ICC to sRGB
-        print_section("🎨 ICC to sRGB Conversion", char="-", color=Mocha.green)
-        icc_to_srgb = ask_yes_no("Run ICC to sRGB conversion?", default=False)
-        summary["🎨 ICC to sRGB"] = "Run" if icc_to_srgb else "Skipped"
-        if icc_to_srgb:
-            print_info("Running ICC to sRGB conversion in tempA (parallel)...")
-
-            def icc_one(fpath):
-                if not dry_run:
-                    ICCToSRGBConverter.process_image(fpath, fpath)
-                else:
-                    print_info(f"[Dry run] Would convert ICC to sRGB: {fpath}")
-
-            for tempA in tempA_folders:
-                if not os.path.exists(tempA):
-                    print_warning(f"Folder does not exist: {tempA}")
-                    continue
-                files = [
-                    os.path.join(tempA, f)
-                    for f in os.listdir(tempA)
-                    if f.lower().endswith(SUPPORTED_IMAGE_EXTENSIONS)
-                ]
-                with concurrent.futures.ThreadPoolExecutor(
-                    max_workers=max_workers
-                ) as executor:
-                    list(
-                        tqdm(
-                            executor.map(icc_one, files),
-                            total=len(files),
-                            desc=f"ICC to sRGB {os.path.basename(tempA)}",
-                        )
-                    )
+        if not (steghide_choice or zsteg_choice):
+            print_info("Skipping steganography checks (no tool selected).")
         else:
-            print_info("Skipping ICC to sRGB conversion.")
-        # 5. Format normalization: convert to PNG, save to tempB (parallel)
-        print_section("🖼️  Convert to PNG", char="-", color=Mocha.blue)
-        to_png = ask_yes_no("Convert images to PNG format?", default=False)
-        summary["🖼️  Convert to PNG"] = "Run" if to_png else "Skipped"
-        if to_png:
-            tempB_folders = []
-
-            def to_png_one(args):
-                src, dst = args
-                if not dry_run:
-                    try:
-                        with Image.open(src) as img:
-                            img.save(dst, format="PNG")
-                    except Exception as e:
-                        print_warning(f"Failed to convert {src} to PNG: {e}")
-                else:
-                    print_info(f"[Dry run] Would convert {src} -> {dst}")
-
-            for tempA in tempA_folders:
-                tempB = tempA + "_B"
-                tempB_folders.append(tempB)
-                if not dry_run:
-                    os.makedirs(tempB, exist_ok=True)
-                if not os.path.exists(tempA):
-                    print_warning(f"Folder does not exist: {tempA}")
+            out_files = []
+            for _, out_folder in folders:
+                if not os.path.exists(out_folder):
+                    print_warning(f"Folder does not exist: {out_folder}")
                     continue
-                files = [
-                    f
-                    for f in os.listdir(tempA)
-                    if f.lower().endswith(SUPPORTED_IMAGE_EXTENSIONS)
-                ]
-                args_list = [
-                    (
-                        os.path.join(tempA, fname),
-                        os.path.join(tempB, os.path.splitext(fname)[0] + ".png"),
-                    )
-                    for fname in files
-                ]
-                with concurrent.futures.ThreadPoolExecutor(
-                    max_workers=max_workers
-                ) as executor:
-                    list(
-                        tqdm(
-                            executor.map(to_png_one, args_list),
-                            total=len(args_list),
-                            desc=f"To PNG {os.path.basename(tempB)}",
-                        )
-                    )
-        else:
-            print_info("Skipping PNG conversion.")
-        # 6. Remove transparency (optional, in-place in tempB, parallel)
-        print_section("🧊 Remove Transparency (Alpha)", char="-", color=Mocha.teal)
-        remove_alpha = ask_yes_no("Remove transparency (alpha channel)?", default=False)
-        summary["🧊 Remove Alpha"] = "Run" if remove_alpha else "Skipped"
-        if remove_alpha:
-            print_info("🔍 First, scanning for images with alpha channels...")
-
-            def remove_alpha_one(fpath):
-                if not dry_run:
-                    remover = AlphaRemover()
-                    success, result = remover.process(fpath, output_path=fpath)
-                    if not success:
-                        # Check if this is just an informational message about no alpha channel
-                        if (
-                            "No alpha channel to remove" in result
-                            and "already processed" in result
-                        ):
-                            print_info(f"✓ {os.path.basename(fpath)}: {result}")
-                        else:
-                            print_warning(
-                                f"Failed to remove alpha from {fpath}: {result}"
-                            )
-                    else:
-                        print_success(f"✓ Removed alpha from {os.path.basename(fpath)}")
-                else:
-                    print_info(f"[Dry run] Would remove alpha: {fpath}")
-
-            for tempB in tempB_folders:
-                if not os.path.exists(tempB):
-                    print_warning(f"Folder does not exist: {tempB}")
-                    continue
-
-                # First, scan for images with alpha channels
+                out_files.extend(
+                    os.path.join(out_folder, f)
+                    for f in _list_sanitize_inputs(out_folder)
+                )
+            if dry_run:
                 print_info(
-                    f"🔍 Scanning {os.path.basename(tempB)} for images with alpha channels..."
+                    f"[Dry run] Would run steganography checks on {len(out_files)} images"
                 )
-                images_with_alpha = find_images_with_alpha(tempB)
-
-                if not images_with_alpha:
-                    print_success(
-                        f"✓ No images with alpha channels found in {os.path.basename(tempB)}"
-                    )
-                    continue
-
-                print_success(
-                    f"✓ Found {len(images_with_alpha)} images with alpha channels in {os.path.basename(tempB)}"
+            else:
+                steg_report = os.path.join(
+                    tempfile.gettempdir(), f"steg_scan_{uuid.uuid4().hex[:8]}.jsonl"
+                )
+                print_info("Running steganography checks on output images...")
+                steg = scan_images(
+                    out_files,
+                    use_zsteg=zsteg_choice,
+                    use_steghide=steghide_choice,
+                    report_path=steg_report,
+                    max_workers=max_workers,
                 )
-
-                # Show the files that will be processed
-                if not dry_run:
-                    print_info("📋 Images to process:")
-                    for img_path in images_with_alpha:
-                        print_info(f"  • {os.path.basename(img_path)}")
-
-                # Now process only the images with alpha channels
                 print_info(
-                    f"🧊 Removing alpha channels from {len(images_with_alpha)} images..."
+                    f"Prefilter handled {steg['scanned'] - steg['tool_scans'] - steg['cached']} images, "
+                    f"{steg['cached']} cached, {steg['tool_scans']} sent to tools"
                 )
-
-                import threading
-
-                thread = threading.Thread(target=lambda: None)
-                task_registry.register_thread(thread)
-                with concurrent.futures.ThreadPoolExecutor(
-                    max_workers=max_workers
-                ) as executor:
-                    list(
-                        tqdm(
-                            executor.map(remove_alpha_one, images_with_alpha),
-                            total=len(images_with_alpha),
-                            desc=f"Remove alpha {os.path.basename(tempB)}",
-                        )
-                    )
-                clear_memory()
-                clear_cuda_cache()
-        else:
-            print_info("Skipping alpha removal.")
-        # 7. Metadata removal: oxipng to output (per-file parallel)
-        print_section("🗑️  Remove Metadata (oxipng)", char="-", color=Mocha.peach)
-        remove_metadata = ask_yes_no("Remove metadata (oxipng)?", default=False)
-        summary["🗑️  Remove Metadata"] = "Run" if remove_metadata else "Skipped"
-        if remove_metadata:
-            print_info(
-                "Running oxipng for metadata removal and final output (per-file parallel)..."
-            )
-            for idx, (_, out_folder) in enumerate(folders):
-                tempB = tempB_folders[idx]
-                if not dry_run:
-                    os.makedirs(out_folder, exist_ok=True)
-                    parallel_oxipng(tempB, out_folder, dry_run, max_workers)
-                else:
-                    if not os.path.exists(tempB):
-                        print_warning(f"Folder does not exist: {tempB}")
-                        continue
-                    print_info(
-                        f"[Dry run] Would run oxipng on all PNGs in {tempB} to {out_folder}"
-                    )
-        else:
-            print_info("Skipping metadata removal.")
-        # 8. Steganography checks (not parallelized, but could be if needed)
-        print_section("🕵️  Steganography Checks", char="-", color=Mocha.mauve)
-        run_steg = ask_yes_no(
-            "Run steganography checks (steghide/zsteg)?", default=False
-        )
-        steghide_choice = False
-        zsteg_choice = False
-        zsteg_results_file = None
-        if run_steg:
-            steghide_choice = ask_yes_no(
-                "Use steghide for steganography checks?", default=False
-            )
-            zsteg_choice = ask_yes_no(
-                "Use zsteg for steganography checks?", default=True
-            )
-            summary["🕵️  Steganography"] = (
-                f"steghide: {'Run' if steghide_choice else 'Skipped'}, zsteg: {'Run' if zsteg_choice else 'Skipped'}"
-            )
-            if not (steghide_choice or zsteg_choice):
-                print_info("Skipping steganography checks (no tool selected).")
-            else:
-                if zsteg_choice:
-                    zsteg_results_file = os.path.join(
-                        tempfile.gettempdir(),
-                        f"zsteg_results_{uuid.uuid4().hex[:8]}.txt",
-                    )
-                    with open(zsteg_results_file, "w", encoding="utf-8") as f:
-                        f.write("ZSTEG RESULTS LEGEND:\n")
-                        f.write("- text: Possible hidden text found in a channel.\n")
-                        f.write("- file: Possible embedded file signature detected.\n")
-                        f.write("- No hidden data: No suspicious output.\n")
-                        f.write(
-                            "- Stack overflow: zsteg Ruby bug, not a workflow error.\n\n"
+                for path, result in steg["results"].items():
+                    if result.get("verdict") == "suspicious":
+                        details = "; ".join(
+                            r["summary"] for r in result.get("tools", {}).values()
                         )
-                print_info("Running steganography checks on output PNGs...")
-                for _, out_folder in folders:
-                    if not os.path.exists(out_folder):
-                        print_warning(f"Folder does not exist: {out_folder}")
-                        continue
-                    png_files = [
-                        f for f in os.listdir(out_folder) if f.lower().endswith(".png")
-                    ]
-                    for fname in tqdm(
-                        png_files, desc=f"Steg check {os.path.basename(out_folder)}"
-                    ):
-                        fpath = os.path.join(out_folder, fname)
-                        if steghide_choice:
-                            print_info(f"[Steghide] Checking {fpath}")
-                            if not dry_run:
-                                _run_steghide_check(fpath)
-                            else:
-                                print_info(f"[Dry run] Would run steghide on {fpath}")
-                        if zsteg_choice:
-                            print_info(f"[zsteg] Checking {fpath}")
-                            if not dry_run:
-                                _run_zsteg_check(
-                                    fpath, zsteg_results_file=zsteg_results_file
-                                )
-                            else:
-                                print_info(f"[Dry run] Would run zsteg on {fpath}")
-        else:
-            summary["🕵️  Steganography"] = "steghide: Skipped, zsteg: Skipped"
-            print_info("Skipping steganography checks.")
-        if zsteg_results_file:
-            summary["📄 Zsteg results file"] = zsteg_results_file
-        print_success("Sanitization complete.")
-        play_done_sound()
-        clear_memory()
-        clear_cuda_cache()
-        return summary
-
-
-def _batch_rename_pngs(folder: str, dry_run: bool = False):
-    import uuid
-
-    files = sorted([f for f in os.listdir(folder) if f.lower().endswith(".png")])
-    padding = 5
-    prefix = ""
-    if dry_run:
-        for idx, filename in enumerate(files, 1):
-            ext = ".png"
-            new_name = f"{prefix}{str(idx).zfill(padding)}{ext}"
-        print_info(f"Would rename: {filename} -> {new_name}")
-    print_info("Dry run complete. No files were renamed.")
-    return
-    temp_renames = []
-    final_renames = []
-    for idx, filename in enumerate(files, 1):
-        ext = ".png"
-        final_name = f"{prefix}{str(idx).zfill(padding)}{ext}"
-        temp_name = f"temp_{uuid.uuid4().hex[:12]}{ext}"
-        src = os.path.join(folder, filename)
-        temp_path = os.path.join(folder, temp_name)
-        final_path = os.path.join(folder, final_name)
-        temp_renames.append((src, temp_path))
-        final_renames.append((temp_path, final_path))
-    print_info("Phase 1: Renaming to temporary names...")
-    for src, temp_path in tqdm(temp_renames, desc="Temp renaming"):
-        os.rename(src, temp_path)
-        log_operation("rename_temp", f"{src} -> {temp_path}")
-    print_info("Phase 2: Renaming to final names...")
-    for temp_path, final_path in tqdm(final_renames, desc="Final renaming"):
-        os.rename(temp_path, final_path)
-        log_operation("rename_final", f"{temp_path} -> {final_path}")
-    print_info("Batch renaming complete.")
+                        print_warning(f"Possible hidden data in {path}: {details}")
+                summary["🔎 Steg Verdicts"] = ", ".join(
+                    f"{verdict}: {steg[verdict]}"
+                    for verdict in ("clean", "suspicious", "unverified", "skipped", "error")
+                    if steg[verdict]
+                )
+    else:
+        summary["🕵️  Steganography"] = "steghide: Skipped, zsteg: Skipped"
+        print_info("Skipping steganography checks.")
+    if steg_report:
+        summary["📄 Steg scan report"] = steg_report
+    print_success("Sanitization complete.")
+    play_done_sound()
+    clear_memory()
+    clear_cuda_cache()
+    return summary
 
 
 def has_alpha_channel(image_path: str) -> bool:
@@ -946,46 +738,3 @@ def find_images_with_alpha(folder_path: str) -> List[str]:
             images_with_alpha.append(image_path)
 
     return images_with_alpha
-
-
-def _run_steghide_check(image_path: str):
-    import subprocess
-    import re
-    import os
-
-    # Only run steghide on supported formats
-    SUPPORTED_STEGHIDE_EXTS = (".bmp", ".au", ".wav", ".jpg", ".jpeg")
-    ext = os.path.splitext(image_path)[1].lower()
-    if ext not in SUPPORTED_STEGHIDE_EXTS:
-        print_info(
-            f"[Steghide] Skipping {image_path} (unsupported format for steghide)"
-        )
-        return
-    try:
-        result = subprocess.run(
-            ["steghide", "info", image_path],
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            timeout=30,
-        )
-        # Remove ANSI color codes if present
-        stdout = re.sub(r"\x1b\[[0-9;]*m", "", result.stdout)
-        stderr = re.sub(r"\x1b\[[0-9;]*m", "", result.stderr)
-        if result.returncode == 0:
-            if "embedded data" in stdout.lower():
-                print_warning(f"[Steghide] Possible hidden data in {image_path}:")
-                print_info(stdout.strip())
-            else:
-                print_success(f"[Steghide] No hidden data in {image_path}")
-        else:
-            print_warning(f"[Steghide] Error for {image_path}: {stderr.strip()}")
-    except FileNotFoundError:
-        print_error("Steghide not found in PATH.")
-    except subprocess.CalledProcessError as e:
-        print_error(f"[Steghide] CalledProcessError for {image_path}: {e}")
-    except Exception as e:
-        print_error(f"[Steghide] Exception for {image_path}: {e}")
-
-
-# zsteg is always run for PNGs, as it is designed for that format.
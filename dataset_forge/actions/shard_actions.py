@@ -0,0 +1,523 @@
+"""
+Sharded tar (WebDataset-style) export, import and streaming for Dataset Forge.
+
+Packs HQ/LQ pairs (or single-folder datasets) plus per-sample metadata into
+fixed-size tar shards with a JSON index, so training loaders and other Dataset
+Forge actions can stream samples without touching millions of loose files.
+
+Shard layout follows the WebDataset convention: every sample is a group of
+consecutive members sharing a key (``<key>.hq.png``, ``<key>.lq.png``,
+``<key>.json``). The ``index.json`` written next to the shards records the data
+offset and size of every member so single samples can be read with one seek.
+"""
+
+import hashlib
+import io
+import json
+import os
+import tarfile
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from dataset_forge.utils.file_utils import get_image_files
+from dataset_forge.utils.history_log import log_operation
+from dataset_forge.utils.monitoring import monitor_all
+from dataset_forge.utils.parallel_utils import prefetch_map
+from dataset_forge.utils.printing import (
+    print_header,
+    print_info,
+    print_success,
+    print_warning,
+    print_error,
+)
+from dataset_forge.utils.progress_utils import tqdm
+from dataset_forge.utils.audio_utils import play_done_sound
+
+SHARD_INDEX_FILENAME = "index.json"
+SHARD_INDEX_VERSION = 1
+DEFAULT_SHARD_SIZE_MB = 512
+DEFAULT_SAMPLES_PER_SHARD = 10000
+DEFAULT_READ_WORKERS = 8
+
+_TAR_BLOCK = tarfile.BLOCKSIZE
+
+
+def _sample_key(filename: str, used: set) -> str:
+    """Return a unique WebDataset key for a filename (no dots allowed in keys)."""
+    stem = os.path.splitext(filename)[0].replace(".", "_")
+    key = stem
+    counter = 1
+    while key in used:
+        key = f"{stem}_{counter}"
+        counter += 1
+    used.add(key)
+    return key
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class ShardWriter:
+    """
+    Write samples into rolling tar shards and build the shard index.
+
+    A new shard is started when the current one would exceed `max_shard_bytes`
+    or `max_samples`. Shards are written to a temporary name and renamed on
+    close so an interrupted export never leaves a truncated ``.tar`` behind.
+
+    Example:
+        >>> with ShardWriter("out/", prefix="train") as writer:
+        ...     writer.write("0001", {"hq.png": hq_bytes, "lq.png": lq_bytes}, {"score": 0.9})
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        prefix: str = "shard",
+        max_shard_bytes: int = DEFAULT_SHARD_SIZE_MB * 1024 * 1024,
+        max_samples: int = DEFAULT_SAMPLES_PER_SHARD,
+        paired: bool = True,
+    ):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.max_shard_bytes = max_shard_bytes
+        self.max_samples = max_samples
+        self.paired = paired
+        self.shards: List[Dict[str, Any]] = []
+        self._tar: Optional[tarfile.TarFile] = None
+        self._current: Optional[Dict[str, Any]] = None
+        self._tmp_path: Optional[str] = None
+        os.makedirs(output_dir, exist_ok=True)
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(write_index=exc_type is None)
+
+    @property
+    def total_samples(self) -> int:
+        return sum(shard["num_samples"] for shard in self.shards)
+
+    def _open_shard(self) -> None:
+        name = f"{self.prefix}-{len(self.shards):06d}.tar"
+        self._tmp_path = os.path.join(self.output_dir, name + ".tmp")
+        self._tar = tarfile.open(self._tmp_path, "w", format=tarfile.PAX_FORMAT)
+        self._current = {"name": name, "num_samples": 0, "samples": []}
+        self.shards.append(self._current)
+
+    def _close_shard(self) -> None:
+        if self._tar is None:
+            return
+        self._tar.close()
+        final_path = os.path.join(self.output_dir, self._current["name"])
+        os.replace(self._tmp_path, final_path)
+        self._current["size_bytes"] = os.path.getsize(final_path)
+        self._tar = None
+        self._current = None
+        self._tmp_path = None
+
+    def _add_member(self, name: str, data: bytes) -> List[int]:
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self._tar.addfile(info, io.BytesIO(data))
+        # tar.offset now points past the padded data block of this member
+        padded = -(-len(data) // _TAR_BLOCK) * _TAR_BLOCK
+        return [self._tar.offset - padded, len(data)]
+
+    def write(
+        self, key: str, members: Dict[str, bytes], metadata: Optional[Dict] = None
+    ) -> None:
+        """
+        Append one sample to the current shard.
+
+        Args:
+            key: Sample key (must not contain dots)
+            members: Mapping of member suffix (e.g. ``"hq.png"``) to file bytes
+            metadata: Optional JSON-serializable per-sample metadata
+        """
+        if "." in key:
+            raise ValueError(f"Sample key must not contain '.': {key}")
+        payload = dict(members)
+        if metadata is not None:
+            payload["json"] = json.dumps(metadata, sort_keys=True).encode("utf-8")
+        sample_bytes = sum(len(v) + 2 * _TAR_BLOCK for v in payload.values())
+
+        if self._tar is None or (
+            self._current["num_samples"] > 0
+            and (
+                self._current["num_samples"] >= self.max_samples
+                or self._tar.offset + sample_bytes > self.max_shard_bytes
+            )
+        ):
+            self._close_shard()
+            self._open_shard()
+
+        entry = {"key": key, "members": {}}
+        for suffix, data in payload.items():
+            entry["members"][suffix] = self._add_member(f"{key}.{suffix}", data)
+        self._current["samples"].append(entry)
+        self._current["num_samples"] += 1
+
+    def close(self, write_index: bool = True) -> Optional[str]:
+        """
+        Finish the current shard and write ``index.json``.
+
+        Returns:
+            Path to the index file, or None if no index was written.
+        """
+        self._close_shard()
+        if not write_index:
+            return None
+        index = {
+            "version": SHARD_INDEX_VERSION,
+            "format": "webdataset",
+            "paired": self.paired,
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "total_samples": self.total_samples,
+            "shards": self.shards,
+        }
+        index_path = os.path.join(self.output_dir, SHARD_INDEX_FILENAME)
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+        return index_path
+
+
+def load_shard_index(shard_dir: str) -> Dict[str, Any]:
+    """
+    Load the shard index from a shard directory.
+
+    Raises:
+        FileNotFoundError: If the directory has no ``index.json``
+    """
+    index_path = os.path.join(shard_dir, SHARD_INDEX_FILENAME)
+    if not os.path.exists(index_path):
+        raise FileNotFoundError(f"No shard index found: {index_path}")
+    with open(index_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _sample_from_members(key: str, members: Dict[str, bytes]) -> Dict[str, Any]:
+    sample: Dict[str, Any] = {"__key__": key}
+    for suffix, data in members.items():
+        if suffix == "json":
+            sample["json"] = json.loads(data.decode("utf-8"))
+        else:
+            sample[suffix] = data
+    return sample
+
+
+def iter_tar_samples(tar_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream samples from a single tar shard without extracting it.
+
+    Members are grouped by key (text before the first dot of the basename).
+    Each sample is a dict with ``__key__``, one entry per member suffix
+    (raw bytes) and a decoded ``json`` entry when metadata is present.
+    """
+    current_key = None
+    members: Dict[str, bytes] = {}
+    with tarfile.open(tar_path, mode="r|") as tar:
+        for info in tar:
+            if not info.isfile():
+                continue
+            base = os.path.basename(info.name)
+            if "." not in base:
+                continue
+            key, suffix = base.split(".", 1)
+            if current_key is not None and key != current_key:
+                yield _sample_from_members(current_key, members)
+                members = {}
+            current_key = key
+            members[suffix] = tar.extractfile(info).read()
+    if current_key is not None:
+        yield _sample_from_members(current_key, members)
+
+
+def _suffix_for(sample: Dict[str, Any], role: str) -> Optional[str]:
+    """Return the member suffix (e.g. ``hq.png``) for a role in a sample."""
+    for suffix in sample:
+        if suffix.split(".", 1)[0] == role and suffix != "json":
+            return suffix
+    return None
+
+
+def decode_image(data: bytes):
+    """Decode image bytes from a shard into a loaded PIL Image."""
+    from PIL import Image
+
+    img = Image.open(io.BytesIO(data))
+    img.load()
+    return img
+
+
+class ShardReader:
+    """
+    Streaming and random-access reader for a shard directory.
+
+    Iterating yields samples shard by shard using sequential tar reads, which
+    is the fast path on network filesystems. :meth:`read` uses the offsets in
+    ``index.json`` to fetch one sample with a single seek per member.
+
+    Example:
+        >>> reader = ShardReader("shards/")
+        >>> for key, img in reader.iter_images("hq"):
+        ...     print(key, img.size)
+    """
+
+    def __init__(self, shard_dir: str):
+        self.shard_dir = shard_dir
+        self.index = load_shard_index(shard_dir)
+        self._key_map: Optional[Dict[str, Tuple[str, Dict[str, List[int]]]]] = None
+
+    def __len__(self) -> int:
+        return int(self.index.get("total_samples", 0))
+
+    @property
+    def paired(self) -> bool:
+        return bool(self.index.get("paired", False))
+
+    def shard_paths(self) -> List[str]:
+        return [
+            os.path.join(self.shard_dir, shard["name"])
+            for shard in self.index.get("shards", [])
+        ]
+
+    def keys(self) -> List[str]:
+        return [
+            sample["key"]
+            for shard in self.index.get("shards", [])
+            for sample in shard["samples"]
+        ]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for path in self.shard_paths():
+            yield from iter_tar_samples(path)
+
+    def read(self, key: str) -> Dict[str, Any]:
+        """
+        Read a single sample by key using the index offsets.
+
+        Raises:
+            KeyError: If the key is not in the index
+        """
+        if self._key_map is None:
+            self._key_map = {
+                sample["key"]: (shard["name"], sample["members"])
+                for shard in self.index.get("shards", [])
+                for sample in shard["samples"]
+            }
+        shard_name, offsets = self._key_map[key]
+        members = {}
+        with open(os.path.join(self.shard_dir, shard_name), "rb") as f:
+            for suffix, (offset, size) in offsets.items():
+                f.seek(offset)
+                members[suffix] = f.read(size)
+        return _sample_from_members(key, members)
+
+    def iter_images(self, role: str = "hq") -> Iterator[Tuple[str, Any]]:
+        """
+        Yield (key, PIL Image) for one role (``"hq"`` or ``"lq"``) of every sample.
+
+        Lets analysis, scoring and dedup actions consume shards directly.
+        """
+        for sample in self:
+            suffix = _suffix_for(sample, role)
+            if suffix is None:
+                continue
+            try:
+                yield sample["__key__"], decode_image(sample[suffix])
+            except Exception as e:
+                print_warning(f"Could not decode {sample['__key__']}.{suffix}: {e}")
+
+
+def _collect_samples(
+    hq_folder: str, lq_folder: Optional[str]
+) -> List[Tuple[str, Optional[str]]]:
+    """Return (hq_path, lq_path) tuples for every sample to export."""
+    hq_files = get_image_files(hq_folder)
+    if not lq_folder:
+        return [(path, None) for path in hq_files]
+    lq_by_name = {os.path.basename(p): p for p in get_image_files(lq_folder)}
+    pairs = []
+    for hq_path in hq_files:
+        lq_path = lq_by_name.get(os.path.basename(hq_path))
+        if lq_path is not None:
+            pairs.append((hq_path, lq_path))
+    return pairs
+
+
+@monitor_all("export_to_shards")
+def export_to_shards(
+    hq_folder: str,
+    output_dir: str,
+    lq_folder: Optional[str] = None,
+    shard_size_mb: int = DEFAULT_SHARD_SIZE_MB,
+    samples_per_shard: int = DEFAULT_SAMPLES_PER_SHARD,
+    prefix: str = "shard",
+    sample_metadata: Optional[Dict[str, Dict[str, Any]]] = None,
+    read_workers: int = DEFAULT_READ_WORKERS,
+) -> Dict[str, Any]:
+    """
+    Pack an HQ/LQ dataset (or single folder) into WebDataset-style tar shards.
+
+    Args:
+        hq_folder: HQ folder (or the only folder in single-folder mode)
+        output_dir: Directory to write ``<prefix>-NNNNNN.tar`` shards and ``index.json``
+        lq_folder: Optional LQ folder; only filenames present in both are exported
+        shard_size_mb: Target maximum shard size in megabytes
+        samples_per_shard: Maximum number of samples per shard
+        prefix: Shard filename prefix
+        sample_metadata: Optional extra metadata (e.g. quality scores) keyed by filename
+        read_workers: Threads used to prefetch source files
+    Returns:
+        Dict with ``index_path``, ``num_shards`` and ``num_samples``.
+    """
+    print_header("📦 Export Dataset to Tar Shards")
+    samples = _collect_samples(hq_folder, lq_folder)
+    if not samples:
+        print_warning("No images (or matching HQ/LQ pairs) found to export.")
+        return {"index_path": None, "num_shards": 0, "num_samples": 0}
+
+    sample_metadata = sample_metadata or {}
+    used_keys: set = set()
+
+    def load(item):
+        hq_path, lq_path = item
+        return _read_bytes(hq_path), _read_bytes(lq_path) if lq_path else None
+
+    with ShardWriter(
+        output_dir,
+        prefix=prefix,
+        max_shard_bytes=shard_size_mb * 1024 * 1024,
+        max_samples=samples_per_shard,
+        paired=lq_folder is not None,
+    ) as writer:
+        for (hq_path, lq_path), (hq_bytes, lq_bytes) in tqdm(
+            prefetch_map(load, samples, max_workers=read_workers),
+            total=len(samples),
+            desc="Writing shards",
+        ):
+            filename = os.path.basename(hq_path)
+            key = _sample_key(filename, used_keys)
+            hq_ext = os.path.splitext(filename)[1].lower()
+            members = {f"hq{hq_ext}": hq_bytes}
+            meta = {
+                "filename": filename,
+                "hq_sha256": hashlib.sha256(hq_bytes).hexdigest(),
+            }
+            if lq_bytes is not None:
+                lq_ext = os.path.splitext(lq_path)[1].lower()
+                members[f"lq{lq_ext}"] = lq_bytes
+                meta["lq_sha256"] = hashlib.sha256(lq_bytes).hexdigest()
+            meta.update(sample_metadata.get(filename, {}))
+            writer.write(key, members, meta)
+        num_shards = len(writer.shards)
+        num_samples = writer.total_samples
+
+    index_path = os.path.join(output_dir, SHARD_INDEX_FILENAME)
+    print_success(f"Exported {num_samples} samples into {num_shards} shard(s).")
+    print_info(f"Shard index: {index_path}")
+    log_operation(
+        "export_to_shards",
+        f"{hq_folder} (+{lq_folder}) -> {output_dir}: {num_samples} samples, {num_shards} shards",
+    )
+    play_done_sound()
+    return {
+        "index_path": index_path,
+        "num_shards": num_shards,
+        "num_samples": num_samples,
+    }
+
+
+@monitor_all("import_from_shards")
+def import_from_shards(
+    shard_dir: str,
+    hq_output: str,
+    lq_output: Optional[str] = None,
+    verify: bool = True,
+) -> Dict[str, Any]:
+    """
+    Unpack shards back into loose HQ/LQ folders using original filenames.
+
+    Args:
+        shard_dir: Directory containing shards and ``index.json``
+        hq_output: Destination for HQ (or single-folder) images
+        lq_output: Destination for LQ images (required to restore LQ members)
+        verify: Check SHA256 of every member against the stored metadata
+    Returns:
+        Dict with ``imported`` and ``corrupt`` (list of sample keys) entries.
+    """
+    print_header("📂 Import Dataset from Tar Shards")
+    reader = ShardReader(shard_dir)
+    os.makedirs(hq_output, exist_ok=True)
+    if lq_output:
+        os.makedirs(lq_output, exist_ok=True)
+
+    imported = 0
+    corrupt: List[str] = []
+    for sample in tqdm(reader, total=len(reader), desc="Importing shards"):
+        key = sample["__key__"]
+        meta = sample.get("json", {})
+        targets = [("hq", hq_output)]
+        if lq_output:
+            targets.append(("lq", lq_output))
+        ok = True
+        for role, dest_dir in targets:
+            suffix = _suffix_for(sample, role)
+            if suffix is None:
+                continue
+            data = sample[suffix]
+            expected = meta.get(f"{role}_sha256")
+            if verify and expected and hashlib.sha256(data).hexdigest() != expected:
+                ok = False
+                continue
+            # Pairs are matched by basename on export, so HQ and LQ share it
+            filename = meta.get("filename") or f"{key}.{suffix.split('.', 1)[1]}"
+            with open(os.path.join(dest_dir, filename), "wb") as f:
+                f.write(data)
+        if ok:
+            imported += 1
+        else:
+            corrupt.append(key)
+
+    if corrupt:
+        print_error(f"{len(corrupt)} sample(s) failed checksum verification.")
+    print_success(f"Imported {imported} samples from {shard_dir}.")
+    log_operation(
+        "import_from_shards", f"{shard_dir} -> {hq_output}: {imported} samples"
+    )
+    play_done_sound()
+    return {"imported": imported, "corrupt": corrupt}
+
+
+def verify_shards(shard_dir: str) -> Dict[str, Any]:
+    """
+    Stream every shard and check member checksums against the stored metadata.
+
+    Returns:
+        Dict with ``checked`` count, ``corrupt`` keys and ``missing_shards``.
+    """
+    reader = ShardReader(shard_dir)
+    missing = [p for p in reader.shard_paths() if not os.path.exists(p)]
+    checked = 0
+    corrupt: List[str] = []
+    for path in reader.shard_paths():
+        if path in missing:
+            continue
+        for sample in iter_tar_samples(path):
+            checked += 1
+            meta = sample.get("json", {})
+            for role in ("hq", "lq"):
+                suffix = _suffix_for(sample, role)
+                expected = meta.get(f"{role}_sha256")
+                if suffix and expected:
+                    if hashlib.sha256(sample[suffix]).hexdigest() != expected:
+                        corrupt.append(sample["__key__"])
+                        break
+    return {"checked": checked, "corrupt": corrupt, "missing_shards": missing}
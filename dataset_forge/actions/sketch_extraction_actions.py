@@ -1,10 +1,18 @@
+import json
 import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple
+
+import numpy as np
 from PIL import Image
 import torch
+from dataset_forge.utils.cache_utils import CACHE_BASE_DIR
+from dataset_forge.utils.parallel_utils import prefetch_map
 from dataset_forge.utils.progress_utils import tqdm
 from dataset_forge.utils.input_utils import (
+    ask_yes_no,
     get_file_operation_choice,
     get_destination_path,
 )
@@ -101,6 +109,20 @@ def clear_model_cache():
     clear_cuda_cache()
 
 
+def _is_sketch_prediction(
+    pred_class: int, confidence: float, confidence_threshold: float
+) -> bool:
+    """Decide whether a (class, confidence) prediction counts as a sketch."""
+    # For the original Sketch-126-DomainNet model, check if prediction is in sketch class IDs
+    if _loaded_model_name == "prithivMLmods/Sketch-126-DomainNet":
+        return (pred_class in SKETCH_CLASS_IDS) and (
+            confidence >= confidence_threshold
+        )
+    # For fallback models, use a simpler heuristic based on confidence
+    # Higher confidence might indicate more structured/sketch-like content
+    return confidence >= confidence_threshold
+
+
 def is_sketch(image_path: str, confidence_threshold: float = 0.5) -> bool:
     try:
         image = Image.open(image_path).convert("RGB")
@@ -118,48 +140,320 @@ def is_sketch(image_path: str, confidence_threshold: float = 0.5) -> bool:
             pred_class = torch.argmax(probs, dim=1).item()
             confidence = probs[0][pred_class].item()
 
-        # For the original Sketch-126-DomainNet model, check if prediction is in sketch class IDs
-        if _loaded_model_name == "prithivMLmods/Sketch-126-DomainNet":
-            return (pred_class in SKETCH_CLASS_IDS) and (
-                confidence >= confidence_threshold
-            )
-        else:
-            # For fallback models, use a simpler heuristic based on confidence
-            # Higher confidence might indicate more structured/sketch-like content
-            return confidence >= confidence_threshold
+        return _is_sketch_prediction(pred_class, confidence, confidence_threshold)
 
     except Exception as e:
         print_warning(f"Error processing image {image_path}: {e}")
         return False
 
 
+# --- Batched pipeline ---
+
+DEFAULT_SKETCH_BATCH_SIZE = 32
+SUPPORTED_SKETCH_EXTS = [".jpg", ".jpeg", ".png", ".bmp", ".webp"]
+ONNX_MODEL_DIR = os.path.join(CACHE_BASE_DIR, "models")
+
+# Per-worker processor used by the decode pool
+_worker_processor = None
+_inference_fns = {}
+
+
+def _init_preprocess_worker(model_name: str):
+    """Process-pool initializer: load only the (lightweight) image processor."""
+    global _worker_processor
+    torch.set_num_threads(1)
+    _worker_processor = AutoImageProcessor.from_pretrained(model_name)
+
+
+def _preprocess_image(image_path: str, processor=None):
+    """Decode an image and run the processor; returns pixel values or None."""
+    processor = processor or _worker_processor
+    try:
+        with Image.open(image_path) as img:
+            image = img.convert("RGB")
+        return processor(images=image, return_tensors="np")["pixel_values"][0]
+    except Exception:
+        return None
+
+
+def _get_inference_fn(model, backend: str = "torch"):
+    """
+    Return a callable mapping a pixel_values tensor to logits.
+
+    backend:
+        "torch"   - eager PyTorch
+        "compile" - torch.compile'd model (CPU graph optimizations)
+        "onnx"    - ONNX Runtime session exported once to store/cache/models
+    Unavailable backends fall back to eager PyTorch.
+    """
+    key = (id(model), backend)
+    if key in _inference_fns:
+        return _inference_fns[key]
+
+    def eager(pixel_values):
+        with torch.no_grad():
+            return model(pixel_values=pixel_values).logits
+
+    fn = eager
+    if backend == "compile":
+        try:
+            compiled = torch.compile(model)
+
+            def fn(pixel_values):
+                with torch.no_grad():
+                    return compiled(pixel_values=pixel_values).logits
+
+        except Exception as e:
+            print_warning(f"torch.compile unavailable ({e}); using eager PyTorch.")
+            fn = eager
+    elif backend == "onnx":
+        try:
+            fn = _onnx_inference_fn(model)
+        except Exception as e:
+            print_warning(f"ONNX backend unavailable ({e}); using eager PyTorch.")
+            fn = eager
+    _inference_fns[key] = fn
+    return fn
+
+
+def _onnx_inference_fn(model):
+    import onnxruntime as ort
+
+    os.makedirs(ONNX_MODEL_DIR, exist_ok=True)
+    safe_name = (_loaded_model_name or "sketch").replace("/", "__")
+    onnx_path = os.path.join(ONNX_MODEL_DIR, f"{safe_name}.onnx")
+    if not os.path.exists(onnx_path):
+        print_info(f"Exporting sketch model to ONNX: {onnx_path}")
+        size = getattr(model.config, "vision_config", model.config).image_size
+        dummy = torch.zeros(1, 3, size, size)
+        torch.onnx.export(
+            model,
+            (dummy,),
+            onnx_path,
+            input_names=["pixel_values"],
+            output_names=["logits"],
+            dynamic_axes={"pixel_values": {0: "batch"}, "logits": {0: "batch"}},
+        )
+    session = ort.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+
+    def fn(pixel_values):
+        logits = session.run(["logits"], {"pixel_values": pixel_values.numpy()})[0]
+        return torch.from_numpy(logits)
+
+    return fn
+
+
+def classify_batch(pixel_values, backend: str = "torch"):
+    """
+    Classify a batch of preprocessed images.
+
+    Returns:
+        (pred_classes, confidences) lists.
+    """
+    model, _ = get_model_and_processor()
+    logits = _get_inference_fn(model, backend)(torch.as_tensor(pixel_values))
+    probs = torch.nn.functional.softmax(logits.float(), dim=1)
+    confidences, preds = probs.max(dim=1)
+    return preds.tolist(), confidences.tolist()
+
+
+def _load_sketch_results(
+    results_file: Optional[str], model_name: Optional[str], confidence_threshold: float
+) -> Tuple[dict, int]:
+    """
+    Read the finished images of a previous run from its JSONL results.
+
+    Only records made with the same model and confidence threshold count as
+    done; records of failed images are dropped so those images are retried.
+
+    Returns:
+        ({path: record}, number of ignored records)
+    """
+    done = {}
+    ignored = 0
+    if results_file and os.path.exists(results_file):
+        with open(results_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    path = record["path"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if (
+                    record.get("error")
+                    or record.get("model") != model_name
+                    or record.get("threshold") != confidence_threshold
+                ):
+                    ignored += 1
+                    continue
+                done[path] = record
+    return done, ignored
+
+
 def extract_sketches_from_folder(
     input_dir: str,
     output_dir: str,
     operation: str = "copy",
     confidence_threshold: float = 0.5,
+    batch_size: int = DEFAULT_SKETCH_BATCH_SIZE,
+    num_workers: Optional[int] = None,
+    backend: str = "torch",
+    results_file: Optional[str] = None,
+    resume: bool = False,
 ) -> Tuple[int, int]:
+    """
+    Classify every image under input_dir and copy/move the sketches.
+
+    Images are decoded and preprocessed on a worker-process pool (threads when
+    num_workers is 0) and classified in fixed-size batches. Matches are copied
+    or moved on a background thread, and each result is appended to
+    `results_file` (JSONL) once its file operation has finished, so an
+    interrupted scan can be resumed.
+
+    Args:
+        input_dir: Folder to scan recursively
+        output_dir: Destination for sketches
+        operation: "copy" or "move"
+        confidence_threshold: Minimum class confidence
+        batch_size: Images per forward pass
+        num_workers: Preprocessing processes (0 = threads in this process)
+        backend: "torch", "compile" or "onnx"
+        results_file: Optional JSONL results file for resuming
+        resume: Skip images already recorded in results_file by a run with the
+            same model and confidence_threshold; otherwise results_file is
+            overwritten
+
+    Returns:
+        (found, errors)
+    """
     os.makedirs(output_dir, exist_ok=True)
-    supported_exts = [".jpg", ".jpeg", ".png", ".bmp", ".webp"]
-    found, errors = 0, 0
     image_files = []
     for root, _, files in os.walk(input_dir):
-        for fname in files:
+        for fname in sorted(files):
             ext = os.path.splitext(fname)[1].lower()
-            if ext in supported_exts:
+            if ext in SUPPORTED_SKETCH_EXTS:
                 image_files.append(os.path.join(root, fname))
-    for input_path in tqdm(image_files, desc=f"Scanning {os.path.basename(input_dir)}"):
+
+    # Load first: resume records are only valid for the model actually in use
+    model, processor = get_model_and_processor()
+    done, ignored = (
+        _load_sketch_results(results_file, _loaded_model_name, confidence_threshold)
+        if resume
+        else ({}, 0)
+    )
+    found = sum(1 for r in done.values() if r.get("is_sketch"))
+    errors = 0
+    pending = [p for p in image_files if p not in done]
+    if ignored:
+        print_info(
+            f"Ignoring {ignored} earlier result(s) from failed images or a different model/threshold."
+        )
+    if done:
+        print_info(f"Resuming: {len(image_files) - len(pending)} images already scanned.")
+    if not pending:
+        return found, errors
+
+    if num_workers is None:
+        num_workers = max(1, min(8, (os.cpu_count() or 2) - 1))
+    if num_workers > 0:
+        preprocessed = prefetch_map(
+            _preprocess_image,
+            pending,
+            max_workers=num_workers,
+            prefetch=batch_size * 2,
+            use_processes=True,
+            initializer=_init_preprocess_worker,
+            initargs=(_loaded_model_name,),
+        )
+    else:
+        preprocessed = prefetch_map(
+            lambda p: _preprocess_image(p, processor), pending, prefetch=batch_size * 2
+        )
+
+    write_lock = threading.Lock()
+    results_out = None
+    if results_file:
+        os.makedirs(os.path.dirname(os.path.abspath(results_file)), exist_ok=True)
+        results_out = open(results_file, "a" if resume else "w", encoding="utf-8")
+        if resume and results_out.tell() > 0:
+            # Terminate a line left half-written by an interrupted run
+            with open(results_file, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    results_out.write("\n")
+
+    def record(path, is_match, pred=None, confidence=None, error=None):
+        if results_out is None:
+            return
+        line = json.dumps(
+            {
+                "path": path,
+                "is_sketch": is_match,
+                "pred": pred,
+                "confidence": confidence,
+                "error": error,
+                "model": _loaded_model_name,
+                "threshold": confidence_threshold,
+            }
+        )
+        with write_lock:
+            results_out.write(line + "\n")
+            results_out.flush()
+
+    def transfer(path, pred, confidence):
+        dest_path = os.path.join(output_dir, os.path.basename(path))
+        if operation == "copy":
+            shutil.copy2(path, dest_path)
+        elif operation == "move":
+            shutil.move(path, dest_path)
+        record(path, True, pred, confidence)
+
+    file_ops = ThreadPoolExecutor(max_workers=4)
+    futures = []
+
+    def run_batch(batch):
+        nonlocal found, errors
+        paths = [p for p, _ in batch]
         try:
-            if is_sketch(input_path, confidence_threshold=confidence_threshold):
-                dest_path = os.path.join(output_dir, os.path.basename(input_path))
-                if operation == "copy":
-                    shutil.copy2(input_path, dest_path)
-                elif operation == "move":
-                    shutil.move(input_path, dest_path)
-                found += 1
+            preds, confs = classify_batch(np.stack([v for _, v in batch]), backend)
         except Exception as e:
-            print_warning(f"Error processing {input_path}: {e}")
-            errors += 1
+            print_warning(f"Batch classification failed: {e}")
+            errors += len(paths)
+            return
+        for path, pred, conf in zip(paths, preds, confs):
+            if _is_sketch_prediction(pred, conf, confidence_threshold):
+                found += 1
+                futures.append((path, file_ops.submit(transfer, path, pred, conf)))
+            else:
+                record(path, False, pred, conf)
+
+    try:
+        batch = []
+        with tqdm(total=len(pending), desc=f"Scanning {os.path.basename(input_dir)}") as pbar:
+            for path, pixel_values in preprocessed:
+                pbar.update(1)
+                if pixel_values is None:
+                    print_warning(f"Could not open image: {path}")
+                    errors += 1
+                    record(path, False, error="decode failed")
+                    continue
+                batch.append((path, pixel_values))
+                if len(batch) >= batch_size:
+                    run_batch(batch)
+                    batch = []
+            if batch:
+                run_batch(batch)
+        for path, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                print_warning(f"Error processing {path}: {e}")
+                found -= 1
+                errors += 1
+    finally:
+        file_ops.shutdown(wait=True)
+        if results_out is not None:
+            results_out.close()
     return found, errors
 
 
@@ -184,11 +478,30 @@ def extract_sketches_workflow(
         if not output_base:
             print_error("No output folder specified. Aborting.")
             return
+        results_names = (
+            ["sketch_results.jsonl"]
+            if single_folder
+            else ["hq_sketch_results.jsonl", "lq_sketch_results.jsonl"]
+        )
+        resume = False
+        if any(
+            os.path.exists(os.path.join(output_base, name)) for name in results_names
+        ):
+            resume = ask_yes_no(
+                "Results from an earlier scan were found. Resume and skip images "
+                "already scanned with the same model and threshold?",
+                default=False,
+            )
         if single_folder:
             print_info(f"Extracting sketches from: {single_folder}")
             out_dir = os.path.join(output_base, "sketches")
             found, errors = extract_sketches_from_folder(
-                single_folder, out_dir, operation, confidence_threshold
+                single_folder,
+                out_dir,
+                operation,
+                confidence_threshold,
+                results_file=os.path.join(output_base, "sketch_results.jsonl"),
+                resume=resume,
             )
             print_success(
                 f"Extracted {found} sketches from {single_folder} (errors: {errors})"
@@ -197,13 +510,23 @@ def extract_sketches_workflow(
             print_info(f"Extracting sketches from HQ: {hq_folder}")
             out_hq = os.path.join(output_base, "hq_sketches")
             found_hq, errors_hq = extract_sketches_from_folder(
-                hq_folder, out_hq, operation, confidence_threshold
+                hq_folder,
+                out_hq,
+                operation,
+                confidence_threshold,
+                results_file=os.path.join(output_base, "hq_sketch_results.jsonl"),
+                resume=resume,
             )
             print_info(f"Extracted {found_hq} sketches from HQ (errors: {errors_hq})")
             print_info(f"Extracting sketches from LQ: {lq_folder}")
             out_lq = os.path.join(output_base, "lq_sketches")
             found_lq, errors_lq = extract_sketches_from_folder(
-                lq_folder, out_lq, operation, confidence_threshold
+                lq_folder,
+                out_lq,
+                operation,
+                confidence_threshold,
+                results_file=os.path.join(output_base, "lq_sketch_results.jsonl"),
+                resume=resume,
             )
             print_success(
                 f"Extracted {found_lq} sketches from LQ (errors: {errors_lq})"
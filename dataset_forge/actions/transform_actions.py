@@ -1,7 +1,10 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
 import cv2
 import numpy as np
-from PIL import Image, ImageEnhance, ImageFilter, ImageOps
+from PIL import Image, ImageOps
 from dataset_forge.utils.progress_utils import tqdm, image_map, smart_map
 from dataset_forge.utils.parallel_utils import (
     parallel_image_processing,
@@ -15,7 +18,6 @@ from dataset_forge.utils.input_utils import (
     get_file_operation_choice,
     get_destination_path,
 )
-from dataset_forge.utils.file_utils import get_unique_filename
 from dataset_forge.utils.history_log import log_operation
 from dataset_forge.utils.monitoring import monitor_all, task_registry
 from dataset_forge.utils.audio_utils import play_done_sound
@@ -30,6 +32,363 @@ from dataset_forge.utils.printing import (
 from dataset_forge.utils.color import Mocha
 
 
+# Transform chains: an ordered list of (operation, value) pairs applied to a
+# single decoded array. Runs of point-wise operations collapse into one LUT.
+TRANSFORM_TYPES = (
+    "brightness",
+    "contrast",
+    "gamma",
+    "saturation",
+    "sharpness",
+    "blur",
+    "hue",
+)
+POINTWISE_TRANSFORMS = ("brightness", "contrast", "gamma")
+# Luma weights in OpenCV's BGR channel order (ITU-R 601, as PIL's "L" mode)
+_LUMA_BGR = (0.114, 0.587, 0.299)
+# PIL's ImageFilter.SMOOTH kernel, used as the degenerate image for sharpness
+_SMOOTH_KERNEL = np.array([[1, 1, 1], [1, 5, 1], [1, 1, 1]], np.float32) / 13.0
+
+
+def parse_transform_chain(spec) -> list:
+    """
+    Normalise a transform chain.
+
+    Accepts "brightness=1.1, contrast=1.2", a list of "name=value" strings,
+    (name, value) tuples or {"op": name, "value": value} dicts.
+
+    Returns:
+        List of (name, float value) tuples in application order.
+
+    Raises:
+        ValueError: On unknown operations or malformed entries.
+    """
+    items = spec.split(",") if isinstance(spec, str) else spec
+    chain = []
+    for item in items:
+        if isinstance(item, dict):
+            name, value = item.get("op"), item.get("value")
+        elif isinstance(item, str):
+            if not item.strip():
+                continue
+            name, _, value = item.partition("=")
+        else:
+            name, value = item
+        name = str(name).strip().lower()
+        if name not in TRANSFORM_TYPES:
+            raise ValueError(f"Unknown transformation type: {name}")
+        try:
+            chain.append((name, float(value)))
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid value for {name}: {value!r}")
+    if not chain:
+        raise ValueError("Empty transform chain.")
+    return chain
+
+
+def _max_value(dtype) -> Optional[int]:
+    """Full-scale value for integer images, None for float images."""
+    if np.issubdtype(dtype, np.integer):
+        return int(np.iinfo(dtype).max)
+    return None
+
+
+def _luma_weights(channels: int) -> tuple:
+    return _LUMA_BGR if channels == 3 else (1.0 / channels,) * channels
+
+
+def _pointwise(name: str, value: float, x, mean: float, clip: bool = True):
+    """
+    Apply one point-wise op in normalised [0, 1] space.
+
+    Integer images are clipped after every step like PIL's enhancers; float
+    (HDR) images keep values above 1.
+    """
+    if name == "brightness":
+        x = x * value
+    elif name == "contrast":
+        x = mean + value * (x - mean)
+    elif name == "gamma":
+        x = np.power(np.maximum(x, 0.0), 1.0 / value)
+    return np.clip(x, 0.0, 1.0) if clip else x
+
+
+def _channel_histograms(color: np.ndarray, channels: int, maxval: int) -> list:
+    if color.dtype == np.uint8:
+        return [
+            cv2.calcHist([color], [c], None, [256], [0, 256]).ravel()
+            for c in range(channels)
+        ]
+    planes = [color] if color.ndim == 2 else [color[..., c] for c in range(channels)]
+    return [np.bincount(p.ravel(), minlength=maxval + 1) for p in planes]
+
+
+def _apply_pointwise_group(color: np.ndarray, ops: list) -> np.ndarray:
+    """
+    Apply consecutive point-wise ops as one lookup table per channel.
+
+    Contrast needs the mean luminance of its input; it is derived from the
+    source histograms pushed through the LUT built so far, so the whole run
+    still reads the pixels only once.
+    """
+    channels = 1 if color.ndim == 2 else color.shape[2]
+    planes = [color] if color.ndim == 2 else [color[..., c] for c in range(channels)]
+    weights = _luma_weights(channels)
+    maxval = _max_value(color.dtype)
+
+    if maxval is None:
+        # Float images: evaluate directly, no LUT domain
+        planes = [p.astype(np.float32) for p in planes]
+        for name, value in ops:
+            mean = sum(w * float(p.mean()) for w, p in zip(weights, planes))
+            planes = [_pointwise(name, value, p, mean, clip=False) for p in planes]
+        out = planes[0] if color.ndim == 2 else np.dstack(planes)
+        return out.astype(color.dtype)
+
+    hists = None
+    domain = np.arange(maxval + 1, dtype=np.float64) / maxval
+    luts = [domain.copy() for _ in planes]
+    for name, value in ops:
+        mean = 0.0
+        if name == "contrast":
+            if hists is None:
+                hists = _channel_histograms(color, channels, maxval)
+            mean = sum(
+                w * float(np.dot(h, lut)) / max(h.sum(), 1)
+                for w, h, lut in zip(weights, hists, luts)
+            )
+        luts = [_pointwise(name, value, lut, mean) for lut in luts]
+
+    tables = [np.rint(lut * maxval).astype(color.dtype) for lut in luts]
+    if color.dtype == np.uint8:
+        if color.ndim == 2:
+            return cv2.LUT(color, tables[0])
+        return cv2.LUT(color, np.dstack(tables).reshape(1, 256, channels))
+    out = [table[p] for table, p in zip(tables, planes)]
+    return out[0] if color.ndim == 2 else np.dstack(out)
+
+
+def _apply_spatial(color: np.ndarray, name: str, value: float) -> np.ndarray:
+    """Apply a non point-wise op (saturation, sharpness, blur, hue)."""
+    if color.ndim == 2 and name in ("saturation", "hue"):
+        return color
+    if name == "hue" and color.dtype == np.uint8:
+        hsv = cv2.cvtColor(color, cv2.COLOR_BGR2HSV)
+        hsv[:, :, 0] = ((hsv[:, :, 0].astype(np.int32) + int(value)) % 180).astype(
+            np.uint8
+        )
+        return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+
+    maxval = _max_value(color.dtype)
+    x = color.astype(np.float32)
+    if maxval is not None:
+        x /= maxval
+    if name == "saturation":
+        gray = cv2.transform(x, np.array([_LUMA_BGR], np.float32))[..., None]
+        x = gray + value * (x - gray)
+    elif name == "sharpness":
+        smooth = cv2.filter2D(x, -1, _SMOOTH_KERNEL, borderType=cv2.BORDER_REPLICATE)
+        x = smooth + value * (x - smooth)
+    elif name == "blur":
+        if value > 0:
+            x = cv2.GaussianBlur(x, (0, 0), sigmaX=value)
+    elif name == "hue":
+        # Float HSV hue is in degrees; keep the 8-bit unit (2 degrees per step)
+        hsv = cv2.cvtColor(x, cv2.COLOR_BGR2HSV)
+        hsv[:, :, 0] = (hsv[:, :, 0] + 2.0 * value) % 360.0
+        x = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+    if maxval is None:
+        return x.astype(color.dtype)
+    return np.rint(np.clip(x, 0.0, 1.0) * maxval).astype(color.dtype)
+
+
+def apply_transform_chain(image: np.ndarray, chain) -> np.ndarray:
+    """
+    Apply a transform chain to an image array (OpenCV BGR/BGRA/gray layout).
+
+    The alpha channel is carried through untouched and the dtype (8-bit,
+    16-bit or float) is preserved. Consecutive point-wise operations
+    (brightness, contrast, gamma) are fused into one LUT pass.
+
+    Args:
+        image: Image array as returned by cv2.imread(..., IMREAD_UNCHANGED)
+        chain: Anything accepted by parse_transform_chain
+    Returns:
+        Transformed array with the same shape and dtype.
+    """
+    chain = parse_transform_chain(chain)
+    alpha = None
+    color = image
+    if image.ndim == 3 and image.shape[2] in (2, 4):
+        color, alpha = image[..., :-1], image[..., -1:]
+        if color.shape[2] == 1:
+            color = color[..., 0]
+
+    i = 0
+    while i < len(chain):
+        if chain[i][0] in POINTWISE_TRANSFORMS:
+            j = i
+            while j < len(chain) and chain[j][0] in POINTWISE_TRANSFORMS:
+                j += 1
+            color = _apply_pointwise_group(color, chain[i:j])
+            i = j
+        else:
+            color = _apply_spatial(color, *chain[i])
+            i += 1
+
+    if alpha is None:
+        return color
+    if color.ndim == 2:
+        color = color[..., None]
+    return np.concatenate([color, alpha], axis=2)
+
+
+def _read_image_array(path: str) -> Optional[np.ndarray]:
+    """Decode an image once, keeping bit depth and alpha (unicode-path safe)."""
+    data = np.fromfile(path, dtype=np.uint8)
+    image = cv2.imdecode(data, cv2.IMREAD_UNCHANGED)
+    if image is None:
+        # Formats OpenCV cannot decode (e.g. GIF) go through PIL
+        with Image.open(path) as img:
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+            arr = np.array(img)
+        code = cv2.COLOR_RGBA2BGRA if arr.shape[2] == 4 else cv2.COLOR_RGB2BGR
+        image = cv2.cvtColor(arr, code)
+    return image
+
+
+def _write_image_array(path: str, image: np.ndarray) -> None:
+    ext = os.path.splitext(path)[1] or ".png"
+    ok, buf = cv2.imencode(ext, image)
+    if not ok:
+        if image.ndim == 3:
+            code = cv2.COLOR_BGRA2RGBA if image.shape[2] == 4 else cv2.COLOR_BGR2RGB
+            image = cv2.cvtColor(image, code)
+        Image.fromarray(image).save(path)
+        return
+    buf.tofile(path)
+
+
+def transform_image_file(input_path: str, chain, output_path: str) -> None:
+    """Decode input_path once, apply the chain and encode to output_path."""
+    image = _read_image_array(input_path)
+    result = apply_transform_chain(image, chain)
+    out_dir = os.path.dirname(output_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    _write_image_array(output_path, result)
+
+
+def _transform_file_job(job) -> Tuple[str, Optional[str]]:
+    """Process-pool worker: returns (input_path, error or None)."""
+    input_path, output_path, chain, operation = job
+    try:
+        transform_image_file(input_path, chain, output_path)
+        if operation == "move" and os.path.abspath(output_path) != os.path.abspath(
+            input_path
+        ):
+            os.remove(input_path)
+        return input_path, None
+    except Exception as e:
+        return input_path, str(e)
+
+
+def _reserve_output_path(dest_dir: str, filename: str, reserved: set) -> str:
+    """Like get_unique_filename, but also avoids names claimed earlier in this batch."""
+    base, ext = os.path.splitext(filename)
+    candidate, counter = filename, 1
+    while candidate in reserved or os.path.exists(os.path.join(dest_dir, candidate)):
+        candidate = f"{base}_{counter}{ext}"
+        counter += 1
+    reserved.add(candidate)
+    return os.path.join(dest_dir, candidate)
+
+
+def run_transform_jobs(
+    jobs: List[tuple], max_workers: Optional[int] = None, desc: str = "Transforming"
+) -> Dict[str, Optional[str]]:
+    """
+    Run (input, output, chain, operation) jobs on a process pool.
+
+    Returns:
+        Dict of input path -> error message (None on success).
+    """
+    results: Dict[str, Optional[str]] = {}
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers <= 1 or len(jobs) <= 1:
+        for job in tqdm(jobs, desc=desc):
+            path, error = _transform_file_job(job)
+            results[path] = error
+        return results
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as ex:
+        chunksize = max(1, min(32, len(jobs) // (max_workers * 4)))
+        for path, error in tqdm(
+            ex.map(_transform_file_job, jobs, chunksize=chunksize),
+            total=len(jobs),
+            desc=desc,
+        ):
+            results[path] = error
+    return results
+
+
+def transform_pairs(
+    pairs: List[tuple],
+    chain,
+    operation: str = "copy",
+    dest_hq_dir: str = "",
+    dest_lq_dir: str = "",
+    max_workers: Optional[int] = None,
+) -> Tuple[int, int]:
+    """
+    Apply a transform chain to HQ/LQ pairs on a process pool.
+
+    HQ and LQ images are scheduled as independent jobs, so the two halves of
+    a pair run concurrently rather than back to back in one worker. In move
+    mode the sources of a pair are deleted only once both halves were
+    written, so a failure on one side never breaks the pair.
+
+    Args:
+        pairs: (hq_path, lq_path, filename) tuples
+        chain: Transform chain (see parse_transform_chain)
+        operation: "copy", "move" or "inplace"
+    Returns:
+        (successful pairs, failed pairs)
+    """
+    chain = parse_transform_chain(chain)
+    # Workers only write outputs; move-mode sources are removed per pair below
+    job_operation = "copy" if operation == "move" else operation
+    jobs, outputs = [], []
+    reserved_hq, reserved_lq = set(), set()
+    for hq_path, lq_path, filename in pairs:
+        if operation == "inplace":
+            hq_out, lq_out = hq_path, lq_path
+        else:
+            hq_out = _reserve_output_path(dest_hq_dir, filename, reserved_hq)
+            lq_out = _reserve_output_path(dest_lq_dir, filename, reserved_lq)
+        jobs.append((hq_path, hq_out, chain, job_operation))
+        jobs.append((lq_path, lq_out, chain, job_operation))
+        outputs.append(((hq_path, hq_out), (lq_path, lq_out)))
+    errors = run_transform_jobs(jobs, max_workers, desc="Transforming pairs")
+    for path, error in errors.items():
+        if error:
+            print_error(f"Error transforming {path}: {error}")
+    ok = 0
+    for pair in outputs:
+        if any(errors.get(src) for src, _ in pair):
+            continue
+        ok += 1
+        if operation != "move":
+            continue
+        for src, dst in pair:
+            if os.path.abspath(src) == os.path.abspath(dst):
+                continue
+            try:
+                os.remove(src)
+            except OSError as e:
+                print_error(f"Could not remove moved source {src}: {e}")
+    return ok, len(pairs) - ok
+
+
 @monitor_all("apply_transformation_to_image")
 def apply_transformation_to_image(
     input_path: str,
@@ -52,107 +411,22 @@ def apply_transformation_to_image(
         bool: True if successful, False otherwise
     """
     try:
-        # Load image
-        with Image.open(input_path) as img:
-            # Convert to RGB if needed
-            if img.mode != "RGB":
-                img = img.convert("RGB")
-
-            # Apply transformation
-            if transform_type == "brightness":
-                enhancer = ImageEnhance.Brightness(img)
-                img = enhancer.enhance(value)
-            elif transform_type == "contrast":
-                enhancer = ImageEnhance.Contrast(img)
-                img = enhancer.enhance(value)
-            elif transform_type == "saturation":
-                enhancer = ImageEnhance.Color(img)
-                img = enhancer.enhance(value)
-            elif transform_type == "sharpness":
-                enhancer = ImageEnhance.Sharpness(img)
-                img = enhancer.enhance(value)
-            elif transform_type == "blur":
-                img = img.filter(ImageFilter.GaussianBlur(radius=value))
-            elif transform_type == "hue":
-                # Convert to HSV, adjust hue, convert back
-                img_array = np.array(img)
-                hsv = cv2.cvtColor(img_array, cv2.COLOR_RGB2HSV)
-                hsv[:, :, 0] = (hsv[:, :, 0] + value) % 180
-                img_array = cv2.cvtColor(hsv, cv2.COLOR_HSV2RGB)
-                img = Image.fromarray(img_array)
-            else:
-                print_error(f"Unknown transformation type: {transform_type}")
-                return False
-
-            # Save image
-            if operation == "inplace":
-                img.save(input_path)
-            else:
-                # Create output directory if needed
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                img.save(output_path)
-
-            return True
-
+        transform_image_file(
+            input_path,
+            [(transform_type, value)],
+            input_path if operation == "inplace" else output_path,
+        )
+        return True
+    except ValueError as e:
+        print_error(str(e))
+        return False
     except Exception as e:
         print_error(f"Error applying {transform_type} to {input_path}: {e}")
         return False
 
 
-@monitor_all("transform_single_pair", critical_on_error=True)
-def transform_single_pair(
-    pair_info: tuple,
-    transform_type: str,
-    value: float,
-    operation: str,
-    dest_hq_dir: str,
-    dest_lq_dir: str,
-) -> bool:
-    """
-    Transform a single HQ/LQ pair.
-
-    Args:
-        pair_info: Tuple of (hq_path, lq_path, filename)
-        transform_type: Type of transformation
-        value: Transformation value
-        operation: Operation type
-        dest_hq_dir: Destination HQ directory
-        dest_lq_dir: Destination LQ directory
-
-    Returns:
-        bool: True if both images successful, False otherwise
-    """
-    hq_path, lq_path, filename = pair_info
-
-    # Determine output paths
-    if operation == "inplace":
-        hq_output = hq_path
-        lq_output = lq_path
-    else:
-        hq_output = os.path.join(
-            dest_hq_dir, get_unique_filename(dest_hq_dir, filename)
-        )
-        lq_output = os.path.join(
-            dest_lq_dir, get_unique_filename(dest_lq_dir, filename)
-        )
-
-    # Apply transformations
-    hq_success = apply_transformation_to_image(
-        hq_path, transform_type, value, operation, hq_output
-    )
-    lq_success = apply_transformation_to_image(
-        lq_path, transform_type, value, operation, lq_output
-    )
-
-    return hq_success and lq_success
-
-
-@monitor_all("transform_dataset", critical_on_error=True)
-def transform_dataset(hq_folder, lq_folder):
-    """Transform dataset with parallel processing."""
-    print_header("TRANSFORM DATASET", char="=", color=Mocha.lavender)
-
-    # Get transformation type
+def _prompt_transform_chain() -> Optional[list]:
+    """Ask for a single transformation or a comma-separated chain."""
     print_section("Available transformations", char="-", color=Mocha.lavender)
     print_info("1. brightness - Adjust image brightness")
     print_info("2. contrast - Adjust image contrast")
@@ -160,8 +434,12 @@ def transform_dataset(hq_folder, lq_folder):
     print_info("4. sharpness - Adjust image sharpness")
     print_info("5. blur - Apply Gaussian blur")
     print_info("6. hue - Adjust hue (color shift)")
+    print_info("7. gamma - Gamma correction (>1 brightens midtones)")
+    print_info(
+        "Or enter a chain applied in one pass, e.g. brightness=1.1, contrast=1.2, hue=10"
+    )
 
-    transform_choice = input("\nSelect transformation (1-6): ").strip()
+    transform_choice = input("\nSelect transformation (1-7) or chain: ").strip()
 
     transform_map = {
         "1": "brightness",
@@ -170,16 +448,29 @@ def transform_dataset(hq_folder, lq_folder):
         "4": "sharpness",
         "5": "blur",
         "6": "hue",
+        "7": "gamma",
     }
 
-    if transform_choice not in transform_map:
-        print_error("Invalid choice.")
-        return
+    try:
+        if transform_choice in transform_map:
+            selected_transform = transform_map[transform_choice]
+            value = float(input(f"Enter {selected_transform} value: "))
+            return [(selected_transform, value)]
+        return parse_transform_chain(transform_choice)
+    except ValueError as e:
+        print_error(f"Invalid choice: {e}")
+        return None
 
-    selected_transform = transform_map[transform_choice]
 
-    # Get transformation value
-    value = float(input(f"Enter {selected_transform} value: "))
+@monitor_all("transform_dataset", critical_on_error=True)
+def transform_dataset(hq_folder, lq_folder):
+    """Transform dataset with parallel processing."""
+    print_header("TRANSFORM DATASET", char="=", color=Mocha.lavender)
+
+    chain = _prompt_transform_chain()
+    if chain is None:
+        return
+    chain_label = ", ".join(f"{name}={value:g}" for name, value in chain)
 
     # Get operation type
     operation = get_file_operation_choice()
@@ -214,29 +505,16 @@ def transform_dataset(hq_folder, lq_folder):
         lq_path = os.path.join(lq_folder, filename)
         pairs.append((hq_path, lq_path, filename))
 
-    # Setup parallel processing
-    config = ParallelConfig(
-        max_workers=parallel_config.get("max_workers"),
-        processing_type=ProcessingType.THREAD,  # I/O bound task
-        use_gpu=False,  # No GPU needed for basic transformations
-        chunk_size=parallel_config.get("chunk_size", 1),
-    )
-
-    # Process pairs in parallel
-    results = smart_map(
-        lambda pair: transform_single_pair(
-            pair, selected_transform, value, operation, dest_hq_dir, dest_lq_dir
-        ),
+    # HQ and LQ images are independent jobs on a process pool (CPU-bound)
+    successful, failed = transform_pairs(
         pairs,
-        desc=f"Transforming pairs ({selected_transform})",
-        max_workers=config.max_workers,
-        processing_type=ProcessingType.THREAD,
+        chain,
+        operation,
+        dest_hq_dir,
+        dest_lq_dir,
+        max_workers=parallel_config.get("max_workers"),
     )
 
-    # Count results
-    successful = sum(1 for result in results if result)
-    failed = len(results) - successful
-
     print_section("Transformation complete", char="-", color=Mocha.lavender)
     print_info(f"  Successful pairs: {successful}")
     print_info(f"  Failed pairs: {failed}")
@@ -244,7 +522,7 @@ def transform_dataset(hq_folder, lq_folder):
     # Log operation
     log_operation(
         "transform_dataset",
-        f"{selected_transform}={value}, {operation}, {successful}/{len(pairs)} pairs",
+        f"{chain_label}, {operation}, {successful}/{len(pairs)} pairs",
     )
 
     print_success("Dataset transformation complete!")
@@ -256,34 +534,10 @@ def transform_single_folder(folder_path: str):
     """Transform images in a single folder with parallel processing."""
     print_header("TRANSFORM SINGLE FOLDER", char="=", color=Mocha.lavender)
 
-    # Get transformation type
-    print_section("Available transformations", char="-", color=Mocha.lavender)
-    print_info("1. brightness - Adjust image brightness")
-    print_info("2. contrast - Adjust image contrast")
-    print_info("3. saturation - Adjust color saturation")
-    print_info("4. sharpness - Adjust image sharpness")
-    print_info("5. blur - Apply Gaussian blur")
-    print_info("6. hue - Adjust hue (color shift)")
-
-    transform_choice = input("\nSelect transformation (1-6): ").strip()
-
-    transform_map = {
-        "1": "brightness",
-        "2": "contrast",
-        "3": "saturation",
-        "4": "sharpness",
-        "5": "blur",
-        "6": "hue",
-    }
-
-    if transform_choice not in transform_map:
-        print_error("Invalid choice.")
+    chain = _prompt_transform_chain()
+    if chain is None:
         return
-
-    selected_transform = transform_map[transform_choice]
-
-    # Get transformation value
-    value = float(input(f"Enter {selected_transform} value: "))
+    chain_label = ", ".join(f"{name}={value:g}" for name, value in chain)
 
     # Get operation type
     operation = get_file_operation_choice()
@@ -306,29 +560,30 @@ def transform_single_folder(folder_path: str):
 
     print_info(f"\nFound {len(image_files)} images to transform.")
 
-    # Prepare image paths
-    image_paths = [os.path.join(folder_path, f) for f in image_files]
-
-    # Setup parallel processing
-    config = ParallelConfig(
-        max_workers=parallel_config.get("max_workers"),
-        processing_type=ProcessingType.THREAD,
-        use_gpu=False,
-    )
-
-    # Process images in parallel
-    results = image_map(
-        lambda path: apply_transformation_to_image(
-            path, selected_transform, value, operation, dest_dir
-        ),
-        image_paths,
-        desc=f"Transforming images ({selected_transform})",
-        max_workers=config.max_workers,
+    reserved = set()
+    jobs = [
+        (
+            os.path.join(folder_path, f),
+            (
+                os.path.join(folder_path, f)
+                if operation == "inplace"
+                else _reserve_output_path(dest_dir, f, reserved)
+            ),
+            chain,
+            operation,
+        )
+        for f in image_files
+    ]
+    errors = run_transform_jobs(
+        jobs, parallel_config.get("max_workers"), desc="Transforming images"
     )
+    for path, error in errors.items():
+        if error:
+            print_error(f"Error transforming {path}: {error}")
 
     # Count results
-    successful = sum(1 for result in results if result)
-    failed = len(results) - successful
+    successful = sum(1 for error in errors.values() if not error)
+    failed = len(errors) - successful
 
     print_section("Transformation complete", char="-", color=Mocha.lavender)
     print_info(f"  Successful images: {successful}")
@@ -337,7 +592,7 @@ def transform_single_folder(folder_path: str):
     # Log operation
     log_operation(
         "transform_single_folder",
-        f"{selected_transform}={value}, {operation}, {successful}/{len(image_files)} images",
+        f"{chain_label}, {operation}, {successful}/{len(image_files)} images",
     )
 
     print_success("Single folder transformation complete!")
@@ -974,27 +1229,15 @@ def dataset_colour_adjustment(hq_folder, lq_folder):
         lq_path = os.path.join(lq_folder, filename)
         pairs.append((hq_path, lq_path, filename))
 
-    # Setup parallel processing
-    config = ParallelConfig(
-        max_workers=parallel_config.get("max_workers"),
-        processing_type=ProcessingType.THREAD,
-        use_gpu=False,
-    )
-
-    # Process pairs in parallel
-    results = image_map(
-        lambda pair: transform_single_pair(
-            pair, selected_adjustment, value, operation, dest_hq_dir, dest_lq_dir
-        ),
+    successful, failed = transform_pairs(
         pairs,
-        desc=f"Adjusting {selected_adjustment}",
-        max_workers=config.max_workers,
+        [(selected_adjustment, value)],
+        operation,
+        dest_hq_dir,
+        dest_lq_dir,
+        max_workers=parallel_config.get("max_workers"),
     )
 
-    # Count results
-    successful = sum(1 for result in results if result)
-    failed = len(results) - successful
-
     print_success(f"\nColor adjustment complete:")
     print_info(f"  Successful pairs: {successful}")
     print_info(f"  Failed pairs: {failed}")
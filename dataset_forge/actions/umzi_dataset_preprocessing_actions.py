@@ -183,10 +183,83 @@ def safe_model_initialization(
         )
 
 
-def create_embedd_with_progress(img_folder: str, embedder):
-    """Enhanced version of create_embedd with progress tracking."""
+DEFAULT_EMBED_BATCH_SIZE = 16
+DEFAULT_DECODE_WORKERS = 4
+DEFAULT_PAIR_BLOCK_SIZE = 4096
+
+
+def _supports_batched_embedding(embedder) -> bool:
+    """Check whether an embedder exposes the PepeDP ImgToEmbedding internals."""
+    return all(hasattr(embedder, attr) for attr in ("model", "device", "scale", "amp"))
+
+
+def _decode_for_embedding(img_path: str, scale: int = 1):
+    """Read an image as RGB float32 and apply the embedder's downscale (CPU side)."""
+    from pepeline import read, resize, ImgColor, ImgFormat, ResizesAlg, ResizesFilter
+
+    img = read(img_path, ImgColor.RGB, ImgFormat.F32)
+    if scale > 1:
+        h, w = img.shape[:2]
+        img = resize(
+            img,
+            h // scale,
+            w // scale,
+            ResizesAlg.Conv(ResizesFilter.Bilinear),
+            False,
+        )
+    return img
+
+
+def _embed_batch(embedder, images):
+    """Run one forward pass for same-shaped, already downscaled images."""
+    import numpy as np
+    import torch
+
+    x = torch.stack(
+        [
+            torch.from_numpy(np.ascontiguousarray(img.transpose((2, 0, 1))))
+            for img in images
+        ]
+    ).to(embedder.device)
+    if getattr(embedder, "vit", False):
+        x = embedder.check_img_size(x)
+    with torch.inference_mode():
+        with torch.amp.autocast(str(embedder.device), torch.float16, embedder.amp):
+            out = embedder.model(x)
+    out = out.detach().cpu()
+    # Keep the [1, D] shape produced by ImgToEmbedding.__call__
+    return [out[k : k + 1] for k in range(len(images))]
+
+
+def create_embedd_with_progress(
+    img_folder: str,
+    embedder,
+    batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+    num_workers: int = DEFAULT_DECODE_WORKERS,
+    max_buffered: Optional[int] = None,
+):
+    """
+    Enhanced version of create_embedd with progress tracking and batching.
+
+    Images are decoded (and downscaled) by a background thread pool while the
+    model runs. For PepeDP ImgToEmbedding embedders, decoded images with the
+    same shape are grouped into batches of up to `batch_size` and embedded with
+    one forward pass; other callables are applied one image at a time. At most
+    `max_buffered` decoded images wait in partial batches (the largest is
+    embedded early when the cap is hit).
+
+    Args:
+        img_folder: Folder with images to embed
+        embedder: PepeDP ImgToEmbedding instance (or any image -> tensor callable)
+        batch_size: Maximum images per forward pass
+        num_workers: Threads used to decode images ahead of the model
+        max_buffered: Cap on decoded images held across shapes
+            (defaults to 4 * batch_size)
+    Returns:
+        Dict mapping filename to a [1, D] CPU embedding tensor.
+    """
     import os
-    from pepeline import read, ImgColor, ImgFormat
+    from dataset_forge.utils.parallel_utils import ShapeBatcher, prefetch_map
 
     # Get list of image files
     image_files = [
@@ -199,28 +272,111 @@ def create_embedd_with_progress(img_folder: str, embedder):
         print_warning("No image files found in the specified folder")
         return {}
 
+    batched = _supports_batched_embedding(embedder) and batch_size > 1
+    scale = embedder.scale if batched else 1
+
+    def decode(img_name):
+        try:
+            return _decode_for_embedding(os.path.join(img_folder, img_name), scale)
+        except Exception as e:
+            return e
+
     embedded = {}
+    batcher = ShapeBatcher(batch_size, max_buffered)
+
+    def flush(batch):
+        names, images = zip(*batch)
+        try:
+            results = _embed_batch(embedder, list(images))
+        except Exception as e:
+            print_warning(f"Batch embedding failed ({e}); retrying images one by one")
+            results = []
+            for name, img in zip(names, images):
+                try:
+                    results.append(_embed_batch(embedder, [img])[0])
+                except Exception as inner:
+                    print_warning(f"Failed to process {name}: {inner}")
+                    results.append(None)
+        for name, emb in zip(names, results):
+            if emb is not None:
+                embedded[name] = emb
+        pbar.update(len(names))
 
     # Create progress bar for embedding creation
     with tqdm(total=len(image_files), desc="Creating embeddings", unit="img") as pbar:
-        for img_name in image_files:
-            try:
-                img_path = os.path.join(img_folder, img_name)
-                img = read(img_path, ImgColor.RGB, ImgFormat.F32)
-                embedded[img_name] = embedder(img).detach().cpu()
+        for img_name, img in prefetch_map(decode, image_files, max_workers=num_workers):
+            if isinstance(img, Exception):
+                print_warning(f"Failed to process {img_name}: {img}")
                 pbar.update(1)
-            except Exception as e:
-                print_warning(f"Failed to process {img_name}: {e}")
+                continue
+            if not batched:
+                try:
+                    embedded[img_name] = embedder(img).detach().cpu()
+                except Exception as e:
+                    print_warning(f"Failed to process {img_name}: {e}")
                 pbar.update(1)
                 continue
+            ready = batcher.add(img.shape, (img_name, img))
+            if ready:
+                flush(ready)
+        for batch in batcher.drain():
+            flush(batch)
+
+    # Preserve directory listing order regardless of batch grouping
+    return {name: embedded[name] for name in image_files if name in embedded}
+
+
+def iter_blocked_pairs(
+    E, dist_func, threshold: float, block_size: int = DEFAULT_PAIR_BLOCK_SIZE
+):
+    """
+    Yield (i, j, distances) for every block of the pairwise search (hits have i < j).
+
+    The upper triangle of the N x N distance matrix is tiled into
+    block_size x block_size blocks; each block is one dist_func call (a matmul
+    or cdist), thresholded on-device, and only the sparse hits are copied to
+    the CPU.
+
+    Args:
+        E: [N, D] embedding tensor (already on the target device)
+        dist_func: Pairwise distance function returning an [n, m] matrix
+        threshold: Pairs with distance strictly below this are returned
+        block_size: Rows/columns per block (memory is O(block_size^2))
+    Returns:
+        Iterator of (i_indices, j_indices, distances) CPU tensors, one per block
+        (empty tensors for blocks without hits).
+    """
+    import torch
 
-    return embedded
+    N = E.size(0)
+    for r0 in range(0, N, block_size):
+        r1 = min(r0 + block_size, N)
+        rows = E[r0:r1]
+        for c0 in range(r0, N, block_size):
+            c1 = min(c0 + block_size, N)
+            dists = dist_func(rows, E[c0:c1])
+            mask = dists < threshold
+            if c0 == r0:
+                mask = torch.triu(mask, diagonal=1)
+            hits = mask.nonzero().cpu()
+            values = dists[mask].float().cpu()
+            yield hits[:, 0] + r0, hits[:, 1] + c0, values
 
 
 def filtered_pairs_with_progress(
-    embeddings, dist_func, threshold: float = 1.5, device_str: str = None
+    embeddings,
+    dist_func,
+    threshold: float = 1.5,
+    device_str: str = None,
+    block_size: int = DEFAULT_PAIR_BLOCK_SIZE,
 ):
-    """Enhanced version of filtered_pairs with progress tracking."""
+    """
+    Enhanced version of filtered_pairs using a blocked pairwise search.
+
+    Returns the same structure as pepedp's filtered_pairs: a dict with
+    ``names`` and ``filtered_pairs`` (list of (i, j, distance) with i < j,
+    sorted by i then j).
+    """
     import torch
 
     names = list(embeddings.keys())
@@ -243,24 +399,18 @@ def filtered_pairs_with_progress(
     N = E.size(0)
     filtered_pairs = []
 
-    # Create progress bar for duplicate detection
-    with tqdm(total=N, desc="Finding duplicates", unit="img") as pbar:
-        for i in range(N):
-            anchor = E[i].unsqueeze(0)  # [1, D]
-            compare_to = E[i + 1 :]  # [N - i - 1, D]
-            if compare_to.size(0) == 0:
-                pbar.update(1)
-                continue
-
-            dists = dist_func(anchor, compare_to).squeeze(0)  # [N - i - 1]
-            mask = dists < threshold
-            j_indices = torch.nonzero(mask).squeeze(1) + (i + 1)
-
-            for idx, dist_val in zip(j_indices.tolist(), dists[mask].tolist()):
-                filtered_pairs.append((i, idx, dist_val))
+    n_row_blocks = -(-N // block_size)
+    total_blocks = n_row_blocks * (n_row_blocks + 1) // 2
 
+    # Create progress bar for duplicate detection
+    with tqdm(total=total_blocks, desc="Finding duplicates", unit="block") as pbar:
+        for i_idx, j_idx, values in iter_blocked_pairs(
+            E, dist_func, threshold, block_size
+        ):
+            filtered_pairs.extend(zip(i_idx.tolist(), j_idx.tolist(), values.tolist()))
             pbar.update(1)
 
+    filtered_pairs.sort(key=lambda pair: (pair[0], pair[1]))
     return {
         "names": names,
         "filtered_pairs": filtered_pairs,
@@ -374,6 +374,50 @@ def analyze_properties_menu():
 
         play_done_sound()
 
+    def batch_native_resolution_workflow():
+        """Run getnative or resdet over a whole folder, resuming earlier runs."""
+        import os
+
+        from dataset_forge.utils.input_utils import ask_int, ask_yes_no
+
+        folder = get_path_with_history(
+            "📁 Enter folder of images:", allow_hq_lq=True, allow_single_folder=True
+        )
+        if not folder or not os.path.isdir(folder):
+            print_error("❌ Please select a valid folder.")
+            return
+        tool_options = {
+            "1": ("🧪 getnative (VapourSynth, Python)", "getnative"),
+            "2": ("⚡ resdet (C binary, fast)", "resdet"),
+            "0": ("⬅️  Back", None),
+        }
+        tool_key = show_menu("Choose detection tool", tool_options, Mocha.lavender)
+        if tool_key not in ("1", "2"):
+            return
+        tool = tool_options[tool_key][1]
+        results_file = os.path.join(folder, f"native_resolution_{tool}.jsonl")
+        resume = True
+        retry_failed = True
+        if os.path.exists(results_file):
+            print_info(f"Found results from an earlier run: {results_file}")
+            resume = ask_yes_no("Resume it (skip images already analyzed)?", default=True)
+            if resume:
+                retry_failed = ask_yes_no("Retry images that failed last time?", default=True)
+        max_workers = ask_int("Concurrent tool processes", default=4, min_value=1)
+
+        from dataset_forge.actions.getnative_actions import batch_find_native_resolution
+
+        batch_find_native_resolution(
+            folder,
+            tool=tool,
+            results_file=results_file,
+            resume=resume,
+            max_workers=max_workers,
+            retry_failed=retry_failed,
+        )
+        print_prompt("\n⏸️ Press Enter to return to the menu...")
+        input()
+
     def find_native_resolution_workflow():
         """Find native resolution of images."""
         print_header("🎯 Find Native Resolution", color=Mocha.yellow)
@@ -388,6 +432,7 @@ def analyze_properties_menu():
         input_type_options = {
             "1": ("📁 Folder (HQ/LQ)", "folder"),
             "2": ("🖼️ Single Image", "image"),
+            "3": ("📦 Batch Folder (every image, resumable)", "batch"),
             "0": ("⬅️  Back", None),
         }
 
@@ -410,6 +455,9 @@ def analyze_properties_menu():
                     allow_single_folder=True,
                 )
                 break
+            elif key == "3":
+                batch_native_resolution_workflow()
+                return
             elif key == "2":
                 while True:
                     image_path = get_path_with_history("🖼️ Enter image file path:")
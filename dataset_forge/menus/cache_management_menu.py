@@ -123,6 +123,18 @@ def view_cache_statistics():
                 print_info(f"  Size: {size_mb:.2f} MB")
                 print_info("")
 
+        from dataset_forge.utils.feature_store import get_feature_store
+
+        feature_stats = get_feature_store().stats()
+        if feature_stats:
+            print_section("Feature Store", char="-", color=Mocha.lavender)
+            for family, info in feature_stats.items():
+                print_info(
+                    f"  {family:<24} {info['rows']:>10,} images "
+                    f"{info['bytes'] / (1024 * 1024):>9.2f} MB ({info['segments']} segments)"
+                )
+            print_info("")
+
         # Show performance score
         analysis = analyze_cache_performance()
         performance_score = analysis.get("performance_score", 0)
@@ -144,14 +156,15 @@ def clear_caches_menu():
         "2": ("💾 Clear Disk Cache", clear_disk_cache_action),
         "3": ("🤖 Clear Model Cache", clear_model_cache_action),
         "4": ("🧠 Clear In-Memory Cache", clear_in_memory_cache_action),
+        "5": ("🧬 Clear Feature Store", clear_feature_store_action),
         "0": ("🚪 Back", None),
     }
 
     # Define menu context for help system
     menu_context = {
         "Purpose": "Clear different types of caches to free up resources",
-        "Options": "4 cache clearing operations",
-        "Navigation": "Use numbers 1-4 to select, 0 to go back",
+        "Options": "5 cache clearing operations",
+        "Navigation": "Use numbers 1-5 to select, 0 to go back",
     }
 
     while True:
@@ -257,6 +270,34 @@ def clear_in_memory_cache_action():
     input()
 
 
+def clear_feature_store_action():
+    """Clear stored per-image features (quality, hashes, embeddings...) with confirmation."""
+    print_section("🧬 Clear Feature Store")
+
+    from dataset_forge.utils.feature_store import get_feature_store
+
+    store = get_feature_store()
+    families = sorted({name.split("@", 1)[0] for name in store.stats()})
+    if not families:
+        print_info("The feature store is empty.")
+    else:
+        print_info(f"Stored features: {', '.join(families)}")
+        print_warning("Cleared features will be recomputed the next time they are needed.")
+        feature = input("Feature to clear (blank for all): ").strip() or None
+        confirm = input("Are you sure you want to continue? (yes/no): ").strip().lower()
+        if confirm in ["yes", "y"]:
+            try:
+                removed = store.clear(feature)
+                print_success(f"Removed {removed} feature column famil{'y' if removed == 1 else 'ies'}.")
+            except Exception as e:
+                print_error(f"Failed to clear feature store: {e}")
+        else:
+            print_info("Feature store clearing cancelled.")
+
+    print_prompt("Press Enter to return to the menu...")
+    input()
+
+
 def cache_performance_analysis():
     """Display detailed cache performance analysis."""
     print_section("📈 Cache Performance Analysis")
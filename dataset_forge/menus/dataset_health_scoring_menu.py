@@ -33,6 +33,12 @@ def dataset_health_scoring_menu():
         print_info("  [1] Single folder (all images in one folder)")
         print_info("  [2] HQ/LQ parent folder (contains HQ and LQ subfolders)")
         mode = input("Enter 1 for single folder, 2 for HQ/LQ parent: ").strip()
+        print_info("Choose scan mode:")
+        print_info("  [1] Full scan (open every image)")
+        print_info("  [2] Fast preview (2% stratified sample, score with 95% range)")
+        sample_fraction = (
+            0.02 if input("Enter 1 for full scan, 2 for preview: ").strip() == "2" else None
+        )
         if mode == "2":
             parent_path = get_folder_path("Enter HQ/LQ parent folder path:")
             # Try to auto-detect HQ/LQ subfolders
@@ -54,13 +60,13 @@ def dataset_health_scoring_menu():
             print_info(f"Selected HQ: {hq_path}")
             print_info(f"Selected LQ: {lq_path}")
             print_info("Running health scoring for HQ/LQ pair...\n")
-            results = score_dataset(hq_path, lq_path)
+            results = score_dataset(hq_path, lq_path, sample_fraction=sample_fraction)
             dataset_path_display = f"HQ: {hq_path}\nLQ: {lq_path}"
         else:
             dataset_path = get_path_with_history("Enter path to dataset folder:")
             print_info(f"Selected dataset: {dataset_path}")
             print_info("Running health scoring...\n")
-            results = score_dataset(dataset_path)
+            results = score_dataset(dataset_path, sample_fraction=sample_fraction)
             dataset_path_display = dataset_path
         # Show step results (detailed breakdown)
         health = results["health_score"]
@@ -70,6 +76,14 @@ def dataset_health_scoring_menu():
             print_info(f"  {icon} {label} ({pts} pts)")
         print_info("\n─────────────────────────────")
         print_info(f"Dataset Health Score: {health['score']}/100")
+        score_range = health.get("score_range")
+        if score_range and score_range[0] != score_range[1]:
+            scan = results.get("scan", {})
+            print_info(
+                f"95% range: {score_range[0]}-{score_range[1]} "
+                f"(sampled {scan.get('inspected', 0)} of {scan.get('images', 0)} images; "
+                f"❔ = not settled by the sample)"
+            )
         print_info(f"Status: {health['status']}")
         print_info("─────────────────────────────\n")
         if health["suggestions"]:
@@ -16,6 +16,7 @@ from dataset_forge.utils.input_utils import (
     get_folder_path,
     get_path_with_history,
     ask_yes_no,
+    ask_int,
 )
 from dataset_forge.utils import monitoring
 from dataset_forge.utils.menu import lazy_menu
@@ -147,26 +148,76 @@ def combine_split_menu():
         )
         dataset_actions.split_adjust_dataset(hq_folder, lq_folder)
 
+    def export_to_shards_menu():
+        from dataset_forge.actions import shard_actions
+
+        hq_folder = get_folder_path("📁 Enter HQ folder path (or single folder): ")
+        lq_folder = get_folder_path(
+            "📁 Enter LQ folder path (leave blank for single-folder): ",
+            allow_blank=True,
+            allow_hq_lq_options=False,
+        )
+        output_dir = get_folder_path("📦 Enter output folder for shards: ")
+        shard_size_mb = ask_int(
+            "Maximum shard size in MB",
+            default=shard_actions.DEFAULT_SHARD_SIZE_MB,
+            min_value=1,
+        )
+        samples_per_shard = ask_int(
+            "Maximum samples per shard",
+            default=shard_actions.DEFAULT_SAMPLES_PER_SHARD,
+            min_value=1,
+        )
+        shard_actions.export_to_shards(
+            hq_folder,
+            output_dir,
+            lq_folder=lq_folder or None,
+            shard_size_mb=shard_size_mb,
+            samples_per_shard=samples_per_shard,
+        )
+
+    def import_from_shards_menu():
+        from dataset_forge.actions import shard_actions
+
+        shard_dir = get_folder_path("📦 Enter shard folder (containing index.json): ")
+        hq_output = get_folder_path("📁 Enter HQ output folder path: ")
+        lq_output = get_folder_path(
+            "📁 Enter LQ output folder path (leave blank to skip LQ): ",
+            allow_blank=True,
+            allow_hq_lq_options=False,
+        )
+        try:
+            shard_actions.import_from_shards(
+                shard_dir, hq_output, lq_output=lq_output or None
+            )
+        except FileNotFoundError as e:
+            print_error(str(e))
+
     options = {
         "1": ("🔗 Combine Multiple Datasets", dataset_actions.combine_datasets),
         "2": ("✂️  Split and Adjust Dataset", split_adjust_dataset_menu),
+        "3": ("📦 Export to Tar Shards", export_to_shards_menu),
+        "4": ("📂 Import from Tar Shards", import_from_shards_menu),
         "0": ("⬅️  Back", None),
     }
 
     # Define menu context for help system
     menu_context = {
-        "Purpose": "Combine multiple datasets or split existing datasets into subsets",
-        "Options": "2 operations available",
-        "Navigation": "Use numbers 1-2 to select, 0 to go back",
+        "Purpose": "Combine multiple datasets, split existing datasets into subsets, or pack them into streamable tar shards",
+        "Options": "4 operations available",
+        "Navigation": "Use numbers 1-4 to select, 0 to go back",
         "Key Features": [
             "🔗 Combine Multiple Datasets - Merge multiple datasets into one",
             "✂️ Split and Adjust Dataset - Divide dataset into training/validation sets",
+            "📦 Export to Tar Shards - Pack HQ/LQ pairs and metadata into WebDataset-style shards",
+            "📂 Import from Tar Shards - Unpack shards back into loose HQ/LQ folders",
         ],
         "Tips": [
             "Combine datasets when you have multiple sources to merge",
             "Split datasets to create training and validation sets",
             "Use split operations for machine learning workflows",
             "Combined datasets maintain original file organization",
+            "Shards avoid millions of small-file operations on network filesystems",
         ],
     }
 
@@ -216,19 +267,24 @@ def hq_lq_pairs_menu():
         ),
         "3": ("🎲 Extract Random Pairs", extract_random_pairs),
         "4": ("🔄 Shuffle Image Pairs", shuffle_image_pairs),
+        "5": (
+            "🩹 Resume/Roll Back Interrupted Operation",
+            dataset_actions.recover_interrupted_file_operations,
+        ),
         "0": ("⬅️  Back", None),
     }
 
     # Define menu context for help system
     menu_context = {
         "Purpose": "Manage high-quality and low-quality image pairs for super-resolution training",
-        "Options": "4 pair management operations",
-        "Navigation": "Use numbers 1-4 to select, 0 to go back",
+        "Options": "5 pair management operations",
+        "Navigation": "Use numbers 1-5 to select, 0 to go back",
         "Key Features": [
             "🔗 Create/Correct Manual Pairings - Manually create or fix HQ/LQ pairings",
             "🔍 Find Pairs with Fuzzy Matching - Automatically find matching pairs",
             "🎲 Extract Random Pairs - Select random subset of pairs",
             "🔄 Shuffle Image Pairs - Randomize pair order for training",
+            "🩹 Resume/Roll Back Interrupted Operation - Finish or undo a shuffle/split/removal that was cut off",
         ],
         "Tips": [
             "Manual pairings are best for small, curated datasets",
@@ -347,11 +403,45 @@ def clean_organize_menu():
         dataset_actions.remove_small_pairs(hq_folder, lq_folder)
 
     def organize_by_orientation():
+        from dataset_forge.actions.orientation_organizer_actions import (
+            parse_aspect_buckets,
+        )
+
         hq_folder = get_folder_path("📁 Enter HQ folder path: ")
         lq_folder = get_folder_path(
             "📁 Enter LQ folder path: ", allow_blank=True, allow_hq_lq_options=False
         )
-        dataset_actions.organize_hq_lq_by_orientation(hq_folder, lq_folder)
+        spec = input(
+            "Aspect buckets (e.g. 1:1,4:3,3:4,16:9) or blank for landscape/portrait/square: "
+        ).strip()
+        try:
+            buckets = parse_aspect_buckets(spec) if spec else None
+        except ValueError as e:
+            print_error(str(e))
+            return
+        operation = (
+            input("Operation: [copy] / move / link (hardlink): ").strip().lower()
+            or "copy"
+        )
+        if operation not in ("copy", "move", "link"):
+            print_error(f"Unknown operation: {operation}")
+            return
+        if lq_folder:
+            out_hq = get_path_with_history("📁 Output HQ folder: ")
+            out_lq = get_path_with_history("📁 Output LQ folder: ")
+            dataset_actions.organize_hq_lq_by_orientation(
+                hq_folder,
+                lq_folder,
+                out_hq,
+                out_lq,
+                operation=operation,
+                buckets=buckets,
+            )
+        else:
+            out_folder = get_path_with_history("📁 Output folder: ")
+            dataset_actions.organize_images_by_orientation(
+                hq_folder, out_folder, operation=operation, buckets=buckets
+            )
 
     def batch_rename_menu():
         options = {
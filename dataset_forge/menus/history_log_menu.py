@@ -6,7 +6,13 @@ from dataset_forge.utils.printing import (
     print_section,
 )
 from dataset_forge.utils.color import Mocha
-from dataset_forge.utils.history_log import list_logs, read_log, read_most_recent_log
+from dataset_forge.utils.history_log import (
+    list_logs,
+    read_log,
+    read_most_recent_log,
+    query_log,
+    format_log_record,
+)
 
 
 def view_most_recent_log():
@@ -44,6 +50,34 @@ def select_log_to_view():
     input("\nPress Enter to return...")
 
 
+def filter_logs():
+    print_section("Filter Log Records", color=Mocha.sapphire)
+    action = input("Action (blank for any): ").strip() or None
+    start = input("From date YYYY-MM-DD (blank for any): ").strip() or None
+    end = input("To date YYYY-MM-DD (blank for any): ").strip() or None
+    errors_only = input("Only failures? [y/N]: ").strip().lower() == "y"
+    contains = input("Text in details/path (blank for any): ").strip() or None
+    try:
+        records = query_log(
+            limit=200,
+            action=action,
+            start_date=start,
+            end_date=end,
+            outcome="error" if errors_only else None,
+            contains=contains,
+        )
+    except ValueError as e:
+        print_error(f"Invalid filter: {e}")
+        input("\nPress Enter to return...")
+        return
+    print_header(f"Matching Records (latest {len(records)})", color=Mocha.mauve)
+    if not records:
+        print_info("No matching records.")
+    for record in records:
+        print_info(format_log_record(record))
+    input("\nPress Enter to return...")
+
+
 def history_log_menu():
     options = history_log_menu.__menu_options__
     from dataset_forge.utils.printing import print_error
@@ -51,9 +85,9 @@ def history_log_menu():
     # Define menu context for help system
     menu_context = {
         "Purpose": "View and manage change/history logs",
-        "Total Options": "2 log operations",
-        "Navigation": "Use numbers 1-2 to select, 0 to go back",
-        "Key Features": "View recent logs, select specific logs",
+        "Total Options": "3 log operations",
+        "Navigation": "Use numbers 1-3 to select, 0 to go back",
+        "Key Features": "View recent logs, select specific logs, filter by action/date",
     }
 
     while True:
@@ -78,5 +112,6 @@ def history_log_menu():
 history_log_menu.__menu_options__ = {
     "1": ("View most recent log", view_most_recent_log),
     "2": ("Select a log to view", select_log_to_view),
+    "3": ("Filter records by action/date", filter_logs),
     "0": ("Return to main menu", None),
 }
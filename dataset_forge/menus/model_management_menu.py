@@ -219,8 +219,14 @@ def list_downloaded_models_menu(models):
         test_model,
     )
 
+    from dataset_forge.utils.download_utils import HASH_SIDECAR_SUFFIX, PART_SUFFIX
+
+    # Skip checksum sidecars and unfinished downloads kept next to the models
     model_files = [
-        f for f in os.listdir(MODELS_DIR) if os.path.isfile(os.path.join(MODELS_DIR, f))
+        f
+        for f in os.listdir(MODELS_DIR)
+        if os.path.isfile(os.path.join(MODELS_DIR, f))
+        and not f.endswith((HASH_SIDECAR_SUFFIX, PART_SUFFIX))
     ]
     if not model_files:
         print_warning("No models have been downloaded yet.")
@@ -19,6 +19,10 @@ def outlier_detection_menu():
     print_info("  2. Single folder (flag outliers in one set)")
     print_info("")
     mode = input("Select mode: [1] HQ/LQ pair, [2] Single folder: ").strip()
+    method_choice = input(
+        "Scoring method: [1] Mahalanobis (default), [2] kNN distance, [3] Isolation forest: "
+    ).strip()
+    method = {"2": "knn", "3": "isolation_forest"}.get(method_choice, "mahalanobis")
     if mode == "1":
         hq = get_path_with_history(
             "Enter HQ folder path:", allow_hq_lq=True, allow_single_folder=True
@@ -27,13 +31,13 @@ def outlier_detection_menu():
             "Enter LQ folder path:", allow_hq_lq=True, allow_single_folder=True
         )
         print_section("Outlier Detection Progress", color=Mocha.maroon)
-        detect_outliers(hq_folder=hq, lq_folder=lq)
+        detect_outliers(hq_folder=hq, lq_folder=lq, method=method)
     elif mode == "2":
         folder = get_path_with_history(
             "Enter folder path:", allow_hq_lq=True, allow_single_folder=True
         )
         print_section("Outlier Detection Progress", color=Mocha.maroon)
-        detect_outliers(single_path=folder)
+        detect_outliers(single_path=folder, method=method)
     else:
         print_warning("Invalid mode selected.")
     print_prompt("\nPress Enter to return to the menu...")
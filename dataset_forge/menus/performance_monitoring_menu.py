@@ -30,7 +30,7 @@ from dataset_forge.utils.menu_cache import (
     cleanup_menu_cache,
     menu_preload_cache,
 )
-from dataset_forge.utils.monitoring import time_and_record_menu_load
+from dataset_forge.utils.monitoring import time_and_record_menu_load, resource_sampler
 from dataset_forge.utils.audio_utils import play_done_sound
 
 
@@ -47,14 +47,15 @@ def performance_monitoring_menu():
         "6": ("🚀 Preload Common Menus", preload_common_menus_action),
         "7": ("📊 System Performance Overview", system_performance_overview_action),
         "8": ("🔧 Performance Settings", performance_settings_action),
+        "9": ("📉 Resource Timeline", resource_timeline_action),
         "0": ("⬅️  Back", None),
     }
 
     # Define menu context for help system
     menu_context = {
         "Purpose": "Monitor and optimize menu system performance",
-        "Total Options": "8 performance monitoring operations",
-        "Navigation": "Use numbers 1-8 to select, 0 to go back",
+        "Total Options": "9 performance monitoring operations",
+        "Navigation": "Use numbers 1-9 to select, 0 to go back",
         "Key Features": [
             "Menu performance statistics and load time analysis",
             "Menu cache statistics with hit/miss rates",
@@ -63,12 +64,14 @@ def performance_monitoring_menu():
             "Menu preloading for improved performance",
             "System performance overview and monitoring",
             "Performance settings and configuration",
+            "Resource timeline sampling with sparklines and CSV/Parquet export",
         ],
         "Tips": [
             "Use Menu Performance Statistics to identify slow-loading menus",
             "Monitor cache hit rates to optimize cache settings",
             "Run cache optimization regularly for best performance",
             "Preload common menus for faster navigation",
+            "Start the resource timeline before long runs to spot I/O stalls",
         ],
     }
 
@@ -316,6 +319,77 @@ def system_performance_overview_action():
         print_error(f"Error displaying system performance: {e}")
 
 
+def resource_timeline_action():
+    """Start/stop the resource sampler, show sparklines and export samples."""
+    print_section("📉 Resource Timeline")
+
+    try:
+        status = "running" if resource_sampler.running else "stopped"
+        print_info(
+            f"Sampler: {status}  Interval: {resource_sampler.interval}s  "
+            f"Samples: {len(resource_sampler)}/{resource_sampler.capacity}"
+        )
+
+        if len(resource_sampler):
+            print_section("Recent Activity", char="-", color=Mocha.lavender)
+            for label, field in [
+                ("CPU %", "cpu_percent"),
+                ("RSS", "rss_bytes"),
+                ("Disk read", "disk_read_bps"),
+                ("Disk write", "disk_write_bps"),
+                ("Open files", "open_files"),
+                ("GPU mem", "gpu_mem_bytes"),
+            ]:
+                line = resource_sampler.sparkline(field)
+                if line:
+                    print_info(f"  {label:<11} {line}")
+
+            print_section("By Operation", char="-", color=Mocha.lavender)
+            for operation, stats in resource_sampler.operation_summary().items():
+                print_info(
+                    f"  {operation}: {stats['samples']} samples, "
+                    f"CPU {stats['cpu_percent']:.1f}%, RSS {stats['rss_mb']:.0f}MB, "
+                    f"read {stats['disk_read_mbps']:.1f}MB/s, "
+                    f"write {stats['disk_write_mbps']:.1f}MB/s"
+                )
+
+        print_info("\n📝 Options:")
+        print_info(f"  1. {'Stop' if resource_sampler.running else 'Start'} sampling")
+        print_info("  2. Export samples (CSV/Parquet)")
+        print_info("  3. Clear samples")
+        print_prompt("\nEnter option (1-3, or 0 to cancel): ")
+        choice = input().strip()
+
+        if choice == "1":
+            if resource_sampler.running:
+                resource_sampler.stop()
+                print_success("✅ Resource sampling stopped.")
+            else:
+                print_prompt(f"Sampling interval in seconds [{resource_sampler.interval}]: ")
+                value = input().strip()
+                resource_sampler.start(float(value) if value else None)
+                print_success(
+                    f"✅ Resource sampling every {resource_sampler.interval}s."
+                )
+        elif choice == "2":
+            print_prompt("Output file (.csv or .parquet): ")
+            path = input().strip()
+            if path:
+                resource_sampler.export(path)
+                print_success(f"✅ Exported {len(resource_sampler)} samples to {path}")
+                play_done_sound()
+        elif choice == "3":
+            resource_sampler.clear()
+            print_success("✅ Samples cleared.")
+
+    except ValueError:
+        print_error("Invalid input. Please enter a number.")
+    except ImportError as e:
+        print_error(f"Export requires an optional dependency: {e}")
+    except Exception as e:
+        print_error(f"Error in resource timeline: {e}")
+
+
 def performance_settings_action():
     """Configure performance settings."""
     print_section("🔧 Performance Settings")
@@ -995,9 +995,10 @@ def lazy_import_monitoring_action():
         print_section("Actions")
         print_info("1. Clear import cache")
         print_info("2. Run import performance test")
-        print_info("3. Back to menu")
+        print_info("3. Profile main menu import tree")
+        print_info("4. Back to menu")
 
-        choice = input("\nSelect action (1-3): ").strip()
+        choice = input("\nSelect action (1-4): ").strip()
 
         if choice == "1":
             clear_import_cache()
@@ -1005,6 +1006,13 @@ def lazy_import_monitoring_action():
         elif choice == "2":
             run_import_performance_test()
         elif choice == "3":
+            from dataset_forge.utils.lazy_imports import (
+                print_import_tree,
+                profile_import_tree,
+            )
+
+            print_import_tree(profile_import_tree("dataset_forge.menus.main_menu"))
+        elif choice == "4":
             return
         else:
             print_error("Invalid choice")
@@ -132,12 +132,12 @@ def run_single_folder_sanitization():
         "📝 Sanitize Images Workflow Summary 📝", char="=", color=Mocha.green
     )
     for step, status in summary.items():
-        if step == "📄 Zsteg results file":
+        if step == "📄 Steg scan report":
             continue
         color = Mocha.green if ("Run" in status) else Mocha.peach
         print_info(color + f"{step:35} : {status}" + Mocha.reset)
-    if "📄 Zsteg results file" in summary:
-        print_info(f"📄 Zsteg results file: {summary['📄 Zsteg results file']}")
+    if "📄 Steg scan report" in summary:
+        print_info(f"📄 Steg scan report: {summary['📄 Steg scan report']}")
     print_section("", char="-", color=Mocha.lavender)
     input("Press Enter to return to the Sanitize Images menu...")
     print_header("🧹 Sanitize Images Workflow 🧹", char="=", color=Mocha.lavender)
@@ -212,12 +212,12 @@ def run_hq_lq_sanitization():
         "📝 Sanitize Images Workflow Summary 📝", char="=", color=Mocha.green
     )
     for step, status in summary.items():
-        if step == "📄 Zsteg results file":
+        if step == "📄 Steg scan report":
             continue
         color = Mocha.green if ("Run" in status) else Mocha.peach
         print_info(color + f"{step:35} : {status}" + Mocha.reset)
-    if "📄 Zsteg results file" in summary:
-        print_info(f"📄 Zsteg results file: {summary['📄 Zsteg results file']}")
+    if "📄 Steg scan report" in summary:
+        print_info(f"📄 Steg scan report: {summary['📄 Steg scan report']}")
     print_section("", char="-", color=Mocha.lavender)
     input("Press Enter to return to the Sanitize Images menu...")
     print_header("🧹 Sanitize Images Workflow 🧹", char="=", color=Mocha.lavender)
@@ -9,35 +9,54 @@ import sys
 # Check if we're in a test environment
 IS_TEST_ENVIRONMENT = "pytest" in sys.modules or "PYTEST_CURRENT_TEST" in os.environ
 
-# Try to import audio libraries, with fallbacks
-try:
-    import pygame
+_backends = None
+_backends_lock = threading.Lock()
 
-    PYGAME_AVAILABLE = True and not IS_TEST_ENVIRONMENT
-except ImportError:
-    PYGAME_AVAILABLE = False
 
-try:
-    import winsound
+def _audio_backends():
+    """
+    Import the available audio backends on first playback.
 
-    WINSOUND_AVAILABLE = True and not IS_TEST_ENVIRONMENT
-except ImportError:
-    WINSOUND_AVAILABLE = False
+    pygame alone pulls in NumPy and takes a noticeable share of CLI startup,
+    so nothing is imported until a sound is actually played.
 
-try:
-    from playsound import playsound
+    Returns:
+        Dict mapping backend name ("winsound", "playsound", "pydub",
+        "pygame") to the imported module or function(s).
+    """
+    global _backends
+    if _backends is None:
+        with _backends_lock:
+            if _backends is None:
+                backends = {}
+                try:
+                    import winsound
 
-    PLAYSOUND_AVAILABLE = True and not IS_TEST_ENVIRONMENT
-except ImportError:
-    PLAYSOUND_AVAILABLE = False
+                    backends["winsound"] = winsound
+                except ImportError:
+                    pass
+                try:
+                    from playsound import playsound
 
-try:
-    from pydub import AudioSegment
-    from pydub.playback import play
+                    backends["playsound"] = playsound
+                except ImportError:
+                    pass
+                try:
+                    from pydub import AudioSegment
+                    from pydub.playback import play
+
+                    backends["pydub"] = (AudioSegment, play)
+                except ImportError:
+                    pass
+                try:
+                    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+                    import pygame
 
-    PYDUB_AVAILABLE = True and not IS_TEST_ENVIRONMENT
-except ImportError:
-    PYDUB_AVAILABLE = False
+                    backends["pygame"] = pygame
+                except ImportError:
+                    pass
+                _backends = backends
+    return _backends
 
 
 class AudioPlayer:
@@ -62,7 +81,8 @@ class AudioPlayer:
 
     def _init_pygame(self):
         """Initialize pygame mixer if not already done."""
-        if not self._pygame_initialized and PYGAME_AVAILABLE:
+        pygame = _audio_backends().get("pygame")
+        if not self._pygame_initialized and pygame:
             with self._pygame_lock:  # Ensure thread safety
                 if not self._pygame_initialized:  # Double-check pattern
                     try:
@@ -104,9 +124,11 @@ class AudioPlayer:
         system = platform.system().lower()
         audio_path = str(self.audio_file_path)
         file_ext = self.audio_file_path.suffix.lower()
+        backends = _audio_backends()
 
         # Try winsound on Windows first (best for WAV files)
-        if system == "windows" and WINSOUND_AVAILABLE and file_ext == ".wav":
+        if system == "windows" and "winsound" in backends and file_ext == ".wav":
+            winsound = backends["winsound"]
             try:
                 winsound.PlaySound(audio_path, winsound.SND_FILENAME)
                 return
@@ -114,15 +136,16 @@ class AudioPlayer:
                 pass  # Silently fail and try next method
 
         # Try playsound (good for various formats, but may have issues with some MP3s)
-        if PLAYSOUND_AVAILABLE:
+        if "playsound" in backends:
             try:
-                playsound(audio_path, block=True)
+                backends["playsound"](audio_path, block=True)
                 return
             except Exception:
                 pass  # Silently fail and try next method
 
         # Try pydub (good for various formats)
-        if PYDUB_AVAILABLE:
+        if "pydub" in backends:
+            AudioSegment, play = backends["pydub"]
             try:
                 audio = AudioSegment.from_file(audio_path)
                 play(audio)
@@ -131,7 +154,8 @@ class AudioPlayer:
                 pass  # Silently fail and try next method
 
         # Try pygame (cross-platform) - with thread safety
-        if PYGAME_AVAILABLE:
+        if "pygame" in backends:
+            pygame = backends["pygame"]
             try:
                 with self._pygame_lock:  # Ensure thread safety for pygame operations
                     self._init_pygame()
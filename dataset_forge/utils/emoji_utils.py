@@ -36,14 +36,29 @@ except ImportError:
 # Lazy imports for printing utilities to avoid circular dependencies
 from .color import Mocha
 
-# Import the emoji mapping
-try:
-    from .emoji_mapping import EMOJI_TO_DESC
+_emoji_to_desc = None
 
-    EMOJI_MAPPING_AVAILABLE = True
-except ImportError:
-    EMOJI_MAPPING_AVAILABLE = False
-    EMOJI_TO_DESC = {}
+
+def _get_emoji_to_desc() -> Dict[str, str]:
+    """Load the emoji -> description mapping on first use (a ~3.6k entry module)."""
+    global _emoji_to_desc
+    if _emoji_to_desc is None:
+        try:
+            from .emoji_mapping import EMOJI_TO_DESC as mapping
+        except ImportError:
+            mapping = {}
+        _emoji_to_desc = mapping
+    return _emoji_to_desc
+
+
+def __getattr__(name):
+    # EMOJI_TO_DESC / EMOJI_MAPPING_AVAILABLE stay importable without loading
+    # the mapping at module import
+    if name == "EMOJI_TO_DESC":
+        return _get_emoji_to_desc()
+    if name == "EMOJI_MAPPING_AVAILABLE":
+        return bool(_get_emoji_to_desc())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Helper function for lazy printing imports
@@ -124,16 +139,20 @@ class EmojiHandler:
         os.environ.setdefault("PYTHONIOENCODING", "utf-8")
 
     def _load_emoji_mapping(self) -> None:
-        """Load emoji mapping from JSON file for enhanced functionality."""
-        # Skip printing during initialization to avoid circular import issues
-
-        self.emoji_mapping = EMOJI_TO_DESC
-        self.reverse_mapping = {desc: emoji for emoji, desc in EMOJI_TO_DESC.items()}
-
-        if not EMOJI_MAPPING_AVAILABLE:
-            pass  # Silently skip if not available
-        else:
-            pass  # Silently load mappings
+        """Prepare the emoji mapping; it is only loaded when first accessed."""
+        self._reverse_mapping = None
+
+    @property
+    def emoji_mapping(self) -> Dict[str, str]:
+        return _get_emoji_to_desc()
+
+    @property
+    def reverse_mapping(self) -> Dict[str, str]:
+        if self._reverse_mapping is None:
+            self._reverse_mapping = {
+                desc: emoji for emoji, desc in self.emoji_mapping.items()
+            }
+        return self._reverse_mapping
 
     def _setup_emoji_categories(self) -> None:
         """Setup emoji categories for better organization and validation."""
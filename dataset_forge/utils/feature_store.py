@@ -0,0 +1,589 @@
+"""
+Persistent per-image feature store for Dataset Forge.
+
+Quality and complexity metrics, BHI and pyiqa scores, perceptual hashes and
+embeddings are expensive to compute and used by several menus. The store
+keeps them on disk, keyed by the SHA256 of the image content, so an image is
+analyzed once per feature no matter which workflow asks, and renamed or
+copied images are still hits.
+
+Layout under ``store/cache/features/``:
+
+    paths/seg-*.npz             path index: ``paths``, ``size``, ``mtime_ns``
+                                and ``keys`` (hex SHA256), so repeat lookups
+                                only stat files instead of hashing them
+    <feature>@<version>/        one column family per feature type and version
+        meta.json               column names and dtype
+        failed.json             digests the extractor could not analyze
+        seg-*.npz               columnar segments: ``keys`` (hex SHA256)
+                                and ``values`` (rows x columns)
+
+New rows are appended as new segments and segments are compacted once there
+are many of them (compacting the path index also drops files that no longer
+exist). Bumping a feature's version starts a new column family, so
+stale values are never mixed with new ones.
+
+Example:
+    >>> table = get_or_compute(paths, "quality")
+    >>> table.column("sharpness")
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from dataset_forge.utils.cache_utils import CACHE_BASE_DIR
+from dataset_forge.utils.lazy_imports import numpy_as_np as np
+from dataset_forge.utils.parallel_utils import prefetch_map
+from dataset_forge.utils.printing import print_info, print_warning
+from dataset_forge.utils.progress_utils import tqdm
+from dataset_forge.utils.result_cache import file_sha256
+
+FEATURE_STORE_DIR = os.path.join(CACHE_BASE_DIR, "features")
+# Rows written per segment while extracting (bounds the work lost on interrupt)
+SEGMENT_ROWS = 4096
+# Compact a column family (or the path index) once it has more segments than this
+MAX_SEGMENTS = 16
+PATH_INDEX_DIR = "paths"
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """
+    A registered feature type.
+
+    Attributes:
+        name: Feature name used in get_or_compute (e.g. "quality")
+        version: Bump when the extractor's output changes
+        columns: Column names (one value per column per image)
+        extractor: Called with a batch of paths; returns one row per path
+            (a sequence of len(columns) values) or None where it failed
+        dtype: NumPy dtype of the values
+        batch_size: Paths handed to the extractor per call
+    """
+
+    name: str
+    version: str
+    columns: Tuple[str, ...]
+    extractor: Callable[[List[str]], List[Optional[Sequence[Any]]]]
+    dtype: str = "float32"
+    batch_size: int = 64
+
+    @property
+    def family(self) -> str:
+        return f"{self.name}@{self.version}"
+
+
+# feature name -> FeatureSpec
+FEATURE_REGISTRY: Dict[str, FeatureSpec] = {}
+
+
+def register_feature(
+    name: str,
+    version: str,
+    columns: Union[Sequence[str], int],
+    dtype: str = "float32",
+    batch_size: int = 64,
+):
+    """
+    Register a batch extractor for a feature type.
+
+    Args:
+        name: Feature name
+        version: Feature version (part of the on-disk column family)
+        columns: Column names, or the dimension of a vector feature
+            (columns are then named "0".."n-1")
+        dtype: NumPy dtype of the values
+        batch_size: Paths per extractor call
+    """
+    if isinstance(columns, int):
+        columns = [str(i) for i in range(columns)]
+
+    def decorator(func):
+        FEATURE_REGISTRY[name] = FeatureSpec(
+            name, str(version), tuple(columns), func, dtype, batch_size
+        )
+        return func
+
+    return decorator
+
+
+def get_feature_registry() -> Dict[str, FeatureSpec]:
+    """Registered features (importing the built-in extractors on first use)."""
+    import dataset_forge.actions.feature_extractors  # noqa: F401  (registers extractors)
+
+    return FEATURE_REGISTRY
+
+
+@dataclass
+class FeatureTable:
+    """Feature values for a list of images, in input order."""
+
+    feature: str
+    columns: Tuple[str, ...]
+    paths: List[str]
+    values: "np.ndarray"
+    computed: int = 0
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def column(self, name: str) -> "np.ndarray":
+        return self.values[:, self.columns.index(name)]
+
+    def as_dicts(self) -> Dict[str, Dict[str, Any]]:
+        """Map each path to {column: value} (convenient for scalar features)."""
+        return {
+            path: dict(zip(self.columns, row.tolist()))
+            for path, row in zip(self.paths, self.values)
+        }
+
+
+def _list_segments(folder: str) -> List[str]:
+    """Segment files of a folder, oldest first."""
+    return sorted(
+        os.path.join(folder, n)
+        for n in os.listdir(folder)
+        if n.startswith("seg-") and n.endswith(".npz")
+    )
+
+
+def _write_segment(folder: str, **arrays: "np.ndarray") -> str:
+    """Atomically write a new segment (names sort by creation time)."""
+    name = f"seg-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.npz"
+    path = os.path.join(folder, name)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _remove_files(paths: Sequence[str]) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class PathIndex:
+    """
+    Append-only index of path -> (size, mtime_ns, sha256).
+
+    Each content_hashes call with new or changed files appends one segment;
+    compaction rewrites the index as one segment without deleted files.
+    """
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+        self.entries: Dict[str, Tuple[int, int, str]] = {}
+        self._segments = _list_segments(folder)
+        for path in self._segments:
+            try:
+                with np.load(path) as data:
+                    self.entries.update(
+                        zip(
+                            data["paths"].tolist(),
+                            zip(
+                                data["size"].tolist(),
+                                data["mtime_ns"].tolist(),
+                                (k.decode("ascii") for k in data["keys"].tolist()),
+                            ),
+                        )
+                    )
+            except (OSError, ValueError, KeyError):
+                print_warning(f"Skipping unreadable path index segment {path}")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, path: str) -> Optional[Tuple[int, int, str]]:
+        return self.entries.get(path)
+
+    def append(self, entries: Dict[str, Tuple[int, int, str]]) -> None:
+        """Persist new or changed entries as a segment."""
+        if not entries:
+            return
+        self.entries.update(entries)
+        self._segments.append(self._write(entries))
+        if len(self._segments) > MAX_SEGMENTS:
+            self.compact()
+
+    def compact(self) -> int:
+        """
+        Rewrite the index as one segment, dropping files that no longer exist.
+
+        Returns:
+            Number of entries dropped.
+        """
+        old = list(self._segments)
+        before = len(self.entries)
+        self.entries = {p: e for p, e in self.entries.items() if os.path.exists(p)}
+        self._segments = [self._write(self.entries)] if self.entries else []
+        _remove_files(old)
+        return before - len(self.entries)
+
+    def _write(self, entries: Dict[str, Tuple[int, int, str]]) -> str:
+        values = list(entries.values())
+        return _write_segment(
+            self.folder,
+            paths=np.asarray(list(entries), dtype=str),
+            size=np.asarray([e[0] for e in values], dtype="int64"),
+            mtime_ns=np.asarray([e[1] for e in values], dtype="int64"),
+            keys=np.asarray([e[2] for e in values], dtype="S64"),
+        )
+
+
+class ColumnFamily:
+    """The on-disk columnar table of one feature type and version."""
+
+    def __init__(self, folder: str, spec: FeatureSpec):
+        self.folder = folder
+        self.spec = spec
+        self.index: Dict[str, int] = {}
+        self.values = np.empty((0, len(spec.columns)), dtype=spec.dtype)
+        self._segments: List[str] = []
+        self.failed: set = set()
+        self._failed_path = os.path.join(folder, "failed.json")
+        os.makedirs(folder, exist_ok=True)
+        meta_path = os.path.join(folder, "meta.json")
+        if not os.path.exists(meta_path):
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "name": spec.name,
+                        "version": spec.version,
+                        "columns": list(spec.columns),
+                        "dtype": spec.dtype,
+                    },
+                    f,
+                )
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self._failed_path, "r", encoding="utf-8") as f:
+                self.failed = set(json.load(f))
+        except (OSError, ValueError):
+            self.failed = set()
+        self._segments = _list_segments(self.folder)
+        keys, values = [], []
+        for path in self._segments:
+            try:
+                with np.load(path) as data:
+                    if data["values"].shape[1:] != (len(self.spec.columns),):
+                        continue
+                    keys.append(data["keys"])
+                    values.append(data["values"])
+            except (OSError, ValueError, KeyError):
+                print_warning(f"Skipping unreadable feature segment {path}")
+        if values:
+            self.values = np.concatenate(values).astype(self.spec.dtype, copy=False)
+            # Later segments win for duplicate keys
+            self.index = {
+                k.decode("ascii"): i for i, k in enumerate(np.concatenate(keys).tolist())
+            }
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def rows(self, keys: Sequence[Optional[str]]) -> List[Optional[int]]:
+        return [self.index.get(k) for k in keys]
+
+    def append(self, keys: List[str], rows: List[Sequence[Any]]) -> None:
+        """Persist new rows as a segment and add them to the in-memory table."""
+        if not keys:
+            return
+        values = np.asarray(rows, dtype=self.spec.dtype).reshape(len(keys), -1)
+        self._write_segment(np.asarray(keys, dtype="S64"), values)
+        start = len(self.values)
+        self.values = np.concatenate([self.values, values])
+        for i, key in enumerate(keys):
+            self.index[key] = start + i
+        self.failed.difference_update(keys)
+        if len(self._segments) > MAX_SEGMENTS:
+            self.compact()
+
+    def mark_failed(self, keys: List[str]) -> None:
+        """Remember images the extractor could not analyze, so they are not retried."""
+        if not keys:
+            return
+        self.failed.update(keys)
+        tmp_path = f"{self._failed_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(sorted(self.failed), f)
+        os.replace(tmp_path, self._failed_path)
+
+    def _write_segment(self, keys: "np.ndarray", values: "np.ndarray") -> None:
+        self._segments.append(_write_segment(self.folder, keys=keys, values=values))
+
+    def compact(self) -> None:
+        """Rewrite all segments as one (dropping superseded duplicate rows)."""
+        old = list(self._segments)
+        keys = list(self.index)
+        rows = [self.index[k] for k in keys]
+        self._segments = []
+        self._write_segment(np.asarray(keys, dtype="S64"), self.values[rows])
+        _remove_files(old)
+        self.values = self.values[rows]
+        self.index = {k: i for i, k in enumerate(keys)}
+
+
+class FeatureStore:
+    """
+    Content-addressed feature store with batched extraction of misses.
+
+    Args:
+        root: Store folder (defaults to ``store/cache/features``)
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or FEATURE_STORE_DIR
+        os.makedirs(self.root, exist_ok=True)
+        self._families: Dict[str, ColumnFamily] = {}
+        self._lock = threading.RLock()
+        self._paths: Optional[PathIndex] = None
+
+    # --- content hashes ---
+
+    def path_index(self) -> PathIndex:
+        with self._lock:
+            if self._paths is None:
+                self._paths = PathIndex(os.path.join(self.root, PATH_INDEX_DIR))
+            return self._paths
+
+    def content_hashes(
+        self, paths: Sequence[str], max_workers: Optional[int] = None
+    ) -> Dict[str, str]:
+        """
+        SHA256 hex digest of each readable file.
+
+        Files whose size and mtime match the path index are not re-hashed.
+        """
+        index = self.path_index()
+        digests: Dict[str, str] = {}
+        to_hash = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            key = os.path.abspath(path)
+            entry = index.get(key)
+            if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+                digests[path] = entry[2]
+            else:
+                to_hash.append((path, key, st))
+
+        def hash_file(item):
+            try:
+                return file_sha256(item[0])
+            except OSError:
+                return None
+
+        if to_hash:
+            new_entries: Dict[str, Tuple[int, int, str]] = {}
+            for (path, key, st), digest in tqdm(
+                prefetch_map(hash_file, to_hash, max_workers=max_workers),
+                total=len(to_hash),
+                desc="Hashing images",
+            ):
+                if digest is None:
+                    continue
+                digests[path] = digest
+                new_entries[key] = (st.st_size, st.st_mtime_ns, digest)
+            with self._lock:
+                index.append(new_entries)
+        return digests
+
+    # --- features ---
+
+    def family(self, feature: str) -> ColumnFamily:
+        """The column family of a registered feature (loaded on first use)."""
+        spec = get_feature_registry().get(feature)
+        if spec is None:
+            raise KeyError(
+                f"Unknown feature '{feature}'. Available: {', '.join(sorted(FEATURE_REGISTRY))}"
+            )
+        with self._lock:
+            fam = self._families.get(spec.family)
+            if fam is None:
+                fam = self._families[spec.family] = ColumnFamily(
+                    os.path.join(self.root, spec.family), spec
+                )
+            return fam
+
+    def get_or_compute(
+        self,
+        paths: Sequence[str],
+        feature: str,
+        compute: bool = True,
+        retry_failed: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> FeatureTable:
+        """
+        Look up a feature for every path, extracting only the missing ones.
+
+        Misses are de-duplicated by content and handed to the feature's
+        extractor in batches; new rows are persisted as they are produced.
+
+        Args:
+            paths: Image paths
+            feature: Registered feature name (see list_features)
+            compute: Extract misses (False returns only stored values)
+            retry_failed: Also retry images the extractor failed on before
+            max_workers: Workers for hashing
+
+        Returns:
+            FeatureTable with the paths that have a value (unreadable files and
+            extractor failures are left out), in input order.
+        """
+        paths = [str(p) for p in paths]
+        fam = self.family(feature)
+        spec = fam.spec
+        digests = self.content_hashes(paths, max_workers=max_workers)
+        computed = 0
+        if compute:
+            with self._lock:
+                missing: Dict[str, str] = {}
+                for path in paths:
+                    key = digests.get(path)
+                    if (
+                        key is not None
+                        and key not in fam.index
+                        and key not in missing
+                        and (retry_failed or key not in fam.failed)
+                    ):
+                        missing[key] = path
+            if missing:
+                computed = self._extract(fam, missing)
+
+        found = [
+            (path, row)
+            for path, row in zip(paths, fam.rows([digests.get(p) for p in paths]))
+            if row is not None
+        ]
+        values = (
+            fam.values[[row for _, row in found]]
+            if found
+            else np.empty((0, len(spec.columns)), dtype=spec.dtype)
+        )
+        return FeatureTable(
+            feature=feature,
+            columns=spec.columns,
+            paths=[path for path, _ in found],
+            values=values,
+            computed=computed,
+        )
+
+    def _extract(self, fam: ColumnFamily, missing: Dict[str, str]) -> int:
+        spec = fam.spec
+        items = list(missing.items())
+        new_keys: List[str] = []
+        new_rows: List[Sequence[Any]] = []
+        failed: List[str] = []
+        stored_before = len(fam)
+        print_info(
+            f"Extracting '{spec.name}' for {len(items)} image(s) "
+            f"({len(fam)} already stored)"
+        )
+        with tqdm(total=len(items), desc=f"Features ({spec.name})") as pbar:
+            for start in range(0, len(items), spec.batch_size):
+                batch = items[start : start + spec.batch_size]
+                try:
+                    rows = spec.extractor([path for _, path in batch])
+                except Exception as e:
+                    # A broken extractor (missing model, OOM) is not the images' fault
+                    print_warning(f"Feature '{spec.name}' failed on a batch: {e}")
+                    pbar.update(len(batch))
+                    continue
+                for (key, _), row in zip(batch, rows):
+                    if row is None or len(row) != len(spec.columns):
+                        failed.append(key)
+                        continue
+                    new_keys.append(key)
+                    new_rows.append(row)
+                pbar.update(len(batch))
+                if len(new_keys) >= SEGMENT_ROWS:
+                    with self._lock:
+                        fam.append(new_keys, new_rows)
+                    new_keys, new_rows = [], []
+        with self._lock:
+            fam.append(new_keys, new_rows)
+            fam.mark_failed(failed)
+        if failed:
+            print_warning(f"Feature '{spec.name}': {len(failed)} image(s) could not be analyzed")
+        return len(fam) - stored_before
+
+    def clear(self, feature: Optional[str] = None) -> int:
+        """
+        Delete stored values of one feature (all versions) or of every feature.
+
+        The path index is kept, since content hashes do not depend on features.
+
+        Returns:
+            Number of column families removed.
+        """
+        import shutil
+
+        removed = 0
+        with self._lock:
+            for name in os.listdir(self.root):
+                folder = os.path.join(self.root, name)
+                if name == PATH_INDEX_DIR or not os.path.isdir(folder):
+                    continue
+                if feature is None or name.split("@", 1)[0] == feature:
+                    shutil.rmtree(folder, ignore_errors=True)
+                    self._families.pop(name, None)
+                    removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Rows and on-disk size of every column family in the store."""
+        result = {}
+        for name in sorted(os.listdir(self.root)):
+            folder = os.path.join(self.root, name)
+            if name == PATH_INDEX_DIR or not os.path.isdir(folder):
+                continue
+            segments = [n for n in os.listdir(folder) if n.endswith(".npz")]
+            size = sum(os.path.getsize(os.path.join(folder, n)) for n in segments)
+            rows = len(self._families[name]) if name in self._families else None
+            if rows is None:
+                rows = 0
+                for n in segments:
+                    try:
+                        with np.load(os.path.join(folder, n)) as data:
+                            rows += len(data["keys"])
+                    except (OSError, ValueError, KeyError):
+                        pass
+            result[name] = {"rows": rows, "segments": len(segments), "bytes": size}
+        return result
+
+
+_default_store: Optional[FeatureStore] = None
+_default_lock = threading.Lock()
+
+
+def get_feature_store() -> FeatureStore:
+    """The process-wide feature store under ``store/cache/features``."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = FeatureStore()
+        return _default_store
+
+
+def get_or_compute(paths: Sequence[str], feature: str, **kwargs) -> FeatureTable:
+    """Convenience wrapper for ``get_feature_store().get_or_compute``."""
+    return get_feature_store().get_or_compute(paths, feature, **kwargs)
+
+
+def list_features() -> List[str]:
+    """Names of the registered features."""
+    return sorted(get_feature_registry())
@@ -0,0 +1,396 @@
+"""
+Journaled bulk file operations for Dataset Forge.
+
+Bulk renames, moves, copies, hardlinks and deletes are planned up front and
+written to an on-disk journal before anything touches the dataset. Execution
+runs on a thread pool (same-device renames and hardlinks where possible) and
+records every finished operation, so an interrupted run can be resumed or
+rolled back instead of leaving a half-renamed dataset.
+
+Deletes are staged into a trash folder next to the source (a cheap rename on
+the same filesystem) and only purged on commit, which keeps them reversible.
+
+Example:
+    >>> ops = [FileOp("rename", "hq/a.png", "hq/b.png"), FileOp("rename", "hq/b.png", "hq/a.png")]
+    >>> journal = FileJournal.create(ops)
+    >>> summary = journal.execute()
+    >>> journal.commit()
+"""
+
+import json
+import os
+import shutil
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+from dataset_forge.utils.cache_utils import CACHE_BASE_DIR
+from dataset_forge.utils.file_utils import transfer_file
+from dataset_forge.utils.progress_utils import tqdm
+
+JOURNAL_DIR = os.path.join(os.path.dirname(CACHE_BASE_DIR), "journals")
+FILE_OPS = ("rename", "move", "copy", "link", "delete")
+TRASH_DIR_NAME = ".df_trash"
+TEMP_SUFFIX = ".df_tmp"
+# Completed-op records are fsynced in batches of this size
+JOURNAL_SYNC_EVERY = 256
+
+
+@dataclass
+class FileOp:
+    """One planned file operation. `dst` is unused for deletes."""
+
+    op: str
+    src: str
+    dst: Optional[str] = None
+
+
+def _fsync_write(path: str, text: str) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _expand_plan(ops: List[FileOp], job_id: str) -> List[Dict]:
+    """
+    Turn FileOps into journal steps with phases.
+
+    Renames/moves whose destination is another operation's source (swaps,
+    cycles, in-place shuffles) go through a temporary name: phase 0 moves
+    them aside, phase 1 moves them into place. Deletes become moves into a
+    per-directory trash folder.
+    """
+    sources: Set[str] = {os.path.abspath(o.src) for o in ops}
+    destinations: Set[str] = set()
+    steps = []
+    for i, o in enumerate(ops):
+        if o.op not in FILE_OPS:
+            raise ValueError(f"Unknown file operation: {o.op}")
+        src = os.path.abspath(o.src)
+        if o.op == "delete":
+            trash = os.path.join(os.path.dirname(src), TRASH_DIR_NAME, job_id)
+            dst = os.path.join(trash, f"{i}_{os.path.basename(src)}")
+            steps.append(
+                {"op": "move", "src": src, "dst": dst, "phase": 0, "delete": True}
+            )
+            continue
+        if not o.dst:
+            raise ValueError(f"Operation {o.op} on {o.src} needs a destination")
+        dst = os.path.abspath(o.dst)
+        if dst in destinations:
+            raise ValueError(f"Two operations write to {dst}")
+        destinations.add(dst)
+        if dst == src:
+            continue
+        blocked_by_plan = dst in sources
+        if not blocked_by_plan and os.path.lexists(dst):
+            raise FileExistsError(f"Destination already exists: {dst}")
+        if blocked_by_plan and o.op in ("rename", "move"):
+            tmp = f"{src}.{job_id}{TEMP_SUFFIX}"
+            steps.append({"op": o.op, "src": src, "dst": tmp, "phase": 0})
+            steps.append({"op": o.op, "src": tmp, "dst": dst, "phase": 1})
+        elif blocked_by_plan:
+            raise ValueError(f"{o.op} into {dst} would overwrite a planned source")
+        else:
+            steps.append({"op": o.op, "src": src, "dst": dst, "phase": 0})
+    return steps
+
+
+def _step_done(step: Dict) -> bool:
+    """Whether a step's effect is already on disk (for idempotent resume)."""
+    if step["op"] in ("rename", "move"):
+        return not os.path.lexists(step["src"]) and os.path.lexists(step["dst"])
+    if step["op"] == "link":
+        try:
+            return os.path.samefile(step["src"], step["dst"])
+        except OSError:
+            return False
+    return False
+
+
+def _partial_path(step: Dict) -> str:
+    """Where a copy is written before it is renamed over the destination."""
+    return step["dst"] + TEMP_SUFFIX
+
+
+def _run_step(step: Dict) -> None:
+    if _step_done(step):
+        return
+    src, dst = step["src"], step["dst"]
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if step["op"] == "rename":
+        if os.path.lexists(dst):
+            raise FileExistsError(f"Destination already exists: {dst}")
+        os.rename(src, dst)
+        return
+    if step["op"] == "move":
+        try:
+            os.replace(src, dst)
+            return
+        except OSError:
+            pass  # another device: copy, then remove the source
+    # Copies land under a temporary name first, so an interrupted step never
+    # leaves a truncated file at the destination
+    partial = _partial_path(step)
+    transfer_file(src, partial, "copy" if step["op"] == "move" else step["op"])
+    os.replace(partial, dst)
+    if step["op"] == "move":
+        os.remove(src)
+
+
+def _undo_step(step: Dict) -> None:
+    if step["op"] in ("rename", "move"):
+        if os.path.lexists(step["dst"]) and not os.path.lexists(step["src"]):
+            os.makedirs(os.path.dirname(step["src"]), exist_ok=True)
+            transfer_file(step["dst"], step["src"], "move")
+    elif os.path.lexists(step["dst"]):
+        os.remove(step["dst"])
+
+
+def _ran_unrecorded(step: Dict) -> bool:
+    """
+    Whether a step took effect without reaching done.log.
+
+    Copy and link destinations did not exist when the plan was made, so an
+    existing one was written by this journal.
+    """
+    if step["op"] in ("copy", "link"):
+        return os.path.lexists(step["dst"])
+    return _step_done(step)
+
+
+class FileJournal:
+    """
+    A planned bulk file operation persisted under ``store/journals/<id>/``.
+
+    Files:
+        plan.json: job metadata and the expanded, phased steps
+        done.log: indices of completed steps, appended as they finish
+        state.json: planned / running / failed / completed / rolled_back
+    """
+
+    def __init__(self, path: str, plan: Dict):
+        self.path = path
+        self.plan = plan
+        self.steps: List[Dict] = plan["steps"]
+
+    @property
+    def job_id(self) -> str:
+        return self.plan["id"]
+
+    @property
+    def label(self) -> str:
+        return self.plan.get("label", "")
+
+    @classmethod
+    def create(
+        cls,
+        ops: Iterable[FileOp],
+        label: str = "bulk file operation",
+        journal_dir: Optional[str] = None,
+    ) -> "FileJournal":
+        """Validate and expand ops, then persist the journal before any file changes."""
+        job_id = time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:8]
+        ops = list(ops)
+        plan = {
+            "id": job_id,
+            "label": label,
+            "created": time.time(),
+            "ops": [asdict(o) for o in ops],
+            "steps": _expand_plan(ops, job_id),
+        }
+        path = os.path.join(journal_dir or JOURNAL_DIR, job_id)
+        os.makedirs(path, exist_ok=True)
+        _fsync_write(os.path.join(path, "plan.json"), json.dumps(plan))
+        journal = cls(path, plan)
+        journal._set_state("planned")
+        return journal
+
+    @classmethod
+    def load(cls, path: str) -> "FileJournal":
+        with open(os.path.join(path, "plan.json"), "r", encoding="utf-8") as f:
+            return cls(path, json.load(f))
+
+    @property
+    def state(self) -> str:
+        try:
+            with open(os.path.join(self.path, "state.json"), "r", encoding="utf-8") as f:
+                return json.load(f).get("state", "planned")
+        except (OSError, ValueError):
+            return "planned"
+
+    def _set_state(self, state: str, **extra) -> None:
+        _fsync_write(
+            os.path.join(self.path, "state.json"),
+            json.dumps({"state": state, "updated": time.time(), **extra}),
+        )
+
+    def completed_steps(self) -> Set[int]:
+        done_path = os.path.join(self.path, "done.log")
+        if not os.path.exists(done_path):
+            return set()
+        with open(done_path, "r", encoding="utf-8") as f:
+            return {int(line) for line in f if line.strip().isdigit()}
+
+    def execute(self, max_workers: int = 8, desc: Optional[str] = None) -> Dict:
+        """
+        Run (or resume) all pending steps, phase by phase.
+
+        A later phase only starts when every step of the previous phase has
+        succeeded, so a failure never strands files under temporary names
+        without their journal entry.
+
+        Returns:
+            {"completed": int, "errors": {step index: message}, "state": str}
+        """
+        done = self.completed_steps()
+        errors: Dict[int, str] = {}
+        self._set_state("running")
+        with open(os.path.join(self.path, "done.log"), "a", encoding="utf-8") as log:
+            for phase in sorted({s["phase"] for s in self.steps}):
+                pending = [
+                    i
+                    for i, s in enumerate(self.steps)
+                    if s["phase"] == phase and i not in done
+                ]
+                if not pending:
+                    continue
+                with ThreadPoolExecutor(
+                    max_workers=max(1, min(max_workers, len(pending)))
+                ) as ex:
+                    futures = {ex.submit(_run_step, self.steps[i]): i for i in pending}
+                    for n, future in enumerate(
+                        tqdm(
+                            as_completed(futures),
+                            total=len(futures),
+                            desc=desc or self.label or "File operations",
+                        ),
+                        1,
+                    ):
+                        i = futures[future]
+                        try:
+                            future.result()
+                        except Exception as e:
+                            errors[i] = str(e)
+                            continue
+                        done.add(i)
+                        log.write(f"{i}\n")
+                        if n % JOURNAL_SYNC_EVERY == 0:
+                            log.flush()
+                            os.fsync(log.fileno())
+                log.flush()
+                os.fsync(log.fileno())
+                if errors:
+                    break
+        state = "failed" if errors else "completed"
+        self._set_state(state, errors=len(errors))
+        return {"completed": len(done), "errors": errors, "state": state}
+
+    def rollback(self, max_workers: int = 8) -> Dict:
+        """Undo every completed step, latest phase first."""
+        done = self.completed_steps()
+        # Steps that ran but were not yet recorded are detected from disk
+        done |= {i for i, s in enumerate(self.steps) if _ran_unrecorded(s)}
+        for step in self.steps:
+            if os.path.lexists(_partial_path(step)):
+                os.remove(_partial_path(step))
+        errors: Dict[int, str] = {}
+        for phase in sorted({s["phase"] for s in self.steps}, reverse=True):
+            indices = [i for i in done if self.steps[i]["phase"] == phase]
+            if not indices:
+                continue
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(max_workers, len(indices)))
+            ) as ex:
+                futures = {ex.submit(_undo_step, self.steps[i]): i for i in indices}
+                for future in tqdm(
+                    as_completed(futures), total=len(futures), desc="Rolling back"
+                ):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        errors[futures[future]] = str(e)
+        if not errors:
+            self._remove_trash()
+            done_path = os.path.join(self.path, "done.log")
+            if os.path.exists(done_path):
+                os.remove(done_path)
+        self._set_state("failed" if errors else "rolled_back", errors=len(errors))
+        return {"errors": errors, "state": self.state}
+
+    def _trash_dirs(self) -> Set[str]:
+        return {os.path.dirname(s["dst"]) for s in self.steps if s.get("delete")}
+
+    def _remove_trash(self) -> None:
+        for trash in self._trash_dirs():
+            shutil.rmtree(trash, ignore_errors=True)
+            parent = os.path.dirname(trash)
+            if os.path.isdir(parent) and not os.listdir(parent):
+                os.rmdir(parent)
+
+    def commit(self) -> None:
+        """Purge staged deletes and remove the journal once a run has completed."""
+        if self.state != "completed":
+            raise RuntimeError(f"Cannot commit journal in state '{self.state}'")
+        self._remove_trash()
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def discard(self) -> None:
+        """Remove the journal directory (after a rollback)."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def list_incomplete_journals(journal_dir: Optional[str] = None) -> List[FileJournal]:
+    """Journals that were interrupted or failed and can be resumed or rolled back."""
+    journal_dir = journal_dir or JOURNAL_DIR
+    if not os.path.isdir(journal_dir):
+        return []
+    journals = []
+    for name in sorted(os.listdir(journal_dir)):
+        path = os.path.join(journal_dir, name)
+        if not os.path.exists(os.path.join(path, "plan.json")):
+            continue
+        try:
+            journal = FileJournal.load(path)
+        except (OSError, ValueError):
+            continue
+        if journal.state in ("planned", "running", "failed"):
+            journals.append(journal)
+    return journals
+
+
+def run_file_operations(
+    ops: Iterable[FileOp],
+    label: str = "bulk file operation",
+    max_workers: int = 8,
+    journal_dir: Optional[str] = None,
+) -> Dict:
+    """
+    Plan, journal and execute ops; commit the journal when everything succeeded.
+
+    On failure the journal is kept so the run can be resumed or rolled back
+    (see list_incomplete_journals). The summary includes "journal" (its path)
+    and "failed_ops", a list of (FileOp, error message) for failed operations.
+    """
+    ops = list(ops)
+    journal = FileJournal.create(ops, label=label, journal_dir=journal_dir)
+    summary = journal.execute(max_workers=max_workers, desc=label)
+    summary["journal"] = journal.path
+    by_src = {os.path.abspath(o.src): o for o in ops}
+    failed = []
+    for i, message in summary["errors"].items():
+        step = journal.steps[i]
+        src = step["src"]
+        if src.endswith(TEMP_SUFFIX):
+            src = src[: -len(f".{journal.job_id}{TEMP_SUFFIX}")]
+        if src in by_src:
+            failed.append((by_src[src], message))
+    summary["failed_ops"] = failed
+    if summary["state"] == "completed":
+        journal.commit()
+    return summary
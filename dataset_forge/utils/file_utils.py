@@ -8,7 +8,9 @@ file type detection, and optimization functions.
 
 import os
 import shutil
-from typing import List, Optional, Callable
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Callable, Sequence, Tuple
 
 from dataset_forge.utils.printing import print_info, print_warning, print_error
 from dataset_forge.utils.cache_utils import in_memory_cache
@@ -44,6 +46,122 @@ def perform_file_operation(src_path, dest_dir, operation, filename):
     return dest_path
 
 
+
+# Linux FICLONE ioctl: share extents copy-on-write (btrfs, XFS, bcachefs)
+_FICLONE = 0x40049409
+TRANSFER_OPERATIONS = ("copy", "move", "link")
+
+
+def reflink_file(src_path: str, dest_path: str) -> bool:
+    """
+    Try to clone src_path to dest_path without copying data.
+
+    Uses FICLONE on Linux and clonefile on macOS. Returns False (leaving no
+    destination behind) when the filesystem or platform does not support it.
+    """
+    try:
+        if sys.platform.startswith("linux"):
+            import fcntl
+
+            with open(src_path, "rb") as src, open(dest_path, "wb") as dest:
+                try:
+                    fcntl.ioctl(dest.fileno(), _FICLONE, src.fileno())
+                except OSError:
+                    ok = False
+                else:
+                    ok = True
+            if not ok:
+                os.remove(dest_path)
+                return False
+            shutil.copystat(src_path, dest_path)
+            return True
+        if sys.platform == "darwin":
+            import ctypes
+
+            libc = ctypes.CDLL("libc.dylib", use_errno=True)
+            return (
+                libc.clonefile(
+                    os.fsencode(src_path), os.fsencode(dest_path), ctypes.c_int(0)
+                )
+                == 0
+            )
+    except (OSError, AttributeError):
+        pass
+    return False
+
+
+def transfer_file(src_path: str, dest_path: str, operation: str = "copy") -> str:
+    """
+    Copy, move or link a file using the cheapest mechanism available.
+
+    - "move": os.replace (a rename on the same filesystem), falling back to
+      shutil.move across devices
+    - "copy": reflink where supported, otherwise shutil.copy2
+    - "link": hardlink on the same filesystem, otherwise a regular copy
+
+    Returns:
+        The mechanism used: "rename", "move", "reflink", "copy" or "hardlink".
+    """
+    if operation == "move":
+        try:
+            os.replace(src_path, dest_path)
+            return "rename"
+        except OSError:
+            shutil.move(src_path, dest_path)
+            return "move"
+    if operation == "link":
+        try:
+            if os.path.lexists(dest_path):
+                os.remove(dest_path)
+            os.link(src_path, dest_path)
+            return "hardlink"
+        except OSError:
+            pass
+    elif operation != "copy":
+        raise ValueError(f"Unknown operation: {operation}")
+    if reflink_file(src_path, dest_path):
+        return "reflink"
+    shutil.copy2(src_path, dest_path)
+    return "copy"
+
+
+def transfer_files(
+    jobs: Sequence[Tuple[str, str]],
+    operation: str = "copy",
+    max_workers: int = 8,
+    desc: Optional[str] = None,
+) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Run transfer_file for many (src, dest) pairs on a thread pool.
+
+    Destination directories are created up front. Failures are reported per
+    job instead of aborting the batch.
+
+    Returns:
+        Dict mapping dest path to {"method": ..., "error": ...}.
+    """
+    from dataset_forge.utils.progress_utils import tqdm
+
+    for dest_dir in {os.path.dirname(dest) for _, dest in jobs}:
+        if dest_dir:
+            os.makedirs(dest_dir, exist_ok=True)
+    results: Dict[str, Dict[str, Optional[str]]] = {}
+    if not jobs:
+        return results
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as ex:
+        futures = {
+            ex.submit(transfer_file, src, dest, operation): dest for src, dest in jobs
+        }
+        for future in tqdm(
+            as_completed(futures), total=len(futures), desc=desc or f"{operation.title()} files"
+        ):
+            dest = futures[future]
+            try:
+                results[dest] = {"method": future.result(), "error": None}
+            except Exception as e:
+                results[dest] = {"method": None, "error": str(e)}
+    return results
+
 @in_memory_cache(maxsize=512)  # Cache file type checks
 def is_image_file(filename):
     """Check if a filename represents an image file."""
@@ -85,27 +203,25 @@ def run_oxipng_stub(image_path, level=4):
     pass
 
 
-def run_oxipng(image_path, level=4, strip=None, alpha=False):
+def run_oxipng(image_path, level=4, strip=None, alpha=False, threads=None):
     """Run oxipng on the given image_path with the specified options.
     Args:
         image_path (str): Path to the PNG image.
         level (int|str): Optimization level (0-6 or 'max').
         strip (str|None): Metadata to strip ('safe', 'all', or comma-separated list).
         alpha (bool): Whether to use --alpha for transparent pixel optimization.
+        threads (int|None): oxipng --threads; pass 1 when calling from a worker
+            pool. For batches prefer png_optimizer.optimize_pngs.
     """
     import subprocess
+    from dataset_forge.utils.png_optimizer import OxipngOptions
 
     oxipng_bin = shutil.which("oxipng")
     if not oxipng_bin:
         print_warning(f"[Oxipng] Not found in PATH. Skipping optimization for {image_path}.")
         return
-    level_arg = str(level) if isinstance(level, int) else level
-    cmd = [oxipng_bin, "-o", str(level_arg)]
-    if strip:
-        cmd += ["--strip", strip]
-    if alpha:
-        cmd.append("--alpha")
-    cmd.append(image_path)
+    options = OxipngOptions(level=level, strip=strip, alpha=alpha)
+    cmd = options.command(oxipng_bin, threads or os.cpu_count() or 1, image_path)
     try:
         result = subprocess.run(cmd, capture_output=True, text=True)
         if result.returncode == 0:
@@ -1,31 +1,287 @@
-import os
+"""
+Operation history log for Dataset Forge.
+
+Records are written as JSON lines (one file per day) by a background writer
+thread fed through a bounded queue, so actions that log once per file only pay
+for a queue put instead of an open/append/close. Worker processes forward
+their records to the parent's writer via :class:`ProcessLogQueue`; workers
+that were not attached to one append their records synchronously, since a
+pool worker never runs ``atexit`` handlers to drain a writer queue.
+
+Legacy plain-text ``.log`` files are still listed, read and queried.
+"""
+
+import atexit
 import datetime
-from typing import Optional, List
+import json
+import multiprocessing
+import os
+import queue
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
 
 LOGS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", "logs")
+LOG_EXTENSIONS = (".jsonl", ".log")
+LOG_QUEUE_SIZE = 10000
+LOG_BATCH_SIZE = 512
+LOG_FLUSH_INTERVAL = 0.5
 
 os.makedirs(LOGS_DIR, exist_ok=True)
 
+_LEGACY_LINE = re.compile(r"^\[(?P<ts>[^\]]+)\] (?P<action>[^:]+): (?P<details>.*)$")
+
+
+def _make_record(
+    action: str,
+    details: str = "",
+    path: Optional[str] = None,
+    duration: Optional[float] = None,
+    outcome: str = "ok",
+) -> Dict[str, Any]:
+    return {
+        "ts": datetime.datetime.now().isoformat(timespec="milliseconds"),
+        "action": action,
+        "details": details,
+        "path": path,
+        "duration": duration,
+        "outcome": outcome,
+        "pid": os.getpid(),
+    }
+
+
+def _write_records(records: List[Dict[str, Any]], logs_dir: str) -> None:
+    """Append records to their dated JSONL files, one open per file."""
+    by_file: Dict[str, List[str]] = {}
+    for record in records:
+        name = record["ts"][:10] + ".jsonl"
+        by_file.setdefault(name, []).append(json.dumps(record, ensure_ascii=False))
+    os.makedirs(logs_dir, exist_ok=True)
+    for name, lines in by_file.items():
+        with open(os.path.join(logs_dir, name), "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+class OperationLogWriter:
+    """
+    Background thread that drains a bounded queue and appends records in batches.
+
+    Records are flushed when LOG_BATCH_SIZE are pending or LOG_FLUSH_INTERVAL
+    seconds have passed, whichever comes first. A full queue applies
+    backpressure for a few seconds and then falls back to a synchronous write,
+    so records are never dropped.
+    """
+
+    def __init__(
+        self,
+        logs_dir: Optional[str] = None,
+        maxsize: int = LOG_QUEUE_SIZE,
+        batch_size: int = LOG_BATCH_SIZE,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+    ):
+        self.logs_dir = logs_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pid = os.getpid()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self._write_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="OperationLogWriter", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, record: Dict[str, Any]) -> None:
+        try:
+            self._queue.put(record, timeout=5)
+        except queue.Full:
+            self._write([record])
+
+    def flush(self) -> None:
+        """Block until every record submitted so far is on disk."""
+        if self._thread.is_alive():
+            self._queue.join()
+        else:
+            self._drain_now()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=10)
+        self._drain_now()
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        with self._write_lock:
+            try:
+                _write_records(records, self.logs_dir or LOGS_DIR)
+            except OSError:
+                pass
+
+    def _drain_now(self) -> None:
+        pending = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                pending.append(item)
+            self._queue.task_done()
+        if pending:
+            self._write(pending)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = [] if item is None else [item]
+            taken = 1
+            stop = item is None
+            deadline = time.monotonic() + self.flush_interval
+            while not stop and len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                taken += 1
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+            if batch:
+                self._write(batch)
+            for _ in range(taken):
+                self._queue.task_done()
+            if stop:
+                return
+
+
+_writer: Optional[OperationLogWriter] = None
+_writer_lock = threading.Lock()
+# Set in worker processes by attach_worker_log_queue
+_worker_queue = None
+
+
+def get_log_writer() -> OperationLogWriter:
+    """Return this process's log writer, starting it on first use (or after fork)."""
+    global _writer
+    if _writer is None or _writer.pid != os.getpid():
+        with _writer_lock:
+            if _writer is None or _writer.pid != os.getpid():
+                _writer = OperationLogWriter()
+    return _writer
+
+
+def log_operation(
+    action: str,
+    details: str = "",
+    path: Optional[str] = None,
+    duration: Optional[float] = None,
+    outcome: str = "ok",
+) -> None:
+    """
+    Log a dataset operation.
+
+    The record is queued for the background writer and this call returns
+    immediately. Inside a worker process attached with
+    :func:`attach_worker_log_queue`, the record is forwarded to the parent;
+    any other child process writes it synchronously.
+
+    Args:
+        action: Short action name (e.g. "exif_scrub")
+        details: Free-form description
+        path: File or folder the operation applied to
+        duration: Seconds taken, if measured
+        outcome: "ok", "error", "skipped", ...
+    """
+    record = _make_record(action, details, path, duration, outcome)
+    if _worker_queue is not None:
+        _worker_queue.put(record)
+    elif multiprocessing.parent_process() is not None:
+        try:
+            _write_records([record], LOGS_DIR)
+        except OSError:
+            pass
+    else:
+        get_log_writer().submit(record)
+
+
+def flush_log() -> None:
+    """Write out all queued records (called before querying and at exit)."""
+    if _writer is not None and _writer.pid == os.getpid():
+        _writer.flush()
+
 
-def log_operation(action: str, details: str):
-    """Log a dataset operation to a dated log file."""
-    now = datetime.datetime.now()
-    log_filename = now.strftime("%Y-%m-%d") + ".log"
-    log_path = os.path.join(LOGS_DIR, log_filename)
-    with open(log_path, "a", encoding="utf-8") as f:
-        f.write(f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] {action}: {details}\n")
+def _close_writer() -> None:
+    if _writer is not None and _writer.pid == os.getpid():
+        _writer.close()
+
+
+atexit.register(_close_writer)
+
+
+def attach_worker_log_queue(log_queue) -> None:
+    """Process-pool initializer: route this worker's log records to log_queue."""
+    global _worker_queue
+    _worker_queue = log_queue
+
+
+class ProcessLogQueue:
+    """
+    Collect log records from worker processes into the parent's writer.
+
+    Example:
+        with ProcessLogQueue() as log_queue:
+            with ProcessPoolExecutor(
+                initializer=log_queue.initializer, initargs=log_queue.initargs
+            ) as ex:
+                ...
+    """
+
+    def __init__(self):
+        import multiprocessing
+
+        self.queue = multiprocessing.Queue()
+        self.initializer = attach_worker_log_queue
+        self.initargs = (self.queue,)
+        self._listener: Optional[threading.Thread] = None
+
+    def _listen(self) -> None:
+        writer = get_log_writer()
+        while True:
+            record = self.queue.get()
+            if record is None:
+                return
+            writer.submit(record)
+
+    def __enter__(self) -> "ProcessLogQueue":
+        self._listener = threading.Thread(
+            target=self._listen, name="ProcessLogQueueListener", daemon=True
+        )
+        self._listener.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.queue.put(None)
+        if self._listener is not None:
+            self._listener.join(timeout=10)
+        self.queue.close()
+        flush_log()
 
 
 def list_logs() -> List[str]:
     """List all log files in the logs directory, sorted by date descending."""
     if not os.path.exists(LOGS_DIR):
         return []
-    files = [f for f in os.listdir(LOGS_DIR) if f.endswith(".log")]
+    files = [f for f in os.listdir(LOGS_DIR) if f.endswith(LOG_EXTENSIONS)]
     return sorted(files, reverse=True)
 
 
 def read_log(filename: str) -> Optional[str]:
     """Read the contents of a log file."""
+    flush_log()
     log_path = os.path.join(LOGS_DIR, filename)
     if not os.path.exists(log_path):
         return None
@@ -39,3 +295,109 @@ def read_most_recent_log() -> Optional[str]:
     if not logs:
         return None
     return read_log(logs[0])
+
+
+def _parse_line(line: str) -> Optional[Dict[str, Any]]:
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+    match = _LEGACY_LINE.match(line)
+    if not match:
+        return None
+    return {
+        "ts": match.group("ts").replace(" ", "T"),
+        "action": match.group("action"),
+        "details": match.group("details"),
+        "path": None,
+        "duration": None,
+        "outcome": None,
+    }
+
+
+def _to_date(value) -> Optional[datetime.date]:
+    if value is None or isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value))
+
+
+def _logs_oldest_first() -> List[tuple]:
+    """(date or None, filename) pairs by date; a day's legacy .log precedes its .jsonl."""
+    entries = []
+    for filename in list_logs():
+        stem, ext = os.path.splitext(filename)
+        try:
+            day = datetime.date.fromisoformat(stem)
+        except ValueError:
+            day = None
+        entries.append((day, filename, LOG_EXTENSIONS[::-1].index(ext)))
+    entries.sort(key=lambda e: (e[0] is None, e[0] or datetime.date.min, e[2], e[1]))
+    return [(day, filename) for day, filename, _ in entries]
+
+
+def iter_log_records(
+    action: Optional[str] = None,
+    start_date=None,
+    end_date=None,
+    outcome: Optional[str] = None,
+    contains: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream log records matching the filters, oldest first.
+
+    Files outside the date range are skipped by name and matching files are
+    read line by line, so large logs are never loaded whole.
+
+    Args:
+        action: Exact action name
+        start_date: Earliest date (date or "YYYY-MM-DD"), inclusive
+        end_date: Latest date, inclusive
+        outcome: Exact outcome (legacy text records have none)
+        contains: Case-insensitive substring of details or path
+    """
+    flush_log()
+    start, end = _to_date(start_date), _to_date(end_date)
+    needle = contains.lower() if contains else None
+    for day, filename in _logs_oldest_first():
+        if day is not None and ((start and day < start) or (end and day > end)):
+            continue
+        with open(os.path.join(LOGS_DIR, filename), "r", encoding="utf-8") as f:
+            for line in f:
+                record = _parse_line(line)
+                if record is None:
+                    continue
+                if action and record.get("action") != action:
+                    continue
+                if outcome and record.get("outcome") != outcome:
+                    continue
+                if needle and needle not in (
+                    f"{record.get('details') or ''} {record.get('path') or ''}".lower()
+                ):
+                    continue
+                yield record
+
+
+def query_log(limit: Optional[int] = None, **filters) -> List[Dict[str, Any]]:
+    """
+    Return matching records (see iter_log_records), keeping only the newest `limit`.
+    """
+    if limit is None:
+        return list(iter_log_records(**filters))
+    from collections import deque
+
+    return list(deque(iter_log_records(**filters), maxlen=limit))
+
+
+def format_log_record(record: Dict[str, Any]) -> str:
+    """Render a record as a single human-readable line."""
+    line = f"[{record.get('ts', '').replace('T', ' ')}] {record.get('action')}"
+    if record.get("outcome") and record["outcome"] != "ok":
+        line += f" ({record['outcome']})"
+    line += f": {record.get('details') or record.get('path') or ''}"
+    if record.get("duration") is not None:
+        line += f" [{record['duration']:.2f}s]"
+    return line
@@ -31,21 +31,31 @@ class ImageOperation(ABC):
 class AlphaRemover(ImageOperation):
     """Remove alpha channel from images."""
 
+    ALPHA_MODES = {"RGBA": "RGB", "LA": "L", "PA": "P"}
+
+    @staticmethod
+    def has_alpha(img):
+        """True for alpha modes and for palette/grey/RGB images with a transparency key."""
+        return img.mode in AlphaRemover.ALPHA_MODES or "transparency" in img.info
+
+    @staticmethod
+    def strip_alpha(img):
+        """Return img without its alpha channel (unchanged if it has none)."""
+        target = AlphaRemover.ALPHA_MODES.get(img.mode)
+        if target:
+            return img.convert(target)
+        if "transparency" in img.info:
+            img = img.convert("RGB") if img.mode == "P" else img.copy()
+            img.info.pop("transparency", None)
+        return img
+
     def process(self, image_path, output_path=None, operation="inplace"):
         """Remove alpha channel from an image."""
         try:
             with Image.open(image_path) as img:
-                if img.mode in ("RGBA", "LA", "PA"):
+                if self.has_alpha(img):
                     # Convert to RGB or L depending on original mode
-                    if img.mode == "RGBA":
-                        rgb_img = img.convert("RGB")
-                    elif img.mode == "LA":
-                        rgb_img = img.convert("L")
-                    elif img.mode == "PA":
-                        rgb_img = img.convert("P")
-                    else:
-                        return False, f"Unsupported mode with alpha: {img.mode}"
-                    
+                    rgb_img = self.strip_alpha(img)
                     save_path = output_path if output_path else image_path
                     rgb_img.save(save_path, quality=95)
                     return True, save_path
@@ -108,33 +118,35 @@ class ColorAdjuster(ImageOperation):
 
 
 class ICCToSRGBConverter:
+    @staticmethod
+    def convert_image(img):
+        """Apply img's embedded ICC profile (if any) and return an sRGB image, keeping alpha."""
+        has_alpha = "A" in img.getbands()
+        if has_alpha:
+            alpha = img.split()[-1]
+            rgb_img = img.convert("RGB")
+        else:
+            rgb_img = img
+        if "icc_profile" in img.info:
+            input_profile = ImageCms.ImageCmsProfile(BytesIO(img.info["icc_profile"]))
+            srgb_profile = ImageCms.createProfile("sRGB")
+            rgb_converted = ImageCms.profileToProfile(
+                rgb_img, input_profile, srgb_profile, outputMode="RGB"
+            )
+        else:
+            rgb_converted = rgb_img
+        if has_alpha:
+            channels = list(rgb_converted.split())
+            channels.append(alpha)
+            return Image.merge("RGBA", channels)
+        return rgb_converted
+
     @staticmethod
     def process_image(input_path, output_path):
         """Process a single image by applying its ICC profile and converting to sRGB while preserving alpha."""
         try:
             img = Image.open(input_path)
-            has_alpha = "A" in img.getbands()
-            if has_alpha:
-                alpha = img.split()[-1]
-                rgb_img = img.convert("RGB")
-            else:
-                rgb_img = img
-            if "icc_profile" in img.info:
-                input_profile = ImageCms.ImageCmsProfile(
-                    BytesIO(img.info["icc_profile"])
-                )
-                srgb_profile = ImageCms.createProfile("sRGB")
-                rgb_converted = ImageCms.profileToProfile(
-                    rgb_img, input_profile, srgb_profile, outputMode="RGB"
-                )
-            else:
-                rgb_converted = rgb_img
-            if has_alpha:
-                channels = list(rgb_converted.split())
-                channels.append(alpha)
-                final_image = Image.merge("RGBA", channels)
-            else:
-                final_image = rgb_converted
+            final_image = ICCToSRGBConverter.convert_image(img)
             final_image.save(output_path, "PNG", icc_profile=None)
             log_operation("icc_to_srgb", f"Converted ICC to sRGB for {input_path}")
         except Exception as e:
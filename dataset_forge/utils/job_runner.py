@@ -0,0 +1,343 @@
+"""
+Headless job runner for Dataset Forge.
+
+Runs a chain of actions described in a YAML or JSON job file without any
+interactive prompts, so pipelines can run unattended under a scheduler:
+
+    python -m dataset_forge run job.yaml [--dry-run] [--report report.json]
+                                         [--output normal|quiet|json]
+
+Job file format:
+
+    name: prepare-dataset
+    input: /data/raw            # folder the first step reads
+    output: /data/final         # folder the last step writes
+    work_dir: /scratch/forge    # optional, where intermediate folders go
+                                # (default: next to the output)
+    keep_intermediate: false    # optional, keep intermediate step folders
+    continue_on_error: false    # optional, keep going after a failed step
+    steps:
+      - action: sanitize
+        params: {strip_metadata: true, to_png: true}
+      - action: dedup
+        params: {max_distance: 4}
+      - action: dpid
+        output: /data/half      # optional, keep this step's output
+        params: {method: basicsr, scale: 0.5}
+
+Each step reads the previous step's output folder and writes a new folder, so
+the input dataset is never modified. Filtering steps hardlink the files they
+keep instead of copying them. Step adapters are registered with
+``register_step`` (see ``dataset_forge.actions.job_actions``).
+
+Exit codes: 0 success, 1 a step failed, 2 invalid job file or arguments.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from dataset_forge.utils.file_utils import is_image_file
+from dataset_forge.utils.history_log import log_operation
+from dataset_forge.utils.printing import (
+    OUTPUT_MODES,
+    print_error,
+    print_header,
+    print_info,
+    print_section,
+    print_success,
+    print_warning,
+    set_output_mode,
+)
+
+EXIT_OK = 0
+EXIT_STEP_FAILED = 1
+EXIT_INVALID_JOB = 2
+
+# action name -> adapter(input_dir, output_dir, **params) -> Optional[str]
+STEP_REGISTRY: Dict[str, Callable[..., Optional[str]]] = {}
+
+
+class JobError(ValueError):
+    """Raised for job files that cannot be run (bad format, unknown action...)."""
+
+
+def register_step(name: str):
+    """
+    Register a headless step adapter under an action name.
+
+    The adapter is called as ``adapter(input_dir, output_dir, **params)``,
+    must not prompt, and writes its results under output_dir. It may return
+    a different folder (e.g. a subfolder) as the step's output.
+    """
+
+    def decorator(func):
+        STEP_REGISTRY[name] = func
+        return func
+
+    return decorator
+
+
+def get_step_registry() -> Dict[str, Callable[..., Optional[str]]]:
+    """Registered step adapters (importing the built-in adapters on first use)."""
+    import dataset_forge.actions.job_actions  # noqa: F401  (registers adapters)
+
+    return STEP_REGISTRY
+
+
+@dataclass
+class StepReport:
+    """Outcome and timing of one job step."""
+
+    index: int
+    action: str
+    input: str
+    output: Optional[str] = None
+    status: str = "pending"
+    error: Optional[str] = None
+    seconds: float = 0.0
+    files_in: int = 0
+    files_out: int = 0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files_in / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class JobReport:
+    """Outcome of a whole job."""
+
+    name: str
+    status: str = "pending"
+    seconds: float = 0.0
+    steps: List[StepReport] = field(default_factory=list)
+
+    @property
+    def exit_code(self) -> int:
+        return EXIT_OK if self.status in ("success", "planned") else EXIT_STEP_FAILED
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        for step, step_data in zip(self.steps, data["steps"]):
+            step_data["files_per_second"] = round(step.files_per_second, 2)
+        return data
+
+
+def load_job(path: str) -> Dict[str, Any]:
+    """
+    Read and validate a YAML (.yaml/.yml) or JSON job file.
+
+    Raises:
+        JobError: If the file cannot be parsed or does not describe a valid job.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if path.lower().endswith((".yaml", ".yml")):
+                from dataset_forge.utils.lazy_imports import yaml
+
+                job = yaml.safe_load(f)
+            else:
+                job = json.load(f)
+    except OSError as e:
+        raise JobError(f"Cannot read job file {path}: {e}")
+    except Exception as e:
+        raise JobError(f"Cannot parse job file {path}: {e}")
+    validate_job(job)
+    job.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    return job
+
+
+def validate_job(job: Any) -> None:
+    """Raise JobError unless job is a runnable job description."""
+    if not isinstance(job, dict):
+        raise JobError("Job file must contain a mapping at the top level.")
+    if not job.get("input") or not os.path.isdir(job["input"]):
+        raise JobError(f"Job input folder does not exist: {job.get('input')}")
+    steps = job.get("steps")
+    if not isinstance(steps, list) or not steps:
+        raise JobError("Job must define a non-empty 'steps' list.")
+    registry = get_step_registry()
+    for i, step in enumerate(steps, 1):
+        if not isinstance(step, dict) or "action" not in step:
+            raise JobError(f"Step {i} must be a mapping with an 'action'.")
+        if step["action"] not in registry:
+            raise JobError(
+                f"Step {i}: unknown action '{step['action']}'. "
+                f"Available: {', '.join(sorted(registry))}"
+            )
+        if not isinstance(step.get("params", {}), dict):
+            raise JobError(f"Step {i}: 'params' must be a mapping.")
+    if not job.get("output") and not steps[-1].get("output"):
+        raise JobError("Job must define an 'output' folder.")
+
+
+def count_images(folder: Optional[str]) -> int:
+    """Number of image files directly inside folder (0 if it does not exist)."""
+    if not folder or not os.path.isdir(folder):
+        return 0
+    with os.scandir(folder) as it:
+        return sum(1 for e in it if e.is_file() and is_image_file(e.name))
+
+
+def _step_output(job: Dict[str, Any], index: int, work_dir: str) -> str:
+    step = job["steps"][index]
+    if step.get("output"):
+        return step["output"]
+    if index == len(job["steps"]) - 1:
+        return job["output"]
+    return os.path.join(work_dir, f"{index + 1:02d}_{step['action']}")
+
+
+def run_job(job: Dict[str, Any], dry_run: bool = False) -> JobReport:
+    """
+    Run the steps of a validated job in order, chaining their folders.
+
+    Args:
+        job: Job description (see load_job)
+        dry_run: Only print the step plan
+
+    Returns:
+        JobReport with per-step status, timing and throughput.
+    """
+    registry = get_step_registry()
+    report = JobReport(name=job.get("name", "job"))
+    keep_intermediate = job.get("keep_intermediate", False)
+    continue_on_error = job.get("continue_on_error", False)
+
+    # Intermediates default to the output's parent so hardlinks stay on one filesystem
+    final_output = job.get("output") or job["steps"][-1]["output"]
+    work_root = job.get("work_dir") or os.path.dirname(os.path.abspath(final_output))
+    os.makedirs(work_root, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix="dataset_forge_job_", dir=work_root)
+
+    print_header(f"Job: {report.name}")
+    job_start = time.perf_counter()
+    current = job["input"]
+    try:
+        for i, step in enumerate(job["steps"]):
+            output = _step_output(job, i, work_dir)
+            step_report = StepReport(
+                index=i + 1, action=step["action"], input=current, output=output
+            )
+            report.steps.append(step_report)
+            print_section(f"Step {i + 1}/{len(job['steps'])}: {step['action']}")
+            print_info(f"{current} -> {output}")
+            if dry_run:
+                step_report.status = "planned"
+                current = output
+                continue
+
+            step_report.files_in = count_images(current)
+            os.makedirs(output, exist_ok=True)
+            start = time.perf_counter()
+            try:
+                produced = registry[step["action"]](
+                    current, output, **step.get("params", {})
+                )
+            except (Exception, SystemExit) as e:
+                step_report.seconds = round(time.perf_counter() - start, 3)
+                step_report.status = "failed"
+                step_report.error = str(e) or type(e).__name__
+                print_error(f"Step {i + 1} ({step['action']}) failed: {step_report.error}")
+                log_operation(
+                    "job_runner",
+                    f"{report.name}: step {i + 1} {step['action']} failed: {step_report.error}",
+                    outcome="error",
+                )
+                if not continue_on_error:
+                    break
+                # The next step reads this step's input instead
+                continue
+            step_report.seconds = round(time.perf_counter() - start, 3)
+            step_report.output = produced or output
+            step_report.files_out = count_images(step_report.output)
+            step_report.status = "success"
+            print_success(
+                f"{step['action']}: {step_report.files_in} -> {step_report.files_out} images "
+                f"in {step_report.seconds:.2f}s ({step_report.files_per_second:.1f} images/s)"
+            )
+            current = step_report.output
+    finally:
+        if not keep_intermediate:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report.seconds = round(time.perf_counter() - job_start, 3)
+    if dry_run:
+        report.status = "planned"
+    elif all(s.status == "success" for s in report.steps) and len(report.steps) == len(job["steps"]):
+        report.status = "success"
+    else:
+        report.status = "failed"
+    if not dry_run:
+        log_operation(
+            "job_runner",
+            f"{report.name}: {report.status} in {report.seconds:.1f}s",
+            outcome="success" if report.status == "success" else "error",
+        )
+    return report
+
+
+def print_job_report(report: JobReport) -> None:
+    """Print the per-step timing table of a finished job."""
+    print_section(f"Job Summary: {report.name} ({report.status})")
+    for step in report.steps:
+        line = (
+            f"{step.index:>2}. {step.action:<14} {step.status:<8} {step.seconds:>8.2f}s "
+            f"{step.files_in:>7} -> {step.files_out:<7} {step.files_per_second:>8.1f} img/s"
+        )
+        if step.status == "failed":
+            print_error(f"{line}  {step.error}")
+        else:
+            print_info(line)
+    print_info(f"Total: {report.seconds:.2f}s")
+
+
+def run_job_cli(argv: Optional[List[str]] = None) -> int:
+    """Entry point for ``dataset-forge run``. Returns the process exit code."""
+    parser = argparse.ArgumentParser(
+        prog="dataset-forge run", description="Run a Dataset Forge job file headlessly."
+    )
+    parser.add_argument("job", nargs="?", help="YAML or JSON job file")
+    parser.add_argument("--dry-run", action="store_true", help="Validate and print the plan only")
+    parser.add_argument("--report", help="Write the job report as JSON to this path")
+    parser.add_argument("--list-actions", action="store_true", help="List available actions and exit")
+    parser.add_argument(
+        "--output",
+        choices=OUTPUT_MODES,
+        help="Console output: normal, quiet (warnings/errors only) or json lines",
+    )
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return EXIT_OK if e.code == 0 else EXIT_INVALID_JOB
+    if args.output:
+        set_output_mode(args.output)
+    if args.list_actions:
+        for name in sorted(get_step_registry()):
+            print(name)
+        return EXIT_OK
+    if not args.job:
+        parser.print_usage()
+        return EXIT_INVALID_JOB
+
+    try:
+        job = load_job(args.job)
+    except JobError as e:
+        print_error(str(e))
+        return EXIT_INVALID_JOB
+
+    report = run_job(job, dry_run=args.dry_run)
+    print_job_report(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+        print_info(f"Job report written to {args.report}")
+    if report.exit_code != EXIT_OK:
+        print_warning(f"Job '{report.name}' did not complete successfully.")
+    return report.exit_code
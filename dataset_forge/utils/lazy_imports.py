@@ -7,12 +7,17 @@ CLI startup times and memory usage.
 """
 
 import importlib
+import subprocess
 import sys
 import time
+from dataclasses import dataclass, field
 from functools import wraps
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from dataset_forge.utils.printing import print_info
+from dataset_forge.utils.printing import print_info, print_section, print_warning
+
+# Modules that must not be imported just to start the CLI
+HEAVY_STARTUP_MODULES = ("torch", "pygame", "psutil", "numpy", "dataset_forge.utils.emoji_mapping")
 
 
 class LazyImport:
@@ -310,3 +315,120 @@ def monitor_import_performance(func: Callable) -> Callable:
             print_info(f"Function {func.__name__} took {function_time:.3f}s")
 
     return wrapper
+
+
+@dataclass
+class ImportNode:
+    """One module in an import tree (times in milliseconds)."""
+
+    name: str
+    self_ms: float = 0.0
+    cumulative_ms: float = 0.0
+    children: List["ImportNode"] = field(default_factory=list)
+
+
+def parse_importtime(output: str) -> List[ImportNode]:
+    """
+    Build an import tree from ``python -X importtime`` output.
+
+    Returns:
+        The top-level ImportNodes, each with its nested children.
+    """
+    roots: List[ImportNode] = []
+    # importtime prints children before their parent, indented one level deeper
+    pending: Dict[int, List[ImportNode]] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            node = ImportNode(
+                name=name.strip(),
+                self_ms=int(self_us) / 1000,
+                cumulative_ms=int(cumulative_us) / 1000,
+            )
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        node.children = pending.pop(depth + 1, [])
+        if depth == 0:
+            roots.append(node)
+        else:
+            pending.setdefault(depth, []).append(node)
+    return roots
+
+
+def profile_import_tree(module: str = "dataset_forge.cli", timeout: float = 120) -> List[ImportNode]:
+    """
+    Measure the import tree of module in a fresh interpreter.
+
+    A subprocess is used so modules already imported in this process do not
+    hide their cost.
+
+    Raises:
+        RuntimeError: If the module cannot be imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed: {result.stderr.strip()[-500:]}")
+    return parse_importtime(result.stderr)
+
+
+def print_import_tree(
+    roots: List[ImportNode], min_ms: float = 5.0, max_depth: int = 6
+) -> None:
+    """Print an import tree, hiding branches cheaper than min_ms."""
+    total = sum(node.cumulative_ms for node in roots)
+    print_section(f"Import Tree ({total:.0f} ms total, showing >= {min_ms:g} ms)")
+
+    def show(node: ImportNode, depth: int) -> None:
+        if node.cumulative_ms < min_ms or depth > max_depth:
+            return
+        print_info(
+            f"{node.cumulative_ms:>9.1f} ms {node.self_ms:>8.1f} ms  {'  ' * depth}{node.name}"
+        )
+        for child in sorted(node.children, key=lambda c: c.cumulative_ms, reverse=True):
+            show(child, depth + 1)
+
+    print_info(f"{'cumulative':>12} {'self':>11}  module")
+    for node in sorted(roots, key=lambda n: n.cumulative_ms, reverse=True):
+        show(node, 0)
+
+    loaded = set()
+    stack = list(roots)
+    while stack:
+        node = stack.pop()
+        loaded.add(node.name)
+        stack.extend(node.children)
+    heavy = [name for name in HEAVY_STARTUP_MODULES if name in loaded]
+    if heavy:
+        print_warning(f"Heavy modules loaded at import: {', '.join(heavy)}")
+
+
+def profile_imports_cli(argv: Optional[List[str]] = None) -> int:
+    """Entry point for ``dataset-forge profile-imports``. Returns the exit code."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="dataset-forge profile-imports",
+        description="Show the per-module import tree of a Dataset Forge module.",
+    )
+    parser.add_argument("module", nargs="?", default="dataset_forge.menus.main_menu")
+    parser.add_argument("--min-ms", type=float, default=5.0, help="Hide branches cheaper than this")
+    parser.add_argument("--depth", type=int, default=6, help="Maximum tree depth to show")
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return e.code or 0
+    try:
+        roots = profile_import_tree(args.module)
+    except (RuntimeError, subprocess.TimeoutExpired) as e:
+        print_warning(str(e))
+        return 1
+    print_import_tree(roots, min_ms=args.min_ms, max_depth=args.depth)
+    return 0
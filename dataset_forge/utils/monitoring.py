@@ -8,10 +8,12 @@ performance analytics, error tracking, and health checks.
 
 import functools
 import os
-import psutil
+import sys
+import threading
 import time
 from typing import Any, Dict, List, Optional
 
+from dataset_forge.utils.lazy_imports import numpy_as_np as np, psutil
 from dataset_forge.utils.printing import print_info, print_warning, print_error
 
 
@@ -34,12 +36,25 @@ def monitor_performance(op_name):
     return decorator
 
 
+# Names of the monitor_all operations currently running (innermost last)
+_active_operations: List[str] = []
+
+
+def current_operation() -> str:
+    """Return the innermost running monitor_all operation, or '' if none."""
+    try:
+        return _active_operations[-1]
+    except IndexError:
+        return ""
+
+
 def monitor_all(op_name, critical_on_error=False):
     """Comprehensive monitoring decorator that tracks performance, errors, and resources."""
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             start_time = time.time()
+            _active_operations.append(op_name)
             try:
                 result = func(*args, **kwargs)
                 duration = time.time() - start_time
@@ -52,6 +67,11 @@ def monitor_all(op_name, critical_on_error=False):
                 if critical_on_error:
                     print_error(f"Critical error in {op_name}: {e}")
                 raise
+            finally:
+                try:
+                    _active_operations.remove(op_name)
+                except ValueError:
+                    pass
         return wrapper
     return decorator
 
@@ -59,15 +79,18 @@ def monitor_all(op_name, critical_on_error=False):
 class ResourceMonitor:
     """Monitor system resources in real-time."""
 
-    def __init__(self):
+    def __init__(self, sampler: Optional["ResourceSampler"] = None):
         self.background_thread = None
         self.stop_flag = False
+        self.sampler = sampler
+        # Prime the non-blocking CPU counter used by snapshot()
+        psutil.cpu_percent(interval=None)
 
     def snapshot(self) -> Dict[str, Any]:
         """Take a snapshot of current resource usage."""
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=0.1)
+            # CPU usage since the previous call (non-blocking)
+            cpu_percent = psutil.cpu_percent(interval=None)
 
             # Memory usage
             memory = psutil.virtual_memory()
@@ -127,25 +150,278 @@ class ResourceMonitor:
                 'gpu': []
             }
 
-    def _background_loop(self):
-        """Background monitoring loop."""
-        while not self.stop_flag:
-            snapshot = self.snapshot()
-            # Store or process snapshot as needed
-            time.sleep(2.0)
-
     def start_background(self, interval: float = 2.0):
-        """Start background monitoring."""
-        import threading
+        """Start background sampling into the time-series ring buffer."""
+        if self.sampler is None:
+            self.sampler = resource_sampler
         self.stop_flag = False
-        self.background_thread = threading.Thread(target=self._background_loop, daemon=True)
-        self.background_thread.start()
+        self.sampler.start(interval)
+        self.background_thread = self.sampler.thread
 
     def stop_background(self):
         """Stop background monitoring."""
         self.stop_flag = True
-        if self.background_thread:
-            self.background_thread.join()
+        if self.sampler is not None:
+            self.sampler.stop()
+
+
+class ResourceSampler:
+    """
+    Time-series resource sampler backed by a fixed-size NumPy ring buffer.
+
+    Each sample records process CPU, per-core CPU, RSS, system disk read/write
+    throughput, open file count and GPU memory (NaN without CUDA), tagged with
+    the monitor_all operation running at the time. Sampling never blocks: CPU
+    percentages are measured since the previous sample.
+
+    Example:
+        >>> sampler = ResourceSampler(capacity=600)
+        >>> sampler.start(interval=0.5)
+        >>> ...  # long-running work
+        >>> sampler.stop()
+        >>> sampler.export("resources.csv")
+    """
+
+    FIELDS = (
+        "timestamp",
+        "cpu_percent",
+        "rss_bytes",
+        "disk_read_bps",
+        "disk_write_bps",
+        "open_files",
+        "gpu_mem_bytes",
+        "operation_id",
+    )
+
+    def __init__(self, capacity: int = 3600, interval: float = 1.0):
+        self.capacity = capacity
+        self.interval = interval
+        self._index = 0
+        self._count = 0
+        self._operations: List[str] = [""]
+        self._operation_ids: Dict[str, int] = {"": 0}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self._last_disk = None
+        self._last_time = None
+        # psutil and the NumPy buffers are set up on first use, so creating
+        # the module-level sampler costs nothing at import time
+        self._data = None
+
+    def _ensure_ready(self) -> None:
+        if self._data is not None:
+            return
+        with self._lock:
+            if self._data is not None:
+                return
+            self.num_cores = psutil.cpu_count() or 1
+            self._per_core = np.full(
+                (self.capacity, self.num_cores), np.nan, dtype=np.float32
+            )
+            self._process = psutil.Process()
+            self._process.cpu_percent(None)
+            psutil.cpu_percent(interval=None, percpu=True)
+            self._data = np.full(
+                (self.capacity, len(self.FIELDS)), np.nan, dtype=np.float64
+            )
+
+    def _open_files(self) -> float:
+        try:
+            if hasattr(self._process, "num_fds"):
+                return float(self._process.num_fds())
+            return float(len(self._process.open_files()))
+        except (psutil.Error, OSError):
+            return np.nan
+
+    @staticmethod
+    def _gpu_memory() -> float:
+        # Only report GPU memory if torch is already loaded; never import it here
+        torch = sys.modules.get("torch")
+        try:
+            if torch is not None and torch.cuda.is_available():
+                return float(
+                    sum(
+                        torch.cuda.memory_allocated(i)
+                        for i in range(torch.cuda.device_count())
+                    )
+                )
+        except Exception:
+            pass
+        return np.nan
+
+    def sample(self) -> Dict[str, Any]:
+        """Record one sample into the ring buffer and return it."""
+        self._ensure_ready()
+        now = time.time()
+        try:
+            disk = psutil.disk_io_counters()
+        except Exception:
+            disk = None
+        read_bps = write_bps = np.nan
+        if disk is not None and self._last_disk is not None:
+            elapsed = max(now - self._last_time, 1e-6)
+            read_bps = (disk.read_bytes - self._last_disk.read_bytes) / elapsed
+            write_bps = (disk.write_bytes - self._last_disk.write_bytes) / elapsed
+        self._last_disk, self._last_time = disk, now
+
+        try:
+            rss = float(self._process.memory_info().rss)
+            cpu = self._process.cpu_percent(None)
+        except psutil.Error:
+            rss, cpu = np.nan, np.nan
+        per_core = psutil.cpu_percent(interval=None, percpu=True)
+
+        operation = current_operation()
+        with self._lock:
+            op_id = self._operation_ids.get(operation)
+            if op_id is None:
+                op_id = len(self._operations)
+                self._operations.append(operation)
+                self._operation_ids[operation] = op_id
+            row = (
+                now,
+                cpu,
+                rss,
+                read_bps,
+                write_bps,
+                self._open_files(),
+                self._gpu_memory(),
+                op_id,
+            )
+            self._data[self._index] = row
+            self._per_core[self._index, : len(per_core)] = per_core[: self.num_cores]
+            self._index = (self._index + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+        record = dict(zip(self.FIELDS, row))
+        record["operation"] = operation
+        record["per_core"] = per_core
+        return record
+
+    def _loop(self):
+        while not self._stop_event.is_set():
+            start = time.time()
+            self.sample()
+            self._stop_event.wait(max(0.0, self.interval - (time.time() - start)))
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, interval: Optional[float] = None):
+        """Start sampling on a daemon thread every `interval` seconds."""
+        if interval is not None:
+            self.interval = interval
+        if self.running:
+            return
+        self._stop_event.clear()
+        self.thread = threading.Thread(
+            target=self._loop, name="ResourceSampler", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        """Stop the sampling thread."""
+        self._stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def clear(self):
+        """Drop all recorded samples."""
+        self._ensure_ready()
+        with self._lock:
+            self._data[:] = np.nan
+            self._per_core[:] = np.nan
+            self._index = 0
+            self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def samples(self) -> Dict[str, "np.ndarray"]:
+        """
+        Return recorded samples in chronological order.
+
+        Returns:
+            Dict with one array per field, plus ``per_core`` (N x cores) and
+            ``operation`` (operation names).
+        """
+        self._ensure_ready()
+        with self._lock:
+            if self._count < self.capacity:
+                order = np.arange(self._count)
+            else:
+                order = (np.arange(self.capacity) + self._index) % self.capacity
+            data = self._data[order].copy()
+            per_core = self._per_core[order].copy()
+            operations = list(self._operations)
+        result = {field: data[:, i] for i, field in enumerate(self.FIELDS)}
+        result["per_core"] = per_core
+        result["operation"] = np.array(
+            [operations[int(i)] for i in result["operation_id"]], dtype=object
+        )
+        return result
+
+    def to_dataframe(self):
+        """Return the samples as a pandas DataFrame (one column per core)."""
+        import pandas as pd
+
+        samples = self.samples()
+        per_core = samples.pop("per_core")
+        samples.pop("operation_id")
+        frame = pd.DataFrame(samples)
+        for core in range(per_core.shape[1]):
+            frame[f"cpu{core}_percent"] = per_core[:, core]
+        return frame
+
+    def export(self, path: str) -> str:
+        """
+        Export samples to CSV or Parquet, chosen by file extension.
+
+        Parquet needs pyarrow or fastparquet installed.
+        """
+        frame = self.to_dataframe()
+        if path.lower().endswith(".parquet"):
+            frame.to_parquet(path, index=False)
+        else:
+            frame.to_csv(path, index=False)
+        return path
+
+    def sparkline(self, field: str = "cpu_percent", width: int = 60) -> str:
+        """Render the most recent values of a field as a unicode sparkline."""
+        values = self.samples()[field][-width:].astype(np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return ""
+        ticks = "▁▂▃▄▅▆▇█"
+        low, high = values.min(), values.max()
+        if high == low:
+            return ticks[0] * values.size
+        levels = ((values - low) / (high - low) * (len(ticks) - 1)).round().astype(int)
+        return "".join(ticks[i] for i in levels)
+
+    def operation_summary(self) -> Dict[str, Dict[str, float]]:
+        """Mean CPU, RSS and disk throughput per tagged operation."""
+        import warnings
+
+        samples = self.samples()
+        summary = {}
+        with warnings.catch_warnings():
+            # Empty slices (e.g. the first sample's disk rate) are expected here
+            warnings.simplefilter("ignore", RuntimeWarning)
+            for operation in dict.fromkeys(samples["operation"]):
+                mask = samples["operation"] == operation
+                read = np.nanmean(samples["disk_read_bps"][mask])
+                write = np.nanmean(samples["disk_write_bps"][mask])
+                summary[operation or "(idle)"] = {
+                    "samples": int(mask.sum()),
+                    "cpu_percent": float(np.nanmean(samples["cpu_percent"][mask])),
+                    "rss_mb": float(np.nanmax(samples["rss_bytes"][mask]) / 1024**2),
+                    "disk_read_mbps": float(np.nan_to_num(read) / 1024**2),
+                    "disk_write_mbps": float(np.nan_to_num(write) / 1024**2),
+                }
+        return summary
 
 
 class PerformanceAnalytics:
@@ -471,6 +747,7 @@ def print_health_check_results(results: Dict[str, Any]):
 perf_analytics = PerformanceAnalytics()
 error_tracker = ErrorTracker()
 task_registry = TaskRegistry()
+resource_sampler = ResourceSampler()
 
 
 def time_and_record_menu_load(menu_name):
@@ -0,0 +1,208 @@
+"""
+HQ/LQ pair resolution for Dataset Forge.
+
+Pairs are matched with dictionary lookups in O(n) instead of scanning one file
+list per file of the other. Matching can be by exact relative path or by stem
+(``foo.png`` <-> ``foo.jpg``), optionally across subfolders. The result is a
+compact ``PairTable`` (numpy string arrays) that is cached for the session and
+reused by every operation until either folder changes.
+
+Example:
+    >>> table = resolve_pairs("dataset/hq", "dataset/lq", by_stem=True)
+    >>> for hq_path, lq_path in table.iter_paths():
+    ...     process(hq_path, lq_path)
+"""
+
+import os
+import threading
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from dataset_forge.utils.file_utils import is_image_file
+from dataset_forge.utils.lazy_imports import numpy_as_np as np
+
+# Session cache: (hq, lq, by_stem, recursive) -> (folder signature, PairTable)
+_PAIR_CACHE: Dict[Tuple, Tuple[Tuple, "PairTable"]] = {}
+_PAIR_CACHE_LOCK = threading.Lock()
+
+
+def list_image_files(folder: str, recursive: bool = False) -> List[str]:
+    """
+    Return sorted image paths relative to folder (``/``-separated when recursive).
+
+    Uses os.scandir so file-type checks come from the directory listing rather
+    than one stat call per entry.
+    """
+    files = []
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(folder, rel_dir)) as it:
+                for entry in it:
+                    rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    if entry.is_file() and is_image_file(entry.name):
+                        files.append(rel)
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        stack.append(rel)
+        except OSError:
+            continue
+    files.sort()
+    return files
+
+
+def _stem(rel_path: str) -> str:
+    return os.path.splitext(rel_path)[0]
+
+
+def match_pairs(
+    hq_files: Sequence[str], lq_files: Sequence[str], by_stem: bool = False
+) -> Tuple[List[Tuple[str, str]], List[str], List[str]]:
+    """
+    Match two file lists in linear time.
+
+    Exact names always match first. With by_stem, the remaining files are
+    matched on their path without extension; if one side has several files
+    with the same stem, the first in sorted order is paired.
+
+    Returns:
+        (pairs as (hq, lq) in hq order, unmatched hq files, unmatched lq files)
+    """
+    lq_names = set(lq_files)
+    pairs = []
+    hq_left = []
+    for name in hq_files:
+        if name in lq_names:
+            pairs.append((name, name))
+        else:
+            hq_left.append(name)
+    matched_lq = {lq for _, lq in pairs}
+    lq_left = [name for name in lq_files if name not in matched_lq]
+    if by_stem and hq_left and lq_left:
+        lq_by_stem: Dict[str, str] = {}
+        for name in sorted(lq_left):
+            lq_by_stem.setdefault(_stem(name), name)
+        still_left = []
+        for name in hq_left:
+            lq = lq_by_stem.pop(_stem(name), None)
+            if lq is None:
+                still_left.append(name)
+            else:
+                pairs.append((name, lq))
+        hq_left = still_left
+        matched_lq = {lq for _, lq in pairs}
+        lq_left = [name for name in lq_left if name not in matched_lq]
+        pairs.sort()
+    return pairs, hq_left, lq_left
+
+
+class PairTable:
+    """
+    Resolved HQ/LQ pairs stored as two aligned numpy string arrays.
+
+    Attributes:
+        hq_folder, lq_folder: Roots the relative paths are resolved against
+        hq, lq: Relative paths of each pair
+        hq_only, lq_only: Relative paths without a partner
+    """
+
+    def __init__(
+        self,
+        hq_folder: str,
+        lq_folder: str,
+        pairs: List[Tuple[str, str]],
+        hq_only: List[str],
+        lq_only: List[str],
+    ):
+        self.hq_folder = hq_folder
+        self.lq_folder = lq_folder
+        self.hq = np.array([p[0] for p in pairs], dtype=str)
+        self.lq = np.array([p[1] for p in pairs], dtype=str)
+        self.hq_only = np.array(hq_only, dtype=str)
+        self.lq_only = np.array(lq_only, dtype=str)
+
+    def __len__(self) -> int:
+        return len(self.hq)
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return zip(self.hq.tolist(), self.lq.tolist())
+
+    def names(self) -> List[str]:
+        """HQ relative paths; identical to the LQ ones for exact-name matching."""
+        return self.hq.tolist()
+
+    def iter_paths(self) -> Iterator[Tuple[str, str]]:
+        """Yield (hq_path, lq_path) joined with the folder roots."""
+        for hq, lq in self:
+            yield os.path.join(self.hq_folder, hq), os.path.join(self.lq_folder, lq)
+
+    def take(self, indices) -> "PairTable":
+        """Sub-table for the given indices (e.g. a random sample)."""
+        indices = np.asarray(indices, dtype=np.int64)
+        table = PairTable(self.hq_folder, self.lq_folder, [], [], [])
+        table.hq, table.lq = self.hq[indices], self.lq[indices]
+        table.hq_only, table.lq_only = self.hq_only, self.lq_only
+        return table
+
+
+def _folder_signature(folder: str, recursive: bool) -> Tuple:
+    """Directory mtimes; adding, removing or renaming a file changes them."""
+    try:
+        signature = [os.stat(folder).st_mtime_ns]
+    except OSError:
+        return ()
+    if recursive:
+        for root, dirs, _ in os.walk(folder):
+            for d in dirs:
+                try:
+                    signature.append(os.stat(os.path.join(root, d)).st_mtime_ns)
+                except OSError:
+                    pass
+    return tuple(signature)
+
+
+def resolve_pairs(
+    hq_folder: str,
+    lq_folder: str,
+    by_stem: bool = False,
+    recursive: bool = False,
+    use_cache: bool = True,
+) -> PairTable:
+    """
+    Resolve HQ/LQ pairs for two folders, reusing the session cache when valid.
+
+    Args:
+        by_stem: Match ``foo.png`` with ``foo.jpg`` when exact names differ
+        recursive: Include subfolders (pairs must share the relative subpath)
+        use_cache: Reuse the table from an earlier call if neither folder's
+            directory mtimes changed since
+    """
+    key = (os.path.abspath(hq_folder), os.path.abspath(lq_folder), by_stem, recursive)
+    signature = (
+        _folder_signature(hq_folder, recursive),
+        _folder_signature(lq_folder, recursive),
+    )
+    if use_cache:
+        with _PAIR_CACHE_LOCK:
+            cached = _PAIR_CACHE.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+    pairs, hq_only, lq_only = match_pairs(
+        list_image_files(hq_folder, recursive),
+        list_image_files(lq_folder, recursive),
+        by_stem=by_stem,
+    )
+    table = PairTable(hq_folder, lq_folder, pairs, hq_only, lq_only)
+    with _PAIR_CACHE_LOCK:
+        _PAIR_CACHE[key] = (signature, table)
+    return table
+
+
+def matching_pair_names(hq_folder: str, lq_folder: str) -> List[str]:
+    """Sorted image filenames present in both folders (top level, exact names)."""
+    return resolve_pairs(hq_folder, lq_folder).names()
+
+
+def clear_pair_cache() -> None:
+    """Drop all cached pair tables."""
+    with _PAIR_CACHE_LOCK:
+        _PAIR_CACHE.clear()
@@ -14,7 +14,18 @@ from concurrent.futures import (
     as_completed,
     Executor,
 )
-from typing import Callable, List, Any, Optional, Dict, Tuple, Union, Iterator
+from typing import (
+    Callable,
+    List,
+    Any,
+    Optional,
+    Dict,
+    Tuple,
+    Union,
+    Iterator,
+    Iterable,
+)
+from collections import deque
 import functools
 import time
 import logging
@@ -535,6 +546,99 @@ def parallel_image_processing(
     return processor.process_images(func, image_paths, desc)
 
 
+def prefetch_map(
+    func: Callable,
+    items: Iterable[Any],
+    max_workers: Optional[int] = None,
+    prefetch: Optional[int] = None,
+    use_processes: bool = False,
+    initializer: Optional[Callable] = None,
+    initargs: Tuple = (),
+) -> Iterator[Tuple[Any, Any]]:
+    """
+    Lazily apply func to items on a worker pool, yielding (item, result) in order.
+
+    Unlike executor.map, at most `prefetch` calls are in flight at once, so large
+    or unbounded inputs can be streamed (e.g. decoding images while the consumer
+    runs a model or writes an archive) without holding every result in memory.
+
+    Args:
+        func: Function to apply to each item (exceptions propagate to the consumer)
+        items: Iterable of items to process
+        max_workers: Number of workers (defaults to the I/O or CPU worker count)
+        prefetch: Maximum number of pending results (defaults to 4 * max_workers)
+        use_processes: Use a process pool (func must be picklable) for CPU-bound work
+        initializer: Optional per-worker initializer (e.g. to load a preprocessor)
+        initargs: Arguments for initializer
+
+    Returns:
+        Iterator of (item, func(item)) tuples in input order
+    """
+    default_type = "cpu" if use_processes else "io"
+    max_workers = max(1, max_workers or get_optimal_worker_count(default_type))
+    prefetch = max(1, prefetch or max_workers * 4)
+    executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_cls(
+        max_workers=max_workers, initializer=initializer, initargs=initargs
+    ) as executor:
+        pending = deque()
+        for item in items:
+            pending.append((item, executor.submit(func, item)))
+            if len(pending) >= prefetch:
+                head, future = pending.popleft()
+                yield head, future.result()
+        while pending:
+            head, future = pending.popleft()
+            yield head, future.result()
+
+
+class ShapeBatcher:
+    """
+    Group streamed items (e.g. decoded images) into same-shape batches.
+
+    A bucket is released when it holds `batch_size` items. To keep memory
+    bounded on mixed-resolution data, where many shapes would otherwise each
+    hold a partial batch, the largest bucket is also released once
+    `max_buffered` items are waiting across all buckets.
+
+    Example:
+        batcher = ShapeBatcher(batch_size=8)
+        for item, array in decoded:
+            ready = batcher.add(array.shape, (item, array))
+            if ready:
+                run(ready)
+        for ready in batcher.drain():
+            run(ready)
+    """
+
+    def __init__(self, batch_size: int, max_buffered: Optional[int] = None):
+        self.batch_size = max(1, batch_size)
+        self.max_buffered = max(self.batch_size, max_buffered or 4 * self.batch_size)
+        self._buckets: Dict[Any, List[Any]] = {}
+        self.buffered = 0
+
+    def add(self, shape: Any, item: Any) -> Optional[List[Any]]:
+        """Buffer item under shape; returns a batch to process, if one is due."""
+        bucket = self._buckets.setdefault(shape, [])
+        bucket.append(item)
+        self.buffered += 1
+        if len(bucket) >= self.batch_size:
+            return self._pop(shape)
+        if self.buffered >= self.max_buffered:
+            return self._pop(max(self._buckets, key=lambda s: len(self._buckets[s])))
+        return None
+
+    def drain(self) -> Iterator[List[Any]]:
+        """Release every remaining partial batch."""
+        while self._buckets:
+            yield self._pop(next(iter(self._buckets)))
+
+    def _pop(self, shape: Any) -> List[Any]:
+        batch = self._buckets.pop(shape)
+        self.buffered -= len(batch)
+        return batch
+
+
 def get_optimal_worker_count(task_type: str = "auto") -> int:
     """
     Get optimal number of workers based on task type and system resources.
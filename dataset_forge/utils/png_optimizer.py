@@ -0,0 +1,293 @@
+"""
+Adaptive oxipng scheduling for Dataset Forge.
+
+oxipng parallelizes its compression trials internally, so running one oxipng
+per file on a pool of ``cpu_count`` threads oversubscribes the machine many
+times over. This scheduler sizes the number of concurrent oxipng processes
+against oxipng's own ``--threads`` so the total stays at the core count:
+large batches run single-threaded oxipng on every core, small batches give
+each file several threads. Files are dispatched largest-first, so a few huge
+images do not end up running alone at the end of the batch.
+
+Files that were already optimized at the requested level (or higher) with the
+same strip/alpha options are skipped. That is tracked per folder in a small
+sidecar index (``.oxipng_index.json``) holding each file's size, mtime and
+SHA256 after optimization. A file optimized under a time budget may have been
+cut short, so it only counts as done for runs with the same or a smaller
+budget. Each file can be given a time budget
+(``--timeout``), and every run reports bytes saved per second so levels can
+be compared on real data.
+
+Example:
+    >>> report = optimize_pngs(paths, OxipngOptions(level=4, strip="safe"))
+    >>> report["saved_per_second"]
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from dataset_forge.utils.progress_utils import tqdm
+from dataset_forge.utils.result_cache import file_sha256
+
+INDEX_FILENAME = ".oxipng_index.json"
+# 2: entries record the --timeout budget they were optimized under
+INDEX_VERSION = 2
+# Budget overrun allowed before a stuck oxipng process is killed
+KILL_GRACE_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class OxipngOptions:
+    """
+    oxipng settings for a batch.
+
+    Attributes:
+        level: Optimization level 0-6 or "max"
+        strip: Metadata to strip ("safe", "all", comma-separated list or None)
+        alpha: Pass --alpha (optimize fully transparent pixels)
+        timeout: Per-file time budget in seconds (oxipng --timeout), or None
+    """
+
+    level: Union[int, str] = 4
+    strip: Optional[str] = None
+    alpha: bool = False
+    timeout: Optional[float] = None
+
+    @property
+    def level_rank(self) -> int:
+        return 7 if str(self.level) == "max" else int(self.level)
+
+    def command(self, oxipng_bin: str, threads: int, src: str, dst: Optional[str] = None) -> List[str]:
+        cmd = [oxipng_bin, "-o", str(self.level), "--threads", str(threads)]
+        if self.strip:
+            cmd += ["--strip", self.strip]
+        if self.alpha:
+            cmd.append("--alpha")
+        if self.timeout:
+            cmd += ["--timeout", str(int(self.timeout) or 1)]
+        if dst and os.path.abspath(dst) != os.path.abspath(src):
+            cmd += ["--out", dst]
+        cmd.append(src)
+        return cmd
+
+
+def plan_concurrency(n_files: int, cpu_count: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Split the cores between concurrent oxipng processes and their threads.
+
+    Returns:
+        (concurrent processes, --threads per process), with their product
+        never exceeding the core count.
+    """
+    cpu_count = max(1, cpu_count or os.cpu_count() or 1)
+    if n_files <= 0:
+        return 1, cpu_count
+    jobs = min(n_files, cpu_count)
+    return jobs, max(1, cpu_count // jobs)
+
+
+class OptimizationIndex:
+    """Per-folder sidecar recording which PNGs are already optimized and how."""
+
+    def __init__(self, folder: str):
+        self.path = os.path.join(folder, INDEX_FILENAME)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.entries = data.get("files", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def is_optimized(self, path: str, options: OxipngOptions) -> bool:
+        entry = self.entries.get(os.path.basename(path))
+        if not entry or entry["strip"] != options.strip or entry["alpha"] != options.alpha:
+            return False
+        if entry["level_rank"] < options.level_rank:
+            return False
+        budget = entry.get("timeout")
+        if budget is not None and (options.timeout is None or options.timeout > budget):
+            # Possibly cut short by its budget; a longer run may do better
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if st.st_size != entry["size"]:
+            return False
+        if st.st_mtime_ns == entry["mtime_ns"]:
+            return True
+        # Touched or copied since: only the content hash can tell
+        return file_sha256(path) == entry["sha256"]
+
+    def record(self, path: str, options: OxipngOptions) -> None:
+        st = os.stat(path)
+        self.entries[os.path.basename(path)] = {
+            "sha256": file_sha256(path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "level_rank": options.level_rank,
+            "strip": options.strip,
+            "alpha": options.alpha,
+            "timeout": options.timeout,
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "files": self.entries}, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+def _run_oxipng_job(cmd: List[str], timeout: Optional[float]) -> Tuple[bool, str]:
+    """Run one oxipng command. Returns (success, error message)."""
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=timeout + KILL_GRACE_SECONDS if timeout else None,
+        )
+    except subprocess.TimeoutExpired:
+        return False, "timed out"
+    except OSError as e:
+        return False, str(e)
+    if result.returncode != 0:
+        return False, result.stderr.strip()[:200]
+    return True, ""
+
+
+def optimize_pngs(
+    files: Sequence[Union[str, Tuple[str, str]]],
+    options: OxipngOptions = OxipngOptions(),
+    cpu_count: Optional[int] = None,
+    use_index: bool = True,
+    desc: str = "oxipng",
+) -> Dict[str, Any]:
+    """
+    Optimize PNG files with oxipng on an adaptively sized pool.
+
+    Args:
+        files: Paths to optimize in place, or (src, dst) tuples to write dst
+        options: oxipng settings (level, strip, alpha, per-file timeout)
+        cpu_count: Cores to use (defaults to all)
+        use_index: Skip files the sidecar index marks as already optimized
+            with these options, and record newly optimized files
+
+    Returns:
+        Report dict: files, optimized, skipped, failed ([(path, error)]),
+        bytes_before, bytes_after, bytes_saved, seconds, saved_per_second,
+        processes, threads_per_process and per_file ({path: {...}}).
+    """
+    report: Dict[str, Any] = {
+        "files": len(files),
+        "optimized": 0,
+        "skipped": 0,
+        "failed": [],
+        "bytes_before": 0,
+        "bytes_after": 0,
+        "per_file": {},
+    }
+    oxipng_bin = shutil.which("oxipng")
+    if not oxipng_bin:
+        report["failed"] = [
+            (f if isinstance(f, str) else f[0], "oxipng not found in PATH") for f in files
+        ]
+        report.update(bytes_saved=0, seconds=0.0, saved_per_second=0.0, processes=0, threads_per_process=0)
+        return report
+
+    indexes: Dict[str, OptimizationIndex] = {}
+    jobs = []
+    for item in files:
+        src, dst = (item, item) if isinstance(item, str) else item
+        in_place = os.path.abspath(src) == os.path.abspath(dst)
+        index = None
+        if use_index and in_place:
+            folder = os.path.dirname(os.path.abspath(src))
+            index = indexes.get(folder)
+            if index is None:
+                index = indexes[folder] = OptimizationIndex(folder)
+            if index.is_optimized(src, options):
+                report["skipped"] += 1
+                continue
+        try:
+            size = os.path.getsize(src)
+        except OSError as e:
+            report["failed"].append((src, str(e)))
+            continue
+        jobs.append((size, src, dst, index))
+    # Largest first: the long jobs start early instead of straggling at the end
+    jobs.sort(key=lambda job: job[0], reverse=True)
+
+    processes, threads = plan_concurrency(len(jobs), cpu_count)
+    report["processes"], report["threads_per_process"] = processes, threads
+
+    def work(job):
+        size, src, dst, _ = job
+        start = time.perf_counter()
+        ok, error = _run_oxipng_job(
+            options.command(oxipng_bin, threads, src, dst), options.timeout
+        )
+        elapsed = time.perf_counter() - start
+        after = os.path.getsize(dst) if ok and os.path.exists(dst) else size
+        return ok, error, after, elapsed
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=processes) as executor:
+            futures = {executor.submit(work, job): job for job in jobs}
+            for future in tqdm(as_completed(futures), total=len(futures), desc=desc):
+                size, src, dst, index = futures[future]
+                ok, error, after, elapsed = future.result()
+                report["per_file"][dst] = {
+                    "before": size,
+                    "after": after,
+                    "seconds": round(elapsed, 3),
+                }
+                if not ok:
+                    report["failed"].append((src, error))
+                    continue
+                report["optimized"] += 1
+                report["bytes_before"] += size
+                report["bytes_after"] += after
+                if index is not None:
+                    index.record(dst, options)
+    finally:
+        for index in indexes.values():
+            try:
+                index.save()
+            except OSError:
+                pass
+    seconds = time.perf_counter() - start
+    saved = report["bytes_before"] - report["bytes_after"]
+    report.update(
+        bytes_saved=saved,
+        seconds=round(seconds, 3),
+        saved_per_second=saved / seconds if seconds > 0 else 0.0,
+    )
+    return report
+
+
+def format_optimization_report(report: Dict[str, Any]) -> str:
+    """One-line human summary of an optimize_pngs report."""
+    before = report["bytes_before"]
+    pct = 100.0 * report["bytes_saved"] / before if before else 0.0
+    return (
+        f"{report['optimized']} optimized, {report['skipped']} already optimized, "
+        f"{len(report['failed'])} failed; saved {report['bytes_saved'] / 1e6:.2f} MB "
+        f"({pct:.1f}%) in {report['seconds']:.1f}s = "
+        f"{report['saved_per_second'] / 1e3:.1f} KB/s "
+        f"[{report.get('processes', 0)} x oxipng --threads {report.get('threads_per_process', 0)}]"
+    )
@@ -1,125 +1,291 @@
+"""
+Centralized console output for Dataset Forge.
+
+All ``print_*`` helpers share one output layer that keeps printing cheap
+inside hot loops:
+
+- Text is sanitized for emoji safety once per distinct string (memoized),
+  and pure-ASCII text skips sanitization entirely.
+- Whether the console can encode non-ASCII text is detected once per
+  output stream instead of failing and retrying on every call.
+- stdout is flushed at most every ``FLUSH_INTERVAL`` seconds (a background
+  flusher writes out anything left pending); errors and prompts flush
+  immediately.
+- Warnings are rate-limited per call site: after ``WARNING_BURST`` warnings
+  from the same line within ``WARNING_WINDOW`` seconds, further ones are
+  counted and summarized instead of printed. Pending summaries are written
+  when the site warns again after the window, by ``flush_output()`` and
+  ``reset_warning_limits()``, and at interpreter exit.
+- Output modes for headless runs (``set_output_mode`` or the
+  ``DATASET_FORGE_OUTPUT`` environment variable): "normal", "quiet" (only
+  warnings, errors and prompts) and "json" (one JSON object per line, no
+  colors).
+"""
+
+import atexit
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+
 from .color import Mocha
 from .audio_utils import play_error_sound
 
+OUTPUT_MODES = ("normal", "quiet", "json")
+FLUSH_INTERVAL = 0.1
+WARNING_BURST = 20
+WARNING_WINDOW = 10.0
 
-def _safe_print(text: str, color: str = "") -> None:
-    """Safely print text with emoji handling and color support."""
-    try:
-        # Normalize and sanitize text for emoji safety
-        from .emoji_utils import normalize_unicode, sanitize_emoji
+_NON_ASCII = re.compile(r"[^\x00-\x7F]+")
 
-        safe_text = sanitize_emoji(normalize_unicode(text))
 
-        # Print with color and proper encoding
-        if color:
-            print(color + safe_text + Mocha.reset, flush=True)
-        else:
-            print(safe_text, flush=True)
-    except UnicodeEncodeError as e:
-        # Fallback: print without emojis
-        import re
+class _OutputState:
+    """Process-wide console state shared by the print helpers."""
 
-        fallback_text = re.sub(r"[^\x00-\x7F]+", "", text)
-        if color:
-            print(color + fallback_text + Mocha.reset, flush=True)
-        else:
-            print(fallback_text, flush=True)
-    except Exception as e:
-        # Final fallback: print original text
-        if color:
-            print(color + text + Mocha.reset, flush=True)
-        else:
-            print(text, flush=True)
+    def __init__(self):
+        mode = os.environ.get("DATASET_FORGE_OUTPUT", "normal").lower()
+        self.mode = mode if mode in OUTPUT_MODES else "normal"
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.last_flush = 0.0
+        self.flusher = None
+        self.unicode_streams = {}
+        # call site -> [window start, count in window, suppressed count]
+        self.warning_sites = {}
 
 
-def print_header(title, char="#", color=Mocha.mauve):
-    """Print a header with emoji-safe handling."""
-    try:
-        from .emoji_utils import normalize_unicode, sanitize_emoji
+_state = _OutputState()
 
-        safe_title = sanitize_emoji(normalize_unicode(title))
-    except ImportError:
-        safe_title = title
 
-    _safe_print(char * 50, color + Mocha.bold)
-    _safe_print(f"{safe_title.center(50)}", color + Mocha.bold)
-    _safe_print(char * 50, color + Mocha.bold)
+def set_output_mode(mode: str) -> None:
+    """
+    Select how messages are written.
+
+    Args:
+        mode: "normal" (colored), "quiet" (warnings, errors and prompts) or
+            "json" (one JSON object per line with level and message)
+    """
+    if mode not in OUTPUT_MODES:
+        raise ValueError(f"Output mode must be one of {OUTPUT_MODES}")
+    flush_output()
+    _state.mode = mode
 
 
-def print_section(title, char="-", color=Mocha.sapphire):
-    """Print a section header with emoji-safe handling."""
-    try:
-        from .emoji_utils import normalize_unicode, sanitize_emoji
+def get_output_mode() -> str:
+    return _state.mode
 
-        safe_title = sanitize_emoji(normalize_unicode(title))
-    except ImportError:
-        safe_title = title
 
-    _safe_print(char * 40, color)
-    _safe_print(f"{safe_title.center(40)}", color + Mocha.bold)
-    _safe_print(char * 40, color)
+def flush_output() -> None:
+    """Report suppressed warnings and flush any output still pending in stdout."""
+    _report_suppressed_warnings()
+    _flush_stdout()
 
 
-def print_success(msg):
-    """Print success message with emoji-safe handling."""
+def _flush_stdout() -> None:
+    with _state.lock:
+        _state.dirty = False
+        _state.last_flush = time.monotonic()
+    try:
+        sys.stdout.flush()
+    except (OSError, ValueError, AttributeError):
+        pass
+
+
+def _flusher_loop() -> None:
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        with _state.lock:
+            if not _state.dirty:
+                _state.flusher = None
+                return
+        _flush_stdout()
+
+
+def _after_write(force_flush: bool) -> None:
+    now = time.monotonic()
+    if force_flush or now - _state.last_flush >= FLUSH_INTERVAL:
+        _flush_stdout()
+        return
+    with _state.lock:
+        _state.dirty = True
+        if _state.flusher is None:
+            _state.flusher = threading.Thread(target=_flusher_loop, daemon=True)
+            _state.flusher.start()
+
+
+def _stream_supports_unicode() -> bool:
+    """Whether the current stdout can encode emoji (cached per stream)."""
+    stream = sys.stdout
+    key = id(stream)
+    supported = _state.unicode_streams.get(key)
+    if supported is None:
+        encoding = getattr(stream, "encoding", None) or "ascii"
+        try:
+            "✅🧹".encode(encoding)
+            supported = True
+        except (UnicodeEncodeError, LookupError):
+            supported = False
+        _state.unicode_streams[key] = supported
+    return supported
+
+
+@functools.lru_cache(maxsize=4096)
+def _sanitize_cached(text: str) -> str:
     try:
         from .emoji_utils import normalize_unicode, sanitize_emoji
 
-        safe_msg = sanitize_emoji(normalize_unicode(msg))
-    except ImportError:
-        safe_msg = msg
+        return sanitize_emoji(normalize_unicode(text))
+    except Exception:
+        return text
+
+
+def sanitize_text(text) -> str:
+    """Emoji-safe version of text (ASCII passes through, the rest is memoized)."""
+    text = str(text)
+    if text.isascii():
+        return text
+    return _sanitize_cached(text)
+
+
+def _emit(
+    text,
+    color: str = "",
+    level: str = "info",
+    force_flush: bool = False,
+    end: str = "\n",
+    prefix: str = "",
+) -> None:
+    mode = _state.mode
+    if mode == "quiet" and level not in ("warning", "error", "prompt"):
+        return
+    text = sanitize_text(text)
+    if mode == "json":
+        line = json.dumps(
+            {"time": round(time.time(), 3), "level": level, "message": text.strip()}
+        )
+        color, end = "", "\n"
+    else:
+        text = prefix + text
+        line = text if _stream_supports_unicode() else _NON_ASCII.sub("", text)
+        if color:
+            line = color + line + Mocha.reset
+    try:
+        print(line, end=end, flush=False)
+    except UnicodeEncodeError:
+        print(_NON_ASCII.sub("", line), end=end, flush=False)
+    _after_write(force_flush)
+
+
+def _rate_limited(site) -> bool:
+    """Count a warning from site; True if it should be suppressed."""
+    now = time.monotonic()
+    with _state.lock:
+        entry = _state.warning_sites.get(site)
+        if entry is None or now - entry[0] >= WARNING_WINDOW:
+            suppressed = entry[2] if entry else 0
+            _state.warning_sites[site] = [now, 1, 0]
+        else:
+            entry[1] += 1
+            if entry[1] > WARNING_BURST:
+                entry[2] += 1
+                return True
+            return False
+    if suppressed:
+        _emit_suppressed(suppressed)
+    return False
+
+
+def _emit_suppressed(count: int) -> None:
+    _emit(
+        f"({count} similar warning(s) suppressed)",
+        Mocha.peach + Mocha.bold,
+        "warning",
+        prefix="! ",
+    )
+
+
+def _report_suppressed_warnings() -> None:
+    """Print the summary of every call site with warnings still unreported."""
+    with _state.lock:
+        pending = [entry[2] for entry in _state.warning_sites.values() if entry[2]]
+        for entry in _state.warning_sites.values():
+            entry[2] = 0
+    for count in pending:
+        _emit_suppressed(count)
+
+
+def reset_warning_limits() -> None:
+    """Report pending suppressed warnings, then forget rate-limit history (e.g. between batch jobs)."""
+    _report_suppressed_warnings()
+    with _state.lock:
+        _state.warning_sites.clear()
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    try:
+        flush_output()
+    except (OSError, ValueError):
+        pass
+
 
-    _safe_print("  " + safe_msg, Mocha.green + Mocha.bold)
+def _safe_print(text: str, color: str = "") -> None:
+    """Safely print text with emoji handling and color support."""
+    _emit(text, color)
 
 
-def print_warning(msg):
-    """Print warning message with emoji-safe handling."""
-    try:
-        from .emoji_utils import normalize_unicode, sanitize_emoji
+def print_header(title, char="#", color=Mocha.mauve):
+    """Print a header with emoji-safe handling."""
+    safe_title = sanitize_text(title)
+    if _state.mode == "json":
+        _emit(safe_title, level="header")
+        return
+    _emit(char * 50, color + Mocha.bold, "header")
+    _emit(f"{safe_title.center(50)}", color + Mocha.bold, "header")
+    _emit(char * 50, color + Mocha.bold, "header")
 
-        safe_msg = sanitize_emoji(normalize_unicode(msg))
-    except ImportError:
-        safe_msg = msg
 
-    _safe_print("! " + safe_msg, Mocha.peach + Mocha.bold)
+def print_section(title, char="-", color=Mocha.sapphire):
+    """Print a section header with emoji-safe handling."""
+    safe_title = sanitize_text(title)
+    if _state.mode == "json":
+        _emit(safe_title, level="section")
+        return
+    _emit(char * 40, color, "section")
+    _emit(f"{safe_title.center(40)}", color + Mocha.bold, "section")
+    _emit(char * 40, color, "section")
 
 
-def print_error(msg):
-    """Print error message with emoji-safe handling."""
-    play_error_sound(block=False)
+def print_success(msg):
+    """Print success message with emoji-safe handling."""
+    _emit(msg, Mocha.green + Mocha.bold, "success", prefix="  ")
 
-    try:
-        from .emoji_utils import normalize_unicode, sanitize_emoji
 
-        safe_msg = sanitize_emoji(normalize_unicode(msg))
-    except ImportError:
-        safe_msg = msg
+def print_warning(msg):
+    """Print warning message with emoji-safe handling (rate-limited per call site)."""
+    caller = sys._getframe(1)
+    if _rate_limited((caller.f_code.co_filename, caller.f_lineno)):
+        return
+    _emit(msg, Mocha.peach + Mocha.bold, "warning", prefix="! ")
 
-    _safe_print("  " + safe_msg, Mocha.red + Mocha.bold)
+
+def print_error(msg):
+    """Print error message with emoji-safe handling."""
+    play_error_sound(block=False)
+    _emit(msg, Mocha.red + Mocha.bold, "error", force_flush=True, prefix="  ")
 
 
 def print_info(msg):
     """Print info message with emoji-safe handling."""
-    try:
-        from .emoji_utils import normalize_unicode, sanitize_emoji
-
-        safe_msg = sanitize_emoji(normalize_unicode(msg))
-    except ImportError:
-        safe_msg = msg
-
-    _safe_print(safe_msg, Mocha.sky)
+    _emit(msg, Mocha.sky)
 
 
 def print_prompt(msg):
     """Print prompt message with emoji-safe handling."""
-    try:
-        from .emoji_utils import normalize_unicode, sanitize_emoji
-
-        safe_msg = sanitize_emoji(normalize_unicode(msg))
-        print(Mocha.yellow + safe_msg + Mocha.reset, end="", flush=True)
-    except ImportError:
-        # Fallback if emoji utilities are not available
-        print(Mocha.yellow + msg + Mocha.reset, end="", flush=True)
+    _emit(msg, Mocha.yellow, "prompt", force_flush=True, end="")
 
 
 def print_emoji_safe(text: str, color: str = "") -> None:
@@ -130,13 +296,11 @@ def print_emoji_safe(text: str, color: str = "") -> None:
         text: Text to print
         color: Optional color code
     """
+    flush_output()
     try:
         from .emoji_utils import safe_print_emoji
 
         safe_print_emoji(text, use_colors=bool(color))
     except ImportError:
         # Fallback to regular printing
-        if color:
-            print(color + text + Mocha.reset, flush=True)
-        else:
-            print(text, flush=True)
+        _emit(text, color, force_flush=True)
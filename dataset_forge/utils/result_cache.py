@@ -0,0 +1,238 @@
+"""
+Persistent per-file result caching and resumable batch execution for Dataset Forge.
+
+Slow per-file analyses (external tools such as getfscaler, getnative or resdet)
+are keyed by the file's content hash plus the tool arguments, so re-running a
+scan over the same images is free. Batch runs stream one JSON line per file to
+a results file as soon as each file finishes, which also lets an interrupted
+directory scan resume where it stopped.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from dataset_forge.utils.cache_utils import CACHE_BASE_DIR
+from dataset_forge.utils.progress_utils import tqdm
+
+RESULT_CACHE_DIR = os.path.join(CACHE_BASE_DIR, "results")
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Return the SHA256 hex digest of a file, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class FileResultCache:
+    """
+    On-disk JSON cache for per-file results keyed by content hash + arguments.
+
+    Entries live under ``store/cache/results/<namespace>/`` (one small JSON file
+    per key), so they survive restarts and can be cleared per tool.
+
+    Example:
+        >>> cache = FileResultCache("getfscaler")
+        >>> key = cache.make_key("img.png", {"native_height": 720})
+        >>> cache.get(key) is None
+        True
+    """
+
+    def __init__(self, namespace: str, cache_dir: Optional[str] = None):
+        self.namespace = namespace
+        self.cache_dir = os.path.join(cache_dir or RESULT_CACHE_DIR, namespace)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._hash_memo: Dict[tuple, str] = {}
+        self._lock = threading.Lock()
+
+    def _content_hash(self, path: str) -> str:
+        # Avoid re-hashing unchanged files within a session
+        stat = os.stat(path)
+        memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._hash_memo.get(memo_key)
+        if cached is None:
+            cached = file_sha256(path)
+            with self._lock:
+                self._hash_memo[memo_key] = cached
+        return cached
+
+    def make_key(self, path: str, args: Optional[Dict[str, Any]] = None) -> str:
+        """Build a cache key from the file content hash and the tool arguments."""
+        args_blob = json.dumps(args or {}, sort_keys=True, default=str)
+        args_hash = hashlib.sha256(args_blob.encode("utf-8")).hexdigest()[:16]
+        return f"{self._content_hash(path)}_{args_hash}"
+
+    def entry_path(self, key: str, suffix: str = ".json") -> str:
+        """
+        Path of the entry for key.
+
+        Callers storing non-JSON payloads (e.g. ``.npz`` arrays) use their own
+        suffix, so the entry is still found and removed by clear().
+        """
+        return os.path.join(self.cache_dir, key[:2], f"{key}{suffix}")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for key, or None."""
+        entry_path = self.entry_path(key)
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a JSON-serializable result atomically."""
+        entry_path = self.entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        tmp_path = f"{entry_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, default=str)
+        os.replace(tmp_path, entry_path)
+
+    def clear(self) -> int:
+        """
+        Remove all entries (of any suffix) in this namespace.
+
+        Returns:
+            Number of entries removed (leftover temporary files are removed
+            but not counted).
+        """
+        removed = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                try:
+                    os.remove(os.path.join(root, name))
+                except OSError:
+                    continue
+                if ".tmp" not in name:
+                    removed += 1
+        return removed
+
+
+def load_jsonl_results(results_file: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load completed results from a JSONL results file.
+
+    Truncated trailing lines (from an interrupted run) are ignored.
+
+    Returns:
+        Dict mapping file path to its result.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    if not results_file or not os.path.exists(results_file):
+        return results
+    with open(results_file, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and "file" in record:
+                results[record["file"]] = record.get("result", {})
+    return results
+
+
+def run_cached_batch(
+    files: Iterable[str],
+    func: Callable[[str], Dict[str, Any]],
+    cache: Optional[FileResultCache] = None,
+    cache_args: Optional[Dict[str, Any]] = None,
+    results_file: Optional[str] = None,
+    resume: bool = True,
+    max_workers: int = 4,
+    desc: str = "Analyzing",
+    is_cacheable: Callable[[Dict[str, Any]], bool] = lambda r: bool(r.get("success")),
+    retry_failed: bool = True,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run func over files on a bounded worker pool with caching and JSONL streaming.
+
+    Each worker thread drives one external process at a time, so at most
+    `max_workers` tool processes run concurrently. Results are appended to
+    `results_file` (one ``{"file", "result", "cached"}`` line per file) as soon
+    as they complete.
+
+    Args:
+        files: File paths to analyze
+        func: Analysis function returning a JSON-serializable dict
+        cache: Optional FileResultCache for content-hash keyed reuse
+        cache_args: Tool arguments that are part of the cache key
+        results_file: Optional JSONL file to stream results to
+        resume: Skip files already recorded in results_file
+        max_workers: Maximum concurrent analyses
+        desc: Progress bar description
+        is_cacheable: Predicate deciding which results are stored in the cache
+        retry_failed: On resume, run again the files whose recorded result
+            fails is_cacheable (e.g. a tool error) instead of keeping it
+    Returns:
+        Dict mapping file path to result, including resumed entries.
+    """
+    files = [str(f) for f in files]
+    results: Dict[str, Dict[str, Any]] = {}
+    if results_file and resume:
+        wanted = set(files)
+        done = load_jsonl_results(results_file)
+        results.update(
+            {
+                f: r
+                for f, r in done.items()
+                if f in wanted and (not retry_failed or is_cacheable(r))
+            }
+        )
+    pending = [f for f in files if f not in results]
+
+    def work(path: str):
+        key = None
+        if cache is not None:
+            try:
+                key = cache.make_key(path, cache_args)
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached, True
+            except OSError:
+                key = None
+        result = func(path)
+        if key is not None and is_cacheable(result):
+            cache.set(key, result)
+        return result, False
+
+    out = None
+    if results_file:
+        parent = os.path.dirname(os.path.abspath(results_file))
+        os.makedirs(parent, exist_ok=True)
+        out = open(results_file, "a" if resume else "w", encoding="utf-8")
+        if resume and out.tell() > 0:
+            # Terminate a line left half-written by an interrupted run
+            with open(results_file, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    out.write("\n")
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(work, path): path for path in pending}
+            with tqdm(total=len(pending), desc=desc) as pbar:
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        result, from_cache = future.result()
+                    except Exception as e:
+                        result, from_cache = {"success": False, "error": str(e)}, False
+                    results[path] = result
+                    if out is not None:
+                        record = {"file": path, "result": result, "cached": from_cache}
+                        out.write(json.dumps(record, default=str) + "\n")
+                        out.flush()
+                    pbar.update(1)
+    finally:
+        if out is not None:
+            out.close()
+    return results
@@ -124,27 +124,7 @@ class QualityAnalyzer:
         try:
             # Load image
             image = Image.open(image_path).convert("RGB")
-            image_array = np.array(image)
-
-            # Analyze various quality aspects
-            metrics = {}
-
-            # Sharpness analysis
-            metrics["sharpness"] = self._analyze_sharpness(image_array)
-
-            # Contrast analysis
-            metrics["contrast"] = self._analyze_contrast(image_array)
-
-            # Brightness analysis
-            metrics["brightness"] = self._analyze_brightness(image_array)
-
-            # Noise analysis
-            metrics["noise"] = self._analyze_noise(image_array)
-
-            # Artifact detection
-            metrics["artifacts"] = self._analyze_artifacts(image_array)
-
-            return metrics
+            return self.analyze_quality_array(np.array(image))
 
         except Exception as e:
             self.logger.error(f"Error analyzing quality for {image_path}: {e}")
@@ -156,6 +136,24 @@ class QualityAnalyzer:
                 "artifacts": 0.0,
             }
 
+    def analyze_quality_array(self, image_array: np.ndarray) -> Dict[str, float]:
+        """
+        Analyze quality metrics of a decoded RGB image.
+
+        Args:
+            image_array: HxWx3 uint8 array
+
+        Returns:
+            Dictionary of quality metrics
+        """
+        return {
+            "sharpness": self._analyze_sharpness(image_array),
+            "contrast": self._analyze_contrast(image_array),
+            "brightness": self._analyze_brightness(image_array),
+            "noise": self._analyze_noise(image_array),
+            "artifacts": self._analyze_artifacts(image_array),
+        }
+
     def _analyze_sharpness(self, image: np.ndarray) -> float:
         """Analyze image sharpness using Laplacian variance."""
         try:
@@ -285,28 +283,7 @@ class ComplexityAnalyzer:
         try:
             # Load image
             image = Image.open(image_path).convert("RGB")
-            image_array = np.array(image)
-
-            # Analyze various complexity aspects
-            metrics = {}
-
-            # Edge density analysis
-            metrics["edge_density"] = self._analyze_edge_density(image_array)
-
-            # Texture complexity analysis
-            metrics["texture_complexity"] = self._analyze_texture_complexity(
-                image_array
-            )
-
-            # Color variety analysis
-            metrics["color_variety"] = self._analyze_color_variety(image_array)
-
-            # Structural complexity analysis
-            metrics["structural_complexity"] = self._analyze_structural_complexity(
-                image_array
-            )
-
-            return metrics
+            return self.analyze_complexity_array(np.array(image))
 
         except Exception as e:
             self.logger.error(f"Error analyzing complexity for {image_path}: {e}")
@@ -317,6 +294,23 @@ class ComplexityAnalyzer:
                 "structural_complexity": 0.5,
             }
 
+    def analyze_complexity_array(self, image_array: np.ndarray) -> Dict[str, float]:
+        """
+        Analyze complexity metrics of a decoded RGB image.
+
+        Args:
+            image_array: HxWx3 uint8 array
+
+        Returns:
+            Dictionary of complexity metrics
+        """
+        return {
+            "edge_density": self._analyze_edge_density(image_array),
+            "texture_complexity": self._analyze_texture_complexity(image_array),
+            "color_variety": self._analyze_color_variety(image_array),
+            "structural_complexity": self._analyze_structural_complexity(image_array),
+        }
+
     def _analyze_edge_density(self, image: np.ndarray) -> float:
         """Analyze edge density in the image."""
         try:
@@ -462,10 +456,16 @@ class SamplePrioritizer:
             f"Prioritizing {len(sample_paths)} samples using {strategy.value} strategy"
         )
 
+        # Stored features (feature store) make repeat runs pure lookups
+        stored = self._stored_metrics(sample_paths) if self.config.cache_results else {}
+
         # Analyze all samples
         sample_infos = []
 
         for i, path in enumerate(sample_paths):
+            if path in stored:
+                sample_infos.append(self._sample_from_metrics(path, *stored[path]))
+                continue
             if i % 100 == 0:
                 print_info(f"Analyzing sample {i+1}/{len(sample_paths)}")
 
@@ -479,37 +479,56 @@ class SamplePrioritizer:
 
         return sorted_samples
 
+    def _stored_metrics(
+        self, paths: List[str]
+    ) -> Dict[str, Tuple[Dict[str, float], Dict[str, float]]]:
+        """Quality and complexity metrics from the feature store (computing misses)."""
+        try:
+            from dataset_forge.utils.feature_store import get_or_compute
+
+            quality = get_or_compute(paths, "quality").as_dicts()
+            complexity = get_or_compute(paths, "complexity").as_dicts()
+        except Exception as e:
+            self.logger.warning(f"Feature store unavailable, analyzing directly: {e}")
+            return {}
+        return {p: (quality[p], complexity[p]) for p in paths if p in quality and p in complexity}
+
+    def _sample_from_metrics(
+        self,
+        path: str,
+        quality_metrics: Dict[str, float],
+        complexity_metrics: Dict[str, float],
+        analysis_time: float = 0.0,
+    ) -> SampleInfo:
+        return SampleInfo(
+            path=path,
+            quality_score=self._compute_weighted_score(
+                quality_metrics, self.config.quality_weights
+            ),
+            complexity_score=self._compute_weighted_score(
+                complexity_metrics, self.config.complexity_weights
+            ),
+            metadata={
+                "quality_metrics": quality_metrics,
+                "complexity_metrics": complexity_metrics,
+            },
+            analysis_time=analysis_time,
+        )
+
     def _analyze_sample(self, path: str) -> SampleInfo:
         """Analyze a single sample for prioritization."""
         start_time = time.time()
 
         try:
-            # Analyze quality
             quality_metrics = self.quality_analyzer.analyze_quality(path)
-            quality_score = self._compute_weighted_score(
-                quality_metrics, self.config.quality_weights
-            )
-
-            # Analyze complexity
             complexity_metrics = self.complexity_analyzer.analyze_complexity(path)
-            complexity_score = self._compute_weighted_score(
-                complexity_metrics, self.config.complexity_weights
-            )
-
-            # Create sample info
-            sample_info = SampleInfo(
-                path=path,
-                quality_score=quality_score,
-                complexity_score=complexity_score,
-                metadata={
-                    "quality_metrics": quality_metrics,
-                    "complexity_metrics": complexity_metrics,
-                },
+            return self._sample_from_metrics(
+                path,
+                quality_metrics,
+                complexity_metrics,
+                analysis_time=time.time() - start_time,
             )
 
-            sample_info.analysis_time = time.time() - start_time
-            return sample_info
-
         except Exception as e:
             self.logger.error(f"Error analyzing sample {path}: {e}")
             return SampleInfo(
@@ -0,0 +1,470 @@
+"""
+Batched steganography scanning for Dataset Forge.
+
+Images first go through a cheap in-process prefilter: appended bytes after the
+end-of-image marker, plus LSB-plane statistics computed with NumPy (RS
+steganalysis on the leading pixels, where sequential embedders write, and on
+the whole image). Only images the prefilter cannot clear are
+handed to the external tools. zsteg is a Ruby program with a noticeable startup
+cost, so it is run on batches of files per invocation; steghide has no batch
+mode and runs once per file. Both run on a bounded pool, so at most
+``max_workers`` tool processes exist at any time.
+
+Verdicts are cached by file content hash (``FileResultCache("steg_scan")``),
+so unchanged files are never rescanned, and each result is streamed to a JSONL
+report as soon as it is known (same line format as ``run_cached_batch``).
+
+Example:
+    >>> summary = scan_images(paths, use_zsteg=True, report_path="steg.jsonl")
+    >>> summary["suspicious"]
+"""
+
+import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image
+
+from dataset_forge.utils.lazy_imports import numpy_as_np as np
+from dataset_forge.utils.parallel_utils import prefetch_map
+from dataset_forge.utils.progress_utils import tqdm
+from dataset_forge.utils.result_cache import FileResultCache, load_jsonl_results
+
+# Bump when the prefilter or verdict logic changes so cached verdicts are redone
+STEG_SCAN_VERSION = 1
+ZSTEG_EXTENSIONS = (".png", ".bmp")
+STEGHIDE_EXTENSIONS = (".jpg", ".jpeg", ".bmp")
+# Formats whose pixel LSBs are stored losslessly, so LSB statistics are meaningful
+LSB_EXTENSIONS = (".png", ".bmp", ".tif", ".tiff")
+ZSTEG_BATCH_SIZE = 16
+TOOL_TIMEOUT = 30
+# zsteg embeds sequentially from the first pixel, so short payloads only
+# disturb the head of the image
+HEAD_PIXELS = 64 * 1024
+# RS analysis: clean images stay well below this asymmetry; a few percent of
+# embedded LSBs in the analysed window already exceed it
+RS_ASYMMETRY_THRESHOLD = 0.25
+# Below this R_-M - S_-M the image is too noisy for RS to tell anything
+RS_MIN_REGULARITY = 0.05
+RS_MIN_GROUPS = 1024
+# Larger images are subsampled (every k-th group) to bound prefilter cost
+RS_MAX_GROUPS = 256 * 1024
+
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+_ZSTEG_HEADER_RE = re.compile(r"^\[\.\]\s+(.+?)\s*$")
+
+
+def parse_zsteg_output(stdout: str, stderr: str) -> Tuple[str, str]:
+    """
+    Parse zsteg output and return (summary, full_output).
+    Summary is a human-friendly one-line result for CLI.
+    Full_output is the raw output for the report.
+    """
+    # Detect stack overflow or Ruby errors
+    if (
+        "stack level too deep" in stdout
+        or "SystemStackError" in stdout
+        or "stack level too deep" in stderr
+        or "SystemStackError" in stderr
+    ):
+        return (
+            "Stack overflow (zsteg Ruby bug, see details in results file)",
+            stdout + "\n" + stderr,
+        )
+    if "zsteg not found" in stderr.lower():
+        return ("[zsteg] Not found in PATH.", stdout + "\n" + stderr)
+    # Summarize findings
+    text_lines = []
+    file_types = set()
+    for line in stdout.splitlines():
+        if "text:" in line:
+            text_lines.append(line.strip())
+        elif "file:" in line:
+            # Try to extract file type after 'file:'
+            m = re.search(r"file: (.+)$", line)
+            if m:
+                file_types.add(m.group(1).strip())
+    summary_parts = []
+    if text_lines:
+        n = len(text_lines)
+        shown = text_lines[:2]
+        summary = f"Hidden text found in {n} channel{'s' if n > 1 else ''}"
+        if n > 2:
+            summary += f" (e.g. {', '.join(shown)[:60]}... +{n-2} more)"
+        else:
+            summary += f" (e.g. {', '.join(shown)[:60]})"
+        summary_parts.append(summary)
+    if file_types:
+        types_list = list(file_types)
+        shown_types = types_list[:2]
+        summary = f"Embedded file signature detected ({', '.join(shown_types)[:60]}"
+        if len(types_list) > 2:
+            summary += f", +{len(types_list)-2} more)"
+        else:
+            summary += ")"
+        summary_parts.append(summary)
+    if not summary_parts:
+        return ("No suspicious hidden data detected.", stdout + "\n" + stderr)
+    return ("; ".join(summary_parts), stdout + "\n" + stderr)
+
+
+def _zsteg_verdict(stdout: str, stderr: str) -> Dict[str, Any]:
+    summary, _ = parse_zsteg_output(stdout, stderr)
+    if summary.startswith("No suspicious"):
+        verdict = "clean"
+    elif summary.startswith(("Stack overflow", "[zsteg]")):
+        verdict = "error"
+    else:
+        verdict = "suspicious"
+    return {"verdict": verdict, "summary": summary}
+
+
+def _trailing_bytes(data: bytes, ext: str) -> int:
+    """Bytes stored after the image's end marker (a common way to hide a file)."""
+    if ext == ".png":
+        end = data.rfind(b"IEND")
+        return max(0, len(data) - (end + 8)) if end >= 0 else 0
+    if ext in (".jpg", ".jpeg"):
+        end = data.rfind(b"\xff\xd9")
+        return max(0, len(data) - (end + 2)) if end >= 0 else 0
+    if ext == ".bmp" and len(data) >= 6:
+        declared = int.from_bytes(data[2:6], "little")
+        return max(0, len(data) - declared) if declared else 0
+    return 0
+
+
+_RS_MASK = np.array([0, 1, 1, 0], dtype=bool)
+
+
+def _rs_regularity(groups) -> Tuple[float, float]:
+    """
+    RS steganalysis: (R_M - S_M, R_-M - S_-M) for pixel groups of 4.
+
+    A group is regular/singular when flipping the masked pixels' LSBs raises/
+    lowers its smoothness sum. In clean images the positive (0<->1) and
+    negative (-1<->0) flips behave alike; LSB embedding pushes R_M - S_M
+    towards zero while R_-M - S_-M grows.
+    """
+    g = groups.astype(np.int16)
+    base = np.abs(np.diff(g, axis=1)).sum(axis=1)
+    pos = g.copy()
+    pos[:, _RS_MASK] ^= 1
+    neg = g.copy()
+    neg[:, _RS_MASK] = ((neg[:, _RS_MASK] + 1) ^ 1) - 1
+    f_pos = np.abs(np.diff(pos, axis=1)).sum(axis=1)
+    f_neg = np.abs(np.diff(neg, axis=1)).sum(axis=1)
+    n = len(g)
+    return (
+        float(np.count_nonzero(f_pos > base) - np.count_nonzero(f_pos < base)) / n,
+        float(np.count_nonzero(f_neg > base) - np.count_nonzero(f_neg < base)) / n,
+    )
+
+
+def rs_asymmetry(values) -> Optional[float]:
+    """
+    Relative gap between negative and positive RS regularity of a flat uint8 array.
+
+    Roughly 0 for clean images and approaching 1 as the share of embedded LSBs
+    grows. None when there are too few pixels or the image is too noisy for
+    the statistic to mean anything.
+    """
+    groups = values[: len(values) // 4 * 4].reshape(-1, 4)
+    if len(groups) < RS_MIN_GROUPS:
+        return None
+    if len(groups) > RS_MAX_GROUPS:
+        groups = groups[:: len(groups) // RS_MAX_GROUPS + 1]
+    d_pos, d_neg = _rs_regularity(groups)
+    if d_neg < RS_MIN_REGULARITY:
+        return None
+    return (d_neg - d_pos) / d_neg
+
+
+def lsb_prefilter(path: str) -> Dict[str, Any]:
+    """
+    Decide whether an image needs an external steganography scan.
+
+    Returns:
+        Dict with ``suspicious`` (True, False, or None when the statistics do
+        not apply, e.g. JPEG, 16-bit or very noisy images), ``reasons`` and
+        ``trailing_bytes``.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, "rb") as f:
+        data = f.read()
+    reasons = []
+    trailing = _trailing_bytes(data, ext)
+    if trailing:
+        reasons.append(f"{trailing} bytes after end of image")
+    undecided = True
+    if ext in LSB_EXTENSIONS:
+        with Image.open(io.BytesIO(data)) as img:
+            pixels = np.asarray(img)
+        if pixels.dtype == np.uint8:
+            undecided = False
+            channels = pixels.reshape(pixels.shape[0] * pixels.shape[1], -1)
+            for c in range(channels.shape[1]):
+                channel = np.ascontiguousarray(channels[:, c])
+                windows = [("head", channel[:HEAD_PIXELS])]
+                if len(channel) > HEAD_PIXELS:
+                    windows.append(("image", channel))
+                for window, values in windows:
+                    asymmetry = rs_asymmetry(values)
+                    if asymmetry is None:
+                        undecided = True
+                    elif asymmetry > RS_ASYMMETRY_THRESHOLD:
+                        reasons.append(
+                            f"LSB embedding signature in channel {c} ({window}: RS asymmetry {asymmetry:.2f})"
+                        )
+                        break
+    if reasons:
+        suspicious = True
+    else:
+        suspicious = None if undecided else False
+    return {"suspicious": suspicious, "reasons": reasons, "trailing_bytes": trailing}
+
+
+def _run_tool(cmd: List[str], timeout: int) -> Tuple[int, str, str]:
+    result = subprocess.run(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        timeout=timeout,
+    )
+    return result.returncode, _ANSI_RE.sub("", result.stdout), _ANSI_RE.sub("", result.stderr)
+
+
+def run_zsteg_batch(paths: List[str], zsteg_path: str = "zsteg") -> Dict[str, Dict[str, Any]]:
+    """
+    Scan several files with one zsteg process.
+
+    zsteg prints a ``[.] <file>`` header before each file when given more than
+    one. Files whose section is missing (e.g. zsteg crashed part way through
+    the batch) are rescanned individually.
+
+    Returns:
+        Dict mapping path to {"verdict", "summary"}.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        code, stdout, stderr = _run_tool([zsteg_path, *paths], TOOL_TIMEOUT * len(paths))
+    except (OSError, subprocess.SubprocessError) as e:
+        code, stdout, stderr = -1, "", str(e)
+    if len(paths) == 1:
+        if stdout or not stderr:
+            return {paths[0]: _zsteg_verdict(stdout, stderr)}
+        return {paths[0]: {"verdict": "error", "summary": stderr.strip()[:200]}}
+
+    wanted = set(paths)
+    sections: Dict[str, List[str]] = {}
+    current = None
+    for line in stdout.splitlines():
+        match = _ZSTEG_HEADER_RE.match(line)
+        if match and match.group(1) in wanted:
+            current = sections.setdefault(match.group(1), [])
+        elif current is not None:
+            current.append(line)
+    missing = [p for p in paths if p not in sections]
+    if code != 0 and sections:
+        # The last section may have been cut short by the crash
+        last = list(sections)[-1]
+        del sections[last]
+        missing.append(last)
+    for path, lines in sections.items():
+        results[path] = _zsteg_verdict("\n".join(lines), "")
+    for path in missing:
+        results.update(run_zsteg_batch([path], zsteg_path))
+    return results
+
+
+def run_steghide(path: str, steghide_path: str = "steghide") -> Dict[str, Any]:
+    """Run ``steghide info`` on one file (steghide has no batch mode)."""
+    try:
+        code, stdout, stderr = _run_tool(
+            [steghide_path, "info", "-p", "", path], TOOL_TIMEOUT
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        return {"verdict": "error", "summary": str(e)}
+    if code == 0 and "embedded" in stdout.lower():
+        return {"verdict": "suspicious", "summary": stdout.strip()[:200]}
+    if code == 0 or "could not extract" in stderr.lower():
+        return {"verdict": "clean", "summary": "No hidden data found."}
+    return {"verdict": "error", "summary": stderr.strip()[:200]}
+
+
+def _combine(prefilter: Optional[Dict[str, Any]], tools: Dict[str, Dict[str, Any]]) -> str:
+    """Overall verdict: tool findings win; without tools, fall back to the prefilter."""
+    verdicts = [r["verdict"] for r in tools.values()]
+    if "suspicious" in verdicts:
+        return "suspicious"
+    if "error" in verdicts:
+        return "error"
+    if verdicts:
+        return "clean"
+    flagged = prefilter.get("suspicious") if prefilter else None
+    if flagged is None:
+        return "skipped"
+    return "unverified" if flagged else "clean"
+
+
+def scan_images(
+    paths: Iterable[str],
+    use_zsteg: bool = True,
+    use_steghide: bool = False,
+    prefilter: bool = True,
+    report_path: Optional[str] = None,
+    use_cache: bool = True,
+    resume: bool = False,
+    max_workers: Optional[int] = None,
+    batch_size: int = ZSTEG_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Scan images for hidden data, streaming one JSON line per image to report_path.
+
+    Args:
+        paths: Image files to scan
+        use_zsteg: Scan PNG/BMP files with zsteg (batched)
+        use_steghide: Scan JPEG/BMP files with steghide
+        prefilter: Only send images the LSB/trailing-data prefilter cannot
+            clear to the external tools
+        report_path: JSONL file receiving ``{"file", "result", "cached"}`` lines
+        use_cache: Reuse and store verdicts keyed by file content hash
+        resume: Skip files already recorded in report_path
+        max_workers: Maximum concurrent prefilter workers / tool processes
+        batch_size: Files per zsteg invocation
+
+    Returns:
+        Summary dict with counts per verdict (clean, suspicious, error,
+        unverified = flagged by the prefilter but no tool available, skipped =
+        nothing applicable), ``cached``, ``tool_scans`` and ``results``.
+    """
+    paths = [str(p) for p in paths]
+    max_workers = max(1, max_workers or os.cpu_count() or 1)
+    tools = {
+        "zsteg": shutil.which("zsteg") if use_zsteg else None,
+        "steghide": shutil.which("steghide") if use_steghide else None,
+    }
+    cache = FileResultCache("steg_scan") if use_cache else None
+    cache_args = {
+        "version": STEG_SCAN_VERSION,
+        "prefilter": prefilter,
+        "tools": sorted(name for name, exe in tools.items() if exe),
+    }
+    results: Dict[str, Dict[str, Any]] = {}
+    if report_path and resume:
+        wanted = set(paths)
+        results.update(
+            {f: r for f, r in load_jsonl_results(report_path).items() if f in wanted}
+        )
+    cached_count = 0
+    out = None
+    lock = threading.Lock()
+    if report_path:
+        os.makedirs(os.path.dirname(os.path.abspath(report_path)) or ".", exist_ok=True)
+        out = open(report_path, "a" if resume else "w", encoding="utf-8")
+
+    def emit(path: str, result: Dict[str, Any], cached: bool, key: Optional[str]):
+        results[path] = result
+        if key and not cached and result["verdict"] in ("clean", "suspicious"):
+            cache.set(key, result)
+        if out is not None:
+            with lock:
+                out.write(json.dumps({"file": path, "result": result, "cached": cached}) + "\n")
+                out.flush()
+
+    def prepare(path: str):
+        key = None
+        if cache is not None:
+            try:
+                key = cache.make_key(path, cache_args)
+                hit = cache.get(key)
+                if hit is not None:
+                    return key, hit, None
+            except OSError:
+                key = None
+        pre = None
+        if prefilter:
+            try:
+                pre = lsb_prefilter(path)
+            except Exception as e:
+                pre = {"suspicious": None, "reasons": [f"prefilter failed: {e}"], "trailing_bytes": 0}
+        return key, None, pre
+
+    pending = [p for p in paths if p not in results]
+    needs_tools: Dict[str, Tuple[Optional[str], Optional[Dict[str, Any]]]] = {}
+    try:
+        for path, (key, hit, pre) in tqdm(
+            prefetch_map(prepare, pending, max_workers=max_workers),
+            total=len(pending),
+            desc="Steg prefilter",
+        ):
+            if hit is not None:
+                cached_count += 1
+                emit(path, hit, True, key)
+                continue
+            ext = os.path.splitext(path)[1].lower()
+            wanted = (tools["zsteg"] and ext in ZSTEG_EXTENSIONS) or (
+                tools["steghide"] and ext in STEGHIDE_EXTENSIONS
+            )
+            if not wanted or (pre is not None and pre["suspicious"] is False):
+                emit(path, {"verdict": _combine(pre, {}), "prefilter": pre, "tools": {}}, False, key)
+            else:
+                needs_tools[path] = (key, pre)
+
+        tool_results: Dict[str, Dict[str, Dict[str, Any]]] = {p: {} for p in needs_tools}
+        remaining = {p: 0 for p in needs_tools}
+        zsteg_files = [p for p in needs_tools if tools["zsteg"] and p.lower().endswith(ZSTEG_EXTENSIONS)]
+        steghide_files = [p for p in needs_tools if tools["steghide"] and p.lower().endswith(STEGHIDE_EXTENSIONS)]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for i in range(0, len(zsteg_files), max(1, batch_size)):
+                batch = zsteg_files[i : i + max(1, batch_size)]
+                futures[executor.submit(run_zsteg_batch, batch, tools["zsteg"])] = ("zsteg", batch)
+                for p in batch:
+                    remaining[p] += 1
+            for p in steghide_files:
+                futures[executor.submit(run_steghide, p, tools["steghide"])] = ("steghide", [p])
+                remaining[p] += 1
+            with tqdm(total=len(needs_tools), desc="Steg scan") as pbar:
+                for future in as_completed(futures):
+                    tool, batch = futures[future]
+                    try:
+                        found = future.result()
+                    except Exception as e:
+                        found = {p: {"verdict": "error", "summary": str(e)} for p in batch}
+                    if tool == "steghide":
+                        found = {batch[0]: found}
+                    for p in batch:
+                        tool_results[p][tool] = found.get(p, {"verdict": "error", "summary": "no output"})
+                        remaining[p] -= 1
+                        if remaining[p] == 0:
+                            key, pre = needs_tools[p]
+                            result = {
+                                "verdict": _combine(pre, tool_results[p]),
+                                "prefilter": pre,
+                                "tools": tool_results[p],
+                            }
+                            emit(p, result, False, key)
+                            pbar.update(1)
+    finally:
+        if out is not None:
+            out.close()
+
+    summary: Dict[str, Any] = {
+        "scanned": len(results),
+        "cached": cached_count,
+        "tool_scans": len(needs_tools),
+        "report_path": report_path,
+        "results": results,
+    }
+    for verdict in ("clean", "suspicious", "unverified", "skipped", "error"):
+        summary[verdict] = sum(1 for r in results.values() if r.get("verdict") == verdict)
+    return summary
@@ -61,12 +61,11 @@ def _sigint_handler(signum, frame):
         clear_memory()
     except Exception as e:
         print_error(f"[SIGINT] Memory cleanup failed: {e}")
-    # Try to gracefully quit pygame audio if running
+    # Try to gracefully quit pygame audio if running (never import it just to quit)
     try:
-        # Use lazy import for pygame
-        from dataset_forge.utils.lazy_imports import pygame
+        pygame = sys.modules.get("pygame")
 
-        if pygame.mixer.get_init():
+        if pygame is not None and pygame.mixer.get_init():
             pygame.mixer.quit()
             print_info("[SIGINT] Pygame mixer quit.")
     except ImportError:
@@ -80,6 +79,21 @@ def _sigint_handler(signum, frame):
 def main():
     global main_menu
     
+    # Headless mode: `run job.yaml` executes a job file without any menus
+    if len(sys.argv) > 1 and sys.argv[1] == "run":
+        from dataset_forge.utils.job_runner import run_job_cli
+
+        sys.exit(run_job_cli(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "profile-imports":
+        from dataset_forge.utils.lazy_imports import profile_imports_cli
+
+        sys.exit(profile_imports_cli(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] in ("--version", "-V"):
+        from dataset_forge import __version__
+
+        print(f"dataset-forge {__version__}")
+        sys.exit(0)
+
     # Suppress pygame warnings and other unnecessary output
     warnings.filterwarnings("ignore", category=UserWarning, module="pygame")
     os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
@@ -0,0 +1,15 @@
+import pytest
+
+from dataset_forge.utils import feature_store, history_log
+
+
+@pytest.fixture(autouse=True)
+def isolated_stores(tmp_path_factory, monkeypatch):
+    """Keep the feature store and operation log out of the source tree."""
+    monkeypatch.setattr(
+        feature_store, "FEATURE_STORE_DIR", str(tmp_path_factory.mktemp("features"))
+    )
+    monkeypatch.setattr(feature_store, "_default_store", None)
+    monkeypatch.setattr(history_log, "LOGS_DIR", str(tmp_path_factory.mktemp("logs")))
+    yield
+    history_log.flush_log()
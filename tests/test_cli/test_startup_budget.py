@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+import time
+
+from dataset_forge.utils.lazy_imports import HEAVY_STARTUP_MODULES, parse_importtime
+
+# Generous enough for slow CI machines; a heavy import at startup (torch,
+# pygame) alone blows well past it.
+STARTUP_BUDGET_SECONDS = 2.0
+
+
+def _run(args, timeout=30):
+    env = os.environ.copy()
+    env["PYTHONIOENCODING"] = "utf-8"
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, timeout=timeout, env=env
+    )
+
+
+def test_version_startup_within_budget():
+    _run(["-m", "dataset_forge", "--version"])  # warm the bytecode cache
+    start = time.perf_counter()
+    result = _run(["-m", "dataset_forge", "--version"])
+    elapsed = time.perf_counter() - start
+    assert result.returncode == 0
+    assert "dataset-forge" in result.stdout
+    assert elapsed < STARTUP_BUDGET_SECONDS, f"startup took {elapsed:.2f}s"
+
+
+def test_menu_import_defers_heavy_modules():
+    code = (
+        "import sys, dataset_forge.cli, dataset_forge.menus.main_menu;"
+        f"print([m for m in {HEAVY_STARTUP_MODULES!r} if m in sys.modules])"
+    )
+    result = _run(["-c", code])
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_parse_importtime_builds_tree():
+    output = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |     c",
+            "import time:       200 |        300 |   b",
+            "import time:        50 |        350 | a",
+            "import time:        10 |         10 | d",
+        ]
+    )
+    roots = parse_importtime(output)
+    assert [r.name for r in roots] == ["a", "d"]
+    assert roots[0].cumulative_ms == 0.35
+    assert roots[0].children[0].name == "b"
+    assert roots[0].children[0].children[0].name == "c"
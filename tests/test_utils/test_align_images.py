@@ -4,7 +4,19 @@ import tempfile
 import numpy as np
 import cv2
 import pytest
-from dataset_forge.actions.align_images_actions import align_images_workflow
+from dataset_forge.actions import align_images_actions
+from dataset_forge.actions.align_images_actions import (
+    align_image,
+    align_images_workflow,
+)
+from dataset_forge.utils.result_cache import FileResultCache
+
+
+@pytest.fixture(autouse=True)
+def keypoint_cache(tmp_path, monkeypatch):
+    cache = FileResultCache("align_keypoints", cache_dir=str(tmp_path / "cache"))
+    monkeypatch.setattr(align_images_actions, "_keypoint_cache", cache)
+    return cache
 
 
 def create_feature_rich_image(path, color=(0, 0, 255), size=(64, 64), text=None):
@@ -107,3 +119,68 @@ def test_align_images_workflow(tmp_path, recursive):
         assert os.path.isfile(path), f"Output image missing: {path}"
     # Clean up
     shutil.rmtree(out, ignore_errors=True)
+
+
+def make_scene(seed=0, size=(480, 320)):
+    rng = np.random.default_rng(seed)
+    img = np.zeros((size[1], size[0], 3), np.uint8)
+    for _ in range(40):
+        center = tuple(int(v) for v in rng.integers(0, size[0], 2) % (size[0], size[1]))
+        color = tuple(int(c) for c in rng.integers(30, 255, 3))
+        cv2.circle(img, center, int(rng.integers(4, 30)), color, -1)
+    return cv2.GaussianBlur(img, (0, 0), 1.0)
+
+
+def aligned_error(out, ref, margin=30):
+    crop = (slice(margin, -margin), slice(margin, -margin))
+    return np.abs(out[crop].astype(float) - ref[crop].astype(float)).mean()
+
+
+@pytest.mark.parametrize("method", ["auto", "homography", "ecc", "translation"])
+def test_align_image_recovers_shift(method):
+    ref = make_scene()
+    shift = np.float32([[1, 0, 6.5], [0, 1, -4.0]])
+    src = cv2.warpAffine(ref, shift, (ref.shape[1], ref.shape[0]))
+    # max_side below the image size exercises the coarse-to-fine path
+    out = align_image(src, ref, method=method, max_side=256)
+    assert out is not None and out.shape == src.shape
+    assert aligned_error(out, ref) < aligned_error(src, ref) / 5
+
+
+def test_reference_keypoints_are_cached(tmp_path, keypoint_cache, monkeypatch):
+    ref_path = str(tmp_path / "ref.png")
+    ref = make_scene(1)
+    cv2.imwrite(ref_path, ref)
+    src = np.roll(ref, 3, axis=1)
+    assert align_image(src, ref, method="homography", reference_path=ref_path) is not None
+    assert list((tmp_path / "cache").rglob("*.npz"))
+
+    calls = []
+    original = align_images_actions._sift_features
+    monkeypatch.setattr(
+        align_images_actions,
+        "_sift_features",
+        lambda gray: calls.append(gray.shape) or original(gray),
+    )
+    assert align_image(src, ref, method="homography", reference_path=ref_path) is not None
+    # Only the source image is detected again
+    assert len(calls) == 1
+
+    assert keypoint_cache.clear() == 1
+    assert not list((tmp_path / "cache").rglob("*.npz"))
+
+
+def test_align_workflow_process_pool(tmp_path):
+    folder1, folder2, out = (tmp_path / n for n in ("src", "ref", "out"))
+    folder1.mkdir()
+    folder2.mkdir()
+    for i in range(4):
+        ref = make_scene(i)
+        cv2.imwrite(str(folder2 / f"{i}.png"), ref)
+        cv2.imwrite(str(folder1 / f"{i}.png"), np.roll(ref, (2, -3), axis=(0, 1)))
+    align_images_workflow(
+        str(folder1), str(folder2), str(out), recursive=False, max_workers=2
+    )
+    for i in range(4):
+        aligned = cv2.imread(str(out / f"{i}.png"))
+        assert aligned_error(aligned, make_scene(i)) < 5
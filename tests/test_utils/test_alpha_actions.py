@@ -0,0 +1,44 @@
+import numpy as np
+from PIL import Image
+
+from dataset_forge.actions import alpha_actions
+
+
+def make_images(folder):
+    (folder / "sub").mkdir(parents=True)
+    Image.new("RGB", (8, 8)).save(folder / "rgb.png")
+    Image.new("RGBA", (8, 8), (1, 2, 3, 255)).save(folder / "opaque.png")
+    binary = np.zeros((8, 8, 4), np.uint8)
+    binary[:4, :, 3] = 255
+    Image.fromarray(binary).save(folder / "sub" / "binary.png")
+    soft = np.full((8, 8, 4), 128, np.uint8)
+    Image.fromarray(soft).save(folder / "sub" / "soft.webp", lossless=True)
+    Image.new("RGBA", (8, 8), (0, 0, 0, 10)).save(folder / "lossy.webp", quality=80)
+    Image.new("RGB", (8, 8)).save(folder / "plain.webp")
+    palette = Image.new("P", (8, 8))
+    palette.save(folder / "palette_trns.png", transparency=0)
+    Image.new("RGB", (8, 8)).save(folder / "photo.jpg")
+    (folder / "broken.png").write_bytes(b"not a png")
+
+
+def test_alpha_from_header_matches_pil(tmp_path):
+    make_images(tmp_path)
+    for rel, path in alpha_actions._scan_image_files(str(tmp_path)):
+        if rel == "broken.png":
+            assert alpha_actions.alpha_from_header(path) is None
+            continue
+        with Image.open(path) as img:
+            assert alpha_actions.alpha_from_header(path) == alpha_actions._mode_has_alpha(img), rel
+
+
+def test_audit_classifies_alpha(tmp_path):
+    make_images(tmp_path)
+    audit = alpha_actions.audit_alpha(str(tmp_path), classify=True, max_workers=2)
+    assert audit["classes"] == {
+        "lossy.webp": "true",
+        "opaque.png": "opaque",
+        "palette_trns.png": "binary",
+        "sub/binary.png": "binary",
+        "sub/soft.webp": "true",
+    }
+    assert [rel for rel, _ in audit["errors"]] == ["broken.png"]
@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from dataset_forge.actions.correct_hq_lq_pairing_actions import (
+    assign_pairs,
+    fuzzy_hq_lq_pairing_logic,
+    hamming_candidates,
+)
+
+
+def brute_force_candidates(query, db, threshold, top_k):
+    out = []
+    for q in range(len(query)):
+        dist = (query[q] != db).sum(axis=1)
+        idx = [d for d in np.lexsort((np.arange(len(db)), dist)) if dist[d] <= threshold]
+        out.extend((q, d, dist[d]) for d in idx[:top_k])
+    return out
+
+
+@pytest.mark.parametrize("num_bits,threshold", [(64, 8), (64, 0), (256, 10), (12, 3)])
+def test_hamming_candidates_match_bruteforce(num_bits, threshold):
+    rng = np.random.default_rng(0)
+    db = rng.random((300, num_bits)) < 0.5
+    # Queries are noisy copies of database rows plus random rows
+    query = db[rng.permutation(300)[:120]].copy()
+    flips = rng.random(query.shape) < (threshold / num_bits)
+    query ^= flips
+    query = np.vstack([query, rng.random((30, num_bits)) < 0.5])
+    qi, di, dist = hamming_candidates(query, db, threshold, top_k=3)
+    got = list(zip(qi.tolist(), di.tolist(), dist.tolist()))
+    assert got == brute_force_candidates(query, db, threshold, 3)
+
+
+def test_assign_pairs_resolves_conflicts_globally():
+    # HQ 0 is close to both LQ 0 and LQ 1; HQ 1 only matches LQ 0.
+    # Greedy first-come assignment would leave HQ 1 unpaired.
+    hq = np.array([0, 0, 1])
+    lq = np.array([0, 1, 0])
+    cost = np.array([1.0, 2.0, 1.0])
+    assert assign_pairs(hq, lq, cost) == [(0, 1), (1, 0)]
+
+
+def test_assign_pairs_is_order_independent():
+    rng = np.random.default_rng(1)
+    hq = rng.integers(0, 50, 400)
+    lq = rng.integers(0, 50, 400)
+    cost = rng.integers(0, 9, 400).astype(float)
+    perm = rng.permutation(400)
+    assert assign_pairs(hq, lq, cost) == assign_pairs(hq[perm], lq[perm], cost[perm])
+
+
+def make_pattern(seed, size):
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 256, (8, 8, 3), dtype=np.uint8)
+    return Image.fromarray(base).resize((size, size), Image.NEAREST)
+
+
+def test_fuzzy_pairing_pairs_scrambled_names(tmp_path):
+    hq = tmp_path / "hq"
+    lq = tmp_path / "lq"
+    hq.mkdir()
+    lq.mkdir()
+    for i in range(12):
+        make_pattern(i, 128).save(hq / f"hq_{i:02d}.png")
+        # LQ names are scrambled relative to HQ
+        make_pattern(i, 32).save(lq / f"lq_{(i * 7) % 12:02d}.png")
+    (lq / "notes.txt").write_text("not an image")
+
+    pairs = fuzzy_hq_lq_pairing_logic(str(hq), str(lq), max_workers=4)
+    assert len(pairs) == 12
+    for hq_path, lq_path in pairs:
+        i = int(os.path.basename(hq_path)[3:5])
+        assert os.path.basename(lq_path) == f"lq_{(i * 7) % 12:02d}.png"
+    assert pairs == fuzzy_hq_lq_pairing_logic(str(hq), str(lq), max_workers=1)
+
+
+def test_fuzzy_pairing_embedding_rerank(tmp_path):
+    hq = tmp_path / "hq"
+    lq = tmp_path / "lq"
+    hq.mkdir()
+    lq.mkdir()
+    # Identical hashes everywhere: only the embedder can tell images apart
+    for name in ["a", "b"]:
+        Image.new("RGB", (64, 64), (128, 128, 128)).save(hq / f"{name}.png")
+        Image.new("RGB", (16, 16), (128, 128, 128)).save(lq / f"{name}_lq.png")
+
+    def embedder(paths):
+        return np.array(
+            [[1.0, 0.0] if os.path.basename(p).startswith("b") else [0.0, 1.0] for p in paths]
+        )
+
+    pairs = fuzzy_hq_lq_pairing_logic(str(hq), str(lq), embedder=embedder)
+    names = sorted((os.path.basename(h), os.path.basename(l)) for h, l in pairs)
+    assert names == [("a.png", "a_lq.png"), ("b.png", "b_lq.png")]
@@ -133,3 +133,56 @@ def test_suggestions_on_failure(tmp_path):
     result = dhs.score_dataset(str(folder))
     suggestions = result["health_score"]["suggestions"]
     assert suggestions
+
+
+def test_score_dataset_single_scan_matches_step_functions(tmp_path, monkeypatch):
+    folder = tmp_path / "images"
+    folder.mkdir()
+    for i in range(12):
+        create_dummy_image(str(folder / f"img_{i}.png"), size=(128 + 64 * (i % 2), 128))
+    with open(folder / "bad.png", "wb") as f:
+        f.write(b"not an image")
+    opened = []
+    real_inspect = dhs._inspect_image
+    monkeypatch.setattr(dhs, "_inspect_image", lambda p: opened.append(p) or real_inspect(p))
+    result = dhs.score_dataset(str(folder))
+    # Every image is opened exactly once for all checks together
+    assert sorted(opened) == sorted(str(p) for p in folder.iterdir())
+    assert result["scan"] == {
+        "images": 13,
+        "inspected": 13,
+        "sampled": False,
+        "sample_fraction": None,
+        "strata": 1,
+    }
+    assert result["unreadable_files_check"]["unreadable"] == [str(folder / "bad.png")]
+    assert result["quality_metrics"] == dhs.quality_metrics(str(folder))
+    assert result["aspect_ratio_consistency"] == dhs.aspect_ratio_consistency(str(folder))
+    score = result["health_score"]
+    assert score["score_range"] == (score["score"], score["score"])
+
+
+def test_score_dataset_sampling_mode(tmp_path, monkeypatch):
+    monkeypatch.setattr(dhs, "MIN_PER_STRATUM", 3)
+    folder = tmp_path / "images"
+    folder.mkdir()
+    for i in range(40):
+        create_dummy_image(str(folder / f"img_{i}.png"), size=(320, 320))
+    for i in range(20):
+        create_dummy_image(str(folder / f"img_{i}.jpg"), size=(320, 320), fmt="JPEG")
+    result = dhs.score_dataset(str(folder), sample_fraction=0.1, seed=1)
+    scan = result["scan"]
+    # Stratified: 4 of 40 PNGs and 3 (the minimum) of 20 JPEGs
+    assert scan["sampled"] and scan["images"] == 60 and scan["inspected"] == 7
+    assert result["basic_validation"]["passed"]
+    quality = result["quality_metrics"]
+    assert quality["avg_resolution"] == (320, 320) and quality["certain"]
+    unreadable = result["unreadable_files_check"]
+    assert unreadable["unreadable_rate"] == 0.0
+    low, high = unreadable["unreadable_rate_ci"]
+    assert low == 0.0 < high < 1.0
+    # A clean sample cannot prove there are no corrupt files in the rest
+    assert not unreadable["certain"]
+    health = result["health_score"]
+    assert health["score_range"][0] < health["score"] == health["score_range"][1]
+    assert health["breakdown"]["unreadable_files_check"][0] == "❔"
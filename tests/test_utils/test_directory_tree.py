@@ -54,3 +54,34 @@ def test_magic_unavailable(monkeypatch, dummy_tree):
     tree_str, stats = gen.generate_tree(dummy_tree)
     assert "a.jpg" in tree_str
     assert "b.txt" in tree_str
+
+
+def test_stats_cover_whole_tree_and_keep_top_files(tmp_path):
+    for d in range(3):
+        sub = tmp_path / f"d{d}" / "nested"
+        sub.mkdir(parents=True)
+        for i in range(20):
+            (sub / f"{i}.png").write_bytes(b"x" * (d * 100 + i))
+    (tmp_path / "empty").mkdir()
+    (tmp_path / "skip.tmp").write_bytes(b"x")
+    gen = directory_tree_actions.EnhancedDirectoryTreeGenerator()
+    stats = gen.collect_statistics(str(tmp_path), max_workers=4)
+    assert stats["total_files"] == 60
+    assert stats["total_dirs"] == 7
+    assert stats["empty_directories"] == 1
+    assert stats["extensions"] == {".png": 60}
+    largest = stats["largest_files"]
+    assert len(largest) == directory_tree_actions.TOP_N_FILES
+    assert largest[0] == (str(tmp_path / "d2" / "nested" / "19.png"), 219)
+
+
+def test_streamed_json_matches_tree(tmp_path, dummy_tree):
+    import json
+
+    gen = directory_tree_actions.EnhancedDirectoryTreeGenerator()
+    tree_str, _ = gen.generate_tree(dummy_tree)
+    out = gen.stream_tree_to_json(dummy_tree, str(tmp_path / "tree.json"))
+    with open(out, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["tree_output"] == tree_str
+    assert data["statistics"]["total_files"] == 2
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from dataset_forge.utils import download_utils
+from dataset_forge.utils.download_utils import (
+    ChecksumMismatchError,
+    compute_file_sha256,
+    download_files,
+    stream_download,
+)
+
+FILES = {
+    "/model_a.pth": os.urandom(300_000),
+    "/model_b.pth": os.urandom(120_000),
+}
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Minimal static file server with single-range support."""
+
+    ranges_seen = []
+
+    def do_GET(self):
+        data = FILES.get(self.path)
+        if data is None:
+            self.send_error(404)
+            return
+        range_header = self.headers.get("Range")
+        if range_header:
+            RangeHandler.ranges_seen.append(range_header)
+            start = int(range_header.split("=")[1].split("-")[0])
+            if start >= len(data):
+                self.send_response(416)
+                self.end_headers()
+                return
+            body = data[start:]
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}"
+            )
+        else:
+            body = data
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_stream_download_hashes_and_writes_sidecar(tmp_path, server_url):
+    dest = tmp_path / "model_a.pth"
+    data = FILES["/model_a.pth"]
+    digest = stream_download(
+        server_url + "/model_a.pth", str(dest), expected_sha256=sha(data).upper()
+    )
+    assert digest == sha(data)
+    assert dest.read_bytes() == data
+    assert not os.path.exists(str(dest) + ".part")
+    assert download_utils.read_hash_sidecar(str(dest)) == sha(data)
+
+
+def test_stream_download_resumes_part_file(tmp_path, server_url):
+    dest = tmp_path / "model_a.pth"
+    data = FILES["/model_a.pth"]
+    (tmp_path / "model_a.pth.part").write_bytes(data[:100_000])
+    RangeHandler.ranges_seen.clear()
+    digest = stream_download(server_url + "/model_a.pth", str(dest))
+    assert RangeHandler.ranges_seen == ["bytes=100000-"]
+    assert digest == sha(data)
+    assert dest.read_bytes() == data
+
+
+def test_stream_download_complete_part_file(tmp_path, server_url):
+    dest = tmp_path / "model_b.pth"
+    data = FILES["/model_b.pth"]
+    (tmp_path / "model_b.pth.part").write_bytes(data)
+    assert stream_download(server_url + "/model_b.pth", str(dest)) == sha(data)
+    assert dest.read_bytes() == data
+
+
+def test_checksum_mismatch_discards_download(tmp_path, server_url):
+    dest = tmp_path / "model_b.pth"
+    with pytest.raises(ChecksumMismatchError):
+        stream_download(server_url + "/model_b.pth", str(dest), expected_sha256="0" * 64)
+    assert not dest.exists()
+    assert not os.path.exists(str(dest) + ".part")
+
+
+def test_download_files_concurrently(tmp_path, server_url):
+    jobs = [
+        {"url": server_url + name, "dest_path": str(tmp_path / name.lstrip("/"))}
+        for name in FILES
+    ]
+    jobs.append({"url": server_url + "/missing.pth", "dest_path": str(tmp_path / "x")})
+    results = download_files(jobs, max_workers=3)
+    for name, data in FILES.items():
+        assert results[str(tmp_path / name.lstrip("/"))]["sha256"] == sha(data)
+    assert results[str(tmp_path / "x")]["error"]
+
+
+def test_sidecar_makes_repeat_verification_instant(tmp_path, monkeypatch):
+    path = tmp_path / "ckpt.pth"
+    path.write_bytes(b"weights" * 1000)
+    expected = sha(path.read_bytes())
+    assert compute_file_sha256(str(path)) == expected
+
+    def fail(*args, **kwargs):
+        raise AssertionError("file was re-hashed")
+
+    monkeypatch.setattr(download_utils, "_hash_file", fail)
+    assert compute_file_sha256(str(path)) == expected
+
+    # Modifying the file invalidates the sidecar
+    monkeypatch.undo()
+    path.write_bytes(b"other" * 10)
+    assert compute_file_sha256(str(path)) == sha(b"other" * 10)
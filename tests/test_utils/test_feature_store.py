@@ -0,0 +1,119 @@
+import shutil
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from dataset_forge.utils import feature_store as fs
+
+
+def _images(folder, n):
+    folder.mkdir()
+    paths = []
+    for i in range(n):
+        path = folder / f"img_{i}.png"
+        Image.new("RGB", (16, 16), (i * 10, 0, 0)).save(path)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def counting_feature(monkeypatch):
+    """A registered 'mean_red' feature that records the batches it is given."""
+    batches = []
+
+    def extractor(paths):
+        batches.append(list(paths))
+        rows = []
+        for path in paths:
+            try:
+                with Image.open(path) as img:
+                    rows.append([float(np.asarray(img)[..., 0].mean()), 1.0])
+            except Exception:
+                rows.append(None)
+        return rows
+
+    spec = fs.FeatureSpec("mean_red", "1", ("red", "one"), extractor, batch_size=3)
+    fs.get_feature_registry()
+    monkeypatch.setitem(fs.FEATURE_REGISTRY, "mean_red", spec)
+    return batches
+
+
+def test_get_or_compute_batches_misses_and_reuses(tmp_path, counting_feature):
+    paths = _images(tmp_path / "imgs", 7)
+    copy = str(tmp_path / "imgs" / "copy.png")
+    shutil.copy(paths[2], copy)
+    bad = tmp_path / "imgs" / "bad.png"
+    bad.write_bytes(b"not an image")
+    store = fs.FeatureStore(str(tmp_path / "store"))
+
+    table = store.get_or_compute(paths + [copy, str(bad)], "mean_red")
+    # The copy shares its content hash, so 8 unique contents in batches of 3
+    assert [len(b) for b in counting_feature] == [3, 3, 2]
+    assert table.computed == 7
+    assert table.paths == paths + [copy]
+    assert table.column("red").tolist() == [i * 10.0 for i in range(7)] + [20.0]
+
+    # A fresh store on the same folder answers from disk without extracting
+    # (including the image the extractor failed on)
+    counting_feature.clear()
+    again = fs.FeatureStore(str(tmp_path / "store")).get_or_compute(
+        paths + [copy, str(bad)], "mean_red"
+    )
+    assert counting_feature == []
+    assert again.computed == 0
+    np.testing.assert_array_equal(again.values, table.values)
+    assert again.as_dicts()[paths[1]] == {"red": 10.0, "one": 1.0}
+
+    # Only new content is extracted
+    extra = tmp_path / "imgs" / "extra.png"
+    Image.new("RGB", (16, 16), (200, 0, 0)).save(extra)
+    more = store.get_or_compute(paths + [str(extra)], "mean_red")
+    assert counting_feature == [[str(extra)]]
+    assert more.column("red")[-1] == 200.0
+
+
+def test_compaction_and_versions(tmp_path, counting_feature, monkeypatch):
+    monkeypatch.setattr(fs, "MAX_SEGMENTS", 2)
+    paths = _images(tmp_path / "imgs", 4)
+    store = fs.FeatureStore(str(tmp_path / "store"))
+    for path in paths:
+        store.get_or_compute([path], "mean_red")
+    stats = store.stats()["mean_red@1"]
+    assert stats["rows"] == 4 and stats["segments"] <= 2
+    reloaded = fs.FeatureStore(str(tmp_path / "store")).get_or_compute(paths, "mean_red")
+    assert reloaded.column("red").tolist() == [0.0, 10.0, 20.0, 30.0]
+
+    # A new version is a separate column family and recomputes
+    spec = fs.FEATURE_REGISTRY["mean_red"]
+    monkeypatch.setitem(
+        fs.FEATURE_REGISTRY,
+        "mean_red",
+        fs.FeatureSpec("mean_red", "2", spec.columns, spec.extractor),
+    )
+    counting_feature.clear()
+    assert store.get_or_compute(paths, "mean_red").computed == 4
+    assert set(store.stats()) == {"mean_red@1", "mean_red@2"}
+    assert store.clear("mean_red") == 2
+    assert store.stats() == {}
+
+
+def test_path_index_is_append_only_and_pruned(tmp_path, counting_feature, monkeypatch):
+    monkeypatch.setattr(fs, "MAX_SEGMENTS", 3)
+    paths = _images(tmp_path / "imgs", 5)
+    store = fs.FeatureStore(str(tmp_path / "store"))
+    index_dir = tmp_path / "store" / fs.PATH_INDEX_DIR
+
+    store.content_hashes(paths[:2])
+    store.content_hashes(paths[:2])  # all hits: nothing written
+    assert len(list(index_dir.glob("seg-*.npz"))) == 1
+    store.content_hashes(paths[2:3])
+    assert len(list(index_dir.glob("seg-*.npz"))) == 2
+
+    # Compaction drops files that were deleted since they were indexed
+    (tmp_path / "imgs" / "img_0.png").unlink()
+    store.content_hashes(paths[3:4])
+    store.content_hashes(paths[4:])
+    assert len(list(index_dir.glob("seg-*.npz"))) == 1
+    reloaded = fs.FeatureStore(str(tmp_path / "store")).path_index()
+    assert sorted(reloaded.entries) == sorted(str(p) for p in paths[1:])
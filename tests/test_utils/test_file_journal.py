@@ -0,0 +1,122 @@
+import os
+import shutil
+
+import pytest
+
+from dataset_forge.utils import file_journal
+from dataset_forge.utils.file_journal import (
+    FileJournal,
+    FileOp,
+    list_incomplete_journals,
+    run_file_operations,
+)
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_inplace_swap_and_delete(tmp_path):
+    folder = tmp_path / "hq"
+    write(folder / "a.png", "A")
+    write(folder / "b.png", "B")
+    write(folder / "c.png", "C")
+    ops = [
+        FileOp("rename", str(folder / "a.png"), str(folder / "b.png")),
+        FileOp("rename", str(folder / "b.png"), str(folder / "a.png")),
+        FileOp("delete", str(folder / "c.png")),
+    ]
+    summary = run_file_operations(ops, journal_dir=str(tmp_path / "journals"))
+    assert summary["state"] == "completed" and not summary["failed_ops"]
+    assert (folder / "a.png").read_text() == "B"
+    assert (folder / "b.png").read_text() == "A"
+    assert sorted(os.listdir(folder)) == ["a.png", "b.png"]
+    assert os.listdir(tmp_path / "journals") == []
+
+
+def test_conflicting_plan_is_rejected_before_touching_files(tmp_path):
+    write(tmp_path / "a.png", "A")
+    write(tmp_path / "b.png", "B")
+    write(tmp_path / "taken.png", "T")
+    with pytest.raises(FileExistsError):
+        FileJournal.create(
+            [FileOp("rename", str(tmp_path / "a.png"), str(tmp_path / "taken.png"))],
+            journal_dir=str(tmp_path / "journals"),
+        )
+    with pytest.raises(ValueError):
+        FileJournal.create(
+            [
+                FileOp("copy", str(tmp_path / "a.png"), str(tmp_path / "out.png")),
+                FileOp("copy", str(tmp_path / "b.png"), str(tmp_path / "out.png")),
+            ],
+            journal_dir=str(tmp_path / "journals"),
+        )
+    assert (tmp_path / "a.png").read_text() == "A"
+
+
+def test_interrupted_run_can_resume_or_roll_back(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    names = [f"{i}.png" for i in range(6)]
+    for name in names:
+        write(src / name, name)
+    journal_dir = str(tmp_path / "journals")
+    ops = [
+        FileOp("move", str(src / name), str(tmp_path / "out" / f"{i:05d}.png"))
+        for i, name in enumerate(names)
+    ]
+    ops.append(FileOp("delete", str(src / "extra.png")))
+    write(src / "extra.png", "extra")
+
+    original = file_journal._run_step
+
+    def crash_on_third(step):
+        if step["src"].endswith("2.png"):
+            raise OSError("disk unplugged")
+        original(step)
+
+    monkeypatch.setattr(file_journal, "_run_step", crash_on_third)
+    summary = run_file_operations(ops, journal_dir=journal_dir, max_workers=2)
+    assert summary["state"] == "failed"
+    assert [op.src for op, _ in summary["failed_ops"]] == [str(src / "2.png")]
+
+    (journal,) = list_incomplete_journals(journal_dir)
+    journal.rollback()
+    assert sorted(os.listdir(src)) == sorted(names + ["extra.png"])
+    assert not any((tmp_path / "out").iterdir())
+
+    monkeypatch.setattr(file_journal, "_run_step", original)
+    journal = FileJournal.create(ops, journal_dir=journal_dir)
+    monkeypatch.setattr(file_journal, "_run_step", crash_on_third)
+    journal.execute()
+    monkeypatch.setattr(file_journal, "_run_step", original)
+    assert journal.execute()["state"] == "completed"
+    journal.commit()
+    assert os.listdir(src) == []
+    assert (tmp_path / "out" / "00002.png").read_text() == "2.png"
+
+
+def test_rollback_removes_interrupted_and_unrecorded_copies(tmp_path, monkeypatch):
+    src, out = tmp_path / "src", tmp_path / "out"
+    for name in ("a.png", "b.png"):
+        write(src / name, name)
+    ops = [FileOp("copy", str(src / n), str(out / n)) for n in ("a.png", "b.png")]
+    journal = FileJournal.create(ops, journal_dir=str(tmp_path / "journals"))
+
+    def interrupted_copy(src_path, dst_path, operation):
+        # Dies halfway through writing b.png
+        with open(dst_path, "w") as f:
+            f.write("trunc")
+        if src_path.endswith("b.png"):
+            raise OSError("power loss")
+        shutil.copy2(src_path, dst_path)
+
+    monkeypatch.setattr(file_journal, "transfer_file", interrupted_copy)
+    journal.execute(max_workers=1)
+    assert sorted(os.listdir(out)) == ["a.png", "b.png" + file_journal.TEMP_SUFFIX]
+
+    # a.png finished but its done.log entry was lost
+    os.remove(os.path.join(journal.path, "done.log"))
+    assert journal.rollback()["state"] == "rolled_back"
+    assert os.listdir(out) == []
+    assert sorted(os.listdir(src)) == ["a.png", "b.png"]
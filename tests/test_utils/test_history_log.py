@@ -0,0 +1,98 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from dataset_forge.utils import history_log
+from dataset_forge.utils.history_log import (
+    ProcessLogQueue,
+    flush_log,
+    log_operation,
+    query_log,
+)
+
+
+@pytest.fixture(autouse=True)
+def logs_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_log, "LOGS_DIR", str(tmp_path))
+    yield tmp_path
+    flush_log()
+
+
+def _set_logs_dir(path):
+    history_log.LOGS_DIR = path
+
+
+def _log_from_worker(i):
+    log_operation("worker_op", f"item {i}", path=f"/data/{i}.png")
+    return i
+
+
+def test_records_are_batched_jsonl(logs_dir):
+    for i in range(1000):
+        log_operation("resize", f"Resized {i}", path=f"/img/{i}.png", duration=0.01)
+    flush_log()
+    files = list(logs_dir.glob("*.jsonl"))
+    assert len(files) == 1
+    lines = files[0].read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1000
+    record = json.loads(lines[-1])
+    assert record["action"] == "resize"
+    assert record["path"] == "/img/999.png"
+    assert record["outcome"] == "ok"
+
+
+def test_query_filters_and_legacy_logs(logs_dir):
+    (logs_dir / "2020-01-01.log").write_text(
+        "[2020-01-01 10:00:00] exif_scrub: Scrubbed EXIF from a.jpg\n"
+        "[2020-01-01 10:00:01] resize: old record\n",
+        encoding="utf-8",
+    )
+    log_operation("exif_scrub", "Failed: boom", path="b.jpg", outcome="error")
+    log_operation("resize", "new record")
+
+    scrubs = query_log(action="exif_scrub")
+    assert [r["details"] for r in scrubs] == ["Scrubbed EXIF from a.jpg", "Failed: boom"]
+    assert [r["path"] for r in query_log(outcome="error")] == ["b.jpg"]
+    assert [r["details"] for r in query_log(start_date="2021-01-01", action="resize")] == [
+        "new record"
+    ]
+    assert len(query_log(end_date="2020-01-01")) == 2
+    assert query_log(limit=1)[0]["details"] == "new record"
+    assert query_log(contains="B.JPG")[0]["outcome"] == "error"
+
+
+def test_same_day_legacy_log_is_read_before_jsonl(logs_dir):
+    (logs_dir / "2020-01-02.jsonl").write_text(
+        json.dumps({"ts": "2020-01-02T12:00:00.000", "action": "new"}) + "\n",
+        encoding="utf-8",
+    )
+    (logs_dir / "2020-01-02.log").write_text(
+        "[2020-01-02 09:00:00] old: legacy\n", encoding="utf-8"
+    )
+    (logs_dir / "2020-01-01.jsonl").write_text(
+        json.dumps({"ts": "2020-01-01T12:00:00.000", "action": "first"}) + "\n",
+        encoding="utf-8",
+    )
+    assert [r["action"] for r in query_log()] == ["first", "old", "new"]
+
+
+def test_unattached_process_pool_workers_write_directly(logs_dir):
+    with ProcessPoolExecutor(
+        max_workers=2, initializer=_set_logs_dir, initargs=(str(logs_dir),)
+    ) as ex:
+        assert sorted(ex.map(_log_from_worker, range(50))) == list(range(50))
+    records = query_log(action="worker_op")
+    assert sorted(r["path"] for r in records) == sorted(f"/data/{i}.png" for i in range(50))
+
+
+def test_process_pool_records_reach_parent_writer(logs_dir):
+    with ProcessLogQueue() as log_queue:
+        with ProcessPoolExecutor(
+            max_workers=2,
+            initializer=log_queue.initializer,
+            initargs=log_queue.initargs,
+        ) as ex:
+            assert sorted(ex.map(_log_from_worker, range(20))) == list(range(20))
+    records = query_log(action="worker_op")
+    assert sorted(r["path"] for r in records) == sorted(f"/data/{i}.png" for i in range(20))
@@ -0,0 +1,76 @@
+import json
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from dataset_forge.utils import job_runner
+
+
+def make_dataset(folder):
+    folder.mkdir()
+    rng = np.random.default_rng(0)
+    for i in range(3):
+        img = (rng.random((32, 32, 3)) * 255).astype("uint8")
+        Image.fromarray(img).save(folder / f"{i}.jpg", quality=95)
+    (folder / "dup.jpg").write_bytes((folder / "0.jpg").read_bytes())
+
+
+def write_job(path, job):
+    path.write_text(json.dumps(job))
+    return str(path)
+
+
+def test_job_chains_steps_and_cleans_intermediates(tmp_path):
+    make_dataset(tmp_path / "in")
+    job_path = write_job(
+        tmp_path / "job.json",
+        {
+            "input": str(tmp_path / "in"),
+            "output": str(tmp_path / "out"),
+            "steps": [
+                {"action": "sanitize", "params": {"to_png": True, "max_workers": 1}},
+                {"action": "dedup"},
+                {"action": "dpid", "params": {"method": "basicsr", "scale": 0.5}},
+            ],
+        },
+    )
+    report_path = tmp_path / "report.json"
+    assert job_runner.run_job_cli([job_path, "--report", str(report_path)]) == 0
+
+    out = tmp_path / "out" / "50pct"
+    assert sorted(os.listdir(out)) == ["0.png", "1.png", "2.png"]
+    with Image.open(out / "0.png") as img:
+        assert img.size == (16, 16)
+    report = json.loads(report_path.read_text())
+    assert [(s["action"], s["files_in"], s["files_out"]) for s in report["steps"]] == [
+        ("sanitize", 4, 4),
+        ("dedup", 4, 3),
+        ("dpid", 3, 3),
+    ]
+    # Only the input, the output, the job and the report remain
+    assert sorted(os.listdir(tmp_path)) == ["in", "job.json", "out", "report.json"]
+    assert len(os.listdir(tmp_path / "in")) == 4
+
+
+def test_exit_codes(tmp_path):
+    make_dataset(tmp_path / "in")
+    bad_action = write_job(
+        tmp_path / "bad.json",
+        {"input": str(tmp_path / "in"), "output": str(tmp_path / "out"), "steps": [{"action": "nope"}]},
+    )
+    assert job_runner.run_job_cli([bad_action]) == job_runner.EXIT_INVALID_JOB
+    with pytest.raises(job_runner.JobError):
+        job_runner.load_job(bad_action)
+
+    failing = write_job(
+        tmp_path / "failing.json",
+        {
+            "input": str(tmp_path / "in"),
+            "output": str(tmp_path / "out"),
+            "steps": [{"action": "degrade", "params": {"degradation": "missing"}}],
+        },
+    )
+    assert job_runner.run_job_cli([failing]) == job_runner.EXIT_STEP_FAILED
+    assert job_runner.run_job_cli([failing, "--dry-run"]) == job_runner.EXIT_OK
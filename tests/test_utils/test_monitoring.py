@@ -34,3 +34,43 @@ def test_performance_analytics():
     summary = analytics.summary()
     assert "test" in summary
     assert summary["test"]["count"] == 1
+
+
+def test_resource_sampler_ring_buffer_and_tagging(tmp_path):
+    """ResourceSampler wraps around, tags operations and exports."""
+    from dataset_forge.utils.monitoring import ResourceSampler, monitor_all
+
+    sampler = ResourceSampler(capacity=4)
+
+    @monitor_all("sampled_op")
+    def work():
+        return sampler.sample()
+
+    assert work()["operation"] == "sampled_op"
+    for _ in range(5):
+        sampler.sample()
+    samples = sampler.samples()
+    assert len(sampler) == 4
+    assert len(samples["timestamp"]) == 4
+    assert (samples["timestamp"][1:] >= samples["timestamp"][:-1]).all()
+    assert "sampled_op" not in samples["operation"]
+    assert samples["per_core"].shape == (4, sampler.num_cores)
+    assert len(sampler.sparkline("rss_bytes")) == 4
+    assert "(idle)" in sampler.operation_summary()
+
+    out = tmp_path / "samples.csv"
+    sampler.export(str(out))
+    assert "cpu0_percent" in out.read_text().splitlines()[0]
+
+
+def test_resource_sampler_background_thread():
+    """Background sampling honours the interval and stops cleanly."""
+    import time
+    from dataset_forge.utils.monitoring import ResourceSampler
+
+    sampler = ResourceSampler(capacity=100)
+    sampler.start(interval=0.02)
+    time.sleep(0.2)
+    sampler.stop()
+    assert not sampler.running
+    assert len(sampler) >= 3
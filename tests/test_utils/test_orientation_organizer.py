@@ -0,0 +1,99 @@
+import os
+
+import pytest
+from PIL import Image
+
+from dataset_forge.actions.orientation_organizer_actions import (
+    assign_aspect_bucket,
+    get_image_orientation,
+    organize_hq_lq_by_orientation,
+    organize_images_by_orientation,
+    parse_aspect_buckets,
+    read_image_size,
+)
+from dataset_forge.utils.file_utils import transfer_file
+
+
+def save(path, size, exif_orientation=None):
+    img = Image.new("RGB", size, (10, 20, 30))
+    if exif_orientation:
+        exif = Image.Exif()
+        exif[0x0112] = exif_orientation
+        img.save(path, exif=exif)
+    else:
+        img.save(path)
+
+
+def test_exif_orientation_swaps_dimensions(tmp_path):
+    path = tmp_path / "rotated.jpg"
+    save(path, (200, 100), exif_orientation=6)
+    assert read_image_size(str(path)) == (100, 200)
+    assert read_image_size(str(path), honour_exif=False) == (200, 100)
+    assert get_image_orientation(str(path)) == "portrait"
+    assert get_image_orientation(str(tmp_path / "missing.png")) is None
+
+
+def test_aspect_buckets():
+    buckets = parse_aspect_buckets("1:1, 4:3, 3:4, 16x9")
+    assert list(buckets) == ["1x1", "4x3", "3x4", "16x9"]
+    assert assign_aspect_bucket(1920, 1080, buckets) == "16x9"
+    assert assign_aspect_bucket(1000, 1100, buckets) == "1x1"
+    assert assign_aspect_bucket(600, 820, buckets) == "3x4"
+    with pytest.raises(ValueError):
+        parse_aspect_buckets("wide")
+
+
+@pytest.mark.parametrize("operation", ["copy", "move", "link"])
+def test_organize_single_folder(tmp_path, operation):
+    src = tmp_path / "src"
+    src.mkdir()
+    save(src / "land.png", (64, 32))
+    save(src / "port.png", (32, 64))
+    save(src / "sq.png", (32, 32))
+    (src / "broken.png").write_bytes(b"not an image")
+    out = tmp_path / "out"
+
+    result = organize_images_by_orientation(
+        str(src), str(out), ["landscape", "portrait"], operation=operation
+    )
+    assert result == {
+        "landscape": [str(out / "landscape" / "land.png")],
+        "portrait": [str(out / "portrait" / "port.png")],
+    }
+    assert (out / "landscape" / "land.png").exists()
+    assert (src / "land.png").exists() == (operation != "move")
+    assert (src / "sq.png").exists()
+
+
+def test_hq_lq_pairs_share_bucket(tmp_path):
+    hq, lq = tmp_path / "hq", tmp_path / "lq"
+    hq.mkdir()
+    lq.mkdir()
+    # LQ aspect ratio differs slightly; the HQ decides the bucket
+    save(hq / "a.png", (400, 300))
+    save(lq / "a.png", (100, 76))
+    save(hq / "b.png", (160, 90))
+    save(lq / "b.png", (40, 24))
+    save(hq / "unpaired.png", (64, 64))
+
+    result = organize_hq_lq_by_orientation(
+        str(hq),
+        str(lq),
+        str(tmp_path / "out_hq"),
+        str(tmp_path / "out_lq"),
+        buckets=parse_aspect_buckets("4:3,16:9"),
+    )
+    assert [tuple(map(os.path.basename, p)) for p in result["4x3"]] == [("a.png", "a.png")]
+    assert [tuple(map(os.path.basename, p)) for p in result["16x9"]] == [("b.png", "b.png")]
+    assert (tmp_path / "out_lq" / "4x3" / "a.png").exists()
+
+
+def test_transfer_file_link_shares_inode(tmp_path):
+    src = tmp_path / "a.bin"
+    src.write_bytes(b"data")
+    assert transfer_file(str(src), str(tmp_path / "b.bin"), "link") == "hardlink"
+    assert os.path.samefile(src, tmp_path / "b.bin")
+    assert transfer_file(str(src), str(tmp_path / "c.bin"), "copy") in ("reflink", "copy")
+    assert (tmp_path / "c.bin").read_bytes() == b"data"
+    assert transfer_file(str(src), str(tmp_path / "d.bin"), "move") == "rename"
+    assert not src.exists()
@@ -0,0 +1,78 @@
+import csv
+
+import numpy as np
+import pytest
+from PIL import Image
+
+torch = pytest.importorskip("torch")
+
+from dataset_forge.actions import outlier_detection_actions as oda
+from dataset_forge.actions.outlier_detection_actions import (
+    RunningStats,
+    score_outliers,
+)
+
+
+class ColorEmbedder:
+    """Tiny stand-in for ImgToEmbedding: embeds an image as its mean colour."""
+
+    device = "cpu"
+    amp = False
+
+    def __init__(self):
+        self.net = torch.nn.Sequential(torch.nn.AdaptiveAvgPool2d(1), torch.nn.Flatten())
+
+    @staticmethod
+    def transform(img):
+        return torch.from_numpy(np.asarray(img, dtype=np.float32) / 255.0).permute(2, 0, 1)
+
+
+def test_running_stats_matches_numpy():
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(500, 6))
+    stats = RunningStats(6)
+    for start in range(0, 500, 73):
+        stats.update(data[start : start + 73])
+    assert np.allclose(stats.mean, data.mean(axis=0))
+    assert np.allclose(stats.covariance(shrinkage=0), np.cov(data, rowvar=False))
+
+
+@pytest.mark.parametrize("method", oda.OUTLIER_METHODS)
+def test_methods_rank_planted_outliers_first(method, monkeypatch):
+    monkeypatch.setattr(oda, "STATS_CHUNK_ROWS", 128)
+    rng = np.random.default_rng(1)
+    data = rng.normal(size=(600, 16)).astype(np.float32)
+    data[[5, 250]] += 12.0
+    scores = score_outliers(data, method)
+    assert set(np.argsort(-scores)[:2]) == {5, 250}
+
+
+def test_detect_outliers_writes_ranked_csv(tmp_path, monkeypatch):
+    monkeypatch.setattr(oda, "OUTLIER_WORK_DIR", str(tmp_path / "work"))
+    folder = tmp_path / "images"
+    folder.mkdir()
+    rng = np.random.default_rng(2)
+    for i in range(60):
+        color = (120 + rng.integers(-8, 8, 3)).astype(np.uint8)
+        Image.new("RGB", (16, 16), tuple(int(c) for c in color)).save(folder / f"{i:03d}.png")
+    Image.new("RGB", (16, 16), (255, 0, 255)).save(folder / "odd.png")
+    (folder / "broken.png").write_bytes(b"not an image")
+
+    out_csv = tmp_path / "ranked.csv"
+    result = oda._detect_outliers_for_folder(
+        str(folder),
+        "ConvNextS",
+        "cpu",
+        method="mahalanobis",
+        batch_size=8,
+        output_csv=str(out_csv),
+        embedder=ColorEmbedder(),
+    )
+    assert len(result["files"]) == 61
+    with open(out_csv, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 61
+    assert rows[0]["path"].endswith("odd.png")
+    assert rows[0]["is_outlier"] == "True"
+    # Temporary embedding matrix is removed afterwards
+    assert not any((tmp_path / "work").iterdir())
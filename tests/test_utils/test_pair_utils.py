@@ -0,0 +1,54 @@
+import time
+
+from dataset_forge.utils.pair_utils import (
+    clear_pair_cache,
+    match_pairs,
+    matching_pair_names,
+    resolve_pairs,
+)
+
+
+def touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x")
+
+
+def test_match_pairs_exact_and_by_stem():
+    hq = ["a.png", "b.png", "c.png", "d.png"]
+    lq = ["a.png", "b.jpg", "c.webp", "c.jpg", "e.png"]
+    pairs, hq_only, lq_only = match_pairs(hq, lq)
+    assert pairs == [("a.png", "a.png")]
+    assert hq_only == ["b.png", "c.png", "d.png"]
+
+    pairs, hq_only, lq_only = match_pairs(hq, lq, by_stem=True)
+    assert pairs == [("a.png", "a.png"), ("b.png", "b.jpg"), ("c.png", "c.jpg")]
+    assert hq_only == ["d.png"]
+    assert sorted(lq_only) == ["c.webp", "e.png"]
+
+
+def test_match_pairs_is_linear_for_large_lists():
+    names = [f"{i:06d}.png" for i in range(200_000)]
+    start = time.perf_counter()
+    pairs, _, _ = match_pairs(names, names[::-1])
+    assert len(pairs) == len(names)
+    assert time.perf_counter() - start < 5
+
+
+def test_resolve_pairs_recursive_and_cache(tmp_path):
+    clear_pair_cache()
+    hq, lq = tmp_path / "hq", tmp_path / "lq"
+    for rel in ["a.png", "sub/b.png", "notes.txt"]:
+        touch(hq / rel)
+    for rel in ["a.png", "sub/b.jpg"]:
+        touch(lq / rel)
+
+    assert matching_pair_names(str(hq), str(lq)) == ["a.png"]
+    table = resolve_pairs(str(hq), str(lq), by_stem=True, recursive=True)
+    assert list(table) == [("a.png", "a.png"), ("sub/b.png", "sub/b.jpg")]
+    assert resolve_pairs(str(hq), str(lq), by_stem=True, recursive=True) is table
+    assert list(table.take([1])) == [("sub/b.png", "sub/b.jpg")]
+
+    (lq / "sub" / "b.jpg").unlink()
+    table = resolve_pairs(str(hq), str(lq), by_stem=True, recursive=True)
+    assert table.names() == ["a.png"]
+    assert table.hq_only.tolist() == ["sub/b.png"]
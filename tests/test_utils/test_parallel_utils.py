@@ -61,3 +61,45 @@ def test_smart_map_error():
 
     with pytest.raises(ValueError):
         smart_map(fail_on_three, [1, 2, 3], desc="Test", play_audio=False)
+
+
+def test_prefetch_map_ordered_and_bounded():
+    """prefetch_map yields (item, result) in order from a lazy generator."""
+    from dataset_forge.utils.parallel_utils import prefetch_map
+
+    consumed = []
+
+    def gen():
+        for i in range(10):
+            consumed.append(i)
+            yield i
+
+    stream = prefetch_map(double, gen(), max_workers=2, prefetch=3)
+    first = next(stream)
+    assert first == (0, 0)
+    # Only a bounded window has been pulled from the source so far
+    assert len(consumed) <= 4
+    assert list(stream) == [(i, i * 2) for i in range(1, 10)]
+
+
+def test_prefetch_map_process_pool():
+    """prefetch_map can run picklable functions on worker processes."""
+    from dataset_forge.utils.parallel_utils import prefetch_map
+
+    results = list(prefetch_map(double, range(6), max_workers=2, use_processes=True))
+    assert results == [(i, i * 2) for i in range(6)]
+
+
+def test_shape_batcher_caps_buffered_items():
+    """ShapeBatcher releases full buckets, and the largest one when the cap is hit."""
+    from dataset_forge.utils.parallel_utils import ShapeBatcher
+
+    batcher = ShapeBatcher(batch_size=3, max_buffered=4)
+    released = [batcher.add(s, (s, i)) for i, s in enumerate("aabcb")]
+    assert released[:3] == [None, None, None]
+    # Fourth item hits the cap: the largest bucket ("a") goes early
+    assert released[3] == [("a", 0), ("a", 1)]
+    assert released[4] is None
+    assert batcher.buffered == 3
+    assert sorted(map(len, batcher.drain())) == [1, 2]
+    assert batcher.buffered == 0
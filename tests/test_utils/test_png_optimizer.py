@@ -0,0 +1,52 @@
+import os
+
+from dataset_forge.utils import png_optimizer
+from dataset_forge.utils.png_optimizer import OxipngOptions, optimize_pngs, plan_concurrency
+
+
+def test_plan_concurrency_never_oversubscribes():
+    assert plan_concurrency(1000, cpu_count=8) == (8, 1)
+    assert plan_concurrency(2, cpu_count=8) == (2, 4)
+    assert plan_concurrency(3, cpu_count=8) == (3, 2)
+    for n in range(1, 20):
+        jobs, threads = plan_concurrency(n, cpu_count=6)
+        assert jobs * threads <= 6
+
+
+def test_largest_first_and_index_skips_optimized(tmp_path, monkeypatch):
+    sizes = {"small.png": 10, "big.png": 1000, "mid.png": 100}
+    for name, size in sizes.items():
+        (tmp_path / name).write_bytes(b"x" * size)
+    commands = []
+
+    def fake_oxipng(cmd, timeout):
+        commands.append(cmd)
+        path = cmd[-1]
+        half = os.path.getsize(path) // 2
+        with open(path, "wb") as f:
+            f.write(b"y" * half)
+        return True, ""
+
+    monkeypatch.setattr(png_optimizer.shutil, "which", lambda name: "oxipng")
+    monkeypatch.setattr(png_optimizer, "_run_oxipng_job", fake_oxipng)
+    paths = [str(tmp_path / name) for name in sizes]
+    options = OxipngOptions(level=2, strip="safe", timeout=5)
+
+    report = optimize_pngs(paths, options, cpu_count=1)
+    assert [os.path.basename(c[-1]) for c in commands] == ["big.png", "mid.png", "small.png"]
+    assert commands[0][:5] == ["oxipng", "-o", "2", "--threads", "1"]
+    assert "--timeout" in commands[0]
+    assert (report["optimized"], report["bytes_saved"]) == (3, 555)
+
+    commands.clear()
+    assert optimize_pngs(paths, options)["skipped"] == 3
+    assert optimize_pngs(paths, OxipngOptions(level=1, strip="safe", timeout=5))["skipped"] == 3
+    # A budget may have cut oxipng short: a larger budget optimizes again
+    assert optimize_pngs(paths, OxipngOptions(level=2, strip="safe", timeout=10))["optimized"] == 3
+    # A higher level or a changed file is optimized again
+    assert optimize_pngs(paths[:1], OxipngOptions(level=4, strip="safe"))["optimized"] == 1
+    # Optimized without a budget: done for budgeted runs too
+    assert optimize_pngs(paths[:1], OxipngOptions(level=4, strip="safe", timeout=1))["skipped"] == 1
+    (tmp_path / "big.png").write_bytes(b"z" * 40)
+    report = optimize_pngs(paths, OxipngOptions(level=4, strip="safe"))
+    assert (report["optimized"], report["skipped"]) == (2, 1)
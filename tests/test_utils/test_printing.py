@@ -31,3 +31,63 @@ def test_print_header(capsys):
     captured = capsys.readouterr()
     assert "HeaderTest" in captured.out
     assert "\033[" in captured.out  # ANSI color code present
+
+
+def test_output_modes(capsys):
+    import json
+
+    from dataset_forge.utils import printing
+
+    try:
+        printing.set_output_mode("quiet")
+        print_info("hidden info")
+        print_warning("shown warning")
+        assert capsys.readouterr().out.strip() == "\033[38;2;250;179;135m\033[1m! shown warning\033[0m"
+
+        printing.set_output_mode("json")
+        print_header("Title")
+        print_success("done ✅")
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [(l["level"], l["message"]) for l in lines] == [
+            ("header", "Title"),
+            ("success", "done ✅"),
+        ]
+    finally:
+        printing.set_output_mode("normal")
+
+
+def test_repeated_warnings_are_rate_limited(capsys, monkeypatch):
+    from dataset_forge.utils import printing
+
+    def warn(name):
+        print_warning(f"bad file {name}")
+
+    printing.reset_warning_limits()
+    for i in range(printing.WARNING_BURST + 5):
+        warn(i)
+    out = capsys.readouterr().out
+    assert out.count("bad file") == printing.WARNING_BURST
+
+    # A new window reports how many were dropped before printing again
+    clock = printing.time.monotonic() + printing.WARNING_WINDOW
+    monkeypatch.setattr(printing.time, "monotonic", lambda: clock)
+    warn("again")
+    out = capsys.readouterr().out
+    assert "5 similar warning(s) suppressed" in out
+    assert "bad file again" in out
+
+
+def test_suppressed_warnings_reported_when_loop_ends(capsys):
+    from dataset_forge.utils import printing
+
+    printing.reset_warning_limits()
+    capsys.readouterr()
+    for i in range(printing.WARNING_BURST + 10):
+        print_warning(f"bad file {i}")
+    # The loop never warns again, so the summary comes from the flush
+    printing.flush_output()
+    out = capsys.readouterr().out
+    assert out.count("bad file") == printing.WARNING_BURST
+    assert "10 similar warning(s) suppressed" in out
+    printing.flush_output()
+    assert "suppressed" not in capsys.readouterr().out
@@ -3,6 +3,14 @@ from dataset_forge.actions import quality_scoring_actions
 import os
 
 
+@pytest.fixture(autouse=True)
+def isolated_score_store(monkeypatch, tmp_path):
+    # Keep persisted scores out of the real store/cache directory
+    monkeypatch.setattr(
+        quality_scoring_actions, "QUALITY_SCORE_DIR", str(tmp_path / "scores")
+    )
+
+
 @pytest.fixture
 def dummy_images(tmp_path):
     img = tmp_path / "a.png"
@@ -42,3 +50,128 @@ def test_score_images_with_pyiqa(monkeypatch, dummy_images, tmp_path):
     scores = quality_scoring_actions.score_images_with_pyiqa(str(folder))
     assert isinstance(scores, list)
     assert scores[0][1] == 0.5
+
+
+class BatchDummyMetric:
+    """Scores the mean pixel value; records batch sizes."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, x):
+        if isinstance(x, str):
+            return 0.0
+        self.batch_sizes.append(x.shape[0])
+        return x.mean(dim=(1, 2, 3))
+
+
+@pytest.fixture
+def batch_metric(monkeypatch, tmp_path):
+    metric = BatchDummyMetric()
+    created = []
+
+    def create_metric(*args, **kwargs):
+        created.append(args)
+        return metric
+
+    monkeypatch.setattr(
+        quality_scoring_actions,
+        "pyiqa",
+        type("pyiqa", (), {"create_metric": staticmethod(create_metric)})(),
+    )
+    quality_scoring_actions.clear_metric_cache()
+    metric.created = created
+    return metric
+
+
+def make_images(folder, sizes):
+    from PIL import Image
+
+    folder.mkdir()
+    for i, size in enumerate(sizes):
+        Image.new("RGB", size, (i * 20, i * 20, i * 20)).save(folder / f"img_{i}.png")
+
+
+def test_batched_scoring_buckets_and_persists(batch_metric, tmp_path):
+    folder = tmp_path / "imgs"
+    make_images(folder, [(16, 16)] * 5 + [(8, 12)] * 2)
+    scores = quality_scoring_actions.score_images_with_pyiqa(
+        str(folder), batch_size=4
+    )
+    assert len(scores) == 7
+    assert [os.path.basename(p) for p, _ in scores] == [f"img_{i}.png" for i in range(7)]
+    assert scores[1][1] == pytest.approx(20 / 255, abs=1e-6)
+    assert sorted(batch_metric.batch_sizes) == [1, 2, 4]
+    assert len(batch_metric.created) == 1
+
+    # Second run (new threshold) reuses persisted scores without the model
+    batch_metric.batch_sizes.clear()
+    again = quality_scoring_actions.score_images_with_pyiqa(str(folder))
+    assert again == scores
+    assert batch_metric.batch_sizes == []
+    cached = quality_scoring_actions.load_cached_scores(str(folder))
+    assert cached == scores
+    assert len(quality_scoring_actions.filter_images_by_quality(cached, 0.2)) == 4
+
+
+def test_mixed_resolutions_keep_buffer_bounded(batch_metric, tmp_path, monkeypatch):
+    from dataset_forge.utils.parallel_utils import ShapeBatcher
+
+    peak = []
+
+    class RecordingBatcher(ShapeBatcher):
+        def add(self, shape, item):
+            ready = super().add(shape, item)
+            peak.append(self.buffered + len(ready or ()))
+            return ready
+
+    monkeypatch.setattr(quality_scoring_actions, "ShapeBatcher", RecordingBatcher)
+    folder = tmp_path / "imgs"
+    make_images(folder, [(8 + i, 8) for i in range(10)])
+    scores = quality_scoring_actions.score_paths_with_pyiqa(
+        sorted(str(p) for p in folder.iterdir()),
+        batch_size=4,
+        max_buffered=6,
+        use_cache=False,
+    )
+    assert len(scores) == 10
+    # Every shape is distinct; the cap, not a full batch, releases them
+    assert max(peak) == 6
+    assert batch_metric.batch_sizes == [1] * 10
+
+
+def test_hq_lq_scored_in_one_run(batch_metric, tmp_path):
+    make_images(tmp_path / "hq", [(32, 32)] * 3)
+    make_images(tmp_path / "lq", [(8, 8)] * 3)
+    hq, lq = quality_scoring_actions.score_hq_lq_folders(
+        str(tmp_path / "hq"), str(tmp_path / "lq"), use_cache=False
+    )
+    assert len(hq) == len(lq) == 3
+    assert len(batch_metric.created) == 1
+    assert all("hq" in p for p, _ in hq)
+
+
+def test_scores_are_stored_per_max_side(batch_metric, tmp_path):
+    folder = tmp_path / "imgs"
+    make_images(folder, [(32, 32)] * 2)
+    paths = sorted(str(p) for p in folder.iterdir())
+    quality_scoring_actions.score_paths_with_pyiqa(paths, max_side=8)
+    batch_metric.batch_sizes.clear()
+    quality_scoring_actions.score_paths_with_pyiqa(paths)
+    # Full-resolution scoring must not reuse the downscaled preview scores
+    assert batch_metric.batch_sizes == [2]
+    assert len(quality_scoring_actions.load_cached_scores(str(folder), max_side=8)) == 2
+
+
+def test_reduced_batch_score_falls_back_to_per_image(batch_metric, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        BatchDummyMetric,
+        "__call__",
+        lambda self, x: 0.0 if isinstance(x, str) else x.mean(),
+    )
+    folder = tmp_path / "imgs"
+    make_images(folder, [(8, 8)] * 3)
+    scores = quality_scoring_actions.score_paths_with_pyiqa(
+        sorted(str(p) for p in folder.iterdir()), use_cache=False
+    )
+    assert sorted(scores.values()) == pytest.approx([0.0, 20 / 255, 40 / 255], abs=1e-6)
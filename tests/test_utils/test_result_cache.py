@@ -0,0 +1,123 @@
+import json
+import threading
+
+from dataset_forge.utils import result_cache
+from dataset_forge.utils.result_cache import (
+    FileResultCache,
+    load_jsonl_results,
+    run_cached_batch,
+)
+
+
+def make_files(tmp_path, n=5):
+    paths = []
+    for i in range(n):
+        p = tmp_path / f"file_{i}.bin"
+        p.write_bytes(bytes([i]) * 64)
+        paths.append(str(p))
+    return paths
+
+
+def test_cache_key_depends_on_content_and_args(tmp_path):
+    cache = FileResultCache("test", cache_dir=str(tmp_path / "cache"))
+    a, b = make_files(tmp_path, 2)
+    key = cache.make_key(a, {"h": 720})
+    assert key != cache.make_key(a, {"h": 540})
+    assert key != cache.make_key(b, {"h": 720})
+    assert cache.get(key) is None
+    cache.set(key, {"success": True, "value": 1})
+    assert cache.get(key) == {"success": True, "value": 1}
+    assert cache.clear() == 1
+    assert cache.get(key) is None
+
+
+def test_run_cached_batch_reuses_cache(tmp_path):
+    cache = FileResultCache("test", cache_dir=str(tmp_path / "cache"))
+    files = make_files(tmp_path)
+    calls = []
+    lock = threading.Lock()
+
+    def analyze(path):
+        with lock:
+            calls.append(path)
+        return {"success": True, "size": len(path)}
+
+    first = run_cached_batch(files, analyze, cache=cache, cache_args={"x": 1})
+    assert len(calls) == len(files)
+    second = run_cached_batch(files, analyze, cache=cache, cache_args={"x": 1})
+    assert len(calls) == len(files)
+    assert first == second
+    # Different tool args miss the cache
+    run_cached_batch(files[:1], analyze, cache=cache, cache_args={"x": 2})
+    assert len(calls) == len(files) + 1
+
+
+def test_run_cached_batch_streams_and_resumes(tmp_path):
+    files = make_files(tmp_path)
+    results_file = tmp_path / "out" / "results.jsonl"
+    calls = []
+
+    def analyze(path):
+        calls.append(path)
+        return {"success": path != files[0]}
+
+    run_cached_batch(files[:3], analyze, results_file=str(results_file), max_workers=2)
+    lines = results_file.read_text().splitlines()
+    assert len(lines) == 3
+    assert {json.loads(line)["file"] for line in lines} == set(files[:3])
+
+    # Simulate an interrupted write, then resume over the full list
+    with open(results_file, "a") as f:
+        f.write('{"file": "trunc')
+    results = run_cached_batch(
+        files, analyze, results_file=str(results_file), retry_failed=False
+    )
+    assert len(calls) == 5
+    assert set(results) == set(files)
+    assert results[files[0]] == {"success": False}
+    assert set(load_jsonl_results(str(results_file))) == set(files)
+
+    # By default a resumed run retries only the recorded failure
+    calls.clear()
+    run_cached_batch(files, analyze, results_file=str(results_file))
+    assert calls == [files[0]]
+
+
+def test_run_cached_batch_records_exceptions(tmp_path):
+    files = make_files(tmp_path, 2)
+
+    def analyze(path):
+        raise RuntimeError("tool crashed")
+
+    results = run_cached_batch(files, analyze)
+    assert all(not r["success"] for r in results.values())
+    assert "tool crashed" in results[files[0]]["error"]
+
+
+def test_batch_getfscaler_uses_worker_pool(tmp_path, monkeypatch):
+    from dataset_forge.actions.getfscaler_actions import BatchGetfScaler
+
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_DIR", str(tmp_path / "cache"))
+    images = tmp_path / "imgs"
+    images.mkdir()
+    for i in range(4):
+        (images / f"img{i}.png").write_bytes(bytes([i]) * 16)
+
+    exe = tmp_path / "getfscaler.exe"
+    exe.write_bytes(b"")
+    batch = BatchGetfScaler(str(exe), max_workers=3)
+    calls = []
+    monkeypatch.setattr(
+        batch.scaler,
+        "analyze_image",
+        lambda path, **kw: calls.append(path) or {"success": True, **kw},
+    )
+    results_file = tmp_path / "scan.jsonl"
+    results = batch.analyze_directory(
+        str(images), native_height=540.0, results_file=str(results_file)
+    )
+    assert len(results) == 4
+    assert all(r["native_height"] == 540.0 for r in results.values())
+    assert len(results_file.read_text().splitlines()) == 4
+    batch.analyze_directory(str(images), native_height=540.0)
+    assert len(calls) == 4
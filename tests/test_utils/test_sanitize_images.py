@@ -91,3 +91,83 @@ def test_run_zsteg_check(monkeypatch, dummy_image):
     monkeypatch.setattr("subprocess.run", fake_run)
     result = sanitize_images_actions.run_zsteg_check(dummy_image)
     assert result["result"] == "No stego data found"
+
+
+def test_plan_sanitize_outputs_renames_pairs_in_lockstep(tmp_path):
+    hq, lq = tmp_path / "hq", tmp_path / "lq"
+    hq.mkdir()
+    lq.mkdir()
+    for name in ["b.png", "a.png", "solo.png"]:
+        (hq / name).write_bytes(b"x")
+    for name in ["a.jpg", "b.jpg"]:
+        (lq / name).write_bytes(b"x")
+    folders = [(str(hq), str(tmp_path / "out" / "hq")), (str(lq), str(tmp_path / "out" / "lq"))]
+    jobs = sanitize_images_actions.plan_sanitize_outputs(
+        folders, batch_rename=True, to_png=True
+    )
+    names = [(os.path.basename(src), os.path.basename(dst)) for src, dst in jobs]
+    assert names == [("a.png", "1.png"), ("b.png", "2.png"), ("a.jpg", "1.png"), ("b.jpg", "2.png")]
+
+
+def test_sanitize_pipeline_single_pass(tmp_path):
+    from PIL import Image
+
+    src_dir = tmp_path / "in"
+    src_dir.mkdir()
+    Image.new("RGBA", (8, 8), (255, 0, 0, 128)).save(src_dir / "a.png")
+    Image.new("RGB", (8, 8)).save(src_dir / "b.jpg", dpi=(300, 300))
+    good = (src_dir / "a.png").read_bytes()
+    jobs = sanitize_images_actions.plan_sanitize_outputs(
+        [(str(src_dir), str(tmp_path / "out"))], to_png=True
+    )
+    steps = sanitize_images_actions.SanitizeSteps(
+        remove_alpha=True, strip_metadata=True, to_png=True
+    )
+    done, errors = sanitize_images_actions.run_sanitize_pipeline(
+        jobs, steps, max_workers=2
+    )
+    assert (done, errors) == (2, [])
+    assert sorted(os.listdir(tmp_path / "out")) == ["a.png", "b.png"]
+    for name in ["a.png", "b.png"]:
+        with Image.open(tmp_path / "out" / name) as img:
+            assert img.mode == "RGB"
+            assert "dpi" not in img.info
+    assert (src_dir / "a.png").read_bytes() == good
+
+
+def test_metadata_only_steps_keep_jpeg_and_webp_lossless(tmp_path):
+    from PIL import Image
+
+    src_dir = tmp_path / "in"
+    src_dir.mkdir()
+    exif = Image.Exif()
+    exif[0x010E] = "secret"
+    gradient = Image.linear_gradient("L").convert("RGB").resize((32, 32))
+    gradient.save(src_dir / "a.jpg", quality=60, exif=exif, comment=b"hidden")
+    gradient.save(src_dir / "b.webp", quality=40, exif=exif)
+    Image.new("RGBA", (8, 8), (10, 20, 30, 255)).save(src_dir / "c.webp", lossless=True)
+    jobs = sanitize_images_actions.plan_sanitize_outputs(
+        [(str(src_dir), str(tmp_path / "out"))]
+    )
+    steps = sanitize_images_actions.SanitizeSteps(
+        icc_to_srgb=True, remove_alpha=True, strip_metadata=True
+    )
+    done, errors = sanitize_images_actions.run_sanitize_pipeline(
+        jobs, steps, max_workers=1
+    )
+    assert (done, errors) == (3, [])
+    for name in ["a.jpg", "b.webp"]:
+        with Image.open(src_dir / name) as before, Image.open(
+            tmp_path / "out" / name
+        ) as after:
+            assert "exif" not in after.info and "comment" not in after.info
+            assert before.tobytes() == after.tobytes()
+    with Image.open(src_dir / "a.jpg") as before, Image.open(
+        tmp_path / "out" / "a.jpg"
+    ) as after:
+        assert after.quantization == before.quantization
+    # Alpha removal re-encodes, but a lossless source stays lossless
+    assert sanitize_images_actions._webp_is_lossless(str(tmp_path / "out" / "c.webp"))
+    with Image.open(tmp_path / "out" / "c.webp") as img:
+        assert img.mode == "RGB"
+        assert img.getpixel((0, 0)) == (10, 20, 30)
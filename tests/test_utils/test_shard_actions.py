@@ -0,0 +1,121 @@
+import json
+import os
+import tarfile
+
+import pytest
+from PIL import Image
+
+from dataset_forge.actions import shard_actions
+
+
+def create_dummy_image(path, size=(32, 32), color=(255, 0, 0)):
+    with Image.new("RGB", size, color=color) as img:
+        img.save(path, "PNG")
+
+
+@pytest.fixture
+def hq_lq_folders(tmp_path):
+    hq = tmp_path / "hq"
+    lq = tmp_path / "lq"
+    hq.mkdir()
+    lq.mkdir()
+    for i in range(5):
+        create_dummy_image(str(hq / f"img.{i}.png"), size=(64, 64), color=(i, 0, 0))
+        create_dummy_image(str(lq / f"img.{i}.png"), size=(16, 16), color=(0, i, 0))
+    # Unpaired file is skipped in HQ/LQ mode
+    create_dummy_image(str(hq / "extra.png"))
+    return str(hq), str(lq)
+
+
+def test_export_creates_shards_and_index(tmp_path, hq_lq_folders):
+    hq, lq = hq_lq_folders
+    out = tmp_path / "shards"
+    result = shard_actions.export_to_shards(
+        hq,
+        str(out),
+        lq_folder=lq,
+        samples_per_shard=2,
+        sample_metadata={"img.0.png": {"score": 0.5}},
+    )
+    assert result["num_samples"] == 5
+    assert result["num_shards"] == 3
+    index = shard_actions.load_shard_index(str(out))
+    assert index["paired"] is True
+    assert [s["name"] for s in index["shards"]] == [
+        "shard-000000.tar",
+        "shard-000001.tar",
+        "shard-000002.tar",
+    ]
+    assert not [f for f in os.listdir(out) if f.endswith(".tmp")]
+    with tarfile.open(out / "shard-000000.tar") as tar:
+        names = tar.getnames()
+    assert names[:3] == ["img_0.hq.png", "img_0.lq.png", "img_0.json"]
+
+
+def test_shard_reader_streams_and_reads_by_key(tmp_path, hq_lq_folders):
+    hq, lq = hq_lq_folders
+    out = tmp_path / "shards"
+    shard_actions.export_to_shards(
+        hq,
+        str(out),
+        lq_folder=lq,
+        samples_per_shard=2,
+        sample_metadata={"img.0.png": {"score": 0.5}},
+    )
+    reader = shard_actions.ShardReader(str(out))
+    samples = list(reader)
+    assert len(samples) == len(reader) == 5
+    first = samples[0]
+    assert first["__key__"] == "img_0"
+    assert first["json"]["filename"] == "img.0.png"
+    assert first["json"]["score"] == 0.5
+    with open(os.path.join(hq, "img.0.png"), "rb") as f:
+        assert first["hq.png"] == f.read()
+
+    # Random access through index offsets matches streamed bytes
+    direct = reader.read("img_3")
+    streamed = next(s for s in samples if s["__key__"] == "img_3")
+    assert direct == streamed
+
+    sizes = [img.size for _, img in reader.iter_images("lq")]
+    assert sizes == [(16, 16)] * 5
+
+
+def test_import_round_trip_and_verify(tmp_path, hq_lq_folders):
+    hq, lq = hq_lq_folders
+    out = tmp_path / "shards"
+    shard_actions.export_to_shards(hq, str(out), lq_folder=lq)
+    hq_out = tmp_path / "hq_out"
+    lq_out = tmp_path / "lq_out"
+    result = shard_actions.import_from_shards(str(out), str(hq_out), str(lq_out))
+    assert result["imported"] == 5
+    assert result["corrupt"] == []
+    assert sorted(os.listdir(hq_out)) == sorted(os.listdir(lq_out))
+    with open(os.path.join(lq, "img.2.png"), "rb") as a, open(
+        lq_out / "img.2.png", "rb"
+    ) as b:
+        assert a.read() == b.read()
+    assert shard_actions.verify_shards(str(out))["corrupt"] == []
+
+
+def test_single_folder_export(tmp_path, hq_lq_folders):
+    hq, _ = hq_lq_folders
+    out = tmp_path / "shards"
+    result = shard_actions.export_to_shards(hq, str(out))
+    assert result["num_samples"] == 6
+    index = json.loads((out / "index.json").read_text())
+    assert index["paired"] is False
+    keys = shard_actions.ShardReader(str(out)).keys()
+    assert "extra" in keys
+
+
+def test_writer_rolls_over_on_size(tmp_path):
+    with shard_actions.ShardWriter(str(tmp_path), max_shard_bytes=4096) as writer:
+        for i in range(4):
+            writer.write(f"s{i}", {"bin": b"x" * 2000})
+    assert len(writer.shards) == 4
+
+
+def test_missing_index_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        shard_actions.ShardReader(str(tmp_path))
@@ -0,0 +1,113 @@
+import json
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+
+from dataset_forge.actions import sketch_extraction_actions as sketch
+
+
+class DummyProcessor:
+    def __call__(self, images, return_tensors="np"):
+        array = np.asarray(images.resize((8, 8)), dtype=np.float32) / 255.0
+        return {"pixel_values": array.transpose(2, 0, 1)[None]}
+
+
+class DummyModel:
+    """Dark images are class 0 (a sketch class), bright ones class 130."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, pixel_values):
+        self.batch_sizes.append(pixel_values.shape[0])
+        dark = pixel_values.mean(dim=(1, 2, 3)) < 0.5
+        logits = torch.zeros(pixel_values.shape[0], 200)
+        logits[dark, 0] = 10.0
+        logits[~dark, 130] = 10.0
+        return SimpleNamespace(logits=logits)
+
+
+@pytest.fixture
+def dummy_model(monkeypatch):
+    model = DummyModel()
+    monkeypatch.setattr(
+        sketch, "get_model_and_processor", lambda: (model, DummyProcessor())
+    )
+    monkeypatch.setattr(
+        sketch, "_loaded_model_name", "prithivMLmods/Sketch-126-DomainNet"
+    )
+    return model
+
+
+@pytest.fixture
+def image_folder(tmp_path):
+    folder = tmp_path / "in"
+    folder.mkdir()
+    for i in range(10):
+        value = 20 if i % 2 == 0 else 230
+        Image.new("RGB", (16, 16), (value,) * 3).save(folder / f"img_{i}.png")
+    (folder / "broken.png").write_bytes(b"not an image")
+    return folder
+
+
+def test_batched_extraction_copies_sketches(dummy_model, image_folder, tmp_path):
+    out = tmp_path / "out"
+    results = tmp_path / "results.jsonl"
+    found, errors = sketch.extract_sketches_from_folder(
+        str(image_folder),
+        str(out),
+        batch_size=4,
+        num_workers=0,
+        results_file=str(results),
+    )
+    assert (found, errors) == (5, 1)
+    assert sorted(os.listdir(out)) == [f"img_{i}.png" for i in range(0, 10, 2)]
+    assert dummy_model.batch_sizes == [4, 4, 2]
+    records = [json.loads(line) for line in results.read_text().splitlines()]
+    assert len(records) == 11
+    assert sum(r["is_sketch"] for r in records) == 5
+
+
+def test_extraction_resumes_from_results_file(dummy_model, image_folder, tmp_path):
+    out = tmp_path / "out"
+    results = tmp_path / "results.jsonl"
+    sketch.extract_sketches_from_folder(
+        str(image_folder), str(out), num_workers=0, results_file=str(results)
+    )
+    dummy_model.batch_sizes.clear()
+    found, errors = sketch.extract_sketches_from_folder(
+        str(image_folder),
+        str(out),
+        num_workers=0,
+        results_file=str(results),
+        resume=True,
+    )
+    # Only the image that failed to decode is tried again
+    assert (found, errors) == (5, 1)
+    assert dummy_model.batch_sizes == []
+
+
+def test_resume_ignores_results_from_another_threshold(
+    dummy_model, image_folder, tmp_path
+):
+    out = tmp_path / "out"
+    results = tmp_path / "results.jsonl"
+    sketch.extract_sketches_from_folder(
+        str(image_folder), str(out), num_workers=0, results_file=str(results)
+    )
+    dummy_model.batch_sizes.clear()
+    sketch.extract_sketches_from_folder(
+        str(image_folder),
+        str(out),
+        confidence_threshold=0.9,
+        num_workers=0,
+        results_file=str(results),
+        resume=True,
+    )
+    assert sum(dummy_model.batch_sizes) == 10
+    records = [json.loads(line) for line in results.read_text().splitlines()]
+    assert {r["threshold"] for r in records[-11:]} == {0.9}
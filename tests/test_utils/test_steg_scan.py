@@ -0,0 +1,72 @@
+import json
+
+import numpy as np
+from PIL import Image
+
+from dataset_forge.utils import steg_scan
+from dataset_forge.utils.result_cache import FileResultCache
+
+
+def gradient_image(path):
+    y, x = np.mgrid[0:256, 0:256]
+    rng = np.random.default_rng(0)
+    pixels = np.stack([x, y, (x + y) // 2], axis=-1) + rng.normal(0, 2, (256, 256, 3))
+    pixels = np.clip(pixels, 0, 255).astype(np.uint8)
+    Image.fromarray(pixels).save(path)
+    return pixels
+
+
+def test_prefilter_flags_lsb_embedding_and_appended_data(tmp_path):
+    pixels = gradient_image(tmp_path / "clean.png")
+    embedded = pixels.reshape(-1, 3).copy()
+    bits = np.random.default_rng(1).integers(0, 2, 20000)
+    embedded[:20000, 0] = (embedded[:20000, 0] & 0xFE) | bits
+    Image.fromarray(embedded.reshape(pixels.shape)).save(tmp_path / "lsb.png")
+    (tmp_path / "tail.png").write_bytes((tmp_path / "clean.png").read_bytes() + b"PK\x03\x04")
+
+    assert steg_scan.lsb_prefilter(str(tmp_path / "clean.png"))["suspicious"] is False
+    assert steg_scan.lsb_prefilter(str(tmp_path / "lsb.png"))["suspicious"] is True
+    tail = steg_scan.lsb_prefilter(str(tmp_path / "tail.png"))
+    assert tail["suspicious"] is True and tail["trailing_bytes"] == 4
+
+
+def test_zsteg_batch_splits_output_and_retries_missing(monkeypatch):
+    calls = []
+
+    def fake_run_tool(cmd, timeout):
+        calls.append(cmd[1:])
+        if len(cmd) > 2:
+            out = "[.] a.png\nb1,r,lsb,xy .. text: \"secret\"\n[.] b.png\nimagedata .. nothing\n"
+            return 1, out, "stack level too deep"
+        return 0, "imagedata .. nothing\n", ""
+
+    monkeypatch.setattr(steg_scan, "_run_tool", fake_run_tool)
+    results = steg_scan.run_zsteg_batch(["a.png", "b.png", "c.png"])
+    assert results["a.png"]["verdict"] == "suspicious"
+    assert results["b.png"]["verdict"] == "clean"
+    assert results["c.png"]["verdict"] == "clean"
+    # One batch call, then single-file retries for the cut-off and missing files
+    assert calls == [["a.png", "b.png", "c.png"], ["c.png"], ["b.png"]]
+
+
+def test_scan_images_streams_report_and_caches(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setattr(
+        steg_scan, "FileResultCache", lambda ns: FileResultCache(ns, cache_dir=cache_dir)
+    )
+    gradient_image(tmp_path / "clean.png")
+    (tmp_path / "tail.png").write_bytes((tmp_path / "clean.png").read_bytes() + b"xx")
+    monkeypatch.setattr(steg_scan.shutil, "which", lambda tool: "zsteg")
+    monkeypatch.setattr(
+        steg_scan, "run_zsteg_batch", lambda paths, exe: {p: {"verdict": "clean", "summary": "ok"} for p in paths}
+    )
+    paths = [str(tmp_path / "clean.png"), str(tmp_path / "tail.png")]
+    report = tmp_path / "steg.jsonl"
+    summary = steg_scan.scan_images(paths, report_path=str(report), max_workers=2)
+    assert (summary["clean"], summary["tool_scans"], summary["cached"]) == (2, 1, 0)
+    lines = [json.loads(line) for line in report.read_text().splitlines()]
+    assert {line["file"] for line in lines} == set(paths)
+
+    summary = steg_scan.scan_images(paths, max_workers=2)
+    assert (summary["cached"], summary["tool_scans"]) == (2, 0)
+
@@ -0,0 +1,117 @@
+import cv2
+import numpy as np
+import pytest
+from PIL import Image, ImageEnhance
+
+from dataset_forge.actions import transform_actions
+from dataset_forge.actions.transform_actions import (
+    apply_transform_chain,
+    parse_transform_chain,
+    transform_pairs,
+)
+
+
+def make_bgr(seed=0, size=64):
+    rng = np.random.default_rng(seed)
+    return cv2.GaussianBlur(
+        rng.integers(0, 256, (size, size, 3), dtype=np.uint8), (0, 0), 1.5
+    )
+
+
+def test_parse_transform_chain():
+    assert parse_transform_chain("brightness=1.1, Contrast=0.9") == [
+        ("brightness", 1.1),
+        ("contrast", 0.9),
+    ]
+    assert parse_transform_chain([{"op": "hue", "value": 10}, ("gamma", "2")]) == [
+        ("hue", 10.0),
+        ("gamma", 2.0),
+    ]
+    with pytest.raises(ValueError):
+        parse_transform_chain("emboss=1")
+    with pytest.raises(ValueError):
+        parse_transform_chain("brightness=abc")
+
+
+def test_pointwise_chain_matches_pil_and_uses_one_lut(monkeypatch):
+    bgr = make_bgr()
+    pil = Image.fromarray(cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB))
+    expected = ImageEnhance.Contrast(ImageEnhance.Brightness(pil).enhance(1.2)).enhance(
+        0.8
+    )
+
+    calls = []
+    original_lut = cv2.LUT
+    monkeypatch.setattr(
+        transform_actions.cv2,
+        "LUT",
+        lambda *a: calls.append(1) or original_lut(*a),
+    )
+    out = apply_transform_chain(bgr, "brightness=1.2, contrast=0.8, gamma=1")
+    assert len(calls) == 1
+    diff = np.abs(
+        cv2.cvtColor(out, cv2.COLOR_BGR2RGB).astype(int)
+        - np.asarray(expected).astype(int)
+    )
+    assert diff.max() <= 2
+
+
+def test_chain_preserves_alpha_and_bit_depth():
+    color = make_bgr().astype(np.uint16) * 257
+    alpha = np.full(color.shape[:2] + (1,), 4321, np.uint16)
+    bgra = np.concatenate([color, alpha], axis=2)
+    out = apply_transform_chain(bgra, "gamma=2.2, saturation=1.5, blur=1, hue=20")
+    assert out.dtype == np.uint16 and out.shape == bgra.shape
+    assert (out[..., 3] == 4321).all()
+    assert not np.array_equal(out[..., :3], color)
+
+    gray = make_bgr()[..., 0]
+    assert apply_transform_chain(gray, "hue=30, saturation=0").shape == gray.shape
+
+
+def test_transform_pairs_process_pool(tmp_path):
+    hq, lq = tmp_path / "hq", tmp_path / "lq"
+    out_hq, out_lq = tmp_path / "out_hq", tmp_path / "out_lq"
+    hq.mkdir()
+    lq.mkdir()
+    pairs = []
+    for i in range(3):
+        cv2.imwrite(str(hq / f"{i}.png"), make_bgr(i))
+        cv2.imwrite(str(lq / f"{i}.png"), make_bgr(i, size=16))
+        pairs.append((str(hq / f"{i}.png"), str(lq / f"{i}.png"), f"{i}.png"))
+    (hq / "bad.png").write_bytes(b"broken")
+    (lq / "bad.png").write_bytes(b"broken")
+    pairs.append((str(hq / "bad.png"), str(lq / "bad.png"), "bad.png"))
+
+    ok, failed = transform_pairs(
+        pairs, "brightness=0.5", "copy", str(out_hq), str(out_lq), max_workers=2
+    )
+    assert (ok, failed) == (3, 1)
+    result = cv2.imread(str(out_lq / "1.png"))
+    expected = np.rint(make_bgr(1, size=16) * 0.5)
+    assert np.abs(result.astype(int) - expected).max() <= 1
+    assert (hq / "0.png").exists()
+
+
+def test_transform_pairs_move_keeps_broken_pairs(tmp_path):
+    hq, lq = tmp_path / "hq", tmp_path / "lq"
+    out_hq, out_lq = tmp_path / "out_hq", tmp_path / "out_lq"
+    hq.mkdir()
+    lq.mkdir()
+    cv2.imwrite(str(hq / "good.png"), make_bgr(1))
+    cv2.imwrite(str(lq / "good.png"), make_bgr(1, size=16))
+    # HQ half succeeds, LQ half fails
+    cv2.imwrite(str(hq / "half.png"), make_bgr(2))
+    (lq / "half.png").write_bytes(b"broken")
+    pairs = [
+        (str(hq / name), str(lq / name), name) for name in ("good.png", "half.png")
+    ]
+
+    ok, failed = transform_pairs(
+        pairs, "contrast=1.2", "move", str(out_hq), str(out_lq), max_workers=2
+    )
+    assert (ok, failed) == (1, 1)
+    assert (out_hq / "good.png").exists() and (out_lq / "good.png").exists()
+    assert not (hq / "good.png").exists() and not (lq / "good.png").exists()
+    # The failed pair keeps both of its sources
+    assert (hq / "half.png").exists() and (lq / "half.png").exists()
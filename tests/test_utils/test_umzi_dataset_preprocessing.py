@@ -121,3 +121,95 @@ def test_iqa_filtering_action(cleanup_test_dirs):
     )
     assert os.path.exists(out_folder)
     assert len(os.listdir(out_folder)) > 0
+
+
+class DummyEmbedder:
+    """Minimal stand-in for pepedp ImgToEmbedding (global average pooling)."""
+
+    def __init__(self, scale=1):
+        import torch
+
+        self.device = torch.device("cpu")
+        self.scale = scale
+        self.amp = False
+        self.model = torch.nn.Sequential(
+            torch.nn.AdaptiveAvgPool2d(1), torch.nn.Flatten()
+        )
+
+    def __call__(self, img):
+        import torch
+
+        x = torch.from_numpy(img.transpose((2, 0, 1)).copy())[None]
+        return self.model(x)
+
+
+def test_create_embedd_batched_matches_single(tmp_path):
+    folder = tmp_path / "imgs"
+    folder.mkdir()
+    for i in range(5):
+        make_dummy_image(str(folder / f"img_{i}.png"), size=(32, 32, 3), color=i * 40)
+    make_dummy_image(str(folder / "odd.png"), size=(16, 48, 3), color=7)
+    embedder = DummyEmbedder()
+    batched = umzi.create_embedd_with_progress(str(folder), embedder, batch_size=4)
+    single = umzi.create_embedd_with_progress(str(folder), embedder, batch_size=1)
+    assert list(batched) == list(single)
+    assert len(batched) == 6
+    for name in batched:
+        assert batched[name].shape == (1, 3)
+        assert np.allclose(batched[name].numpy(), single[name].numpy(), atol=1e-6)
+
+
+def test_create_embedd_mixed_shapes_bounded(tmp_path, monkeypatch):
+    from dataset_forge.utils import parallel_utils
+
+    peak = []
+
+    class RecordingBatcher(parallel_utils.ShapeBatcher):
+        def add(self, shape, item):
+            ready = super().add(shape, item)
+            peak.append(self.buffered + len(ready or ()))
+            return ready
+
+    monkeypatch.setattr(parallel_utils, "ShapeBatcher", RecordingBatcher)
+    folder = tmp_path / "imgs"
+    folder.mkdir()
+    for i in range(12):
+        make_dummy_image(
+            str(folder / f"img_{i:02d}.png"), size=(16, 16 + 8 * i, 3), color=i * 20
+        )
+    embedder = DummyEmbedder()
+    batched = umzi.create_embedd_with_progress(
+        str(folder), embedder, batch_size=4, max_buffered=5
+    )
+    single = umzi.create_embedd_with_progress(str(folder), embedder, batch_size=1)
+    assert max(peak) == 5
+    assert list(batched) == list(single)
+    for name in batched:
+        assert np.allclose(batched[name].numpy(), single[name].numpy(), atol=1e-6)
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 7, 64])
+def test_blocked_pairs_match_bruteforce(block_size):
+    import torch
+
+    torch.manual_seed(0)
+    base = torch.randn(6, 8)
+    # Near-duplicates of the first rows mixed into the set
+    E = torch.cat([base, base[:3] + 0.01 * torch.randn(3, 8)], dim=0)
+    embeddings = {f"img_{i}.png": E[i : i + 1] for i in range(E.size(0))}
+    result = umzi.filtered_pairs_with_progress(
+        embeddings,
+        dist_func=lambda a, b: torch.cdist(a, b),
+        threshold=0.5,
+        device_str="cpu",
+        block_size=block_size,
+    )
+    D = torch.cdist(E, E)
+    expected = [
+        (i, j)
+        for i in range(E.size(0))
+        for j in range(i + 1, E.size(0))
+        if D[i, j] < 0.5
+    ]
+    assert [(i, j) for i, j, _ in result["filtered_pairs"]] == expected
+    assert expected == [(0, 6), (1, 7), (2, 8)]